@@ -210,7 +210,9 @@ class AiffReader(PCMReader):
         self.channel_mask = channel_mask
         self.bits_per_sample = bits_per_sample
         self.remaining_frames = total_frames
+        self.total_frames = total_frames
         self.bytes_per_frame = self.channels * self.bits_per_sample / 8
+        self.ssnd_offset = None
 
         self.process = process
 
@@ -237,6 +239,13 @@ class AiffReader(PCMReader):
                         aiff_reader.skip(8)
         except IOError:
             self.read = self.read_error
+            return
+
+        #note where the sound data starts, if the stream is seekable
+        try:
+            self.ssnd_offset = self.file.tell()
+        except IOError:
+            pass
 
     def read(self, bytes):
         """Try to read a pcm.FrameList of size "bytes"."""
@@ -263,6 +272,24 @@ class AiffReader(PCMReader):
                                  self.bits_per_sample,
                                  True, True)
 
+    def seek(self, pcm_frame):
+        """Tries to seek to the given PCM frame offset.
+
+        Returns the PCM frame actually seeked to.
+        Raises ValueError if pcm_frame is negative
+        or IOError if the stream is not seekable."""
+
+        if (pcm_frame < 0):
+            raise ValueError("PCM frame must be >= 0")
+        elif (self.ssnd_offset is None):
+            raise IOError("stream is not seekable")
+
+        pcm_frame = min(pcm_frame, self.total_frames)
+        self.file.seek(self.ssnd_offset +
+                       (pcm_frame * self.bytes_per_frame), 0)
+        self.remaining_frames = self.total_frames - pcm_frame
+        return pcm_frame
+
     def read_error(self, bytes):
         raise IOError()
 
@@ -55,6 +55,13 @@ class AuReader(PCMReader):
                            channel_mask=channel_mask,
                            bits_per_sample=bits_per_sample)
         self.data_size = data_size
+        self.total_data_size = data_size
+
+        #note where the data starts, if the stream is seekable
+        try:
+            self.data_offset = au_file.tell()
+        except IOError:
+            self.data_offset = None
 
     def read(self, bytes):
         """Try to read a pcm.FrameList of size "bytes"."""
@@ -77,6 +84,24 @@ class AuReader(PCMReader):
         except ValueError:
             raise IOError("data ends prematurely")
 
+    def seek(self, pcm_frame):
+        """Tries to seek to the given PCM frame offset.
+
+        Returns the PCM frame actually seeked to.
+        Raises ValueError if pcm_frame is negative
+        or IOError if the stream is not seekable."""
+
+        if (pcm_frame < 0):
+            raise ValueError("PCM frame must be >= 0")
+        elif (self.data_offset is None):
+            raise IOError("stream is not seekable")
+
+        bytes_per_frame = self.channels * self.bits_per_sample / 8
+        pcm_frame = min(pcm_frame, self.total_data_size / bytes_per_frame)
+        self.file.seek(self.data_offset + (pcm_frame * bytes_per_frame), 0)
+        self.data_size = self.total_data_size - (pcm_frame * bytes_per_frame)
+        return pcm_frame
+
 
 class AuAudio(AudioFile):
     """A Sun AU audio file."""
@@ -29,7 +29,8 @@ from audiotools import (AudioFile, MetaData, InvalidFile, PCMReader,
                         ChannelMask, PCMReaderError, __default_quality__,
                         WaveContainer, AiffContainer, to_pcm_progress,
                         image_metrics, RIFF_Chunk, AIFF_Chunk,
-                        PCMReaderProgress)
+                        PCMReaderProgress, __FileSlice__, __replace_file__,
+                        config)
 from __vorbiscomment__ import *
 from __id3__ import skip_id3v2_comment
 
@@ -43,6 +44,11 @@ gettext.install("audiotools", unicode=True)
 #######################
 
 
+#bytes of PADDING reserved whenever a FLAC file's metadata is rewritten
+#so that later, larger metadata can be written in place
+FLAC_PADDING = config.getint_default("FLAC", "padding", 4096)
+
+
 class InvalidFLAC(InvalidFile):
     pass
 
@@ -185,7 +191,7 @@ class FlacMetaData(MetaData):
             return cls([Flac_VORBISCOMMENT.converted(metadata)] +
                        [Flac_PICTURE.converted(image)
                         for image in metadata.images()] +
-                       [Flac_PADDING(4096)])
+                       [Flac_PADDING(FLAC_PADDING)])
 
     def add_image(self, image):
         """Embeds an Image object in this metadata."""
@@ -264,6 +270,9 @@ class FlacMetaData(MetaData):
 
         return self.__class__(cleaned_blocks)
 
+    def copy(self):
+        return self.__class__([block.copy() for block in self.block_list])
+
     def __repr__(self):
         return "FlacMetaData(%s)" % (self.block_list)
 
@@ -275,37 +284,77 @@ class FlacMetaData(MetaData):
 
         while (last != 1):
             (last, block_type, block_length) = reader.parse("1u7u24u")
+            block_list.append(cls.parse_block(block_type, block_length,
+                                              reader))
 
-            if (block_type == 0):    # STREAMINFO
-                block_list.append(
-                    Flac_STREAMINFO.parse(reader.substream(block_length)))
-            elif (block_type == 1):  # PADDING
-                block_list.append(Flac_PADDING.parse(
-                        reader.substream(block_length), block_length))
-            elif (block_type == 2):  # APPLICATION
-                block_list.append(Flac_APPLICATION.parse(
-                        reader.substream(block_length), block_length))
-            elif (block_type == 3):  # SEEKTABLE
-                block_list.append(
-                    Flac_SEEKTABLE.parse(reader.substream(block_length),
-                                         block_length / 18))
-            elif (block_type == 4):  # VORBIS_COMMENT
-                block_list.append(Flac_VORBISCOMMENT.parse(
-                        reader.substream(block_length)))
-            elif (block_type == 5):  # CUESHEET
-                block_list.append(
-                    Flac_CUESHEET.parse(reader.substream(block_length)))
-            elif (block_type == 6):  # PICTURE
-                block_list.append(Flac_PICTURE.parse(
-                        reader.substream(block_length)))
-            elif ((block_type >= 7) and (block_type <= 126)):
-                raise ValueError(_(u"reserved metadata block type %d") %
-                                 (block_type))
+        return cls(block_list)
+
+    @classmethod
+    def parse_file(cls, stream, filename):
+        """returns a FlacMetaData object from the given file object
+        which has already read the 4-byte 'fLaC' file ID
+
+        unlike parse(), PICTURE blocks' image data is skipped over
+        and left in the file named filename until it's accessed"""
+
+        from .bitstream import BitstreamReader
+
+        block_list = []
+
+        last = 0
+
+        while (last != 1):
+            header = stream.read(4)
+            if (len(header) < 4):
+                raise IOError(_(u"unexpected end of file"))
+            (last,
+             block_type,
+             block_length) = BitstreamReader(cStringIO.StringIO(header),
+                                             0).parse("1u7u24u")
+
+            if (block_type == 6):    # PICTURE
+                block_list.append(Flac_PICTURE.parse_file(stream,
+                                                          block_length,
+                                                          filename))
             else:
-                raise ValueError(_(u"invalid metadata block type"))
+                block_data = stream.read(block_length)
+                if (len(block_data) < block_length):
+                    raise IOError(_(u"unexpected end of file"))
+                block_list.append(cls.parse_block(
+                        block_type,
+                        block_length,
+                        BitstreamReader(cStringIO.StringIO(block_data), 0)))
 
         return cls(block_list)
 
+    @classmethod
+    def parse_block(cls, block_type, block_length, reader):
+        """returns a metadata block of the given type and length
+        from a BitstreamReader positioned at the block's contents"""
+
+        if (block_type == 0):    # STREAMINFO
+            return Flac_STREAMINFO.parse(reader.substream(block_length))
+        elif (block_type == 1):  # PADDING
+            return Flac_PADDING.parse(reader.substream(block_length),
+                                      block_length)
+        elif (block_type == 2):  # APPLICATION
+            return Flac_APPLICATION.parse(reader.substream(block_length),
+                                          block_length)
+        elif (block_type == 3):  # SEEKTABLE
+            return Flac_SEEKTABLE.parse(reader.substream(block_length),
+                                        block_length / 18)
+        elif (block_type == 4):  # VORBIS_COMMENT
+            return Flac_VORBISCOMMENT.parse(reader.substream(block_length))
+        elif (block_type == 5):  # CUESHEET
+            return Flac_CUESHEET.parse(reader.substream(block_length))
+        elif (block_type == 6):  # PICTURE
+            return Flac_PICTURE.parse(reader.substream(block_length))
+        elif ((block_type >= 7) and (block_type <= 126)):
+            raise ValueError(_(u"reserved metadata block type %d") %
+                             (block_type))
+        else:
+            raise ValueError(_(u"invalid metadata block type"))
+
     def raw_info(self):
         from os import linesep
 
@@ -526,14 +575,29 @@ class Flac_PICTURE(Image):
         self.__dict__["picture_type"] = picture_type
 
     def copy(self):
-        return Flac_PICTURE(self.picture_type,
-                            self.mime_type,
-                            self.description,
-                            self.width,
-                            self.height,
-                            self.color_depth,
-                            self.color_count,
-                            self.data)
+        if ("data" in self.__dict__):
+            return Flac_PICTURE(self.picture_type,
+                                self.mime_type,
+                                self.description,
+                                self.width,
+                                self.height,
+                                self.color_depth,
+                                self.color_count,
+                                self.data)
+        else:
+            #share image data which has yet to be read from disk
+            picture = Flac_PICTURE(self.picture_type,
+                                   self.mime_type,
+                                   self.description,
+                                   self.width,
+                                   self.height,
+                                   self.color_depth,
+                                   self.color_count,
+                                   None)
+            del(picture.__dict__["data"])
+            picture.__dict__["__data_slice__"] = \
+                self.__dict__["__data_slice__"]
+            return picture
 
     def __getattr__(self, key):
         if (key == "type"):
@@ -548,6 +612,9 @@ class Flac_PICTURE(Image):
             # | Media        |               6 |          3 |
 
             return {0: 4, 3: 0, 4: 1, 5: 2, 6: 3}.get(self.picture_type, 4)
+        elif ((key == "data") and ("__data_slice__" in self.__dict__)):
+            #image data left on disk by parse_file()
+            return self.__dict__["__data_slice__"].read()
         else:
             try:
                 return self.__dict__[key]
@@ -607,6 +674,62 @@ class Flac_PICTURE(Image):
             color_count=reader.read(32),
             data=reader.read_bytes(reader.read(32)))
 
+    @classmethod
+    def parse_file(cls, stream, block_length, filename):
+        """returns a Flac_PICTURE from a file object positioned
+        at the start of a PICTURE block's contents
+
+        the image data itself is left in the file named filename
+        and is read when first accessed,
+        while the file object is positioned at the end of the block"""
+
+        from .bitstream import BitstreamReader
+
+        block_start = stream.tell()
+        header = stream.read(min(block_length, 8))
+        if (len(header) < 8):
+            raise IOError(_(u"unexpected end of file"))
+        (picture_type,
+         mime_type_length) = BitstreamReader(cStringIO.StringIO(header),
+                                             0).parse("32u 32u")
+
+        header = stream.read(mime_type_length + 4)
+        if (len(header) < (mime_type_length + 4)):
+            raise IOError(_(u"unexpected end of file"))
+        reader = BitstreamReader(cStringIO.StringIO(header), 0)
+        mime_type = reader.read_bytes(mime_type_length).decode('ascii')
+        description_length = reader.read(32)
+
+        header = stream.read(description_length + 20)
+        if (len(header) < (description_length + 20)):
+            raise IOError(_(u"unexpected end of file"))
+        reader = BitstreamReader(cStringIO.StringIO(header), 0)
+        description = reader.read_bytes(description_length).decode('utf-8')
+        (width,
+         height,
+         color_depth,
+         color_count,
+         data_length) = reader.parse("32u 32u 32u 32u 32u")
+
+        data_start = stream.tell()
+        if ((data_start + data_length) > (block_start + block_length)):
+            raise IOError(_(u"PICTURE data exceeds block length"))
+        stream.seek(block_start + block_length, 0)
+
+        picture = cls(picture_type=picture_type,
+                      mime_type=mime_type,
+                      description=description,
+                      width=width,
+                      height=height,
+                      color_depth=color_depth,
+                      color_count=color_count,
+                      data=None)
+        del(picture.__dict__["data"])
+        picture.__dict__["__data_slice__"] = __FileSlice__(filename,
+                                                           data_start,
+                                                           data_length)
+        return picture
+
     def build(self, writer):
         writer.build("32u [ 32u%db ] [32u%db ] 32u 32u 32u 32u [ 32u%db ]" %
                      (len(self.mime_type.encode('ascii')),
@@ -1220,15 +1343,16 @@ class FlacAudio(WaveContainer, AiffContainer):
         #even if the blocks aren't present
         #so there's no need to test for None
 
+        return self.__cached_metadata__(self.__read_metadata__)
+
+    def __read_metadata__(self):
         f = file(self.filename, 'rb')
         try:
             f.seek(self.__stream_offset__, 0)
             if (f.read(4) != 'fLaC'):
                 raise InvalidFLAC(_(u'Invalid FLAC file'))
 
-            from .bitstream import BitstreamReader
-
-            return FlacMetaData.parse(BitstreamReader(f, 0))
+            return FlacMetaData.parse_file(f, self.filename)
         finally:
             f.close()
 
@@ -1248,6 +1372,8 @@ class FlacAudio(WaveContainer, AiffContainer):
         if (not isinstance(metadata, FlacMetaData)):
             raise ValueError(_(u"metadata not from audio file"))
 
+        self.__uncache_metadata__()
+
         has_padding = len(metadata.get_blocks(Flac_PADDING.BLOCK_ID)) > 0
 
         if (has_padding):
@@ -1283,6 +1409,7 @@ class FlacAudio(WaveContainer, AiffContainer):
 
             #then overwrite the beginning of the file
             stream = file(self.filename, 'r+b')
+            stream.seek(self.__stream_offset__, 0)
             stream.write('fLaC')
             metadata.build(BitstreamWriter(stream, 0))
             stream.close()
@@ -1290,36 +1417,41 @@ class FlacAudio(WaveContainer, AiffContainer):
             #if padding is smaller than change in metadata,
             #or file has no padding,
             #rewrite entire file to fit new metadata
+            #with a fresh PADDING block for later changes to use
+            if (FLAC_PADDING > 0):
+                metadata.replace_blocks(Flac_PADDING.BLOCK_ID,
+                                        [Flac_PADDING(FLAC_PADDING)])
+            else:
+                metadata.replace_blocks(Flac_PADDING.BLOCK_ID, [])
 
-            import tempfile
+            #the new file is built alongside the old one in a single pass
+            #rather than copying the stream out to a temporary file and back
+            stream_start = self.__stream_offset__ + 4 + self.metadata_length()
+            stream_size = os.path.getsize(self.filename) - stream_start
 
-            stream = file(self.filename, 'rb')
-            stream.seek(self.__stream_offset__, 0)
+            def write_contents(new_file):
+                new_file.write('fLaC')
+                writer = BitstreamWriter(new_file, 0)
+                metadata.build(writer)
+                writer.flush()
+                header_size = new_file.tell()
 
-            if (stream.read(4) != 'fLaC'):
-                raise InvalidFLAC(_(u'Invalid FLAC file'))
+                stream = file(self.filename, 'rb')
+                try:
+                    stream.seek(stream_start, 0)
+                    transfer_data(stream.read, new_file.write)
+                finally:
+                    stream.close()
 
-            #skip the existing metadata blocks
-            stop = 0
-            reader = BitstreamReader(stream, 0)
-            while (stop == 0):
-                (stop, length) = reader.parse("1u 7p 24u")
-                reader.skip_bytes(length)
+                new_file.flush()
+                if (os.fstat(new_file.fileno()).st_size !=
+                    (header_size + stream_size)):
+                    raise IOError(_(u"unexpected end of file"))
 
-            #write the remaining data stream to a temp file
-            file_data = tempfile.TemporaryFile()
-            transfer_data(stream.read, file_data.write)
-            file_data.seek(0, 0)
+            __replace_file__(self.filename, write_contents)
 
-            #finally, rebuild our file using new metadata and old stream
-            stream = file(self.filename, 'wb')
-            stream.write('fLaC')
-            writer = BitstreamWriter(stream, 0)
-            metadata.build(writer)
-            writer.flush()
-            transfer_data(file_data.read, stream.write)
-            file_data.close()
-            stream.close()
+            #the rewritten file no longer has any ID3v2 tag in front of it
+            self.__stream_offset__ = 0
 
     def set_metadata(self, metadata):
         """Takes a MetaData object and sets this track's metadata.
@@ -1482,14 +1614,24 @@ class FlacAudio(WaveContainer, AiffContainer):
             return None
 
     def to_pcm(self):
-        """Returns a PCMReader object containing the track's PCM data."""
+        """Returns a PCMReader object containing the track's PCM data.
+
+        Frames are decoded with audiotools.DECODING_THREADS threads,
+        the file is memory-mapped if audiotools.MMAP_DECODING is set
+        and its MD5 sum is skipped if audiotools.FAST_DECODING is set."""
 
         from . import decoders
+        from . import DECODING_THREADS
+        from . import MMAP_DECODING
+        from . import FAST_DECODING
 
         try:
             return decoders.FlacDecoder(self.filename,
                                         self.channel_mask(),
-                                        self.__stream_offset__)
+                                        self.__stream_offset__,
+                                        DECODING_THREADS,
+                                        MMAP_DECODING,
+                                        not FAST_DECODING)
         except (IOError, ValueError), msg:
             #The only time this is likely to occur is
             #if the FLAC is modified between when FlacAudio
@@ -1501,21 +1643,30 @@ class FlacAudio(WaveContainer, AiffContainer):
                                   bits_per_sample=self.bits_per_sample())
 
     @classmethod
-    def from_pcm(cls, filename, pcmreader, compression=None):
+    def from_pcm(cls, filename, pcmreader, compression=None,
+                 encoding_threads=None):
         """Encodes a new file from PCM data.
 
         Takes a filename string, PCMReader object
         and optional compression level string.
         Encodes a new audio file from pcmreader's data
         at the given filename with the specified compression level
-        and returns a new FlacAudio object."""
+        and returns a new FlacAudio object.
+
+        encoding_threads is the number of threads to encode frames with,
+        which defaults to audiotools.ENCODING_THREADS.
+        The file's contents are the same regardless."""
 
         from . import encoders
+        from . import ENCODING_THREADS
 
         if ((compression is None) or
             (compression not in cls.COMPRESSION_MODES)):
             compression = __default_quality__(cls.NAME)
 
+        if (encoding_threads is None):
+            encoding_threads = ENCODING_THREADS
+
         encoding_options = {"0": {"block_size": 1152,
                                   "max_lpc_order": 0,
                                   "min_residual_partition_order": 0,
@@ -1597,6 +1748,7 @@ class FlacAudio(WaveContainer, AiffContainer):
             offsets = encoders.encode_flac(
                 filename,
                 pcmreader=BufferedPCMReader(pcmreader),
+                threads=max(encoding_threads, 1),
                 **encoding_options)
             flac = FlacAudio(filename)
             metadata = flac.get_metadata()
@@ -1966,11 +2118,15 @@ class FlacAudio(WaveContainer, AiffContainer):
             f.close()
 
     @classmethod
-    def add_replay_gain(cls, filenames, progress=None):
+    def add_replay_gain(cls, filenames, progress=None, analyses=None):
         """Adds ReplayGain values to a list of filename strings.
 
         All the filenames must be of this AudioFile type.
         Raises ValueError if some problem occurs during ReplayGain application.
+
+        "analyses" is an optional dict of filename strings
+        to ReplayGainAnalysis.result() tuples
+        for files which needn't be decoded again.
         """
 
         tracks = [track for track in open_files(filenames) if
@@ -1981,7 +2137,8 @@ class FlacAudio(WaveContainer, AiffContainer):
                  track_gain,
                  track_peak,
                  album_gain,
-                 album_peak) in calculate_replay_gain(tracks, progress):
+                 album_peak) in calculate_replay_gain(tracks, progress,
+                                                      analyses=analyses):
                 metadata = track.get_metadata()
                 try:
                     comment = metadata.get_block(
@@ -2698,13 +2855,17 @@ class OggFlacAudio(FlacAudio):
             f.close()
 
     def to_pcm(self):
-        """Returns a PCMReader object containing the track's PCM data."""
+        """Returns a PCMReader object containing the track's PCM data.
+
+        The stream's MD5 sum is skipped if audiotools.FAST_DECODING is set."""
 
         from . import decoders
+        from . import FAST_DECODING
 
         try:
             return decoders.OggFlacDecoder(self.filename,
-                                           self.channel_mask())
+                                           self.channel_mask(),
+                                           not FAST_DECODING)
         except (IOError, ValueError), msg:
             #The only time this is likely to occur is
             #if the Ogg FLAC is modified between when OggFlacAudio
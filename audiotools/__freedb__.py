@@ -571,9 +571,10 @@ class FreeDBWeb(FreeDB):
 
         import urllib
         import socket
+        from .freedb import fqdn
 
         u = urllib.urlencode({"hello": "user %s %s %s" % \
-                                      (socket.getfqdn(),
+                                      (fqdn(),
                                        "audiotools",
                                        VERSION),
                               "proto": str(6),
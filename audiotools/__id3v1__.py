@@ -35,6 +35,15 @@ class ID3v1Comment(MetaData):
                           track_number=track_number)
         self.__dict__['genre'] = genre
 
+    def copy(self):
+        return ID3v1Comment(self.track_name,
+                            self.artist_name,
+                            self.album_name,
+                            self.year,
+                            self.comment,
+                            self.track_number,
+                            self.genre)
+
     def raw_info(self):
         from os import linesep
 
@@ -27,6 +27,8 @@ if (sys.version_info < (2, 5, 0, 'final', 0)):
 
 
 from . import pcm as pcm
+from .pcmconverter import (BufferedPCMReader, mix_channels,
+                           add_dither, apply_gain)
 import subprocess
 import re
 import cStringIO
@@ -35,10 +37,11 @@ import os.path
 import ConfigParser
 import optparse
 import struct
-from itertools import izip
 import gettext
 import unicodedata
 import cPickle
+import types
+import weakref
 
 gettext.install("audiotools", unicode=True)
 
@@ -106,6 +109,25 @@ class __system_binaries__:
     def __init__(self, config):
         self.config = config
 
+        #whether each command is executable, once looked up
+        self.__executable__ = {}
+
+        #the lookups may also be kept in a file between runs
+        #which is discarded if $PATH or any of its directories change
+        self.__cache_file__ = config.get_default("System", "binary_cache",
+                                                 None)
+        if (self.__cache_file__ is not None):
+            self.__cache_file__ = os.path.expanduser(self.__cache_file__)
+            try:
+                (key, executable) = cPickle.load(file(self.__cache_file__,
+                                                      "rb"))
+                if (key == self.__cache_key__()):
+                    self.__executable__ = executable
+            except Exception:
+                #this runs while audiotools is imported
+                #so a damaged cache file is simply ignored
+                pass
+
     def __getitem__(self, command):
         try:
             return self.config.get("Binaries", command)
@@ -114,14 +136,45 @@ class __system_binaries__:
         except ConfigParser.NoOptionError:
             return command
 
+    def __cache_key__(self):
+        search_path = os.environ.get('PATH', os.defpath)
+        mtimes = []
+        for path in search_path.split(os.pathsep):
+            try:
+                mtimes.append(os.stat(path).st_mtime)
+            except OSError:
+                mtimes.append(None)
+        return (search_path, mtimes)
+
     def can_execute(self, command):
-        if (os.sep in command):
-            return os.access(command, os.X_OK)
-        else:
-            for path in os.environ.get('PATH', os.defpath).split(os.pathsep):
-                if (os.access(os.path.join(path, command), os.X_OK)):
-                    return True
-            return False
+        try:
+            return self.__executable__[command]
+        except KeyError:
+            if (os.sep in command):
+                executable = os.access(command, os.X_OK)
+            else:
+                for path in os.environ.get('PATH',
+                                           os.defpath).split(os.pathsep):
+                    if (os.access(os.path.join(path, command), os.X_OK)):
+                        executable = True
+                        break
+                else:
+                    executable = False
+            self.__executable__[command] = executable
+
+            if (self.__cache_file__ is not None):
+                #the file is replaced whole, so processes sharing it
+                #never see one partially written
+                try:
+                    __replace_file__(
+                        self.__cache_file__,
+                        lambda f: cPickle.dump((self.__cache_key__(),
+                                                self.__executable__),
+                                               f, cPickle.HIGHEST_PROTOCOL))
+                except (IOError, OSError):
+                    pass
+
+            return executable
 
 BIN = __system_binaries__(config)
 
@@ -162,9 +215,12 @@ if (DEFAULT_VERBOSITY not in VERBOSITY_LEVELS):
 
 DEFAULT_TYPE = config.get_default("System", "default_type", "wav")
 
+INDEX_FILE = config.get_default("System", "index_file",
+                                os.path.expanduser('~/.audiotools.index'))
+
 
 def __default_quality__(audio_type):
-    quality = DEFAULT_QUALITY.get(audio_type, "")
+    quality = config.get_default("Quality", audio_type, "")
     try:
         if (quality not in TYPE_MAP[audio_type].COMPRESSION_MODES):
             return TYPE_MAP[audio_type].DEFAULT_COMPRESSION
@@ -184,6 +240,49 @@ if (config.has_option("System", "maximum_jobs")):
 else:
     MAX_JOBS = MAX_CPUS
 
+#the number of threads an encoder may use to encode a single file
+#for those formats which support it
+ENCODING_THREADS = 1
+
+#the number of threads a decoder may use to decode a single file
+#for those formats which support it
+DECODING_THREADS = 1
+
+#whether those decoders which support it map their files into memory
+#rather than reading them through stdio
+#(a file truncated by another process while mapped
+# may crash the decoder, so this is off by default)
+MMAP_DECODING = False
+
+#whether those decoders which check their stream's MD5 sum
+#skip calculating and verifying it entirely,
+#for playback and analysis where the data's integrity isn't being checked
+FAST_DECODING = False
+
+#how long, in seconds, a MusicBrainz or FreeDB response
+#is kept in METADATA_CACHE before being looked up again
+METADATA_CACHE_TTL = config.getint_default("System", "metadata_cache_ttl",
+                                           60 * 60 * 24 * 7)
+
+#the number of processes calculate_replay_gain() may use
+#to analyze an album's tracks in parallel
+REPLAY_GAIN_PROCESSES = 1
+
+#PCMConverter's resampling presets, from fastest to best quality,
+#and the libsamplerate converter each one uses
+RESAMPLE_QUALITIES = ("linear", "fast", "medium", "best")
+__RESAMPLE_CONVERTERS__ = {"linear": 4,
+                           "fast": 2,
+                           "medium": 1,
+                           "best": 0}
+
+#the resampling preset PCMConverter uses by default
+RESAMPLE_QUALITY = "best"
+
+#whether PCMConverter normalizes resampled streams by default
+#rather than clipping samples which overshoot full scale
+RESAMPLE_NORMALIZE = False
+
 BIG_ENDIAN = sys.byteorder == 'big'
 
 
@@ -1040,7 +1139,7 @@ class UnsupportedChannelMask(EncodingError):
             _(u"Unable to write \"%(target_filename)s\"" +
               u" with channel assignment \"%(assignment)s\"") %
             {"target_filename": VerboseMessenger(None).filename(filename),
-             "assignment": audiotools.ChannelMask(mask)})
+             "assignment": ChannelMask(mask)})
 
 
 class UnsupportedChannelCount(EncodingError):
@@ -1078,6 +1177,61 @@ class DecodingError(IOError):
         self.error_message = error_message
 
 
+#maps the (offset, length) of a string at the start of a file
+#to the strings found there and the names of the types
+#whose is_type() methods may accept a file beginning with them
+#
+#types not listed here have their is_type() methods tried on every file
+MAGIC_NUMBERS = {(0, 4): {'fLaC': ['flac'],
+                          'OggS': ['oga', 'ogg'],
+                          'RIFF': ['wav'],
+                          'FORM': ['aiff'],
+                          '.snd': ['au'],
+                          'wvpk': ['wv'],
+                          'ajkg': ['shn'],
+                          'MAC ': ['ape']},
+                 (0, 3): {'ID3': ['mp3', 'mp2', 'flac']},
+                 (0, 1): {'\xFF': ['mp3', 'mp2']},
+                 (4, 4): {'ftyp': ['m4a', 'alac']}}
+
+#the number of bytes open() reads to look up a file's magic numbers
+MAGIC_HEADER_SIZE = max([offset + length for (offset, length)
+                         in MAGIC_NUMBERS.keys()])
+
+#the names of all types listed in MAGIC_NUMBERS
+MAGIC_TYPES = frozenset([name for magic in MAGIC_NUMBERS.values()
+                         for names in magic.values()
+                         for name in names])
+
+
+def __magic_types__(filename, header):
+    """Returns a list of AudioFile classes which may match a file.
+
+    header is a string of the file's first MAGIC_HEADER_SIZE bytes.
+    Types whose magic numbers match the header are returned first,
+    with the type matching filename's suffix ahead of any others.
+    """
+
+    candidates = []
+    for ((offset, length), magic) in MAGIC_NUMBERS.items():
+        for name in magic.get(header[offset:offset + length], []):
+            if (name in TYPE_MAP):
+                candidates.append(TYPE_MAP[name])
+
+    if (len(candidates) > 1):
+        #only the candidates' own types are imported to check suffixes
+        suffix = os.path.splitext(filename)[1][1:]
+        candidates.sort(lambda x, y: cmp(x.SUFFIX != suffix,
+                                         y.SUFFIX != suffix))
+
+    #types without magic numbers are looked up by name
+    #so that other types aren't imported needlessly
+    return candidates + [TYPE_MAP[name]
+                         for (name, module_name, class_name) in AUDIO_TYPES
+                         if ((name not in MAGIC_TYPES) and
+                             (name in TYPE_MAP))]
+
+
 def open(filename):
     """Returns an AudioFile located at the given filename path.
 
@@ -1089,11 +1243,13 @@ def open(filename):
     Raises IOError if some problem occurs attempting to open the file.
     """
 
-    available_types = frozenset(TYPE_MAP.values())
-
     f = file(filename, "rb")
     try:
-        for audioclass in TYPE_MAP.values():
+        #a single read of the file's header determines which types to try
+        #and buffers enough of the file for their is_type() methods
+        header = f.read(MAGIC_HEADER_SIZE)
+
+        for audioclass in __magic_types__(filename, header):
             f.seek(0, 0)
             if (audioclass.is_type(f)):
                 return audioclass(filename)
@@ -1107,21 +1263,28 @@ def open(filename):
 #takes a list of filenames
 #returns a list of AudioFile objects, sorted by track_number()
 #any unsupported files are filtered out
-def open_files(filename_list, sorted=True, messenger=None):
+def open_files(filename_list, sorted=True, messenger=None, index=None):
     """Returns a list of AudioFile objects from a list of filenames.
 
     Files are sorted by album number then track number, by default.
     Unsupported files are filtered out.
     Error messages are sent to messenger, if given.
+    If index is an audiotools.index.LibraryIndex object,
+    files unchanged since they were indexed are taken from it
+    and any others are added to it.
     """
 
     toreturn = []
     if (messenger is None):
         messenger = Messenger("audiotools", None)
+    if (index is None):
+        open_file = open
+    else:
+        open_file = index.open
 
     for filename in filename_list:
         try:
-            toreturn.append(open(filename))
+            toreturn.append(open_file(filename))
         except UnsupportedFile:
             pass
         except IOError, err:
@@ -1130,9 +1293,13 @@ def open_files(filename_list, sorted=True, messenger=None):
         except InvalidFile, err:
             messenger.error(unicode(err))
 
+    if (index is not None):
+        index.commit()
+
     if (sorted):
-        toreturn.sort(lambda x, y: cmp((x.album_number(), x.track_number()),
-                                       (y.album_number(), y.track_number())))
+        #each track's numbers are read once rather than once per comparison
+        toreturn.sort(key=lambda track: (track.album_number(),
+                                         track.track_number()))
     return toreturn
 
 
@@ -1140,13 +1307,15 @@ def open_files(filename_list, sorted=True, messenger=None):
 #iterates recursively over any and all audio files in it
 #optionally sorted by directory name and track_number()
 #any unsupported files are filtered out
-def open_directory(directory, sorted=True, messenger=None):
+def open_directory(directory, sorted=True, messenger=None, index=None):
     """Yields an AudioFile via a recursive search of directory.
 
     Files are sorted by album number/track number by default,
     on a per-directory basis.
     Any unsupported files are filtered out.
     Error messages are sent to messenger, if given.
+    If index is an audiotools.index.LibraryIndex object,
+    it is used as by open_files().
     """
 
     for (basedir, subdirs, filenames) in os.walk(directory):
@@ -1155,7 +1324,8 @@ def open_directory(directory, sorted=True, messenger=None):
         for audiofile in open_files([os.path.join(basedir, filename)
                                      for filename in filenames],
                                     sorted=sorted,
-                                    messenger=messenger):
+                                    messenger=messenger,
+                                    index=index):
             yield audiofile
 
 
@@ -1529,6 +1699,7 @@ def to_pcm_progress(audiofile, progress):
 class PCMReaderProgress:
     def __init__(self, pcmreader, total_frames, progress):
         self.__read__ = pcmreader.read
+        self.__seek__ = getattr(pcmreader, "seek", None)
         self.__close__ = pcmreader.close
         self.sample_rate = pcmreader.sample_rate
         self.channels = pcmreader.channels
@@ -1544,6 +1715,13 @@ class PCMReaderProgress:
         self.progress(self.current_frames, self.total_frames)
         return frame
 
+    def seek(self, pcm_frame):
+        if (self.__seek__ is not None):
+            self.current_frames = self.__seek__(pcm_frame)
+            return self.current_frames
+        else:
+            raise IOError(_(u"stream is not seekable"))
+
     def close(self):
         self.__close__()
 
@@ -1579,6 +1757,46 @@ class ReorderedPCMReader:
         self.pcmreader.close()
 
 
+class PCMReaderTee:
+    """A PCMReader wrapper which passes each pcm.FrameList it reads
+    to one or more callbacks before returning it.
+
+    This allows a single decoding pass to feed an encoder
+    and any number of analyzers at once, such as
+    ReplayGainAnalysis.update, AccurateRipTrackCRC.update
+    or a checksum:
+
+    >>> md5 = hashlib.md5()
+    >>> tee = PCMReaderTee(reader,
+    ...                    [analysis.update,
+    ...                     lambda f: md5.update(f.to_bytes(False, True))])
+    """
+
+    def __init__(self, pcmreader, callbacks):
+        """Initialized with a PCMReader and list of functions
+        which each take a pcm.FrameList."""
+
+        self.pcmreader = pcmreader
+        self.sample_rate = pcmreader.sample_rate
+        self.channels = pcmreader.channels
+        self.channel_mask = pcmreader.channel_mask
+        self.bits_per_sample = pcmreader.bits_per_sample
+        self.callbacks = list(callbacks)
+
+    def read(self, bytes):
+        """Try to read a pcm.FrameList of size "bytes"."""
+
+        framelist = self.pcmreader.read(bytes)
+        for callback in self.callbacks:
+            callback(framelist)
+        return framelist
+
+    def close(self):
+        """Closes the stream."""
+
+        self.pcmreader.close()
+
+
 def transfer_data(from_function, to_function):
     """Sends BUFFER_SIZE strings from from_function to to_function.
 
@@ -1809,83 +2027,6 @@ class PCMCat(PCMReader):
         pass
 
 
-class __buffer__:
-    def __init__(self, channels, bits_per_sample, framelists=None):
-        if (framelists is None):
-            self.buffer = []
-        else:
-            self.buffer = framelists
-        self.end_frame = pcm.from_list([], channels, bits_per_sample, True)
-        self.bytes_per_sample = bits_per_sample / 8
-
-    #returns the length of the entire buffer in bytes
-    def __len__(self):
-        if (len(self.buffer) > 0):
-            return sum(map(len, self.buffer)) * self.bytes_per_sample
-        else:
-            return 0
-
-    def framelist(self):
-        import operator
-
-        return reduce(operator.concat, self.buffer, self.end_frame)
-
-    def push(self, s):
-        self.buffer.append(s)
-
-    def pop(self):
-        return self.buffer.pop(0)
-
-    def unpop(self, s):
-        self.buffer.insert(0, s)
-
-
-class BufferedPCMReader:
-    """A PCMReader which reads exact counts of bytes."""
-
-    def __init__(self, pcmreader):
-        """pcmreader is a regular PCMReader object."""
-
-        self.pcmreader = pcmreader
-        self.sample_rate = pcmreader.sample_rate
-        self.channels = pcmreader.channels
-        self.channel_mask = pcmreader.channel_mask
-        self.bits_per_sample = pcmreader.bits_per_sample
-        self.buffer = __buffer__(self.channels, self.bits_per_sample)
-        self.reader_finished = False
-
-    def close(self):
-        """Closes the sub-pcmreader and frees our internal buffer."""
-
-        del(self.buffer)
-        self.pcmreader.close()
-
-    def read(self, bytes):
-        """Reads as close to "bytes" number of bytes without going over.
-
-        This uses an internal buffer to ensure reading the proper
-        number of bytes on each call.
-        """
-
-        #fill our buffer to at least "bytes", possibly more
-        self.__fill__(bytes)
-        output_framelist = self.buffer.framelist()
-        (output, remainder) = output_framelist.split(
-            output_framelist.frame_count(bytes))
-        self.buffer.buffer = [remainder]
-        return output
-
-    #try to fill our internal buffer to at least "bytes"
-    def __fill__(self, bytes):
-        while ((len(self.buffer) < bytes) and
-               (not self.reader_finished)):
-            s = self.pcmreader.read(BUFFER_SIZE)
-            if (len(s) > 0):
-                self.buffer.push(s)
-            else:
-                self.reader_finished = True
-
-
 class LimitedFileReader:
     def __init__(self, file, total_bytes):
         self.__file__ = file
@@ -1922,9 +2063,14 @@ class LimitedPCMReader:
         self.channel_mask = self.pcmreader.channel_mask
         self.bits_per_sample = self.pcmreader.bits_per_sample
         self.bytes_per_frame = self.channels * (self.bits_per_sample / 8)
+        self.__closed__ = None
 
     def read(self, bytes):
-        if (self.total_pcm_frames > 0):
+        """raises ValueError if the reader has been closed"""
+
+        if (self.__closed__ is not None):
+            raise ValueError(self.__closed__)
+        elif (self.total_pcm_frames > 0):
             frame = self.pcmreader.read(
                 min(bytes,
                     self.total_pcm_frames * self.bytes_per_frame))
@@ -1935,6 +2081,33 @@ class LimitedPCMReader:
                                  False, True)
 
     def close(self):
+        """discards any frames which haven't been read
+
+        so that the next reader from the same BufferedPCMReader
+        starts at the right place"""
+
+        self.__discard__()
+        if (self.__closed__ is None):
+            self.__closed__ = _(u"sub-reader read after it was closed")
+
+    def __supersede__(self):
+        """discards any frames which haven't been read
+        because the next reader from the same BufferedPCMReader
+        has been requested"""
+
+        self.__discard__()
+        if (self.__closed__ is None):
+            self.__closed__ = \
+                _(u"sub-reader read after the next was requested")
+
+    def __discard__(self):
+        while (self.total_pcm_frames > 0):
+            frame = self.pcmreader.read(
+                min(BUFFER_SIZE * self.bytes_per_frame,
+                    self.total_pcm_frames * self.bytes_per_frame))
+            if (len(frame) == 0):
+                break
+            self.total_pcm_frames -= frame.frames
         self.total_pcm_frames = 0
 
 
@@ -1943,88 +2116,52 @@ def pcm_split(reader, pcm_lengths):
 
     Each sub-reader is pcm_length PCM frames long with the same
     channels, bits_per_sample, sample_rate and channel_mask
-    as the full stream.  reader is closed upon completion.
+    as the full stream.  reader is closed upon completion,
+    or once the generator is closed or garbage collected.
+
+    Sub-readers read directly from the full stream,
+    so each must be read before the next is requested.
+    Any frames left unread in one are skipped
+    when the next is requested,
+    and reading from it afterward raises ValueError.
     """
 
-    import tempfile
-
-    def chunk_sizes(total_size, chunk_size):
-        while (total_size > chunk_size):
-            total_size -= chunk_size
-            yield chunk_size
-        yield total_size
-
     full_data = BufferedPCMReader(reader)
 
-    for byte_length in [i * reader.channels * reader.bits_per_sample / 8
-                        for i in pcm_lengths]:
-        if (byte_length > (BUFFER_SIZE * 10)):
-            #if the sub-file length is somewhat large, use a temporary file
-            sub_file = tempfile.TemporaryFile()
-            for size in chunk_sizes(byte_length, BUFFER_SIZE):
-                sub_file.write(full_data.read(size).to_bytes(False, True))
-            sub_file.seek(0, 0)
-        else:
-            #if the sub-file length is very small, use StringIO
-            sub_file = cStringIO.StringIO(
-                full_data.read(byte_length).to_bytes(False, True))
-
-        yield PCMReader(sub_file,
-                        reader.sample_rate,
-                        reader.channels,
-                        reader.channel_mask,
-                        reader.bits_per_sample)
-
-    full_data.close()
-
-
-#going from many channels to less channels
-class __channel_remover__:
-    def __init__(self, old_channel_mask, new_channel_mask):
-        old_channels = ChannelMask(old_channel_mask).channels()
-        self.channels_to_keep = []
-        for new_channel in ChannelMask(new_channel_mask).channels():
-            if (new_channel in old_channels):
-                self.channels_to_keep.append(old_channels.index(new_channel))
-
-    def convert(self, frame_list):
-        return pcm.from_channels(
-            [frame_list.channel(i) for i in self.channels_to_keep])
-
-
-class __channel_adder__:
-    def __init__(self, channels):
-        self.channels = channels
-
-    def convert(self, frame_list):
-        current_channels = [frame_list.channel(i)
-                            for i in xrange(frame_list.channels)]
-        while (len(current_channels) < self.channels):
-            current_channels.append(current_channels[0])
-
-        return pcm.from_channels(current_channels)
-
-
-class __stereo_to_mono__:
-    def __init__(self):
-        pass
-
-    def convert(self, frame_list):
-        return pcm.from_list(
-            [(l + r) / 2 for l, r in izip(frame_list.channel(0),
-                                          frame_list.channel(1))],
-            1, frame_list.bits_per_sample, True)
-
-
-#going from many channels to 2
-class __downmixer__:
-    def __init__(self, old_channel_mask, old_channel_count):
+    #the full stream is closed even if the caller stops early
+    try:
+        for pcm_length in pcm_lengths:
+            sub_reader = LimitedPCMReader(full_data, pcm_length)
+            yield sub_reader
+            sub_reader.__supersede__()
+    finally:
+        full_data.close()
+
+
+def __mixing_matrix__(old_channel_mask, old_channel_count,
+                      new_channel_mask, new_channel_count):
+    """returns a list of new_channel_count rows
+    each containing old_channel_count floats
+    where each new channel is the sum of the old channels
+    multiplied by its row's values"""
+
+    if (new_channel_count == 1):
+        #going from many channels to 1
+        #averages the channels downmixed to 2
+        (left, right) = __mixing_matrix__(old_channel_mask,
+                                          old_channel_count,
+                                          0x3, 2)
+        return [[(l + r) / 2 for (l, r) in zip(left, right)]]
+    elif (new_channel_count == 2):
+        #going from many channels to 2
         #grab the front_left, front_right, front_center,
-        #back_left and back_right channels from old frame_list, if possible
-        #missing channels are replaced with 0-sample channels
+        #back_left and back_right channels from old channels, if possible
+        #missing channels are left out of the mix
         #excess channels are dropped entirely
         #side_left and side_right may be substituted for back_left/right
         #but back channels take precedence
+        REAR_GAIN = 0.6
+        CENTER_GAIN = 0.7
 
         if (int(old_channel_mask) == 0):
             #if the old_channel_mask is undefined
@@ -2048,141 +2185,123 @@ class __downmixer__:
         else:
             old_channel_mask = ChannelMask(old_channel_mask)
 
-        #channels_to_keep is an array of channel offsets
-        #where the index is:
-        #0 - front_left
-        #1 - front_right
-        #2 - front_center
-        #3 - back/side_left
-        #4 - back/side_right
-        #if -1, the channel is blank
-        self.channels_to_keep = []
-        for channel in ["front_left", "front_right", "front_center"]:
+        left = [0.0] * old_channel_count
+        right = [0.0] * old_channel_count
+
+        def mix(channel, left_gain, right_gain):
             if (getattr(old_channel_mask, channel)):
-                self.channels_to_keep.append(old_channel_mask.index(channel))
+                left[old_channel_mask.index(channel)] += left_gain
+                right[old_channel_mask.index(channel)] += right_gain
+
+        mix("front_left", 1.0, 0.0)
+        mix("front_right", 0.0, 1.0)
+        mix("front_center", CENTER_GAIN, CENTER_GAIN)
+
+        #the rear channels are mixed to mono
+        #and added out of phase to the right channel
+        for (back, side) in [("back_left", "side_left"),
+                             ("back_right", "side_right")]:
+            if (getattr(old_channel_mask, back)):
+                mix(back, REAR_GAIN * 0.7, -REAR_GAIN * 0.7)
             else:
-                self.channels_to_keep.append(-1)
-
-        if (old_channel_mask.back_left):
-            self.channels_to_keep.append(old_channel_mask.index("back_left"))
-        elif (old_channel_mask.side_left):
-            self.channels_to_keep.append(old_channel_mask.index("side_left"))
-        else:
-            self.channels_to_keep.append(-1)
-
-        if (old_channel_mask.back_right):
-            self.channels_to_keep.append(old_channel_mask.index("back_right"))
-        elif (old_channel_mask.side_right):
-            self.channels_to_keep.append(old_channel_mask.index("side_right"))
-        else:
-            self.channels_to_keep.append(-1)
+                mix(side, REAR_GAIN * 0.7, -REAR_GAIN * 0.7)
 
-        self.has_empty_channels = (-1 in self.channels_to_keep)
-
-    def convert(self, frame_list):
-        REAR_GAIN = 0.6
-        CENTER_GAIN = 0.7
-
-        if (self.has_empty_channels):
-            empty_channel = pcm.from_list([0] * frame_list.frames,
-                                          1,
-                                          frame_list.bits_per_sample,
-                                          True)
-
-        if (self.channels_to_keep[0] != -1):
-            Lf = frame_list.channel(self.channels_to_keep[0])
-        else:
-            Lf = empty_channel
-
-        if (self.channels_to_keep[1] != -1):
-            Rf = frame_list.channel(self.channels_to_keep[1])
-        else:
-            Rf = empty_channel
-
-        if (self.channels_to_keep[2] != -1):
-            C = frame_list.channel(self.channels_to_keep[2])
-        else:
-            C = empty_channel
-
-        if (self.channels_to_keep[3] != -1):
-            Lr = frame_list.channel(self.channels_to_keep[3])
-        else:
-            Lr = empty_channel
-
-        if (self.channels_to_keep[4] != -1):
-            Rr = frame_list.channel(self.channels_to_keep[4])
-        else:
-            Rr = empty_channel
-
-        mono_rear = [0.7 * (Lr_i + Rr_i) for Lr_i, Rr_i in izip(Lr, Rr)]
-
-        converter = lambda x: int(round(x))
-
-        left_channel = pcm.from_list(
-            [converter(Lf_i +
-                       (REAR_GAIN * mono_rear_i) +
-                       (CENTER_GAIN * C_i))
-             for Lf_i, mono_rear_i, C_i in izip(Lf, mono_rear, C)],
-            1,
-            frame_list.bits_per_sample,
-            True)
-
-        right_channel = pcm.from_list(
-            [converter(Rf_i -
-                       (REAR_GAIN * mono_rear_i) +
-                       (CENTER_GAIN * C_i))
-             for Rf_i, mono_rear_i, C_i in izip(Rf, mono_rear, C)],
-            1,
-            frame_list.bits_per_sample,
-            True)
-
-        return pcm.from_channels([left_channel, right_channel])
+        return [left, right]
+    elif (new_channel_count < old_channel_count):
+        #going from many channels to less channels
+        #keeps those channels in the new channel mask
+        #or the first channels if either mask is undefined
+        old_channels = ChannelMask(old_channel_mask).channels()
+        new_channels = ChannelMask(new_channel_mask).channels()
+        matrix = []
+        for i in xrange(new_channel_count):
+            row = [0.0] * old_channel_count
+            if ((len(old_channels) != old_channel_count) or
+                (len(new_channels) != new_channel_count)):
+                row[i] = 1.0
+            elif (new_channels[i] in old_channels):
+                row[old_channels.index(new_channels[i])] = 1.0
+            matrix.append(row)
+        return matrix
+    else:
+        #going from less channels to many channels
+        #duplicates the first channel in the new ones
+        matrix = []
+        for i in xrange(new_channel_count):
+            row = [0.0] * old_channel_count
+            if (i < old_channel_count):
+                row[i] = 1.0
+            else:
+                row[0] = 1.0
+            matrix.append(row)
+        return matrix
 
 
-#going from many channels to 1
-class __downmix_to_mono__:
-    def __init__(self, old_channel_mask, old_channel_count):
-        self.downmix = __downmixer__(old_channel_mask, old_channel_count)
-        self.mono = __stereo_to_mono__()
+class __channel_mixer__:
+    def __init__(self, old_channel_mask, old_channel_count,
+                 new_channel_mask, new_channel_count):
+        self.matrix = __mixing_matrix__(old_channel_mask, old_channel_count,
+                                        new_channel_mask, new_channel_count)
 
     def convert(self, frame_list):
-        return self.mono.convert(self.downmix.convert(frame_list))
+        return mix_channels(frame_list, self.matrix)
 
 
 class __convert_sample_rate__:
     def __init__(self, old_sample_rate, new_sample_rate,
-                 channels, bits_per_sample):
+                 channels, bits_per_sample, quality, gain=1.0):
         from . import resample
 
         self.resampler = resample.Resampler(
                 channels,
                 float(new_sample_rate) / float(old_sample_rate),
-                0)
+                __RESAMPLE_CONVERTERS__[quality],
+                gain)
         self.unresampled = pcm.FloatFrameList([], channels)
         self.bits_per_sample = bits_per_sample
 
-    def convert(self, frame_list):
-        #FIXME - The floating-point output from resampler.process()
-        #should be normalized rather than just chopping off
-        #excessively high or low samples (above 1.0 or below -1.0)
-        #during conversion to PCM.
-        #Unfortunately, that'll require building a second pass
-        #into the conversion process which will complicate PCMConverter
-        #a lot.
+    def resample(self, frame_list):
         (output, self.unresampled) = self.resampler.process(
             self.unresampled + frame_list.to_float(),
             (len(frame_list) == 0) and (len(self.unresampled) == 0))
 
-        return output.to_int(self.bits_per_sample)
+        return output
+
+    def convert(self, frame_list):
+        #samples above 1.0 or below -1.0 are clipped
+        #during conversion to PCM
+        #unless a gain has been given which keeps them in range
+        return self.resample(frame_list).to_int(self.bits_per_sample)
 
 
 class __convert_sample_rate_and_bits_per_sample__(__convert_sample_rate__):
     def convert(self, frame_list):
-        (output, self.unresampled) = self.resampler.process(
-            self.unresampled + frame_list.to_float(),
-            (len(frame_list) == 0) and (len(self.unresampled) == 0))
+        return __add_dither__(
+            self.resample(frame_list).to_int(self.bits_per_sample))
 
-        return __add_dither__(output.to_int(self.bits_per_sample))
+
+def __resampled_peak__(pcmreader, conversions, new_sample_rate, channels,
+                       resample_quality):
+    """returns the peak absolute value of pcmreader's samples
+    as a float, once run through conversions and resampled
+
+    resample_quality should be the preset the output will use,
+    since each preset overshoots full scale by a different amount"""
+
+    scanner = __convert_sample_rate__(pcmreader.sample_rate,
+                                      new_sample_rate,
+                                      channels,
+                                      pcmreader.bits_per_sample,
+                                      resample_quality)
+    frame_list = pcmreader.read(BUFFER_SIZE)
+    while (True):
+        for converter in conversions:
+            frame_list = converter.convert(frame_list)
+        scanner.resample(frame_list)
+        if ((len(frame_list) == 0) and (len(scanner.unresampled) == 0)):
+            return scanner.resampler.peak()
+        else:
+            frame_list = pcmreader.read(BUFFER_SIZE)
 
 
 class __convert_bits_per_sample__:
@@ -2196,17 +2315,9 @@ class __convert_bits_per_sample__:
 
 def __add_dither__(frame_list):
     if (frame_list.bits_per_sample >= 16):
-        random_bytes = map(ord, os.urandom((len(frame_list) / 8) + 1))
-        white_noise = [(random_bytes[i / 8] & (1 << (i % 8))) >> (i % 8)
-                       for i in xrange(len(frame_list))]
+        return add_dither(frame_list, False)
     else:
-        white_noise = [0] * len(frame_list)
-
-    return pcm.from_list([i ^ w for (i, w) in izip(frame_list,
-                                                   white_noise)],
-                         frame_list.channels,
-                         frame_list.bits_per_sample,
-                         True)
+        return frame_list
 
 
 class PCMConverter:
@@ -2222,8 +2333,27 @@ class PCMConverter:
                  sample_rate,
                  channels,
                  channel_mask,
-                 bits_per_sample):
-        """Takes a PCMReader input and the attributes of the new stream."""
+                 bits_per_sample,
+                 resample_quality=None,
+                 normalize=None):
+        """Takes a PCMReader input and the attributes of the new stream.
+
+        resample_quality is one of the RESAMPLE_QUALITIES presets
+        and defaults to RESAMPLE_QUALITY.
+        If normalize is True (defaulting to RESAMPLE_NORMALIZE)
+        and the stream is resampled, a seekable pcmreader is
+        scanned for its resampled peak first
+        and then rewound, so that output is scaled down
+        by that peak rather than clipped.
+        May raise ValueError if the preset is unknown."""
+
+        if (resample_quality is None):
+            resample_quality = RESAMPLE_QUALITY
+        if (resample_quality not in RESAMPLE_QUALITIES):
+            raise ValueError(_(u"unknown resampling quality \"%s\"") %
+                             (resample_quality))
+        if (normalize is None):
+            normalize = RESAMPLE_NORMALIZE
 
         self.sample_rate = sample_rate
         self.channels = channels
@@ -2233,23 +2363,32 @@ class PCMConverter:
 
         self.conversions = []
         if (self.reader.channels != self.channels):
-            if (self.channels == 1):
-                self.conversions.append(
-                    __downmix_to_mono__(pcmreader.channel_mask,
-                                        pcmreader.channels))
-            elif (self.channels == 2):
-                self.conversions.append(
-                    __downmixer__(pcmreader.channel_mask,
-                                  pcmreader.channels))
-            elif (self.channels < pcmreader.channels):
-                self.conversions.append(
-                    __channel_remover__(pcmreader.channel_mask,
-                                        channel_mask))
-            elif (self.channels > pcmreader.channels):
-                self.conversions.append(
-                    __channel_adder__(self.channels))
+            #channels are removed, added or downmixed
+            #in a single pass over each FrameList
+            self.conversions.append(
+                __channel_mixer__(pcmreader.channel_mask,
+                                  pcmreader.channels,
+                                  channel_mask,
+                                  self.channels))
 
         if (self.reader.sample_rate != self.sample_rate):
+            #resampled samples which overshoot full scale
+            #are scaled back into range if the reader can be rewound
+            #after a first pass to find their peak
+            #(linear interpolation never overshoots, so needn't bother)
+            gain = 1.0
+            if (normalize and
+                (resample_quality != "linear") and
+                self.__rewind__()):
+                peak = __resampled_peak__(pcmreader,
+                                          self.conversions,
+                                          self.sample_rate,
+                                          self.channels,
+                                          resample_quality)
+                self.__rewind__()
+                if (peak > 1.0):
+                    gain = 1.0 / peak
+
             #if we're converting sample rate and bits-per-sample
             #at the same time, short-circuit the conversion to do both at once
             #which can be sped up somewhat
@@ -2259,14 +2398,18 @@ class PCMConverter:
                         self.reader.sample_rate,
                         self.sample_rate,
                         self.channels,
-                        self.bits_per_sample))
+                        self.bits_per_sample,
+                        resample_quality,
+                        gain))
             else:
                 self.conversions.append(
                     __convert_sample_rate__(
                         self.reader.sample_rate,
                         self.sample_rate,
                         self.channels,
-                        self.bits_per_sample))
+                        self.bits_per_sample,
+                        resample_quality,
+                        gain))
 
         else:
             if (self.reader.bits_per_sample != self.bits_per_sample):
@@ -2274,6 +2417,16 @@ class PCMConverter:
                     __convert_bits_per_sample__(
                         self.bits_per_sample))
 
+    def __rewind__(self):
+        """seeks the wrapped reader to its start
+
+        returns True if successful, False if it can't seek"""
+
+        try:
+            return self.reader.seek(0) == 0
+        except (AttributeError, IOError):
+            return False
+
     def read(self, bytes):
         """Try to read a pcm.FrameList of size "bytes"."""
 
@@ -2325,22 +2478,8 @@ class ReplayGainReader:
     def read(self, bytes):
         """Try to read a pcm.FrameList of size "bytes"."""
 
-        multiplier = self.multiplier
-        samples = self.reader.read(bytes)
-
-        if (self.bits_per_sample >= 16):
-            random_bytes = map(ord, os.urandom((len(samples) / 8) + 1))
-            white_noise = [(random_bytes[i / 8] & (1 << (i % 8))) >> (i % 8)
-                           for i in xrange(len(samples))]
-        else:
-            white_noise = [0] * len(samples)
-
-        return pcm.from_list(
-            [(int(round(s * multiplier)) ^ w) for (s, w) in
-             izip(samples, white_noise)],
-            samples.channels,
-            samples.bits_per_sample,
-            True)
+        return __add_dither__(
+            apply_gain(self.reader.read(bytes), self.multiplier))
 
     def close(self):
         """Closes the stream for reading."""
@@ -2371,10 +2510,21 @@ def applicable_replay_gain(tracks):
     return True
 
 
-def calculate_replay_gain(tracks, progress=None):
+def calculate_replay_gain(tracks, progress=None, max_processes=None,
+                          analyses=None):
     """Yields (track, track_gain, track_peak, album_gain, album_peak)
     for each AudioFile in the list of tracks.
 
+    Tracks are analyzed by up to "max_processes" subprocesses at once,
+    which defaults to REPLAY_GAIN_PROCESSES,
+    and their results merged to calculate the album gain.
+
+    "analyses" is an optional dict of filename strings
+    to ReplayGainAnalysis.result() tuples
+    for tracks which have already been analyzed,
+    such as while they were being encoded,
+    so that they needn't be decoded again.
+
     Raises ValueError if a problem occurs during calculation."""
 
     from . import replaygain as replaygain
@@ -2384,25 +2534,143 @@ def calculate_replay_gain(tracks, progress=None):
         raise ValueError(("at least one track is required " +
                           "and all must have the same sample rate"))
     total_frames = sum([track.total_frames() for track in tracks])
-    processed_frames = 0
+    processed_frames = [0] * len(tracks)
+
+    if (max_processes is None):
+        max_processes = REPLAY_GAIN_PROCESSES
+
+    def track_progress(index, current):
+        processed_frames[index] = current
+        if (progress is not None):
+            progress(sum(processed_frames), total_frames)
+
+    if (analyses is None):
+        analyses = {}
+    results = [analyses.get(track.filename, None) for track in tracks]
+    pending = [i for (i, result) in enumerate(results) if result is None]
+    for (i, track) in enumerate(tracks):
+        if (results[i] is not None):
+            processed_frames[i] = track.total_frames()
+
+    if ((max_processes <= 1) or (len(pending) <= 1)):
+        for i in pending:
+            results[i] = __analyze_replay_gain__(
+                tracks[i],
+                lambda current, total: track_progress(i, current))
+    else:
+        for (i, result) in zip(
+            pending,
+            __analyze_replay_gains__(
+                [tracks[i] for i in pending],
+                lambda index, current: track_progress(pending[index],
+                                                      current),
+                max_processes)):
+            results[i] = result
 
     rg = replaygain.ReplayGain(list(sample_rate)[0])
-    gains = []
-    for track in tracks:
-        pcm = track.to_pcm()
+    for (track_gain, track_peak, histogram, peak) in results:
+        rg.add_album_histogram(histogram, peak)
+    (album_gain, album_peak) = rg.album_gain()
+    for (track, (track_gain, track_peak, histogram, peak)) in zip(tracks,
+                                                                  results):
+        yield (track, track_gain, track_peak, album_gain, album_peak)
+
+
+class ReplayGainAnalysis:
+    """Analyzes a single track's ReplayGain
+    from the pcm.FrameLists passed to its update() method.
+
+    This can be a PCMReaderTee callback, so that a track
+    can be analyzed while it's being encoded
+    and its result passed on to calculate_replay_gain()."""
+
+    def __init__(self, sample_rate):
+        """raises ValueError if the sample rate is unsupported"""
+
+        from . import replaygain as replaygain
+
+        self.__replaygain__ = replaygain.ReplayGain(sample_rate)
+
+    def update(self, framelist):
+        """analyzes a pcm.FrameList of 1 or 2 channels
+
+        raises ValueError if the FrameList has too many channels"""
+
+        self.__replaygain__.update(framelist)
+
+    def result(self):
+        """returns a (track_gain, track_peak, histogram, peak) tuple
+
+        the histogram and peak are merged with other tracks'
+        by calculate_replay_gain() to calculate album gain
+
+        raises ValueError if too few PCM frames have been analyzed"""
+
+        (track_gain, track_peak) = self.__replaygain__.title_gain()
+        (histogram, peak) = self.__replaygain__.album_histogram()
+        return (track_gain, track_peak, histogram, peak)
+
+
+def __analyze_replay_gain__(track, progress=None):
+    """analyzes a single AudioFile with its own ReplayGainAnalysis
+    and returns its result"""
+
+    analysis = ReplayGainAnalysis(track.sample_rate())
+    total_frames = track.total_frames()
+    processed_frames = 0
+    pcm = track.to_pcm()
+    try:
         frame = pcm.read(BUFFER_SIZE)
         while (len(frame) > 0):
-            rg.update(frame)
+            analysis.update(frame)
             processed_frames += frame.frames
             if (progress is not None):
                 progress(processed_frames, total_frames)
             frame = pcm.read(BUFFER_SIZE)
+    finally:
         pcm.close()
-        (track_gain, track_peak) = rg.title_gain()
-        gains.append((track, track_gain, track_peak))
-    (album_gain, album_peak) = rg.album_gain()
-    for (track, track_gain, track_peak) in gains:
-        yield (track, track_gain, track_peak, album_gain, album_peak)
+    return analysis.result()
+
+
+def __analyze_replay_gains__(tracks, track_progress, max_processes):
+    """analyzes each AudioFile in a pool of "max_processes" workers
+
+    track_progress(index, current) is called as the track
+    at the given index in the list progresses
+
+    returns a list of __analyze_replay_gain__() results,
+    one per track in the same order"""
+
+    pool = __ExecWorkerPool__(
+        lambda job_id, send: __analyze_replay_gain__(
+            tracks[job_id], __JobProgress__(job_id, send).progress),
+        max_processes)
+    results = {}
+
+    try:
+        job_ids = range(len(tracks))
+
+        while ((len(job_ids) > 0) and pool.idle()):
+            pool.submit(job_ids.pop(0))
+
+        while (pool.running() > 0):
+            for (command, args) in pool.messages():
+                if (command == "progress"):
+                    (job_id, current, total) = args
+                    track_progress(job_id, current)
+                elif (command == "completed"):
+                    (job_id, result) = args
+                    results[job_id] = result
+                    track_progress(job_id, tracks[job_id].total_frames())
+                    if (len(job_ids) > 0):
+                        pool.submit(job_ids.pop(0))
+                elif (command == "exception"):
+                    (job_id, exception) = args
+                    raise exception
+    finally:
+        pool.close()
+
+    return [results[i] for i in xrange(len(tracks))]
 
 
 class InterruptableReader(PCMReader):
@@ -3076,6 +3344,8 @@ class Image:
         Raises InvalidImage if some error occurs during parsing.
         """
 
+        from .__image__ import image_metrics
+
         img = image_metrics(image_data)
 
         return Image(data=image_data,
@@ -3094,14 +3364,18 @@ class Image:
         format is a string such as "JPEG".
         """
 
+        from .__image__ import thumbnail_image
+
         return Image.new(thumbnail_image(self.data, width, height, format),
                          self.description, self.type)
 
     def __eq__(self, image):
         if (image is not None):
-            for attr in ["data", "mime_type", "width", "height",
+            #the image data is compared last
+            #in case it has yet to be read from disk
+            for attr in ["mime_type", "width", "height",
                          "color_depth", "color_count", "description",
-                         "type"]:
+                         "type", "data"]:
                 if (getattr(self, attr) != getattr(image, attr)):
                     return False
             else:
@@ -3112,43 +3386,216 @@ class Image:
     def __ne__(self, image):
         return not self.__eq__(image)
 
-#######################
-#ReplayGain Metadata
-#######################
 
+class __FileSlice__:
+    """a run of bytes in a file which is only read when first needed,
+    such as the data of an embedded image"""
 
-class ReplayGain:
-    """A container for ReplayGain data."""
+    def __init__(self, filename, offset, length):
+        """filename is a plain string
+        offset and length are the slice's position in bytes"""
 
-    def __init__(self, track_gain, track_peak, album_gain, album_peak):
-        """Values are:
+        self.filename = os.path.abspath(filename)
+        self.offset = offset
+        self.length = length
+        self.__data__ = None
+        self.__stat__ = __file_stat__(filename)
+        __FILE_SLICES__.add(self)
 
-        track_gain - a dB float value
-        track_peak - the highest absolute value PCM sample, as a float
-        album_gain - a dB float value
-        album_peak - the highest absolute value PCM sample, as a float
+    def __len__(self):
+        return self.length
 
-        They are also attributes.
-        """
+    def read(self):
+        """returns the slice's bytes as a plain string
 
-        self.track_gain = float(track_gain)
-        self.track_peak = float(track_peak)
-        self.album_gain = float(album_gain)
-        self.album_peak = float(album_peak)
+        raises IOError if the file has been modified or removed
+        since the slice was taken"""
 
-    def __repr__(self):
-        return "ReplayGain(%s,%s,%s,%s)" % \
-            (self.track_gain, self.track_peak,
-             self.album_gain, self.album_peak)
+        if (self.__data__ is None):
+            try:
+                modified = (__file_stat__(self.filename) != self.__stat__)
+            except OSError, err:
+                raise IOError(str(err))
+            if (modified):
+                raise IOError(_(u"file modified since metadata was read"))
+            f = file(self.filename, "rb")
+            try:
+                f.seek(self.offset, 0)
+                data = f.read(self.length)
+            finally:
+                f.close()
+            if (len(data) != self.length):
+                raise IOError(_(u"unexpected end of file"))
+            self.__data__ = data
+            __FILE_SLICES__.discard(self)
+        return self.__data__
 
-    def __eq__(self, rg):
-        from operator import and_
+    def __getstate__(self):
+        #pickled slices are read from disk again rather than storing data
+        state = self.__dict__.copy()
+        state["__data__"] = None
+        return state
 
-        return reduce(and_,
-                      [(hasattr(rg, attr) and
-                        (getattr(self, attr) == getattr(rg, attr)))
-                       for attr in ["track_gain", "track_peak",
-                                    "album_gain", "album_peak"]])
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        __FILE_SLICES__.add(self)
+
+
+#every __FileSlice__ yet to be read,
+#so they can be read before their file is rewritten
+__FILE_SLICES__ = weakref.WeakSet()
+
+
+def __read_file_slices__(filename):
+    """reads every __FileSlice__ of filename which hasn't been read yet
+
+    this is called before a file's contents are rewritten
+    so that data left on disk by any object remains available"""
+
+    filename = os.path.realpath(filename)
+    for file_slice in list(__FILE_SLICES__):
+        if (os.path.realpath(file_slice.filename) == filename):
+            try:
+                file_slice.read()
+            except IOError:
+                #the file has been modified elsewhere
+                #so the data is unavailable anyway
+                pass
+
+
+def __file_stat__(filename):
+    """returns a tuple of values which change
+    whenever the file at the given path is modified or replaced"""
+
+    s = os.stat(filename)
+    return (s.st_ino, s.st_size, s.st_mtime, s.st_ctime)
+
+
+def __replace_file__(filename, write_contents):
+    """calls write_contents() with a new file object opened for writing
+    in the same directory as filename, which then replaces filename
+    (or the file it links to) with the original's permissions and owner
+
+    this way, the original is left intact if write_contents()
+    raises an exception or is interrupted
+
+    if the original has other hard links, its owner can't be kept
+    or its directory isn't writable, the new contents are
+    copied over the original in place instead, once they're complete
+
+    if filename doesn't exist yet, the new file is only
+    readable and writable by its owner
+
+    raises IOError if filename exists but can't be written"""
+
+    import tempfile
+    import stat
+
+    filename = os.path.realpath(filename)
+    try:
+        original = os.stat(filename)
+    except OSError:
+        original = None
+    else:
+        #the original must be writable by us,
+        #not merely replaceable in its directory
+        file(filename, "r+b").close()
+
+    (directory, basename) = os.path.split(filename)
+    try:
+        (fd, temp_name) = tempfile.mkstemp(prefix="." + basename,
+                                           dir=directory)
+        in_place = False
+    except OSError, err:
+        if (original is None):
+            raise IOError(str(err))
+        (fd, temp_name) = tempfile.mkstemp(prefix="." + basename)
+        in_place = True
+
+    try:
+        temp = os.fdopen(fd, "w+b")
+        try:
+            write_contents(temp)
+            temp.flush()
+
+            if ((original is not None) and (not in_place)):
+                os.chmod(temp_name, stat.S_IMODE(original.st_mode))
+                temp_stat = os.fstat(temp.fileno())
+                if (original.st_nlink > 1):
+                    in_place = True
+                elif ((temp_stat.st_uid, temp_stat.st_gid) !=
+                      (original.st_uid, original.st_gid)):
+                    try:
+                        os.chown(temp_name, original.st_uid, original.st_gid)
+                    except OSError:
+                        in_place = True
+
+            if (in_place):
+                #unlike transfer_data(), any IOError must propagate
+                #rather than leave the original cut short
+                temp_size = os.fstat(temp.fileno()).st_size
+                temp.seek(0, 0)
+                f = file(filename, "r+b")
+                try:
+                    s = temp.read(BUFFER_SIZE)
+                    while (len(s) > 0):
+                        f.write(s)
+                        s = temp.read(BUFFER_SIZE)
+                    f.flush()
+                    if (f.tell() != temp_size):
+                        raise IOError(_(u"unable to write complete file"))
+                    f.truncate()
+                finally:
+                    f.close()
+        finally:
+            temp.close()
+
+        if (in_place):
+            os.unlink(temp_name)
+        else:
+            os.rename(temp_name, filename)
+    except:
+        if (os.path.exists(temp_name)):
+            os.unlink(temp_name)
+        raise
+
+#######################
+#ReplayGain Metadata
+#######################
+
+
+class ReplayGain:
+    """A container for ReplayGain data."""
+
+    def __init__(self, track_gain, track_peak, album_gain, album_peak):
+        """Values are:
+
+        track_gain - a dB float value
+        track_peak - the highest absolute value PCM sample, as a float
+        album_gain - a dB float value
+        album_peak - the highest absolute value PCM sample, as a float
+
+        They are also attributes.
+        """
+
+        self.track_gain = float(track_gain)
+        self.track_peak = float(track_peak)
+        self.album_gain = float(album_gain)
+        self.album_peak = float(album_peak)
+
+    def __repr__(self):
+        return "ReplayGain(%s,%s,%s,%s)" % \
+            (self.track_gain, self.track_peak,
+             self.album_gain, self.album_peak)
+
+    def __eq__(self, rg):
+        from operator import and_
+
+        return reduce(and_,
+                      [(hasattr(rg, attr) and
+                        (getattr(self, attr) == getattr(rg, attr)))
+                       for attr in ["track_gain", "track_peak",
+                                    "album_gain", "album_peak"]])
 
     def __ne__(self, rg):
         return not self.__eq__(rg)
@@ -3199,6 +3646,7 @@ class AudioFile:
         Raises InvalidFile or subclass if the file is invalid in some way."""
 
         self.filename = filename
+        self.__metadata_cache__ = None
 
     @classmethod
     def is_type(cls, file):
@@ -3270,6 +3718,37 @@ class AudioFile:
 
         return None
 
+    def __cached_metadata__(self, read_metadata):
+        """Returns a copy of the MetaData object, or None,
+        returned by the read_metadata() function.
+
+        The function is called once and its result kept
+        until the file is modified or __uncache_metadata__() is called,
+        so formats can implement get_metadata() with this
+        and have their metadata parsed only once per instance.
+        The MetaData object must implement a copy() method."""
+
+        key = __file_stat__(self.filename)
+        cache = getattr(self, "__metadata_cache__", None)
+        if ((cache is None) or (cache[0] != key)):
+            cache = (key, read_metadata())
+            self.__metadata_cache__ = cache
+
+        if (cache[1] is not None):
+            return cache[1].copy()
+        else:
+            return None
+
+    def __uncache_metadata__(self):
+        """Discards any MetaData cached by __cached_metadata__().
+
+        This must be called before the file's metadata is rewritten
+        since any image data not yet read from disk,
+        by this object or any other, is read first."""
+
+        self.__metadata_cache__ = None
+        __read_file_slices__(self.filename)
+
     def delete_metadata(self):
         """Deletes the track's MetaData.
 
@@ -3357,6 +3836,31 @@ class AudioFile:
                                      to_pcm_progress(self, progress),
                                      compression)
 
+    @classmethod
+    def can_concatenate(cls):
+        """Returns True if files of this type can be joined by concatenate().
+
+        That is, if their encoded frames can be spliced end to end
+        without being decoded and encoded again."""
+
+        return False
+
+    @classmethod
+    def concatenate(cls, filename, audiofiles):
+        """Joins a list of AudioFile objects of this type end to end.
+
+        Takes a filename string and list of AudioFile objects
+        which must all have the same stream parameters.
+        Writes a new file containing their PCM data in order
+        and returns it as a new AudioFile-compatible object.
+        Since each file can be encoded separately beforehand,
+        this allows a long stream to be encoded in parallel.
+
+        May raise ValueError if the files can't be joined
+        or EncodingError if a problem occurs writing the output file."""
+
+        raise NotImplementedError()
+
     @classmethod
     def __unlink__(cls, filename):
         try:
@@ -3480,11 +3984,17 @@ class AudioFile:
             raise UnsupportedTracknameField(unicode(error.args[0]))
 
     @classmethod
-    def add_replay_gain(cls, filenames, progress=None):
+    def add_replay_gain(cls, filenames, progress=None, analyses=None):
         """Adds ReplayGain values to a list of filename strings.
 
         All the filenames must be of this AudioFile type.
         Raises ValueError if some problem occurs during ReplayGain application.
+
+        "analyses" is an optional dict of filename strings
+        to ReplayGainAnalysis.result() tuples, for files whose
+        PCM data has already been analyzed while encoding them.
+        Formats which add ReplayGain losslessly by calculating it
+        from that PCM data use it to avoid decoding those files again.
         """
 
         track_names = [track.filename for track in
@@ -3634,6 +4144,8 @@ class WaveContainer(AudioFile):
 
         Raises EncodingError if some error occurs during decoding."""
 
+        from .__wav__ import WaveAudio
+
         pcmreader = to_pcm_progress(self, progress)
         WaveAudio.from_pcm(wave_filename, pcmreader)
         pcmreader.close()
@@ -3656,6 +4168,8 @@ class WaveContainer(AudioFile):
         >>> flac = FlacAudio.from_wave("file.flac","file.wav","5")
         """
 
+        from .__wav__ import WaveAudio
+
         return cls.from_pcm(filename,
                             to_pcm_progress(WaveAudio(wave_filename),
                                             progress),
@@ -3681,6 +4195,7 @@ class WaveContainer(AudioFile):
         May raise EncodingError if some problem occurs during encoding."""
 
         import tempfile
+        from .__wav__ import WaveAudio
 
         if (target_class == WaveAudio):
             self.to_wave(target_path, progress=progress)
@@ -3717,6 +4232,8 @@ class AiffContainer(AudioFile):
 
         Raises EncodingError if some error occurs during decoding."""
 
+        from .__aiff__ import AiffAudio
+
         pcmreader = to_pcm_progress(self, progress)
         AiffAudio.from_pcm(aiff_filename, pcmreader)
         pcmreader.close()
@@ -3739,6 +4256,8 @@ class AiffContainer(AudioFile):
         >>> flac = FlacAudio.from_wave("file.flac","file.aiff","5")
         """
 
+        from .__aiff__ import AiffAudio
+
         return cls.from_pcm(filename,
                             to_pcm_progress(AiffAudio(wave_filename)),
                             compression)
@@ -3762,6 +4281,8 @@ class AiffContainer(AudioFile):
         the resulting object.
         May raise EncodingError if some problem occurs during encoding."""
 
+        from .__aiff__ import AiffAudio
+
         if (target_class == AiffAudio):
             self.to_aiff(target_path)
             return AiffAudio(target_path)
@@ -3975,25 +4496,146 @@ def iter_last(iterator):
             return
 
 
-from __image__ import *
+#the modules whose public names are available from this one
+#as though imported with "from module import *"
+#
+#rather than importing them all up front,
+#each is imported once one of its names is first used
+#which keeps short-lived scripts from importing every format
+FORMAT_MODULES = ("__image__",
+                  "__wav__",
+                  "__au__",
+                  "__ogg__",
+                  "__vorbiscomment__",
+                  "__id3__",
+                  "__aiff__",
+                  "__flac__",
+                  "__ape__",
+                  "__mp3__",
+                  "__vorbis__",
+                  "__m4a__",
+                  "__wavpack__",
+                  "__shn__",
+                  "__dvda__",
+                  "__freedb__",
+                  "__musicbrainz__",
+                  "__accuraterip__")
+
+#the NAME, module and class name of each AVAILABLE_TYPES entry
+AUDIO_TYPES = (("flac", "__flac__", "FlacAudio"),
+               ("oga", "__flac__", "OggFlacAudio"),
+               ("mp3", "__mp3__", "MP3Audio"),
+               ("mp2", "__mp3__", "MP2Audio"),
+               ("wav", "__wav__", "WaveAudio"),
+               ("ogg", "__vorbis__", "VorbisAudio"),
+               ("aiff", "__aiff__", "AiffAudio"),
+               ("au", "__au__", "AuAudio"),
+               ("m4a", "__m4a__", "M4AAudio"),
+               ("alac", "__m4a__", "ALACAudio"),
+               ("wv", "__wavpack__", "WavPackAudio"),
+               ("shn", "__shn__", "ShortenAudio"))
+
+__imported_formats__ = set([])
+
+
+def __import_format__(module_name):
+    """Imports the given FORMAT_MODULES entry and returns it.
+
+    Its public names are added to this module's,
+    leaving any names already defined here as they are."""
+
+    module = __import__(module_name, globals(), {}, ["__name__"], 1)
+    if (module_name not in __imported_formats__):
+        module_globals = globals()
+        for (name, value) in module.__dict__.items():
+            if (not name.startswith("_")):
+                module_globals.setdefault(name, value)
+        __imported_formats__.add(module_name)
+    return module
+
+
+def __import_name__(name):
+    """Imports whichever FORMAT_MODULES entry defines name
+    and returns its value.
+
+    Raises AttributeError if no module defines it."""
+
+    if (name.startswith("__")):
+        raise AttributeError(name)
+    elif (name == "AVAILABLE_TYPES"):
+        globals()[name] = tuple([getattr(__import_format__(module_name),
+                                         class_name)
+                                 for (type_name, module_name, class_name)
+                                 in AUDIO_TYPES])
+        return globals()[name]
+    elif (name == "DEFAULT_QUALITY"):
+        #the configured compression mode of each type which has a choice
+        #as a NAME -> compression string dict, built on first use
+        globals()[name] = dict(
+            [(audio_class.NAME,
+              config.get_default("Quality",
+                                 audio_class.NAME,
+                                 audio_class.DEFAULT_COMPRESSION))
+             for audio_class in __import_name__("AVAILABLE_TYPES")
+             if (len(audio_class.COMPRESSION_MODES) > 1)])
+        return globals()[name]
+
+    for (type_name, module_name, class_name) in AUDIO_TYPES:
+        if (class_name == name):
+            __import_format__(module_name)
+            return globals()[name]
+
+    for module_name in FORMAT_MODULES:
+        if (module_name not in __imported_formats__):
+            __import_format__(module_name)
+            if (name in globals()):
+                return globals()[name]
+    else:
+        raise AttributeError(name)
 
-from __wav__ import *
 
-from __au__ import *
-from __ogg__ import *
-from __vorbiscomment__ import *
-from __id3__ import *
-from __aiff__ import *
-from __flac__ import *
+class __lazy_module__(types.ModuleType):
+    """Stands in for this module in sys.modules
+    so that names from its FORMAT_MODULES are imported on first use.
 
-from __ape__ import *
-from __mp3__ import *
-from __vorbis__ import *
-from __m4a__ import *
-from __wavpack__ import *
-from __shn__ import *
+    Attributes are read from and written to the actual module."""
 
-from __dvda__ import *
+    def __init__(self, module):
+        types.ModuleType.__init__(self, module.__name__, module.__doc__)
+        self.__dict__["__real_module__"] = module
+
+    def __getattr__(self, name):
+        module = self.__dict__["__real_module__"]
+        if (name == "__all__"):
+            return self.__all_names__()
+        try:
+            return getattr(module, name)
+        except AttributeError:
+            return module.__import_name__(name)
+
+    def __all_names__(self):
+        #"from audiotools import *" binds the public names
+        #of this module and every format module, as it did
+        #when they were all imported up front, so it imports them all
+        module = self.__dict__["__real_module__"]
+        for module_name in module.FORMAT_MODULES:
+            module.__import_format__(module_name)
+        names = set([name for (name, value) in module.__dict__.items()
+                     if ((not name.startswith("_")) and
+                         (not isinstance(value, types.ModuleType)))])
+        names.update([class_name for (type_name, module_name, class_name)
+                      in module.AUDIO_TYPES])
+        names.update(["AVAILABLE_TYPES", "DEFAULT_QUALITY"])
+        return sorted(names)
+
+    def __setattr__(self, name, value):
+        setattr(self.__dict__["__real_module__"], name, value)
+
+    def __delattr__(self, name):
+        delattr(self.__dict__["__real_module__"], name)
+
+    def __repr__(self):
+        return repr(self.__dict__["__real_module__"])
 
 
 #######################
@@ -4384,6 +5026,8 @@ class CDTrackReaderAccurateRipCRC:
     def __init__(self, cdtrackreader,
                  track_number, track_total,
                  total_sectors):
+        from .__accuraterip__ import AccurateRipTrackCRC
+
         self.cdtrackreader = cdtrackreader
         self.accuraterip_crc = AccurateRipTrackCRC()
         if (track_number == 1):
@@ -4471,10 +5115,6 @@ def most_numerous(item_list, empty_list="", all_differ=""):
 
 __most_numerous__ = most_numerous
 
-from __freedb__ import *
-from __musicbrainz__ import *
-from __accuraterip__ import *
-
 
 def read_metadata_file(filename):
     """Returns an AlbumMetaDataFile-compatible file from a filename string.
@@ -4488,6 +5128,9 @@ def read_metadata_file(filename):
     except IOError, msg:
         raise MetaDataFileException(str(msg))
 
+    from .__freedb__ import XMCD, XMCDException
+    from .__musicbrainz__ import MusicBrainzReleaseXML, MBXMLException
+
     #try XMCD first
     try:
         return XMCD.from_string(data)
@@ -4508,6 +5151,275 @@ def read_metadata_file(filename):
 #######################
 
 
+class __http_connections__:
+    """a pool of persistent HTTP/1.1 connections, keyed by server and port,
+    which successive metadata lookups reuse rather than reconnecting"""
+
+    def __init__(self):
+        import threading
+
+        self.__idle__ = {}
+        self.__lock__ = threading.Lock()
+
+    #the redirect statuses followed, as urllib2.urlopen() does
+    REDIRECTS = (301, 302, 303, 307)
+
+    #the most redirects followed by a single request
+    MAX_REDIRECTS = 10
+
+    def request(self, server, port, method, path, body=None, headers=None):
+        """performs an HTTP request on a pooled connection
+        and returns the response body as a string
+
+        redirects are followed to their new location,
+        on whichever server and port it names
+
+        may raise urllib2.HTTPError if the server responds with an error
+        or urllib2.URLError if the server can't be reached"""
+
+        from urllib2 import HTTPError
+        from urlparse import urljoin, urlsplit
+
+        if (headers is None):
+            headers = {}
+        scheme = "http"
+
+        for redirects in xrange(self.MAX_REDIRECTS + 1):
+            url = "%s://%s:%d%s" % (scheme, server, port, path)
+            response = self.__request__(scheme, server, port,
+                                        method, path, body, headers)
+            location = response.getheader("location")
+            if ((response.status not in self.REDIRECTS) or
+                (location is None)):
+                break
+
+            target = urlsplit(urljoin(url, location))
+            if (target.scheme not in ("http", "https")):
+                break
+            scheme = target.scheme
+            server = target.hostname
+            if (target.port is not None):
+                port = target.port
+            elif (scheme == "https"):
+                port = 443
+            else:
+                port = 80
+            path = target.path or "/"
+            if (len(target.query) > 0):
+                path += "?" + target.query
+
+            #like urlopen(), redirected POSTs are sent as GETs
+            if ((method == "POST") and (response.status != 307)):
+                method = "GET"
+                body = None
+                headers = dict([(key, value) for (key, value)
+                                in headers.items()
+                                if (key.lower() != "content-type")])
+
+        if (response.status != 200):
+            raise HTTPError(url,
+                            response.status,
+                            response.reason,
+                            response.msg,
+                            None)
+        else:
+            return response.data
+
+    def __request__(self, scheme, server, port, method, path, body, headers):
+        #returns a response whose body has been read into its data attribute
+        #so its connection may be reused
+        import httplib
+        import socket
+        from urllib2 import URLError
+
+        while (True):
+            connection = self.__acquire__(scheme, server, port)
+            reused = connection.sock is not None
+            try:
+                connection.request(method, path, body, headers)
+                response = connection.getresponse()
+                response.data = response.read()
+                break
+            except (httplib.HTTPException, socket.error), err:
+                connection.close()
+                if (not reused):
+                    raise URLError(err)
+                #otherwise, the server has probably closed
+                #an idle connection, so try again on a new one
+
+        if (response.will_close):
+            connection.close()
+        else:
+            self.__release__(scheme, server, port, connection)
+
+        return response
+
+    def __acquire__(self, scheme, server, port):
+        import httplib
+
+        self.__lock__.acquire()
+        try:
+            try:
+                return self.__idle__[(scheme, server, port)].pop()
+            except (KeyError, IndexError):
+                if (scheme == "https"):
+                    return httplib.HTTPSConnection(server, port)
+                else:
+                    return httplib.HTTPConnection(server, port)
+        finally:
+            self.__lock__.release()
+
+    def __release__(self, scheme, server, port, connection):
+        self.__lock__.acquire()
+        try:
+            self.__idle__.setdefault((scheme, server, port),
+                                     []).append(connection)
+        finally:
+            self.__lock__.release()
+
+    def close(self):
+        """closes all idle connections"""
+
+        self.__lock__.acquire()
+        try:
+            for connections in self.__idle__.values():
+                for connection in connections:
+                    connection.close()
+            self.__idle__ = {}
+        finally:
+            self.__lock__.release()
+
+HTTP_CONNECTIONS = __http_connections__()
+
+
+class __metadata_cache__:
+    """a cache of metadata lookup responses, keyed by service and disc ID,
+    whose entries expire after METADATA_CACHE_TTL seconds"""
+
+    def __init__(self, config):
+        import threading
+
+        #entries are kept in memory, and also in a directory between runs
+        #if one is configured, with a file per entry
+        #so that storing one never rewrites the others
+        self.__cache_dir__ = config.get_default("System", "metadata_cache",
+                                                None)
+        if (self.__cache_dir__ is not None):
+            self.__cache_dir__ = os.path.expanduser(self.__cache_dir__)
+        self.__entries__ = {}
+        self.__lock__ = threading.Lock()
+
+    def __entry_file__(self, key):
+        from hashlib import sha1
+
+        return os.path.join(self.__cache_dir__, sha1(repr(key)).hexdigest())
+
+    def __getitem__(self, key):
+        from time import time
+
+        self.__lock__.acquire()
+        try:
+            try:
+                (stored, value) = self.__entries__[key]
+            except KeyError:
+                if (self.__cache_dir__ is None):
+                    raise
+                try:
+                    (stored_key, stored, value) = cPickle.load(
+                        file(self.__entry_file__(key), "rb"))
+                except (IOError, EOFError, ValueError, TypeError,
+                        cPickle.UnpicklingError):
+                    raise KeyError(key)
+                if (stored_key != key):
+                    raise KeyError(key)
+                self.__entries__[key] = (stored, value)
+
+            if ((time() - stored) < METADATA_CACHE_TTL):
+                return value
+            else:
+                raise KeyError(key)
+        finally:
+            self.__lock__.release()
+
+    def __setitem__(self, key, value):
+        from time import time
+
+        stored = time()
+        self.__lock__.acquire()
+        try:
+            self.__entries__[key] = (stored, value)
+        finally:
+            self.__lock__.release()
+
+        if (self.__cache_dir__ is not None):
+            #entries are replaced whole, so other processes sharing
+            #the directory never see one partially written
+            try:
+                if (not os.path.isdir(self.__cache_dir__)):
+                    os.makedirs(self.__cache_dir__)
+                __replace_file__(
+                    self.__entry_file__(key),
+                    lambda f: cPickle.dump((key, stored, value), f,
+                                           cPickle.HIGHEST_PROTOCOL))
+            except (IOError, OSError):
+                pass
+
+    def clear(self):
+        """removes all entries, including those in the cache directory"""
+
+        self.__lock__.acquire()
+        try:
+            self.__entries__ = {}
+            if (self.__cache_dir__ is not None):
+                try:
+                    for name in os.listdir(self.__cache_dir__):
+                        if (re.match(r'^[0-9a-f]{40}$', name)):
+                            os.unlink(os.path.join(self.__cache_dir__,
+                                                   name))
+                except OSError:
+                    pass
+        finally:
+            self.__lock__.release()
+
+METADATA_CACHE = __metadata_cache__(config)
+
+
+def __call_concurrently__(functions):
+    """calls each of the given functions with no arguments
+    in its own thread and returns a list of their results, in order
+
+    if any function raises an exception,
+    the first one is raised again once all have finished"""
+
+    import threading
+
+    results = [None] * len(functions)
+    errors = [None] * len(functions)
+
+    def call(index):
+        try:
+            results[index] = functions[index]()
+        except Exception:
+            errors[index] = sys.exc_info()
+
+    #the last function runs in the calling thread
+    threads = [threading.Thread(target=call, args=(i,))
+               for i in xrange(len(functions) - 1)]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+    if (len(functions) > 0):
+        call(len(functions) - 1)
+    for thread in threads:
+        thread.join()
+
+    for error in errors:
+        if (error is not None):
+            raise error[0], error[1], error[2]
+    else:
+        return results
+
+
 def metadata_lookup(first_track_number, last_track_number,
                     offsets, lead_out_offset, total_length,
                     musicbrainz_server="musicbrainz.org",
@@ -4536,15 +5448,12 @@ def metadata_lookup(first_track_number, last_track_number,
     track_count = (last_track_number + 1) - first_track_number
     assert(track_count == len(offsets))
 
-    matches = []
-
-    #MusicBrainz takes precedence over FreeDB
-    if (use_musicbrainz):
+    def musicbrainz_lookup():
         from . import musicbrainz
         from urllib2 import HTTPError
         from xml.parsers.expat import ExpatError
         try:
-            matches.extend(musicbrainz.perform_lookup(
+            return list(musicbrainz.perform_lookup(
                     first_track_number=first_track_number,
                     last_track_number=last_track_number,
                     lead_out_offset=lead_out_offset,
@@ -4552,20 +5461,32 @@ def metadata_lookup(first_track_number, last_track_number,
                     musicbrainz_server=musicbrainz_server,
                     musicbrainz_port=musicbrainz_port))
         except (HTTPError, ExpatError):
-            pass
+            return []
 
-    if (use_freedb):
+    def freedb_lookup():
         from . import freedb
         from urllib2 import HTTPError
         try:
-            matches.extend(freedb.perform_lookup(
+            return list(freedb.perform_lookup(
                     offsets=offsets,
                     total_length=total_length,
                     track_count=track_count,
                     freedb_server=freedb_server,
                     freedb_port=freedb_port))
         except (HTTPError, ValueError), err:
-            pass
+            return []
+
+    #both services are queried at the same time
+    #but MusicBrainz takes precedence over FreeDB
+    lookups = []
+    if (use_musicbrainz):
+        lookups.append(musicbrainz_lookup)
+    if (use_freedb):
+        lookups.append(freedb_lookup)
+
+    matches = []
+    for choices in __call_concurrently__(lookups):
+        matches.extend(choices)
 
     if (len(matches) == 0):
         #no matches, so build a set of dummy metadata
@@ -4581,6 +5502,198 @@ def metadata_lookup(first_track_number, last_track_number,
 #######################
 
 
+def __write_message__(fd, message):
+    """pickles message and writes it to the given file descriptor
+
+    the pickled data is prefixed with its length
+    so that it can be read back whole by __read_message__()"""
+
+    data = cPickle.dumps(message, cPickle.HIGHEST_PROTOCOL)
+    data = struct.pack(">I", len(data)) + data
+    written = 0
+    while (written < len(data)):
+        written += os.write(fd, buffer(data, written))
+
+
+def __read_message__(fd):
+    """reads a message written by __write_message__()
+    from the given file descriptor
+
+    raises EOFError if the writer has closed its end"""
+
+    (length,) = struct.unpack(">I", __read_bytes__(fd, 4))
+    return cPickle.loads(__read_bytes__(fd, length))
+
+
+def __read_bytes__(fd, bytes):
+    """reads exactly "bytes" bytes from the given file descriptor
+
+    raises EOFError if the writer closes its end before then"""
+
+    chunks = []
+    while (bytes > 0):
+        chunk = os.read(fd, bytes)
+        if (len(chunk) == 0):
+            raise EOFError()
+        chunks.append(chunk)
+        bytes -= len(chunk)
+    return "".join(chunks)
+
+
+class __ExecWorker__:
+    def __init__(self, pid, jobs, results):
+        self.pid = pid
+        self.jobs = jobs        # file descriptor of job IDs to the worker
+        self.results = results  # file descriptor of messages from the worker
+        self.job_id = None      # the ID of the worker's current job, if any
+
+
+class __ExecWorkerPool__:
+    """A pool of long-lived worker subprocesses.
+
+    Workers are forked as needed, up to "max_workers" at a time,
+    and each runs one job after another until the pool is closed.
+    Since workers are forked from the process which queued the jobs,
+    the jobs themselves never need to be pickled.
+    Only job IDs are sent to workers,
+    and only progress, results and exceptions are sent back."""
+
+    def __init__(self, run_job, max_workers):
+        """run_job(job_id, send) is called in a worker for each job
+
+        "send" is a function which takes a message tuple
+        to be passed to the parent, such as a progress update.
+        run_job's return value is sent to the parent as
+        a ("completed", [job_id, result]) message
+        and any Exception it raises is sent as an
+        ("exception", [job_id, exception]) message."""
+
+        self.run_job = run_job
+        self.max_workers = max(max_workers, 1)
+        self.workers = []
+        self.exit_statuses = []
+
+    def idle(self):
+        """returns True if a job can be submitted without waiting"""
+
+        return ((len(self.workers) < self.max_workers) or
+                (len([w for w in self.workers if w.job_id is None]) > 0))
+
+    def running(self):
+        """returns the number of jobs currently running"""
+
+        return len([w for w in self.workers if w.job_id is not None])
+
+    def submit(self, job_id):
+        """sends the given job ID to an idle worker,
+        spawning a new worker if necessary"""
+
+        idle_workers = [w for w in self.workers if w.job_id is None]
+        if (len(idle_workers) > 0):
+            worker = idle_workers[0]
+        else:
+            worker = self.__spawn__()
+        worker.job_id = job_id
+        __write_message__(worker.jobs, job_id)
+
+    def messages(self):
+        """yields (command, args) message tuples from running workers
+
+        blocks until at least one message is available
+        and yields all those which are
+
+        if a worker exits in the middle of a job,
+        an ("exception", [job_id, exception]) message is generated for it"""
+
+        import select
+
+        running = dict([(w.results, w) for w in self.workers
+                        if w.job_id is not None])
+        (rlist, wlist, xlist) = select.select(running.keys(), [], [])
+        for fd in rlist:
+            worker = running[fd]
+            try:
+                (command, args) = __read_message__(fd)
+            except EOFError:
+                job_id = worker.job_id
+                self.__reap__(worker)
+                yield ("exception",
+                       [job_id,
+                        ValueError(_(u"job process exited unexpectedly"))])
+                continue
+
+            if (command in ("completed", "exception")):
+                worker.job_id = None
+            yield (command, args)
+
+    def close(self):
+        """stops all workers, terminating those still running jobs"""
+
+        import signal
+
+        for worker in list(self.workers):
+            if (worker.job_id is not None):
+                try:
+                    os.kill(worker.pid, signal.SIGTERM)
+                except OSError:
+                    pass
+            self.__reap__(worker)
+
+    def __reap__(self, worker):
+        #closing the job pipe tells an idle worker to exit
+        os.close(worker.jobs)
+        os.close(worker.results)
+        self.exit_statuses.append(os.waitpid(worker.pid, 0)[1])
+        self.workers.remove(worker)
+
+    def __spawn__(self):
+        (jobs_read, jobs_write) = os.pipe()
+        (results_read, results_write) = os.pipe()
+        pid = os.fork()
+        if (pid > 0):  # parent
+            os.close(jobs_read)
+            os.close(results_write)
+            worker = __ExecWorker__(pid, jobs_write, results_read)
+            self.workers.append(worker)
+            return worker
+        else:          # child
+            os.close(jobs_write)
+            os.close(results_read)
+            #don't hold other workers' pipes open
+            #or they won't see the parent close them
+            for worker in self.workers:
+                os.close(worker.jobs)
+                os.close(worker.results)
+            status = 1
+            try:
+                self.__work__(jobs_read, results_write)
+                status = 0
+            finally:
+                #exit without unwinding the parent's stack
+                try:
+                    sys.stdout.flush()
+                    sys.stderr.flush()
+                finally:
+                    os._exit(status)
+
+    def __work__(self, jobs, results):
+        def send(message):
+            __write_message__(results, message)
+
+        while (True):
+            try:
+                job_id = __read_message__(jobs)
+            except EOFError:
+                return
+
+            try:
+                result = self.run_job(job_id, send)
+            except Exception, e:
+                send(("exception", [job_id, e]))
+            else:
+                send(("completed", [job_id, result]))
+
+
 class ExecQueue:
     """A class for running multiple jobs in parallel."""
 
@@ -4593,59 +5706,59 @@ class ExecQueue:
 
         self.todo.append((function, args, kwargs))
 
-    def __run__(self, function, args, kwargs):
-        pid = os.fork()
-        if (pid > 0):  # parent
-            return pid
-        else:          # child
+    def __run_job__(self, job, send):
+        import traceback
+
+        (function, args, kwargs) = job
+        try:
             if (kwargs is not None):
                 function(*args, **kwargs)
             else:
                 function(*args)
-            sys.exit(0)
+        except Exception:
+            #report the failure as an uncaught exception would have
+            #in the job's own subprocess, before the worker moves on
+            traceback.print_exc()
+            raise
 
     def run(self, max_processes=1):
         """Performs the queued functions in separate subprocesses.
 
         This runs "max_processes" number of functions at a time.
-        It works by spawning a new child process for each function,
-        executing it and spawning a new child as each one exits.
+        It works by spawning up to "max_processes" worker subprocesses
+        which execute one function after another until all are done.
         Therefore, any side effects beyond altering files on
-        disk do not propogate back to the parent."""
-
-        max_processes = max(max_processes, 1)
-
-        process_pool = set([])
+        disk do not propogate back to the parent.
 
-        #fill the process_pool to the limit
-        while ((len(self.todo) > 0) and (len(process_pool) < max_processes)):
-            (function, args, kwargs) = self.todo.pop(0)
-            process_pool.add(self.__run__(function, args, kwargs))
-            #print "Filling %s" % (repr(process_pool))
+        A function which raises an exception has its traceback
+        written to stderr and adds a nonzero exit status
+        to return_values."""
 
-        #as processes end, keep adding new ones to the pool
-        #until we run out of queued jobs
-
-        while (len(self.todo) > 0):
-            try:
-                (pid, return_value) = os.waitpid(0, 0)
-                process_pool.remove(pid)
-                self.return_values.add(return_value)
-                (function, args, kwargs) = self.todo.pop(0)
-                process_pool.add(self.__run__(function, args, kwargs))
-                #print "Resuming %s" % (repr(process_pool))
-            except KeyError:
-                continue
+        (jobs, self.todo) = (self.todo, [])
+        pool = __ExecWorkerPool__(
+            lambda job_id, send: self.__run_job__(jobs[job_id], send),
+            max_processes)
 
-        #finally, wait for the running jobs to finish
-        while (len(process_pool) > 0):
-            try:
-                (pid, return_value) = os.waitpid(0, 0)
-                process_pool.remove(pid)
-                self.return_values.add(return_value)
-                #print "Emptying %s" % (repr(process_pool))
-            except KeyError:
-                continue
+        try:
+            job_ids = range(len(jobs))
+
+            #fill the pool to the limit
+            while ((len(job_ids) > 0) and pool.idle()):
+                pool.submit(job_ids.pop(0))
+
+            #as jobs finish, keep submitting new ones
+            #until we run out of queued jobs
+            while (pool.running() > 0):
+                for (command, args) in pool.messages():
+                    if (command == "exception"):
+                        #the status of a process exiting with 1
+                        self.return_values.add(1 << 8)
+                    if ((command in ("completed", "exception")) and
+                        (len(job_ids) > 0)):
+                        pool.submit(job_ids.pop(0))
+        finally:
+            pool.close()
+            self.return_values.update(pool.exit_statuses)
 
 
 class ExecQueue2:
@@ -4655,91 +5768,50 @@ class ExecQueue2:
         self.todo = []
         self.return_values = set([])
 
-        #a dict of reader->pid values as returned by __run__()
-        self.process_pool = {}
-
     def execute(self, function, args, kwargs=None):
 
         self.todo.append((function, args, kwargs))
 
-    def __run__(self, function, args, kwargs):
-        """executes the given function and arguments in a child job
-
-        returns a (pid, reader) tuple where pid is an int of the child job
-        and reader is a file object containing its piped data"""
-
-        (pipe_read, pipe_write) = os.pipe()
-        pid = os.fork()
-        if (pid > 0):  # parent
-            os.close(pipe_write)
-            reader = os.fdopen(pipe_read, 'r')
-            return (pid, reader)
-        else:          # child
-            os.close(pipe_read)
-            writer = os.fdopen(pipe_write, 'w')
-            if (kwargs is not None):
-                cPickle.dump(function(*args, **kwargs), writer)
-            else:
-                cPickle.dump(function(*args), writer)
-            sys.exit(0)
-
-    def __add_job__(self):
-        """removes a queued function and adds it to our running pool"""
-
-        (function, args, kwargs) = self.todo.pop(0)
-        (pid, file_pointer) = self.__run__(function, args, kwargs)
-        self.process_pool[file_pointer] = pid
-
-    def __await_jobs__(self):
-        """yields a reader file object per finished job
-
-        If the child job exited properly, that reader will have
-        the pickled contents of the completed Python function
-        and it can be used to find the child's PID to be waited for
-        via the process pool.
-        In addition, the returned values of finished child processes
-        are added to our "return_values" attribute."""
-
-        import select
-
-        (readable,
-         writeable,
-         exceptional) = select.select(list(self.process_pool.keys()), [], [])
-        for reader in readable:
-            try:
-                result = cPickle.load(reader)
-            except EOFError:
-                result = None
-            (pid, return_value) = os.waitpid(self.process_pool[reader], 0)
-            self.return_values.add(return_value)
-            yield (reader, result)
+    def __run_job__(self, job, send):
+        (function, args, kwargs) = job
+        if (kwargs is not None):
+            return function(*args, **kwargs)
+        else:
+            return function(*args)
 
     def run(self, max_processes=1):
         """execute all queued functions
 
         Yields the result of each executed function as they complete."""
 
-        max_processes = max(max_processes, 1)
-
-        #fill the process pool to the limit
-        while ((len(self.todo) > 0) and
-               (len(self.process_pool) < max_processes)):
-            self.__add_job__()
-
-        #as processes end, keep adding new ones to the pool
-        #until we run out of queued jobs
-        while (len(self.todo) > 0):
-            for (reader, result) in self.__await_jobs__():
-                del(self.process_pool[reader])
-                if (len(self.todo) > 0):
-                    self.__add_job__()
-                yield result
+        (jobs, self.todo) = (self.todo, [])
+        pool = __ExecWorkerPool__(
+            lambda job_id, send: self.__run_job__(jobs[job_id], send),
+            max_processes)
 
-        #finally, wait for the running jobs to finish
-        while (len(self.process_pool) > 0):
-            for (reader, result) in self.__await_jobs__():
-                del(self.process_pool[reader])
-            yield result
+        try:
+            job_ids = range(len(jobs))
+
+            #fill the pool to the limit
+            while ((len(job_ids) > 0) and pool.idle()):
+                pool.submit(job_ids.pop(0))
+
+            #as jobs finish, keep submitting new ones
+            #until we run out of queued jobs
+            while (pool.running() > 0):
+                for (command, args) in pool.messages():
+                    if (command == "completed"):
+                        result = args[1]
+                    elif (command == "exception"):
+                        result = None
+                    else:
+                        continue
+                    if (len(job_ids) > 0):
+                        pool.submit(job_ids.pop(0))
+                    yield result
+        finally:
+            pool.close()
+            self.return_values.update(pool.exit_statuses)
 
 
 class ProgressJobQueueComplete(Exception):
@@ -4757,6 +5829,7 @@ class ExecProgressQueue:
         self.total_queued_jobs = 0
         self.max_job_id = 0
         self.running_job_pool = {}
+        self.worker_pool = None
         self.results = {}
         self.cached_exception = None
         self.total_progress_message = total_progress_message
@@ -4799,13 +5872,9 @@ class ExecProgressQueue:
         if (progress_text is not None):
             self.progress_display.add_row(job_id, progress_text)
 
-        #spawn subprocess and add it to pool
-        self.running_job_pool[job_id] = __ExecProgressQueueJob__.spawn(
-            job_id,
-            completion_output,
-            function,
-            args,
-            kwargs)
+        #hand job to an idle worker and add it to the running pool
+        self.worker_pool.submit(job_id)
+        self.running_job_pool[job_id] = completion_output
 
     def execute_next_job_nothreads(self):
         """Executes the next queued job without spawning a subprocess."""
@@ -4853,9 +5922,6 @@ class ExecProgressQueue:
         #add result to results
         self.results[job_id] = result
 
-        #clean up job from pool
-        self.running_job_pool[job_id].join()
-
         #remove job from progress display, if present
         self.progress_display.delete_row(job_id)
         self.progress_display.update_row(-1,
@@ -4864,7 +5930,7 @@ class ExecProgressQueue:
         self.progress_display.clear()
 
         #display output text, if any
-        completion_output = self.running_job_pool[job_id].completion_output
+        completion_output = self.running_job_pool[job_id]
         if (completion_output is not None):
             if (callable(completion_output)):
                 output = completion_output(result)
@@ -4888,7 +5954,6 @@ class ExecProgressQueue:
         """Handles an exception caused by the given job."""
 
         #clean up job that raised exception
-        self.running_job_pool[job_id].join()
         del(self.running_job_pool[job_id])
 
         #clean out job queue
@@ -4903,11 +5968,21 @@ class ExecProgressQueue:
 
         self.progress_display.update_row(job_id, current, total)
 
+    def __run_job__(self, job, send):
+        (job_id,
+         progress_text,
+         completion_output,
+         function,
+         args,
+         kwargs) = job
+
+        return function(*args,
+                        progress=__JobProgress__(job_id, send).progress,
+                        **kwargs)
+
     def run(self, max_processes=1):
         """Runs all the queued jobs in parallel."""
 
-        import select
-
         if (len(self.queued_jobs) == 0):
             return
 
@@ -4915,75 +5990,55 @@ class ExecProgressQueue:
             while (len(self.queued_jobs) > 0):
                 self.execute_next_job_nothreads()
         else:
-            for i in xrange(min(max_processes, len(self.queued_jobs))):
-                self.execute_next_job()
-
-            if (self.total_progress_message is not None):
-                self.progress_display.add_row(-1, self.total_progress_message)
+            #workers are forked from this process,
+            #so they can look up queued jobs by ID
+            jobs = dict([(job[0], job) for job in self.queued_jobs])
+            self.worker_pool = __ExecWorkerPool__(
+                lambda job_id, send: self.__run_job__(jobs[job_id], send),
+                max_processes)
 
             try:
-                while (True):
-                    (rlist,
-                     wlist,
-                     xlist) = select.select(
-                        [job.output for job
-                         in self.running_job_pool.values()], [], [])
-                    for reader in rlist:
-                        (command, args) = cPickle.load(reader)
-                        getattr(self, command)(*args)
-            except ProgressJobQueueComplete:
-                if (self.cached_exception is not None):
-                    raise self.cached_exception
-                else:
-                    return
+                for i in xrange(min(max_processes, len(self.queued_jobs))):
+                    self.execute_next_job()
 
+                if (self.total_progress_message is not None):
+                    self.progress_display.add_row(-1,
+                                                  self.total_progress_message)
 
-class __ExecProgressQueueJob__:
-    def __init__(self, pid, output, completion_output):
-        self.pid = pid
-        self.output = output
-        self.completion_output = completion_output
-
-    def join(self):
-        self.output.close()
-        return os.waitpid(self.pid, 0)
-
-    @classmethod
-    def spawn(cls, job_id, completion_output, function, args, kwargs):
-        (read_end, write_end) = os.pipe()
-        pid = os.fork()
-        if (pid > 0):
-            os.close(write_end)
-            return cls(pid, os.fdopen(read_end, 'rb'), completion_output)
-        else:
-            os.close(read_end)
-            output = os.fdopen(write_end, 'wb')
-            try:
                 try:
-                    result = function(
-                        *args,
-                        progress=__JobProgress__(job_id, output).progress,
-                        **kwargs)
-                    cPickle.dump(("completed", [job_id, result]),
-                                 output,
-                                 cPickle.HIGHEST_PROTOCOL)
-                except Exception, e:
-                    cPickle.dump(("exception", [job_id, e]),
-                                 output,
-                                 cPickle.HIGHEST_PROTOCOL)
+                    while (True):
+                        for (command, args) in self.worker_pool.messages():
+                            getattr(self, command)(*args)
+                except ProgressJobQueueComplete:
+                    if (self.cached_exception is not None):
+                        raise self.cached_exception
+                    else:
+                        return
             finally:
-                sys.exit(0)
+                self.worker_pool.close()
+                self.worker_pool = None
 
 
 class __JobProgress__:
-    def __init__(self, job_id, output):
+    """Sends a job's progress to the parent process.
+
+    Updates are sent no more than once per PROGRESS_INTERVAL seconds,
+    since the display can't show them any faster than that anyway."""
+
+    PROGRESS_INTERVAL = 0.1
+
+    def __init__(self, job_id, send):
         self.job_id = job_id
-        self.output = output
+        self.send = send
+        self.last_sent = 0
 
     def progress(self, current, total):
-        cPickle.dump(("progress", [self.job_id, current, total]),
-                     self.output)
-        self.output.flush()
+        import time
+
+        now = time.time()
+        if ((now - self.last_sent) >= self.PROGRESS_INTERVAL):
+            self.send(("progress", [self.job_id, current, total]))
+            self.last_sent = now
 
 
 class __UnthreadedJobProgress__:
@@ -5000,29 +6055,79 @@ class __UnthreadedJobProgress__:
 #Monkey's Audio with my own code in order to make it available again.
 #Yet another reason to avoid that unpleasant file format...
 
-AVAILABLE_TYPES = (FlacAudio,
-                   OggFlacAudio,
-                   MP3Audio,
-                   MP2Audio,
-                   WaveAudio,
-                   VorbisAudio,
-                   AiffAudio,
-                   AuAudio,
-                   M4AAudio,
-                   ALACAudio,
-                   WavPackAudio,
-                   ShortenAudio)
-
-TYPE_MAP = dict([(track_type.NAME, track_type)
-                 for track_type in AVAILABLE_TYPES
-                 if track_type.has_binaries(BIN)])
-
-DEFAULT_QUALITY = dict([(track_type.NAME,
-                         config.get_default("Quality",
-                                            track_type.NAME,
-                                            track_type.DEFAULT_COMPRESSION))
-                        for track_type in AVAILABLE_TYPES
-                        if (len(track_type.COMPRESSION_MODES) > 1)])
-
-if (DEFAULT_TYPE not in TYPE_MAP.keys()):
+class __type_map__:
+    """A dict-like mapping of NAME strings to AudioFile classes
+    for each of the AUDIO_TYPES whose binaries are available.
+
+    A type's module is only imported once that type is looked up,
+    so listing all the keys or values imports every type."""
+
+    def __init__(self, audio_types, system_binaries):
+        self.__audio_types__ = audio_types
+        self.__system_binaries__ = system_binaries
+
+        #NAME -> AudioFile class, or None if its binaries are missing
+        self.__classes__ = {}
+
+    def __class_of__(self, name):
+        try:
+            return self.__classes__[name]
+        except KeyError:
+            for (type_name, module_name, class_name) in self.__audio_types__:
+                if (type_name == name):
+                    audio_class = getattr(__import_format__(module_name),
+                                          class_name)
+                    if (audio_class.has_binaries(self.__system_binaries__)):
+                        self.__classes__[name] = audio_class
+                    else:
+                        self.__classes__[name] = None
+                    return self.__classes__[name]
+            else:
+                return None
+
+    def __getitem__(self, name):
+        audio_class = self.__class_of__(name)
+        if (audio_class is not None):
+            return audio_class
+        else:
+            raise KeyError(name)
+
+    def __contains__(self, name):
+        return self.__class_of__(name) is not None
+
+    def has_key(self, name):
+        return name in self
+
+    def get(self, name, default=None):
+        audio_class = self.__class_of__(name)
+        if (audio_class is not None):
+            return audio_class
+        else:
+            return default
+
+    def keys(self):
+        return [type_name for (type_name, module_name, class_name)
+                in self.__audio_types__ if type_name in self]
+
+    def values(self):
+        return [self[name] for name in self.keys()]
+
+    def items(self):
+        return [(name, self[name]) for name in self.keys()]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+TYPE_MAP = __type_map__(AUDIO_TYPES, BIN)
+
+if (DEFAULT_TYPE not in TYPE_MAP):
     DEFAULT_TYPE = "wav"
+
+sys.modules[__name__] = __lazy_module__(sys.modules[__name__])
@@ -30,8 +30,11 @@ from audiotools import (AudioFile, InvalidFile, PCMReader, PCMConverter,
                         UnsupportedChannelCount,
                         BufferedPCMReader, to_pcm_progress,
                         at_a_time, VERSION, PCMReaderError,
+                        LimitedFileReader, __replace_file__,
                         __default_quality__, iter_last)
 from __m4a_atoms__ import *
+from bisect import bisect_right
+import struct
 import gettext
 
 gettext.install("audiotools", unicode=True)
@@ -46,48 +49,96 @@ class InvalidM4A(InvalidFile):
     pass
 
 
+def parse_m4a_atom_header(reader):
+    """given a BitstreamReader at the start of an atom,
+    returns a (size, name, header_size) tuple
+    where size includes the atom's header of header_size bytes,
+    which is 16 rather than 8 if a 64-bit size follows the atom's name"""
+
+    (size, name) = reader.parse("32u 4b")
+    if (size == 1):
+        return (reader.read64(64), name, 16)
+    else:
+        return (size, name, 8)
+
+
 def get_m4a_atom(reader, *atoms):
     """given a BitstreamReader and atom name strings
     returns a (size, substream) of the final atom data
-    (not including its 64-bit size/name header)
+    (not including its size/name header)
     after traversing the parent atoms
     """
 
     for (last, next_atom) in iter_last(iter(atoms)):
         try:
-            (length, stream_atom) = reader.parse("32u 4b")
+            (length, stream_atom, header_size) = parse_m4a_atom_header(reader)
             while (stream_atom != next_atom):
-                reader.skip_bytes(length - 8)
-                (length, stream_atom) = reader.parse("32u 4b")
+                reader.skip_bytes(length - header_size)
+                (length,
+                 stream_atom,
+                 header_size) = parse_m4a_atom_header(reader)
             if (last):
-                return (length - 8, reader.substream(length - 8))
+                return (length - header_size,
+                        reader.substream(length - header_size))
             else:
-                reader = reader.substream(length - 8)
+                reader = reader.substream(length - header_size)
         except IOError:
             raise KeyError(next_atom)
 
 
+def get_m4a_atom_layout(file):
+    """given a seekable file object of an M4A file,
+    returns a list of (name, offset, size, header_size) tuples
+    of its top-level atoms where offset and size include each atom's header
+    and header_size is 16 rather than 8 for atoms with a 64-bit size
+
+    only atom headers are read, so this is fast for even large files"""
+
+    layout = []
+    file.seek(0, 2)
+    file_size = file.tell()
+    offset = 0
+    while ((offset + 8) <= file_size):
+        file.seek(offset, 0)
+        (size, name) = struct.unpack(">I4s", file.read(8))
+        header_size = 8
+        if (size == 1):
+            #a 64-bit size follows the atom's name
+            size = struct.unpack(">Q", file.read(8))[0]
+            header_size = 16
+        elif (size == 0):
+            #the atom extends to the end of the file
+            size = file_size - offset
+        if ((size < header_size) or ((offset + size) > file_size)):
+            raise InvalidM4A(_(u"invalid atom size"))
+        layout.append((name, offset, size, header_size))
+        offset += size
+    return layout
+
+
 def get_m4a_atom_offset(reader, *atoms):
     """given a BitstreamReader and atom name strings
     returns a (size, offset) of the final atom data
-    (including its 64-bit size/name header)
+    (including its size/name header)
     after traversing the parent atoms"""
 
     offset = 0
 
     for (last, next_atom) in iter_last(iter(atoms)):
         try:
-            (length, stream_atom) = reader.parse("32u 4b")
-            offset += 8
+            (length, stream_atom, header_size) = parse_m4a_atom_header(reader)
+            offset += header_size
             while (stream_atom != next_atom):
-                reader.skip_bytes(length - 8)
-                offset += (length - 8)
-                (length, stream_atom) = reader.parse("32u 4b")
-                offset += 8
+                reader.skip_bytes(length - header_size)
+                offset += (length - header_size)
+                (length,
+                 stream_atom,
+                 header_size) = parse_m4a_atom_header(reader)
+                offset += header_size
             if (last):
-                return (length, offset - 8)
+                return (length, offset - header_size)
             else:
-                reader = reader.substream(length - 8)
+                reader = reader.substream(length - header_size)
         except IOError:
             raise KeyError(next_atom)
 
@@ -97,6 +148,9 @@ class M4ATaggedAudio:
         self.filename = filename
 
     def get_metadata(self):
+        return self.__cached_metadata__(self.__read_metadata__)
+
+    def __read_metadata__(self):
         from .bitstream import BitstreamReader
 
         reader = BitstreamReader(file(self.filename, 'rb'), 0)
@@ -157,6 +211,7 @@ class M4ATaggedAudio:
                               (metadata.size() -
                                metadata["free"].size())))
 
+            self.__uncache_metadata__()
             f = file(self.filename, 'r+b')
             (meta_size, meta_offset) = get_m4a_atom_offset(
                 BitstreamReader(f, 0), "moov", "udta", "meta")
@@ -167,59 +222,122 @@ class M4ATaggedAudio:
         else:
             #if there's insufficient room,
             #attempt to resize the outermost "free" also
+            self.__uncache_metadata__()
 
-            #this is only possible if the file is laid out correctly,
-            #with "free" coming after "moov" but before "mdat"
-            #FIXME
-
-            #if neither fix is possible, the whole file must be rewritten
-            #which also requires adjusting the "stco" atom offsets
-            m4a_tree = M4A_Tree_Atom.parse(
-                None,
-                os.path.getsize(self.filename),
-                BitstreamReader(file(self.filename, "rb"), 0),
-                {"moov": M4A_Tree_Atom,
-                 "trak": M4A_Tree_Atom,
-                 "mdia": M4A_Tree_Atom,
-                 "minf": M4A_Tree_Atom,
-                 "stbl": M4A_Tree_Atom,
-                 "stco": M4A_STCO_Atom,
-                 "udta": M4A_Tree_Atom})
-
-            #find initial mdat offset
-            initial_mdat_offset = m4a_tree.child_offset("mdat")
+            #only the "moov" atom is parsed,
+            #the others (including "mdat") are left on disk
+            f = file(self.filename, "rb")
+            try:
+                atoms = get_m4a_atom_layout(f)
+                atom_names = [atom[0] for atom in atoms]
+                if ("moov" not in atom_names):
+                    return
+                moov_index = atom_names.index("moov")
+                (moov_offset,
+                 moov_size,
+                 moov_header_size) = atoms[moov_index][1:]
+                f.seek(moov_offset + moov_header_size, 0)
+                moov = M4A_Tree_Atom.parse(
+                    "moov",
+                    moov_size - moov_header_size,
+                    BitstreamReader(f, 0),
+                    {"trak": M4A_Tree_Atom,
+                     "mdia": M4A_Tree_Atom,
+                     "minf": M4A_Tree_Atom,
+                     "stbl": M4A_Tree_Atom,
+                     "stco": M4A_STCO_Atom,
+                     "co64": M4A_CO64_Atom,
+                     "udta": M4A_Tree_Atom})
+            finally:
+                f.close()
 
             #adjust moov -> udta -> meta atom
             #(generating sub-atoms as necessary)
-            if (not m4a_tree.has_child("moov")):
-                return
-            else:
-                moov = m4a_tree["moov"]
             if (not moov.has_child("udta")):
-                moov.append_child(M4A_Tree_Atom("udta", []))
+                moov.add_child(M4A_Tree_Atom("udta", []))
             udta = moov["udta"]
             if (not udta.has_child("meta")):
-                udta.append_child(metadata)
+                udta.add_child(metadata)
             else:
                 udta.replace_child(metadata)
+            new_moov_size = 8 + moov.size()
+
+            if (moov_index == (len(atoms) - 1)):
+                #"moov" is the last atom, so it can grow or shrink freely
+                f = file(self.filename, "r+b")
+                f.seek(moov_offset, 0)
+                writer = BitstreamWriter(f, 0)
+                writer.build("32u 4b", (new_moov_size, "moov"))
+                moov.build(writer)
+                writer.flush()
+                f.truncate()
+                f.close()
+                return
+            elif (atom_names[moov_index + 1] == "free"):
+                #"moov" can grow into the "free" atom just after it
+                #as long as what's left can still hold a "free" atom header
+                free_size = (moov_size + atoms[moov_index + 1][2] -
+                             new_moov_size)
+                if ((free_size == 0) or (free_size >= 8)):
+                    f = file(self.filename, "r+b")
+                    f.seek(moov_offset, 0)
+                    writer = BitstreamWriter(f, 0)
+                    writer.build("32u 4b", (new_moov_size, "moov"))
+                    moov.build(writer)
+                    if (free_size > 0):
+                        writer.build("32u 4b", (free_size, "free"))
+                        M4A_FREE_Atom(free_size - 8).build(writer)
+                    writer.flush()
+                    f.close()
+                    return
 
-            #find new mdat offset
-            new_mdat_offset = m4a_tree.child_offset("mdat")
-
-            #adjust moov -> trak -> mdia -> minf -> stbl -> stco offsets
-            #based on the difference between the new mdat position and the old
-            try:
-                delta_offset = new_mdat_offset - initial_mdat_offset
-                stco = m4a_tree["moov"]["trak"]["mdia"]["minf"]["stbl"]["stco"]
-                stco.offsets = [offset + delta_offset for offset in
-                                stco.offsets]
-            except KeyError:
-                #if there is no stco atom, don't worry about it
-                pass
-
-            #then write entire tree back to disk
-            writer = BitstreamWriter(file(self.filename, "wb"), 0)
-            m4a_tree.build(writer)
+            #if neither fix is possible, the whole file must be rewritten
+            #which also requires adjusting the "stco" or "co64" atom offsets
+            #of any chunks in atoms moved by the new "moov" atom's size
+            old_offsets = [atom[1] for atom in atoms]
+            deltas = [0 if (i <= moov_index) else (new_moov_size - moov_size)
+                      for i in xrange(len(atoms))]
+
+            for trak in moov:
+                if (trak.name != "trak"):
+                    continue
+                try:
+                    stbl = trak["mdia"]["minf"]["stbl"]
+                except KeyError:
+                    #if there is no stbl atom, don't worry about it
+                    continue
+                for chunk_offsets in stbl:
+                    if (chunk_offsets.name in ("stco", "co64")):
+                        chunk_offsets.offsets = [
+                            offset + deltas[bisect_right(old_offsets,
+                                                         offset) - 1]
+                            for offset in chunk_offsets.offsets]
+
+            #then stream the atoms into a new file alongside the old one
+            #which replaces it once complete
+            def write_contents(temp):
+                f = file(self.filename, "rb")
+                try:
+                    for (name, offset, size, header_size) in atoms:
+                        if (name == "moov"):
+                            writer = BitstreamWriter(temp, 0)
+                            writer.build("32u 4b", (new_moov_size, "moov"))
+                            moov.build(writer)
+                            writer.flush()
+                        else:
+                            f.seek(offset, 0)
+                            transfer_data(LimitedFileReader(f, size).read,
+                                          temp.write)
+                finally:
+                    f.close()
+
+                temp.flush()
+                if (os.fstat(temp.fileno()).st_size !=
+                    (sum([atom[2] for atom in atoms]) +
+                     new_moov_size - moov_size)):
+                    raise IOError("M4A atoms copied incompletely")
+
+            __replace_file__(self.filename, write_contents)
 
     def set_metadata(self, metadata):
         if (metadata is None):
@@ -527,11 +645,13 @@ class M4AAudio_faac(M4ATaggedAudio, AudioFile):
         return False
 
     @classmethod
-    def add_replay_gain(cls, filenames, progress=None):
+    def add_replay_gain(cls, filenames, progress=None, analyses=None):
         """Adds ReplayGain values to a list of filename strings.
 
         All the filenames must be of this AudioFile type.
         Raises ValueError if some problem occurs during ReplayGain application.
+
+        "analyses" is not used by this format.
         """
 
         track_names = [track.filename for track in
@@ -937,12 +1057,16 @@ class ALACAudio(M4ATaggedAudio, AudioFile):
         return True
 
     def to_pcm(self):
-        """Returns a PCMReader object containing the track's PCM data."""
+        """Returns a PCMReader object containing the track's PCM data.
+
+        The file is memory-mapped if audiotools.MMAP_DECODING is set."""
 
         import audiotools.decoders
 
         try:
-            return audiotools.decoders.ALACDecoder(self.filename)
+            return audiotools.decoders.ALACDecoder(
+                self.filename,
+                mmap=audiotools.MMAP_DECODING)
         except (IOError, ValueError), msg:
             return PCMReaderError(error_message=str(msg),
                                   sample_rate=self.sample_rate(),
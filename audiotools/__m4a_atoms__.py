@@ -17,6 +17,7 @@
 #along with this program; if not, write to the Free Software
 #Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
 
+import copy
 from audiotools import MetaData, Image, image_metrics
 
 #M4A atoms are typically laid on in the file as follows:
@@ -756,6 +757,34 @@ class M4A_STCO_Atom(M4A_Leaf_Atom):
         return 8 + (4 * len(self.offsets))
 
 
+class M4A_CO64_Atom(M4A_STCO_Atom):
+    def __init__(self, version, flags, offsets):
+        self.name = 'co64'
+        self.version = version
+        self.flags = flags
+        self.offsets = offsets
+
+    def __repr__(self):
+        return "M4A_CO64_Atom(%s, %s, %s)" % \
+            (self.version, self.flags, self.offsets)
+
+    @classmethod
+    def parse(cls, name, data_size, reader, parsers):
+        assert(name == "co64")
+        (version, flags, offset_count) = reader.parse("8u 24u 32u")
+        return cls(version, flags,
+                   [reader.read64(64) for i in xrange(offset_count)])
+
+    def build(self, writer):
+        writer.build("8u 24u 32u", (self.version, self.flags,
+                                    len(self.offsets)))
+        for offset in self.offsets:
+            writer.write64(64, offset)
+
+    def size(self):
+        return 8 + (8 * len(self.offsets))
+
+
 class M4A_ALAC_Atom(M4A_Leaf_Atom):
     def __init__(self, reference_index, qt_version, qt_revision_level,
                  qt_vendor, channels, bits_per_sample, qt_compression_id,
@@ -904,6 +933,10 @@ class M4A_META_Atom(MetaData, M4A_Tree_Atom):
         self.__dict__["version"] = version
         self.__dict__["flags"] = flags
 
+    def copy(self):
+        return M4A_META_Atom(self.version, self.flags,
+                             [leaf.copy() for leaf in self])
+
     def __repr__(self):
         return "M4A_META_Atom(%s, %s, %s)" % \
             (repr(self.version), repr(self.flags), repr(self.leaf_atoms))
@@ -1475,7 +1508,8 @@ class M4A_ILST_COVR_Data_Atom(Image, M4A_Leaf_Atom):
                        type=0)
 
     def copy(self):
-        return M4A_ILST_COVR_Data_Atom(self.version, self.flags, self.data)
+        #the image's metrics are already known, so don't parse it again
+        return copy.copy(self)
 
     def __repr__(self):
         return "M4A_ILST_COVR_Data_Atom(%s, %s, ...)" % \
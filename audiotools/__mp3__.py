@@ -23,8 +23,10 @@ from audiotools import (AudioFile, InvalidFile, PCMReader, PCMConverter,
                         subprocess, BIN, BIG_ENDIAN, ApeTag, ReplayGain,
                         ignore_sigint, open_files, EncodingError,
                         DecodingError, PCMReaderError, ChannelMask,
+                        LimitedFileReader, __replace_file__,
                         __default_quality__, config)
 from __id3__ import *
+import os
 import gettext
 
 gettext.install("audiotools", unicode=True)
@@ -35,6 +37,11 @@ gettext.install("audiotools", unicode=True)
 #######################
 
 
+#bytes reserved after a rewritten ID3v2 comment
+#so that later, larger comments can be written in place
+ID3V2_PADDING = 4096
+
+
 class InvalidMP3(InvalidFile):
     """Raised by invalid files during MP3 initialization."""
 
@@ -423,6 +430,9 @@ class MP3Audio(AudioFile):
 
         Raises IOError if unable to read the file."""
 
+        return self.__cached_metadata__(self.__read_metadata__)
+
+    def __read_metadata__(self):
         f = file(self.filename, "rb")
         try:
             if (f.read(3) != "ID3"):      # no ID3v2 tag, try ID3v1
@@ -460,31 +470,14 @@ class MP3Audio(AudioFile):
                    isinstance(metadata, ID3v1Comment))):
             raise _(u"metadata not from audio file")
 
-        #get the original MP3 data
-        f = file(self.filename, "rb")
-        MP3Audio.__find_mp3_start__(f)
-        data_start = f.tell()
-        MP3Audio.__find_last_mp3_frame__(f)
-        data_end = f.tell()
-        f.seek(data_start, 0)
-        mp3_data = f.read(data_end - data_start)
-        f.close()
-
-        from .bitstream import BitstreamWriter
+        self.__uncache_metadata__()
 
-        #write id3v2 + data + id3v1 to file
-        f = file(self.filename, "wb")
         if (isinstance(metadata, ID3CommentPair)):
-            metadata.id3v2.build(BitstreamWriter(f, 0))
-            f.write(mp3_data)
-            metadata.id3v1.build(f)
+            self.__write_tags__(metadata.id3v2, metadata.id3v1)
         elif (isinstance(metadata, ID3v2Comment)):
-            metadata.build(BitstreamWriter(f, 0))
-            f.write(mp3_data)
+            self.__write_tags__(metadata, None)
         elif (isinstance(metadata, ID3v1Comment)):
-            f.write(mp3_data)
-            metadata.build(f)
-        f.close()
+            self.__write_tags__(None, metadata)
 
     def set_metadata(self, metadata):
         """Takes a MetaData object and sets this track's metadata.
@@ -532,20 +525,80 @@ class MP3Audio(AudioFile):
         This removes or unsets tags as necessary in order to remove all data.
         Raises IOError if unable to write the file."""
 
-        #get the original MP3 data
+        self.__uncache_metadata__()
+
+        self.__write_tags__(None, None)
+
+    def __write_tags__(self, id3v2, id3v1):
+        """writes the given ID3v2 and ID3v1 comments, either of which
+        may be None, around the file's existing MPEG frames
+
+        if the new ID3v2 comment fits in the space before the first frame,
+        the file is updated in place
+        otherwise, it is rebuilt in a temporary file with ID3V2_PADDING
+        bytes reserved after the new comment, which then replaces it
+        in either case, the MPEG frames are never held in memory at once"""
+
+        from .bitstream import BitstreamWriter
+
         f = file(self.filename, "rb")
-        MP3Audio.__find_mp3_start__(f)
-        data_start = f.tell()
-        MP3Audio.__find_last_mp3_frame__(f)
-        data_end = f.tell()
-        f.seek(data_start, 0)
-        mp3_data = f.read(data_end - data_start)
-        f.close()
-
-        #write data to file
-        f = file(self.filename, "wb")
-        f.write(mp3_data)
-        f.close()
+        try:
+            MP3Audio.__find_mp3_start__(f)
+            data_start = f.tell()
+            MP3Audio.__find_last_mp3_frame__(f)
+            data_end = f.tell()
+        finally:
+            f.close()
+
+        #any padding left in place must be large enough
+        #to be read as an empty frame header
+        if (id3v2 is not None):
+            padding = data_start - id3v2.size()
+            in_place = (padding == 0) or (padding >= 10)
+        else:
+            padding = 0
+            in_place = (data_start == 0)
+
+        if (in_place):
+            f = file(self.filename, "r+b")
+            try:
+                if (id3v2 is not None):
+                    writer = BitstreamWriter(f, 0)
+                    id3v2.build(writer, padding)
+                    writer.flush()
+                f.seek(data_end, 0)
+                if (id3v1 is not None):
+                    id3v1.build(f)
+                f.truncate()
+            finally:
+                f.close()
+        else:
+            def write_contents(temp):
+                if (id3v2 is not None):
+                    writer = BitstreamWriter(temp, 0)
+                    id3v2.build(writer, ID3V2_PADDING)
+                    writer.flush()
+                f = file(self.filename, "rb")
+                try:
+                    f.seek(data_start, 0)
+                    transfer_data(
+                        LimitedFileReader(f, data_end - data_start).read,
+                        temp.write)
+                finally:
+                    f.close()
+                if (id3v1 is not None):
+                    id3v1.build(temp)
+
+                expected_size = data_end - data_start
+                if (id3v2 is not None):
+                    expected_size += id3v2.size() + ID3V2_PADDING
+                if (id3v1 is not None):
+                    expected_size += 128
+                temp.flush()
+                if (os.fstat(temp.fileno()).st_size != expected_size):
+                    raise IOError("MPEG frames copied incompletely")
+
+            __replace_file__(self.filename, write_contents)
 
     #places mp3file at the position of the next MP3 frame's start
     @classmethod
@@ -607,6 +660,7 @@ class MP3Audio(AudioFile):
             reader.unmark()
             reader.skip(8)
             reader.mark()
+            (frame_sync, mpeg_id, layer) = reader.parse("11u 2u 2u 1p")
         reader.rewind()
         reader.unmark()
 
@@ -668,11 +722,13 @@ class MP3Audio(AudioFile):
         return False
 
     @classmethod
-    def add_replay_gain(cls, filenames, progress=None):
+    def add_replay_gain(cls, filenames, progress=None, analyses=None):
         """Adds ReplayGain values to a list of filename strings.
 
         All the filenames must be of this AudioFile type.
         Raises ValueError if some problem occurs during ReplayGain application.
+
+        "analyses" is not used by this format.
         """
 
         track_names = [track.filename for track in
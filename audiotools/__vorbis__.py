@@ -473,11 +473,13 @@ class VorbisAudio(AudioFile):
         self.set_metadata(MetaData())
 
     @classmethod
-    def add_replay_gain(cls, filenames, progress=None):
+    def add_replay_gain(cls, filenames, progress=None, analyses=None):
         """Adds ReplayGain values to a list of filename strings.
 
         All the filenames must be of this AudioFile type.
         Raises ValueError if some problem occurs during ReplayGain application.
+
+        "analyses" is not used by this format.
         """
 
         track_names = [track.filename for track in
@@ -258,6 +258,13 @@ class WaveReader(PCMReader):
         except IOError:
             raise InvalidWave(_(u"data chunk not found"))
 
+        #note where the data chunk starts, if the stream is seekable
+        self.__data_chunk_size__ = self.data_chunk_length
+        try:
+            self.__data_chunk_offset__ = self.file.tell()
+        except IOError:
+            self.__data_chunk_offset__ = None
+
     def read(self, bytes):
         """Try to read a pcm.FrameList of size "bytes"."""
 
@@ -279,6 +286,28 @@ class WaveReader(PCMReader):
         except ValueError:
             raise IOError("data chunk ends prematurely")
 
+    def seek(self, pcm_frame):
+        """Tries to seek to the given PCM frame offset.
+
+        Returns the PCM frame actually seeked to.
+        Raises ValueError if pcm_frame is negative
+        or IOError if the stream is not seekable."""
+
+        if (pcm_frame < 0):
+            raise ValueError("PCM frame must be >= 0")
+        elif (self.__data_chunk_offset__ is None):
+            raise IOError("stream is not seekable")
+
+        bytes_per_frame = self.channels * self.bits_per_sample / 8
+        pcm_frame = min(pcm_frame,
+                        self.__data_chunk_size__ / bytes_per_frame)
+        self.file.seek(self.__data_chunk_offset__ +
+                       (pcm_frame * bytes_per_frame), 0)
+        self.data_chunk_length = (self.__data_chunk_size__ -
+                                  (pcm_frame * bytes_per_frame))
+        self.wave.remaining = self.data_chunk_length
+        return pcm_frame
+
     def close(self):
         """Closes the stream for reading.
 
@@ -654,11 +683,13 @@ class WaveAudio(WaveContainer):
         return False
 
     @classmethod
-    def add_replay_gain(cls, filenames, progress=None):
+    def add_replay_gain(cls, filenames, progress=None, analyses=None):
         """Adds ReplayGain values to a list of filename strings.
 
         All the filenames must be of this AudioFile type.
         Raises ValueError if some problem occurs during ReplayGain application.
+
+        "analyses" is not used by this format.
         """
 
         from audiotools.replaygain import ReplayGain, ReplayGainReader
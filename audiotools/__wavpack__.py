@@ -387,12 +387,179 @@ class WavPackAudio(ApeTaggedAudio, WaveContainer):
             cls.__unlink__(filename)
             raise err
 
+    @classmethod
+    def can_concatenate(cls):
+        """Returns True if files of this type can be joined by concatenate().
+
+        WavPack blocks are numbered by their starting PCM frame,
+        so they can be renumbered without being decoded."""
+
+        return True
+
+    @classmethod
+    def concatenate(cls, filename, audiofiles):
+        """Joins a list of WavPackAudio objects end to end.
+
+        Takes a filename string and list of WavPackAudio objects
+        which must all have the same stream parameters.
+        Writes a new file containing their PCM data in order
+        and returns it as a new WavPackAudio object.
+
+        Each file's blocks are copied with their block index
+        and total sample count updated for the new file,
+        and the first file's RIFF WAVE header is resized to fit.
+        Since the files' MD5 sums can't be combined,
+        the new file has no MD5 sum.
+
+        May raise ValueError if the files can't be joined
+        or EncodingError if a problem occurs writing the output file."""
+
+        from .bitstream import BitstreamReader
+        from .bitstream import BitstreamWriter
+
+        if (len(audiofiles) == 0):
+            raise ValueError(_(u"at least 1 file is required"))
+        for audiofile in audiofiles:
+            if (not isinstance(audiofile, cls)):
+                raise ValueError(_(u"all files must be WavPack files"))
+            elif ((audiofile.sample_rate() != audiofiles[0].sample_rate()) or
+                  (audiofile.channels() != audiofiles[0].channels()) or
+                  (int(audiofile.channel_mask()) !=
+                   int(audiofiles[0].channel_mask())) or
+                  (audiofile.bits_per_sample() !=
+                   audiofiles[0].bits_per_sample())):
+                raise ValueError(
+                    _(u"all files must have the same stream parameters"))
+            elif (audiofile.has_foreign_riff_chunks()):
+                raise ValueError(
+                    _(u"files with foreign RIFF chunks can't be joined"))
+
+        total_frames = sum([a.total_frames() for a in audiofiles])
+        data_size = (total_frames *
+                     audiofiles[0].channels() *
+                     (audiofiles[0].bits_per_sample() / 8))
+
+        try:
+            writer = BitstreamWriter(open(filename, "wb"), 1)
+        except IOError, msg:
+            raise EncodingError(str(msg))
+
+        try:
+            pcm_offset = 0
+            for (i, audiofile) in enumerate(audiofiles):
+                reader = BitstreamReader(open(audiofile.filename, "rb"), 1)
+                try:
+                    while (True):
+                        try:
+                            (block_id, block_size) = reader.parse("4b 32u")
+                        except IOError:
+                            break
+                        if (block_id != 'wvpk'):
+                            #an APEv2 tag, which isn't carried over
+                            break
+
+                        (version,
+                         track_number,
+                         index_number,
+                         block_index,
+                         block_samples,
+                         flags,
+                         crc) = reader.parse("16u 8u 8u 32p 32u 32u 32u 32u")
+
+                        if (block_samples == 0):
+                            #a footer block holding the file's MD5 sum
+                            #which no longer applies
+                            reader.skip_bytes(block_size - 24)
+                            continue
+                        elif ((block_index == 0) and (flags & 0x800)):
+                            #the initial block of the file,
+                            #whose RIFF WAVE header is only kept
+                            #for the first file
+                            sub_blocks = cls.__concatenated_sub_blocks__(
+                                reader, block_size - 24, i == 0, data_size)
+                        else:
+                            sub_blocks = reader.read_bytes(block_size - 24)
+
+                        writer.build("4b 32u 16u 8u 8u 32u 32u 32u 32u 32u",
+                                     ("wvpk",
+                                      len(sub_blocks) + 24,
+                                      version,
+                                      track_number,
+                                      index_number,
+                                      total_frames,
+                                      block_index + pcm_offset,
+                                      block_samples,
+                                      flags,
+                                      crc))
+                        writer.write_bytes(sub_blocks)
+                finally:
+                    reader.close()
+                pcm_offset += audiofile.total_frames()
+            writer.close()
+        except (IOError, ValueError), msg:
+            writer.close()
+            cls.__unlink__(filename)
+            raise EncodingError(str(msg))
+
+        return cls(filename)
+
+    @classmethod
+    def __concatenated_sub_blocks__(cls, reader, size, keep_header,
+                                    data_size):
+        """reads "size" bytes of sub-blocks from the given reader
+        and returns them as a string
+
+        if keep_header is True, any RIFF WAVE header is resized
+        to "data_size" bytes of PCM data, otherwise it's removed"""
+
+        from .bitstream import BitstreamRecorder
+
+        sub_blocks = BitstreamRecorder(1)
+
+        while (size > 0):
+            (function,
+             nondecoder,
+             actual_size_1_less,
+             large_block) = reader.parse("5u 1u 1u 1u")
+            block_size = reader.read(24 if large_block else 8)
+            data = reader.read_bytes(block_size * 2)
+            size -= (4 if large_block else 2) + block_size * 2
+
+            if (((function == 1) and nondecoder) or (function == 0)):
+                if (not keep_header):
+                    continue
+                elif (function == 1):
+                    #a RIFF WAVE header ends with its "data" chunk's header
+                    header_size = block_size * 2 - actual_size_1_less
+                    if (data[header_size - 8:header_size - 4] != "data"):
+                        raise ValueError(_(u"invalid RIFF WAVE header"))
+                    riff_size = header_size - 8 + data_size
+                    if (riff_size < 2 ** 32):
+                        resized = BitstreamRecorder(1)
+                        resized.build("4b 32u", ("RIFF", riff_size))
+                        resized.write_bytes(data[8:header_size - 4])
+                        resized.build("32u", (data_size,))
+                        data = resized.data() + data[header_size:]
+                    else:
+                        #too large for a RIFF WAVE header,
+                        #so leave a dummy in its place as the encoder does
+                        function = nondecoder = 0
+
+            sub_blocks.build("5u 1u 1u 1u",
+                             (function, nondecoder,
+                              actual_size_1_less, large_block))
+            sub_blocks.write(24 if large_block else 8, block_size)
+            sub_blocks.write_bytes(data)
+
+        return sub_blocks.data()
+
     def to_wave(self, wave_filename, progress=None):
         """Writes the contents of this file to the given .wav filename string.
 
         Raises EncodingError if some error occurs during decoding."""
 
         from . import decoders
+        from . import MMAP_DECODING
 
         try:
             f = open(wave_filename, 'wb')
@@ -405,7 +572,7 @@ class WavPackAudio(ApeTaggedAudio, WaveContainer):
             f.write(head)
             total_frames = self.total_frames()
             current_frames = 0
-            decoder = decoders.WavPackDecoder(self.filename)
+            decoder = decoders.WavPackDecoder(self.filename, MMAP_DECODING)
             frame = decoder.read(4096)
             while (len(frame) > 0):
                 f.write(frame.to_bytes(False, self.bits_per_sample() > 8))
@@ -420,12 +587,19 @@ class WavPackAudio(ApeTaggedAudio, WaveContainer):
             raise EncodingError(str(msg))
 
     def to_pcm(self):
-        """Returns a PCMReader object containing the track's PCM data."""
+        """Returns a PCMReader object containing the track's PCM data.
+
+        The file is memory-mapped if audiotools.MMAP_DECODING is set
+        and its MD5 sum is skipped if audiotools.FAST_DECODING is set."""
 
         from . import decoders
+        from . import MMAP_DECODING
+        from . import FAST_DECODING
 
         try:
-            return decoders.WavPackDecoder(self.filename)
+            return decoders.WavPackDecoder(self.filename,
+                                           MMAP_DECODING,
+                                           not FAST_DECODING)
         except (IOError, ValueError), msg:
             return PCMReaderError(error_message=str(msg),
                                   sample_rate=self.__samplerate__,
@@ -570,11 +744,15 @@ class WavPackAudio(ApeTaggedAudio, WaveContainer):
             raise InvalidWavPack(_(u'FMT chunk not found in WavPack'))
 
     @classmethod
-    def add_replay_gain(cls, filenames, progress=None):
+    def add_replay_gain(cls, filenames, progress=None, analyses=None):
         """Adds ReplayGain values to a list of filename strings.
 
         All the filenames must be of this AudioFile type.
         Raises ValueError if some problem occurs during ReplayGain application.
+
+        "analyses" is an optional dict of filename strings
+        to ReplayGainAnalysis.result() tuples
+        for files which needn't be decoded again.
         """
 
         tracks = [track for track in open_files(filenames) if
@@ -585,7 +763,8 @@ class WavPackAudio(ApeTaggedAudio, WaveContainer):
                  track_gain,
                  track_peak,
                  album_gain,
-                 album_peak) in calculate_replay_gain(tracks, progress):
+                 album_peak) in calculate_replay_gain(tracks, progress,
+                                                      analyses=analyses):
                 metadata = track.get_metadata()
                 if (metadata is None):
                     metadata = ApeTag([])
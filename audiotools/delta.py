@@ -18,16 +18,19 @@
 #Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
 
 import sys
+import os
 from itertools import izip
 import bz2
 import sqlite3
+import struct
 from hashlib import sha1
+from binascii import hexlify
 import base64
 import anydbm
 import subprocess
 import tempfile
 import whichdb
-from audiotools import BIN, transfer_data
+from audiotools import BIN, BUFFER_SIZE, transfer_data
 import cStringIO
 
 
@@ -37,6 +40,9 @@ class UndoDB:
     This stores an undo/redo patch for transforming a file
     back to its original value, or forward again to its modified form."""
 
+    #the granularity at which changed data is found and stored
+    BLOCK_SIZE = 4096
+
     def __init__(self, filename):
         """filename is the location on disk for this undo database."""
 
@@ -95,48 +101,330 @@ class UndoDB:
         return "".join([chr(ord(x) ^ ord(y)) for (x, y) in
                         izip(s, bz2.decompress(patch))])
 
-    def __add__(self, file_data1, file_data2):
-        #file_data1's target is file_data2 and
-        #file_data2's target is file_data1
+    @classmethod
+    def xor_blocks(cls, block1, block2):
+        """Given two strings of equal length, returns their XOR as a string.
+
+        The XOR is performed on the strings as a whole, as long integers,
+        rather than one character at a time."""
+
+        if (len(block1) == 0):
+            return ""
+        else:
+            return ("%x" % (long(hexlify(block1), 16) ^
+                            long(hexlify(block2), 16))).zfill(
+                len(block1) * 2).decode('hex')
+
+    def __add__(self, file1, file2):
+        #file1's target is file2 and
+        #file2's target is file1
+        #both are seekable file objects
+
+        (patch, checksum1, size1, checksum2, size2) = \
+            UndoDB.build_file_patch(file1, file2)
 
         self.cursor.execute(
             "INSERT INTO patch (patch_id, patch_data) VALUES (?, ?)",
-            [None,
-             base64.b64encode(
-                    UndoDB.build_patch(file_data1,
-                                       file_data2)).decode('ascii')])
+            [None, sqlite3.Binary(patch)])
         patch_id = self.cursor.lastrowid
         try:
             self.cursor.execute("""INSERT INTO source_file (
 source_checksum, source_size, target_size, patch_id) values (?, ?, ?, ?)""",
-                                [sha1(file_data1).hexdigest().decode('ascii'),
-                                 len(file_data1),
-                                 len(file_data2),
-                                 patch_id])
+                                [checksum1, size1, size2, patch_id])
             self.cursor.execute("""INSERT INTO source_file (
 source_checksum, source_size, target_size, patch_id) values (?, ?, ?, ?)""",
-                                [sha1(file_data2).hexdigest().decode('ascii'),
-                                 len(file_data2),
-                                 len(file_data1),
-                                 patch_id])
+                                [checksum2, size2, size1, patch_id])
             self.db.commit()
         except sqlite3.IntegrityError:
             self.db.rollback()
 
-    def __undo__(self, file_data):
+    @classmethod
+    def build_file_patch(cls, file1, file2):
+        """Given two seekable file objects, returns a transformation patch
+        along with each file's SHA1 checksum and size as a
+        (patch, checksum1, size1, checksum2, size2) tuple.
+
+        The files are read in chunks, so memory use depends
+        on the amount of changed data rather than on their size.
+        Any data they have in common at their start and their end
+        is left out of the patch, as is any data in between which
+        is unchanged at the same position, in BLOCK_SIZE blocks.
+        So a file with its metadata changed in place
+        or resized in front of its audio data
+        gets a patch no larger than its metadata.
+        The same patch transforms either file into the other."""
+
+        #runs of changed blocks are only worth collecting
+        #on the way through if the files are the same size
+        same_size = (cls.__file_size__(file1) == cls.__file_size__(file2))
+        (checksum1, size1, checksum2, size2,
+         prefix, runs) = cls.__compare_forward__(file1, file2, same_size)
+
+        if ((size1 != size2) or (not same_size)):
+            #any data after a size change will be at different offsets
+            #so find what the files have in common at their ends
+            #and compare what's left between
+            suffix = cls.__common_suffix__(file1, size1, file2, size2,
+                                           prefix)
+            runs = cls.__compare_middle__(file1, size1 - prefix - suffix,
+                                          file2, size2 - prefix - suffix,
+                                          prefix)
+        else:
+            suffix = 0
+
+        compressor = bz2.BZ2Compressor()
+        patch = [compressor.compress(struct.pack(">QQ", prefix, suffix))]
+        for (offset, length, data) in runs:
+            patch.append(compressor.compress(
+                    struct.pack(">QI", offset, length)))
+            for piece in data:
+                patch.append(compressor.compress(piece))
+        patch.append(compressor.flush())
+
+        return ("".join(patch),
+                checksum1.hexdigest().decode('ascii'), size1,
+                checksum2.hexdigest().decode('ascii'), size2)
+
+    @classmethod
+    def __file_size__(cls, file):
+        #returns the size of the given seekable file object
+        try:
+            return os.fstat(file.fileno()).st_size
+        except AttributeError:
+            file.seek(0, 2)
+            return file.tell()
+
+    @classmethod
+    def __blocks__(cls, file, offset, length):
+        #yields (offset, string) tuples of BLOCK_SIZE blocks
+        #from the given region of file, relative to the region's start
+        #until the region is exhausted, in chunks of BUFFER_SIZE
+        file.seek(offset, 0)
+        position = 0
+        while (position < length):
+            chunk = file.read(min(BUFFER_SIZE, length - position))
+            if (len(chunk) == 0):
+                raise IOError("unexpected end of file")
+            for i in xrange(0, len(chunk), cls.BLOCK_SIZE):
+                yield (position + i, chunk[i:i + cls.BLOCK_SIZE])
+            position += len(chunk)
+
+    @classmethod
+    def __compare_forward__(cls, file1, file2, collect_runs):
+        #returns (checksum1, size1, checksum2, size2, prefix, runs)
+        #where prefix is the length of the files' leading blocks in common
+        #and runs are the (offset, length, XOR data list) runs
+        #of changed blocks if collect_runs is True, or empty otherwise
+        #(which are only meaningful if the files are the same size)
+        checksum1 = sha1()
+        checksum2 = sha1()
+        size1 = size2 = 0
+        prefix = None
+        runs = []
+
+        file1.seek(0, 0)
+        file2.seek(0, 0)
+        chunk1 = file1.read(BUFFER_SIZE)
+        chunk2 = file2.read(BUFFER_SIZE)
+        while ((len(chunk1) > 0) or (len(chunk2) > 0)):
+            checksum1.update(chunk1)
+            checksum2.update(chunk2)
+            if (chunk1 != chunk2):
+                for i in xrange(0, max(len(chunk1), len(chunk2)),
+                                cls.BLOCK_SIZE):
+                    block1 = chunk1[i:i + cls.BLOCK_SIZE]
+                    block2 = chunk2[i:i + cls.BLOCK_SIZE]
+                    if (block1 != block2):
+                        if (prefix is None):
+                            prefix = size1 + i
+                        if (collect_runs and
+                            (len(block1) == len(block2))):
+                            cls.__add_run__(
+                                runs, size1 + i - prefix,
+                                cls.xor_blocks(block1, block2))
+            size1 += len(chunk1)
+            size2 += len(chunk2)
+            chunk1 = file1.read(BUFFER_SIZE)
+            chunk2 = file2.read(BUFFER_SIZE)
+
+        if (prefix is None):
+            prefix = size1
+
+        return (checksum1, size1, checksum2, size2, prefix, runs)
+
+    @classmethod
+    def __common_suffix__(cls, file1, size1, file2, size2, prefix):
+        #returns the length of the files' trailing blocks in common
+        #which don't overlap prefix in either file
+        suffix = 0
+        limit = min(size1, size2) - prefix
+        while (suffix < limit):
+            length = min(BUFFER_SIZE, limit - suffix)
+            file1.seek(size1 - suffix - length, 0)
+            file2.seek(size2 - suffix - length, 0)
+            chunk1 = file1.read(length)
+            chunk2 = file2.read(length)
+            if (chunk1 == chunk2):
+                suffix += length
+            else:
+                #walk back through the chunk's blocks from its end
+                for i in xrange(length, 0, -cls.BLOCK_SIZE):
+                    if (chunk1[max(i - cls.BLOCK_SIZE, 0):i] !=
+                        chunk2[max(i - cls.BLOCK_SIZE, 0):i]):
+                        return suffix + (length - i)
+                else:
+                    return suffix + length
+        return suffix
+
+    @classmethod
+    def __compare_middle__(cls, file1, length1, file2, length2, offset):
+        #returns the (offset, length, XOR data list) runs of changed blocks
+        #between two regions of file1 and file2 starting at offset
+        #where the shorter region is padded with NULL bytes
+        runs = []
+        blocks1 = cls.__blocks__(file1, offset, length1)
+        blocks2 = cls.__blocks__(file2, offset, length2)
+        for position in xrange(0, max(length1, length2), cls.BLOCK_SIZE):
+            block_size = min(cls.BLOCK_SIZE,
+                             max(length1, length2) - position)
+            if (position < length1):
+                block1 = blocks1.next()[1].ljust(block_size, chr(0))
+            else:
+                block1 = chr(0) * block_size
+            if (position < length2):
+                block2 = blocks2.next()[1].ljust(block_size, chr(0))
+            else:
+                block2 = chr(0) * block_size
+            if (block1 != block2):
+                cls.__add_run__(runs, position,
+                                cls.xor_blocks(block1, block2))
+        return runs
+
+    @classmethod
+    def __add_run__(cls, runs, offset, data):
+        #appends data to the last run if they're contiguous
+        #and as a new run otherwise
+        #where each run's data is a list of strings
+        #which are never joined together
+        if ((len(runs) > 0) and
+            ((runs[-1][0] + runs[-1][1]) == offset)):
+            runs[-1][1] += len(data)
+            runs[-1][2].append(data)
+        else:
+            runs.append([offset, len(data), [data]])
+
+    @classmethod
+    def apply_file_patch(cls, file, size, patch, new_size):
+        """Given a file object opened for reading and writing,
+        its size, a patch from build_file_patch() and the size
+        of the file the patch was built against,
+        transforms the file in place.
+
+        Only the changed blocks are rewritten
+        unless the file's size changes, in which case the data
+        it has in common with its new version at its end is moved.
+        The changed region is held in a temporary file while that happens,
+        so memory use doesn't depend on the file's size."""
+
+        decompressed = cStringIO.StringIO(bz2.decompress(patch))
+        (prefix, suffix) = struct.unpack(">QQ", decompressed.read(16))
+        length = size - prefix - suffix
+        new_length = new_size - prefix - suffix
+
+        #the XOR data of each changed block, by offset
+        changed_blocks = {}
+        header = decompressed.read(12)
+        while (len(header) == 12):
+            (offset, run_length) = struct.unpack(">QI", header)
+            data = decompressed.read(run_length)
+            for i in xrange(0, run_length, cls.BLOCK_SIZE):
+                changed_blocks[offset + i] = data[i:i + cls.BLOCK_SIZE]
+            header = decompressed.read(12)
+
+        def new_blocks():
+            #yields (offset, string) tuples of changed blocks
+            #in the file's new version
+            for offset in sorted(changed_blocks.keys()):
+                xor_data = changed_blocks[offset]
+                if (offset < length):
+                    file.seek(prefix + offset, 0)
+                    block = file.read(min(len(xor_data), length - offset))
+                else:
+                    block = ""
+                block = cls.xor_blocks(block.ljust(len(xor_data), chr(0)),
+                                       xor_data)
+                if (offset < new_length):
+                    yield (offset, block[0:new_length - offset])
+
+        if (length == new_length):
+            #only the changed blocks need rewriting
+            for (offset, block) in list(new_blocks()):
+                file.seek(prefix + offset, 0)
+                file.write(block)
+        else:
+            #build the new middle in a temporary file
+            middle = tempfile.TemporaryFile()
+            try:
+                for (offset, block) in cls.__blocks__(file, prefix,
+                                                      min(length,
+                                                          new_length)):
+                    middle.write(block)
+                middle.write(chr(0) * max(new_length - length, 0))
+                for (offset, block) in new_blocks():
+                    middle.seek(offset, 0)
+                    middle.write(block)
+
+                #move the common suffix to its new position
+                cls.__move__(file, prefix + length, prefix + new_length,
+                             suffix)
+
+                #and place the new middle in front of it
+                middle.seek(0, 0)
+                file.seek(prefix, 0)
+                transfer_data(middle.read, file.write)
+            finally:
+                middle.close()
+            file.truncate(new_size)
+
+    @classmethod
+    def __move__(cls, file, source, destination, length):
+        #moves length bytes of file data from source to destination
+        #in an order which doesn't overwrite data yet to be moved
+        if (destination > source):
+            position = length
+            while (position > 0):
+                chunk_size = min(BUFFER_SIZE, position)
+                position -= chunk_size
+                file.seek(source + position, 0)
+                chunk = file.read(chunk_size)
+                file.seek(destination + position, 0)
+                file.write(chunk)
+        elif (destination < source):
+            position = 0
+            while (position < length):
+                chunk_size = min(BUFFER_SIZE, length - position)
+                file.seek(source + position, 0)
+                chunk = file.read(chunk_size)
+                file.seek(destination + position, 0)
+                file.write(chunk)
+                position += chunk_size
+
+    def __find_patch__(self, file):
+        #returns a (size, target_size, patch_data) tuple
+        #for the file object's contents, or None if not found
+        checksum = sha1()
+        file.seek(0, 0)
+        transfer_data(file.read, checksum.update)
+        size = file.tell()
+
         self.cursor.execute("""SELECT target_size, patch_data FROM
 source_file, patch WHERE ((source_checksum = ?) AND
                           (source_size = ?) AND
                           (source_file.patch_id = patch.patch_id))""",
-                            [sha1(file_data).hexdigest().decode('ascii'),
-                             len(file_data)])
+                            [checksum.hexdigest().decode('ascii'), size])
         row = self.cursor.fetchone()
         if (row is not None):
-            (target_size, patch) = row
-            return UndoDB.apply_patch(
-                file_data,
-                base64.b64decode(patch.encode('ascii')),
-                target_size)
+            return (size, row[0], row[1])
         else:
             return None
 
@@ -148,7 +436,7 @@ source_file, patch WHERE ((source_checksum = ?) AND
         old_f = open(old_file, 'rb')
         new_f = open(new_file, 'rb')
         try:
-            self.__add__(old_f.read(), new_f.read())
+            self.__add__(old_f, new_f)
         finally:
             old_f.close()
             new_f.close()
@@ -161,17 +449,31 @@ source_file, patch WHERE ((source_checksum = ?) AND
 
         new_f = open(new_file, 'rb')
         try:
-            old_data = self.__undo__(new_f.read())
+            found = self.__find_patch__(new_f)
         finally:
             new_f.close()
-        if (old_data is not None):
-            old_f = open(new_file, 'wb')
-            old_f.write(old_data)
-            old_f.close()
-            return True
-        else:
+        if (found is None):
             return False
 
+        (size, target_size, patch) = found
+        new_f = open(new_file, 'r+b')
+        try:
+            if (isinstance(patch, unicode)):
+                #a patch from an older version of this database
+                #which XORs the entire file and is stored base64-encoded
+                data = UndoDB.apply_patch(
+                    new_f.read(),
+                    base64.b64decode(patch.encode('ascii')),
+                    target_size)
+                new_f.seek(0, 0)
+                new_f.write(data)
+                new_f.truncate(target_size)
+            else:
+                UndoDB.apply_file_patch(new_f, size, str(patch), target_size)
+        finally:
+            new_f.close()
+        return True
+
 
 class OldUndoDB:
     """A class for performing legacy undo operations on files.
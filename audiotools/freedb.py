@@ -58,15 +58,16 @@ def perform_lookup(offsets, total_length, track_count,
     iterates over a list of MetaData objects per successful match, like:
     [track1, track2, ...], [track1, track2, ...], ...
 
+    responses are kept in audiotools.METADATA_CACHE
+    so a disc looked up again recently doesn't query the server
+
     may raise urllib2.HTTPError if an error occurs querying the server
     or ValueError if the server returns invalid data
     """
 
     import re
-    from socket import getfqdn
-    from urllib2 import urlopen
     from urllib import urlencode
-    from itertools import izip
+    from cStringIO import StringIO
     from time import sleep
 
     RESPONSE = re.compile(r'(\d{3}) (.+?)[\r\n]+')
@@ -75,21 +76,40 @@ def perform_lookup(offsets, total_length, track_count,
 
     disc_id = DiscID(offsets, total_length, track_count)
 
-    #perform initial FreeDB query
-    #and get a list of category/disc id/title results
-    #if any matches are found
-    m = urlopen("http://%s:%d/~cddb/cddb.cgi" % (freedb_server, freedb_port),
+    #return the XMCD data of a recent lookup, if any
+    cache_key = ("freedb", freedb_server, freedb_port, str(disc_id))
+    try:
+        for freedb in audiotools.METADATA_CACHE[cache_key]:
+            yield list(xmcd_metadata(freedb))
+        return
+    except KeyError:
+        pass
+
+    def cddb(command):
+        #the query and reads all share one keep-alive connection
+        return StringIO(audiotools.HTTP_CONNECTIONS.request(
+                freedb_server,
+                freedb_port,
+                "POST",
+                "/~cddb/cddb.cgi",
                 urlencode({"hello": "user %s %s %s" % \
-                               (getfqdn(),
+                               (fqdn(),
                                 "audiotools",
                                 audiotools.VERSION),
                            "proto": str(6),
-                           "cmd": ("cddb query %(disc_id)s %(track_count)d " +
-                                   "%(offsets)s %(seconds)d") %
-                           {"disc_id": disc_id,
-                            "track_count": track_count,
-                            "offsets": " ".join(map(str, offsets)),
-                            "seconds": total_length / 75}}))
+                           "cmd": command}),
+                {"Content-type": "application/x-www-form-urlencoded",
+                 "Accept": "text/plain"}))
+
+    #perform initial FreeDB query
+    #and get a list of category/disc id/title results
+    #if any matches are found
+    m = cddb(("cddb query %(disc_id)s %(track_count)d " +
+              "%(offsets)s %(seconds)d") %
+             {"disc_id": disc_id,
+              "track_count": track_count,
+              "offsets": " ".join(map(str, offsets)),
+              "seconds": total_length / 75})
 
     response = RESPONSE.match(m.readline())
     if (response is None):
@@ -126,40 +146,50 @@ def perform_lookup(offsets, total_length, track_count,
             #some error has occurred
             raise ValueError(response.group(2))
 
-    m.close()
-
-    if (len(matches) > 0):
-        #for each result, query FreeDB for XMCD file data
-        for (category, disc_id, title) in matches:
+    #for each result, query FreeDB for XMCD file data
+    xmcd_files = []
+    for (i, (category, match_id, title)) in enumerate(matches):
+        if (i > 0):
             sleep(1)  # add a slight delay to keep the server happy
-            m = urlopen("http://%s:%d/~cddb/cddb.cgi" % (freedb_server,
-                                                         freedb_port),
-                        urlencode({"hello": "user %s %s %s" % \
-                                       (getfqdn(),
-                                        "audiotools",
-                                        audiotools.VERSION),
-                                   "proto": str(6),
-                                   "cmd": ("cddb read %(category)s " +
-                                           "%(disc_id)s") %
-                                   {"category": category,
-                                    "disc_id": disc_id}}))
-            response = RESPONSE.match(m.readline())
-            if (response is None):
-                raise ValueError("invalid response from server")
-            else:
-                #FIXME - check response code here
-                freedb = {}
+        m = cddb("cddb read %(category)s %(disc_id)s" %
+                 {"category": category,
+                  "disc_id": match_id})
+        response = RESPONSE.match(m.readline())
+        if (response is None):
+            raise ValueError("invalid response from server")
+        else:
+            #FIXME - check response code here
+            freedb = {}
+            line = m.readline()
+            while (not line.startswith(".")):
+                if (not line.startswith("#")):
+                    entry = FREEDB_LINE.match(line)
+                    if (entry is not None):
+                        if (entry.group(1) in freedb):
+                            freedb[entry.group(1)] += entry.group(2)
+                        else:
+                            freedb[entry.group(1)] = entry.group(2)
                 line = m.readline()
-                while (not line.startswith(".")):
-                    if (not line.startswith("#")):
-                        entry = FREEDB_LINE.match(line)
-                        if (entry is not None):
-                            if (entry.group(1) in freedb):
-                                freedb[entry.group(1)] += entry.group(2)
-                            else:
-                                freedb[entry.group(1)] = entry.group(2)
-                    line = m.readline()
-                yield list(xmcd_metadata(freedb))
+            xmcd_files.append(freedb)
+
+    audiotools.METADATA_CACHE[cache_key] = xmcd_files
+
+    for freedb in xmcd_files:
+        yield list(xmcd_metadata(freedb))
+
+
+__FQDN__ = []
+
+
+def fqdn():
+    """returns this host's fully-qualified domain name,
+    which is only resolved once per session"""
+
+    if (len(__FQDN__) == 0):
+        from socket import getfqdn
+
+        __FQDN__.append(getfqdn())
+    return __FQDN__[0]
 
 
 def xmcd_metadata(freedb_file):
@@ -0,0 +1,212 @@
+#!/usr/bin/python
+
+#Audio Tools, a module and set of tools for manipulating audio data
+#Copyright (C) 2007-2012  Brian Langenberger
+
+#This program is free software; you can redistribute it and/or modify
+#it under the terms of the GNU General Public License as published by
+#the Free Software Foundation; either version 2 of the License, or
+#(at your option) any later version.
+
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU General Public License for more details.
+
+#You should have received a copy of the GNU General Public License
+#along with this program; if not, write to the Free Software
+#Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+
+import os.path
+import sqlite3
+import cPickle
+import time
+from types import InstanceType
+import audiotools
+
+#files modified less than this many seconds ago aren't indexed
+RACY_SECONDS = 2
+
+
+class LibraryIndex:
+    """A persistent index of audio files' stream parameters and metadata.
+
+    Files are only opened and parsed again
+    when their inode, size, modification time or change time differ
+    from when they were last indexed."""
+
+    def __init__(self, filename):
+        """filename is the location on disk for this index database."""
+
+        self.db = sqlite3.connect(filename)
+        self.cursor = self.db.cursor()
+
+        #an index created before entries were stamped with a version
+        #holds nothing which can be safely restored, so start over
+        self.cursor.execute("PRAGMA table_info(track)")
+        columns = [row[1] for row in self.cursor.fetchall()]
+        if ((len(columns) > 0) and ("version" not in columns)):
+            self.cursor.execute("DROP TABLE track")
+
+        #path is the file's absolute path as a plain string
+        #attributes is the pickled AudioFile's stream parameters
+        #metadata is its pickled MetaData, or NULL if not cached
+        #verified is 1 if the file passed verification when indexed
+        #version is the audiotools.VERSION which indexed the file
+        self.cursor.execute("""CREATE TABLE IF NOT EXISTS track (
+  path BLOB PRIMARY KEY,
+  version TEXT NOT NULL,
+  inode INTEGER NOT NULL,
+  size INTEGER NOT NULL,
+  mtime REAL NOT NULL,
+  ctime REAL NOT NULL,
+  type TEXT NOT NULL,
+  attributes BLOB NOT NULL,
+  metadata BLOB,
+  verified INTEGER NOT NULL DEFAULT 0
+)""")
+
+    def commit(self):
+        """Writes any newly indexed files to disk."""
+
+        self.db.commit()
+
+    def close(self):
+        """Commits any changes and closes any open database handles."""
+
+        self.db.commit()
+        self.cursor.close()
+        self.db.close()
+
+    def open(self, filename):
+        """Returns an AudioFile located at the given filename path.
+
+        If the file is unchanged since it was indexed
+        by this version of audiotools,
+        the AudioFile and its cached MetaData are restored from the index
+        without opening the file.
+        Otherwise, the file is opened with audiotools.open()
+        and added to the index.
+        Raises the same exceptions as audiotools.open()."""
+
+        stat = self.__stat__(filename)
+        path = sqlite3.Binary(os.path.abspath(filename))
+
+        #entries indexed by another version of audiotools are reindexed
+        #since their restored attributes may not match what it expects
+        self.cursor.execute("""SELECT inode, size, mtime, ctime,
+type, attributes, metadata FROM track WHERE path = ? AND version = ?""",
+                            (path, audiotools.VERSION))
+        row = self.cursor.fetchone()
+        if ((row is not None) and
+            (tuple(row[0:4]) == stat) and
+            (row[4] in audiotools.TYPE_MAP)):
+            try:
+                return self.__restore__(filename, stat,
+                                        audiotools.TYPE_MAP[row[4]],
+                                        row[5], row[6])
+            except (cPickle.UnpicklingError, EOFError, AttributeError,
+                    ImportError, TypeError, ValueError):
+                #the entry can't be restored, so reindex it
+                pass
+
+        track = audiotools.open(filename)
+        self.__store__(path, stat, track)
+        return track
+
+    def verified(self, filename):
+        """Returns True if the file at the given filename path
+        has passed verification and is unchanged since."""
+
+        try:
+            stat = self.__stat__(filename)
+        except IOError:
+            return False
+
+        self.cursor.execute("""SELECT inode, size, mtime, ctime
+FROM track WHERE path = ? AND version = ? AND verified = 1""",
+                            (sqlite3.Binary(os.path.abspath(filename)),
+                             audiotools.VERSION))
+        row = self.cursor.fetchone()
+        return (row is not None) and (tuple(row) == stat)
+
+    def set_verified(self, filename, stat=None):
+        """Records that the file at the given filename path
+        has passed verification in its present state.
+
+        stat is the file's audiotools.__file_stat__() value
+        taken before it was verified, if any,
+        and the file is only marked if it's unchanged since then.
+
+        The file is indexed if necessary."""
+
+        current = self.__stat__(filename)
+        if (stat is None):
+            stat = current
+        elif (tuple(stat) != current):
+            #the file was modified while being verified
+            return
+        path = sqlite3.Binary(os.path.abspath(filename))
+
+        for i in xrange(2):
+            self.cursor.execute("""UPDATE track SET verified = 1
+WHERE path = ? AND version = ? AND
+inode = ? AND size = ? AND mtime = ? AND ctime = ?""",
+                                (path, audiotools.VERSION) + current)
+            if (self.cursor.rowcount > 0):
+                return
+            else:
+                self.open(filename)
+
+    @classmethod
+    def __stat__(cls, filename):
+        try:
+            return audiotools.__file_stat__(filename)
+        except OSError, err:
+            raise IOError(str(err))
+
+    def __restore__(self, filename, stat, audioclass, attributes, metadata):
+        attributes = cPickle.loads(str(attributes))
+        attributes["filename"] = filename
+        track = InstanceType(audioclass, attributes)
+        if (metadata is not None):
+            track.__metadata_cache__ = (stat, cPickle.loads(str(metadata)))
+        return track
+
+    def __store__(self, path, stat, track):
+        #a file modified within the resolution of its timestamps
+        #could be modified again without its stat data changing,
+        #so leave it to be indexed on some later run
+        if (stat[2] > (time.time() - RACY_SECONDS)):
+            return
+
+        #formats which cache their metadata keep it after this call
+        try:
+            track.get_metadata()
+        except (IOError, ValueError):
+            #leave metadata errors for the caller to encounter
+            pass
+
+        attributes = dict([(key, value) for (key, value) in
+                           track.__dict__.items()
+                           if (key != "__metadata_cache__")])
+        cache = getattr(track, "__metadata_cache__", None)
+
+        try:
+            attributes = cPickle.dumps(attributes, cPickle.HIGHEST_PROTOCOL)
+            if ((cache is not None) and (cache[0] == stat)):
+                metadata = sqlite3.Binary(
+                    cPickle.dumps(cache[1], cPickle.HIGHEST_PROTOCOL))
+            else:
+                metadata = None
+        except (cPickle.PicklingError, TypeError):
+            #some attribute can't be stored, so don't index the file
+            return
+
+        self.cursor.execute("""INSERT OR REPLACE INTO track
+(path, version, inode, size, mtime, ctime, type, attributes, metadata)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                            (path, audiotools.VERSION) + stat +
+                            (track.NAME,
+                             sqlite3.Binary(attributes),
+                             metadata))
@@ -71,14 +71,15 @@ def perform_lookup(first_track_number, last_track_number,
     iterates over a list of MetaData objects per successful match, like:
     [track1, track2, ...], [track1, track2, ...], ...
 
+    responses are kept in audiotools.METADATA_CACHE
+    so a disc looked up again recently doesn't query the server
+
     may raise urllib2.HTTPError if an error occurs querying the server
     or xml.parsers.expat.ExpatError if there's an error parsing the data
     """
 
-    from urllib2 import urlopen
     from urllib import urlencode
     import xml.dom.minidom
-    from itertools import izip
 
     #build DiscID from input parameters
     disc_id = DiscID(first_track_number,
@@ -87,13 +88,24 @@ def perform_lookup(first_track_number, last_track_number,
                      offsets)
 
     #query MusicBrainz web service (version 2) for <metadata>
-    m = urlopen("http://%s:%d/ws/2/discid/%s?%s" %
-                (musicbrainz_server,
-                 musicbrainz_port,
-                 disc_id,
-                 urlencode({"inc": "artists labels recordings"})))
-
-    xml = xml.dom.minidom.parse(m)
+    #unless it's been queried for this disc recently
+    cache_key = ("musicbrainz", musicbrainz_server, musicbrainz_port,
+                 str(disc_id))
+    try:
+        data = audiotools.METADATA_CACHE[cache_key]
+    except KeyError:
+        data = audiotools.HTTP_CONNECTIONS.request(
+            musicbrainz_server,
+            musicbrainz_port,
+            "GET",
+            "/ws/2/discid/%s?%s" %
+            (disc_id,
+             urlencode({"inc": "artists labels recordings"})),
+            headers={"User-Agent": "audiotools/%s" % (audiotools.VERSION)})
+        xml = xml.dom.minidom.parseString(data)
+        audiotools.METADATA_CACHE[cache_key] = data
+    else:
+        xml = xml.dom.minidom.parseString(data)
 
     #for each <release>s in <release-list>
     #yield a list of MetaData objects
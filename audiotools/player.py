@@ -613,11 +613,16 @@ class OSSAudioOutput(AudioOutput):
         elif (self.bits_per_sample == 16):
             return lambda f: f.to_bytes(False, True)
         elif (self.bits_per_sample == 24):
-            import audiotools.pcm
-
-            return lambda f: audiotools.pcm.from_list(
-                [i >> 8 for i in list(f)],
-                self.channels, 16, True).to_bytes(False, True)
+            def convert_24_to_16(f):
+                #the upper 2 bytes of each little-endian 24-bit sample
+                #are that sample's 16-bit equivalent
+                data = bytearray(f.to_bytes(False, True))
+                converted = bytearray(len(data) * 2 / 3)
+                converted[0::2] = data[1::3]
+                converted[1::2] = data[2::3]
+                return str(converted)
+
+            return convert_24_to_16
         else:
             raise ValueError("Unsupported bits-per-sample")
 
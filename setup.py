@@ -54,6 +54,10 @@ pcmmodule = Extension('audiotools.pcm',
 replaygainmodule = Extension('audiotools.replaygain',
                              sources=['src/replaygain.c'])
 
+pcmconvertermodule = Extension('audiotools.pcmconverter',
+                               sources=['src/pcmconverter.c'],
+                               libraries=['m'])
+
 decoders_defines = [("VERSION", VERSION)]
 decoders_sources = ['src/array.c',
                     'src/pcmconv.c',
@@ -86,7 +90,8 @@ if (sys.platform == 'linux2'):
 
 decodersmodule = Extension('audiotools.decoders',
                            sources=decoders_sources,
-                           define_macros=decoders_defines)
+                           define_macros=decoders_defines,
+                           libraries=['pthread'])
 
 encodersmodule = Extension('audiotools.encoders',
                            sources=['src/array.c',
@@ -99,7 +104,8 @@ encodersmodule = Extension('audiotools.encoders',
                                     'src/encoders/alac.c',
                                     'src/encoders/wavpack.c',
                                     'src/encoders.c'],
-                           define_macros=[("VERSION", VERSION)])
+                           define_macros=[("VERSION", VERSION)],
+                           libraries=['pthread'])
 
 bitstreammodule = Extension('audiotools.bitstream',
                             sources=['src/mod_bitstream.c',
@@ -123,6 +129,7 @@ setup(name='Python Audio Tools',
                    resamplemodule,
                    pcmmodule,
                    replaygainmodule,
+                   pcmconvertermodule,
                    decodersmodule,
                    encodersmodule,
                    bitstreammodule,
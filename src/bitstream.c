@@ -1,6 +1,9 @@
 #include "bitstream.h"
 #include <string.h>
 #include <stdarg.h>
+#include <sys/types.h>
+#include <sys/stat.h>
+#include <sys/mman.h>
 
 /********************************************************
  Audio Tools, a module and set of tools for manipulating audio data
@@ -67,6 +70,7 @@ br_open(FILE *f, bs_endianness endianness)
     bs->callbacks_used = NULL;
     bs->exceptions_used = NULL;
     bs->marks_used = NULL;
+    bs->mapping = NULL;
 
     switch (endianness) {
     case BS_BIG_ENDIAN:
@@ -124,6 +128,7 @@ br_substream_new(bs_endianness endianness)
     bs->callbacks_used = NULL;
     bs->exceptions_used = NULL;
     bs->marks_used = NULL;
+    bs->mapping = NULL;
 
     switch (endianness) {
     case BS_BIG_ENDIAN:
@@ -181,6 +186,7 @@ br_open_buffer(struct bs_buffer* buffer, bs_endianness endianness)
     bs->callbacks_used = NULL;
     bs->exceptions_used = NULL;
     bs->marks_used = NULL;
+    bs->mapping = NULL;
 
     switch (endianness) {
     case BS_BIG_ENDIAN:
@@ -243,6 +249,7 @@ br_open_external(void* user_data,
     bs->callbacks_used = NULL;
     bs->exceptions_used = NULL;
     bs->marks_used = NULL;
+    bs->mapping = NULL;
 
     switch (endianness) {
     case BS_BIG_ENDIAN:
@@ -287,6 +294,69 @@ br_open_external(void* user_data,
     return bs;
 }
 
+/*returns a BR_MMAP stream viewing "size" bytes of "mapping"
+  from "start" onward, positioned at "position" within that view*/
+static BitstreamReader*
+br_open_mapping(struct br_mmap* mapping,
+                size_t start,
+                uint32_t size,
+                uint32_t position,
+                bs_endianness endianness)
+{
+    struct bs_buffer* view = malloc(sizeof(struct bs_buffer));
+    BitstreamReader *bs;
+
+    view->buffer = mapping->data + start;
+    view->buffer_size = size;
+    view->buffer_total_size = size;
+    view->buffer_position = position;
+    view->mark_in_progress = 0;
+
+    bs = br_open_buffer(view, endianness);
+    bs->type = BR_MMAP;
+    bs->mapping = mapping;
+    bs->close_substream = br_close_substream_m;
+    bs->free = br_free_m;
+    mapping->references++;
+
+    return bs;
+}
+
+BitstreamReader*
+br_open_mmap(FILE *f, bs_endianness endianness)
+{
+    struct stat st;
+    long position;
+    void* data;
+    struct br_mmap* mapping;
+
+    if (fstat(fileno(f), &st) ||
+        (!S_ISREG(st.st_mode)) ||
+        (st.st_size <= 0) ||
+        ((uint64_t)st.st_size > UINT32_MAX))
+        return NULL;
+
+    if (((position = ftell(f)) < 0) || (position > st.st_size))
+        return NULL;
+
+    data = mmap(NULL, (size_t)st.st_size, PROT_READ, MAP_PRIVATE,
+                fileno(f), 0);
+    if (data == MAP_FAILED)
+        return NULL;
+
+    mapping = malloc(sizeof(struct br_mmap));
+    mapping->data = data;
+    mapping->size = (size_t)st.st_size;
+    mapping->file = f;
+    mapping->references = 0;
+
+    return br_open_mapping(mapping,
+                           0,
+                           (uint32_t)st.st_size,
+                           (uint32_t)position,
+                           endianness);
+}
+
 /*the number of bytes remaining to be read
   b is evaluated twice*/
 #define BUF_REMAINING_BYTES(b) ((b)->buffer_size - (b)->buffer_position)
@@ -1356,6 +1426,20 @@ br_close_substream_e(BitstreamReader* bs)
 }
 
 
+void
+br_close_substream_m(BitstreamReader* bs)
+{
+    /*perform fclose on the mapped FILE object, if not already closed,
+      though the mapping itself stays valid for any remaining views*/
+    if (bs->mapping->file != NULL) {
+        fclose(bs->mapping->file);
+        bs->mapping->file = NULL;
+    }
+
+    /*swap read methods with closed methods*/
+    br_close_methods(bs);
+}
+
 void
 br_close_substream_c(BitstreamReader* bs)
 {
@@ -1439,6 +1523,24 @@ br_free_e(BitstreamReader* bs)
     br_free_f(bs);
 }
 
+void
+br_free_m(BitstreamReader* bs)
+{
+    struct br_mmap* mapping = bs->mapping;
+
+    /*deallocate view, but not the mapped data it points to*/
+    free(bs->input.substream);
+
+    /*unmap data once no streams are viewing it*/
+    if (--mapping->references == 0) {
+        munmap(mapping->data, mapping->size);
+        free(mapping);
+    }
+
+    /*perform additional deallocations on rest of struct*/
+    br_free_f(bs);
+}
+
 
 void
 br_close(BitstreamReader* bs)
@@ -1819,6 +1921,108 @@ br_etry(BitstreamReader *bs)
     }
 }
 
+BitstreamReader*
+br_mmap_substream(BitstreamReader *stream, uint32_t bytes,
+                  bs_endianness endianness)
+{
+    struct bs_buffer* input = stream->input.substream;
+    BitstreamReader* substream;
+    struct bs_callback *callback;
+    uint32_t i;
+
+    assert(stream->type == BR_MMAP);
+
+    /*byte align the input stream*/
+    stream->state = 0;
+
+    /*abort if there's insufficient bytes remaining
+      in the input stream to pass to the output stream*/
+    if (BUF_REMAINING_BYTES(input) < bytes)
+        br_abort(stream);
+
+    /*view the requested bytes where they are in the mapping*/
+    substream = br_open_mapping(stream->mapping,
+                                (input->buffer - stream->mapping->data) +
+                                input->buffer_position,
+                                bytes,
+                                0,
+                                endianness);
+
+    /*only the parent stream closes the mapped file*/
+    substream->close_substream = br_close_substream_s;
+
+    /*perform callbacks on the viewed bytes*/
+    for (callback = stream->callbacks;
+         callback != NULL;
+         callback = callback->next) {
+        for (i = 0; i < bytes; i++)
+            callback->callback(input->buffer[input->buffer_position + i],
+                               callback->data);
+    }
+
+    /*advance the input buffer past the requested bytes*/
+    input->buffer_position += bytes;
+
+    return substream;
+}
+
+int
+br_fseek(BitstreamReader *bs, long offset, int whence)
+{
+    struct bs_buffer* buffer;
+    long position;
+
+    assert((bs->type == BR_FILE) || (bs->type == BR_MMAP));
+
+    bs->state = 0;
+
+    if (bs->type == BR_FILE)
+        return fseek(bs->input.file, offset, whence);
+
+    buffer = bs->input.substream;
+    switch (whence) {
+    case SEEK_SET:
+        position = offset;
+        break;
+    case SEEK_CUR:
+        position = (long)buffer->buffer_position + offset;
+        break;
+    case SEEK_END:
+        position = (long)buffer->buffer_size + offset;
+        break;
+    default:
+        return -1;
+    }
+
+    if (position < 0)
+        return -1;
+    else if (position > (long)buffer->buffer_size)
+        buffer->buffer_position = buffer->buffer_size;
+    else
+        buffer->buffer_position = (uint32_t)position;
+
+    return 0;
+}
+
+size_t
+br_fread(BitstreamReader *bs, uint8_t *bytes, size_t byte_count)
+{
+    struct bs_buffer* buffer;
+
+    assert((bs->type == BR_FILE) || (bs->type == BR_MMAP));
+
+    if (bs->type == BR_FILE)
+        return fread(bytes, sizeof(uint8_t), byte_count, bs->input.file);
+
+    buffer = bs->input.substream;
+    if (byte_count > BUF_REMAINING_BYTES(buffer))
+        byte_count = BUF_REMAINING_BYTES(buffer);
+    memcpy(bytes, buffer->buffer + buffer->buffer_position, byte_count);
+    buffer->buffer_position += (uint32_t)byte_count;
+
+    return byte_count;
+}
+
 void
 br_substream_reset(struct BitstreamReader_s *substream)
 {
@@ -37,7 +37,7 @@
 
 
 typedef enum {BS_BIG_ENDIAN, BS_LITTLE_ENDIAN} bs_endianness;
-typedef enum {BR_FILE, BR_SUBSTREAM, BR_EXTERNAL} br_type;
+typedef enum {BR_FILE, BR_SUBSTREAM, BR_EXTERNAL, BR_MMAP} br_type;
 typedef enum {BW_FILE, BW_EXTERNAL, BW_RECORDER, BW_ACCUMULATOR} bw_type;
 typedef enum {BS_INST_UNSIGNED, BS_INST_SIGNED, BS_INST_UNSIGNED64,
               BS_INST_SIGNED64, BS_INST_SKIP, BS_INST_SKIP_BYTES,
@@ -109,6 +109,19 @@ struct br_external_input {
     struct bs_buffer* buffer;
 };
 
+/*a read-only memory mapping of a file's contents
+  shared by a BR_MMAP stream and any substreams viewing it
+
+  "file" is the file it was mapped from, closed along with the stream,
+  while the mapping itself is only released
+  once "references" drops to 0*/
+struct br_mmap {
+    uint8_t* data;
+    size_t size;
+    FILE* file;
+    unsigned references;
+};
+
 /*******************************************************************
  *                          BitstreamReader                        *
  *******************************************************************/
@@ -117,12 +130,18 @@ struct br_external_input {
 typedef struct BitstreamReader_s {
     br_type type;
 
+    /*BR_MMAP streams use "substream" as a window
+      onto their mapped data, which is never copied or extended,
+      so that they can share the substream read methods*/
     union {
         FILE* file;
         struct bs_buffer* substream;
         struct br_external_input* external;
     } input;
 
+    /*the mapping a BR_MMAP stream reads from, or NULL*/
+    struct br_mmap* mapping;
+
     int state;
     struct bs_callback* callbacks;
     struct bs_exception* exceptions;
@@ -310,6 +329,8 @@ typedef struct BitstreamReader_s {
 
    where "x" is "f" for raw file, "s" for substream or "p" for Python input
    and "yy" is "be" for big endian or "le" for little endian.
+   Memory-mapped files use the substream variants,
+   along with their own "m" close and free methods.
    For example:
 
    | Function          | Input     | Endianness    |
@@ -365,6 +386,32 @@ br_open_external(void* user_data,
 BitstreamReader*
 br_open_buffer(struct bs_buffer* buffer, bs_endianness endianness);
 
+/*maps the whole of "f" into memory and returns a BR_MMAP stream
+  positioned at f's current offset
+  whose reads walk the mapped data directly
+  rather than calling fgetc for each byte
+
+  f is closed when the stream is, as with br_open
+
+  returns NULL if f can't be mapped,
+  such as if it's a pipe, is empty or is 4GB or larger,
+  in which case f is left as-is and may be passed to br_open instead*/
+BitstreamReader*
+br_open_mmap(FILE *f, bs_endianness endianness);
+
+/*returns a new BR_MMAP stream of the next "bytes" bytes of "stream",
+  which must also be BR_MMAP, advancing "stream" past them
+  as substream_append would
+
+  rather than copying those bytes, the new stream is a view
+  of the same mapping, which remains valid even after "stream"
+  is closed and freed
+
+  calls br_abort if insufficient bytes remain*/
+BitstreamReader*
+br_mmap_substream(BitstreamReader *stream, uint32_t bytes,
+                  bs_endianness endianness);
+
 
 /*bs->read(bs, count)  methods*/
 unsigned int
@@ -565,6 +612,8 @@ br_close_substream_s(BitstreamReader* bs);
 void
 br_close_substream_e(BitstreamReader* bs);
 void
+br_close_substream_m(BitstreamReader* bs);
+void
 br_close_substream_c(BitstreamReader* bs);
 
 
@@ -575,6 +624,8 @@ void
 br_free_s(BitstreamReader* bs);
 void
 br_free_e(BitstreamReader* bs);
+void
+br_free_m(BitstreamReader* bs);
 
 
 /*bs->close(bs)  method*/
@@ -697,10 +748,49 @@ br_try(BitstreamReader *bs);
 void
 br_etry(BitstreamReader *bs);
 
+/*returns the byte offset of a BR_FILE or BR_MMAP stream*/
 static inline long
 br_ftell(BitstreamReader *bs) {
-    assert(bs->type == BR_FILE);
-    return ftell(bs->input.file);
+    assert((bs->type == BR_FILE) || (bs->type == BR_MMAP));
+    if (bs->type == BR_FILE)
+        return ftell(bs->input.file);
+    else
+        return (long)bs->input.substream->buffer_position;
+}
+
+/*repositions a BR_FILE or BR_MMAP stream as fseek(3) does
+  and byte-aligns it
+
+  BR_MMAP streams positioned beyond their end are placed at it
+
+  returns 0 on success, -1 on failure*/
+int
+br_fseek(BitstreamReader *bs, long offset, int whence);
+
+/*reads up to "byte_count" bytes from a byte-aligned
+  BR_FILE or BR_MMAP stream to "bytes" as fread(3) does,
+  without performing callbacks
+
+  returns the number of bytes actually read*/
+size_t
+br_fread(BitstreamReader *bs, uint8_t *bytes, size_t byte_count);
+
+/*returns the address of the next byte to be read from a stream
+  whose input is held in memory (a substream or memory-mapped file)
+  or NULL for other streams
+
+  the bytes consumed between two calls may then be checksummed in bulk
+  rather than by a callback for each byte,
+  provided the stream is byte-aligned at the first call
+  and nothing is appended to it in between*/
+static inline const uint8_t*
+br_buffer_pointer(const BitstreamReader *bs)
+{
+    if ((bs->type == BR_SUBSTREAM) || (bs->type == BR_MMAP))
+        return (bs->input.substream->buffer +
+                bs->input.substream->buffer_position);
+    else
+        return NULL;
 }
 
 /*clears out the substream for possible reuse
@@ -8,3 +8,16 @@ flac_crc8(uint8_t byte, void *checksum);
 
 void
 flac_crc16(uint8_t byte, void *checksum);
+
+/*given a run of bytes and the previous checksum value,
+  returns the checksum updated with all of those bytes
+
+  this is equivalent to calling the per-byte functions above
+  on each byte in turn, but processes 8 bytes at a time
+  and so is much faster for checksumming a whole frame at once*/
+
+uint32_t
+flac_crc8_update(const uint8_t *bytes, unsigned count, uint32_t checksum);
+
+uint32_t
+flac_crc16_update(const uint8_t *bytes, unsigned count, uint32_t checksum);
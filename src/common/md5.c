@@ -212,6 +212,68 @@ audiotools__MD5Update(audiotools__MD5Context *ctx,
     memcpy(ctx->in, buf, len);
 }
 
+/*
+ * Update context with a run of interleaved PCM samples,
+ * packed to little-endian bytes as FrameList.to_bytes(False, is_signed)
+ * would, but without building an intermediate Python string.
+ * Samples are packed through a fixed stack buffer a chunk at a time.
+ */
+void
+audiotools__MD5UpdateSamples(audiotools__MD5Context *ctx,
+                             const int *samples,
+                             unsigned total_samples,
+                             unsigned bits_per_sample,
+                             int is_signed)
+{
+    const unsigned bytes_per_sample = bits_per_sample / 8;
+    const unsigned chunk_samples = MD5_SAMPLE_BUFFER_SIZE / bytes_per_sample;
+    const int adjustment = is_signed ? 0 : (1 << (bits_per_sample - 1));
+    unsigned char buffer[MD5_SAMPLE_BUFFER_SIZE];
+
+    while (total_samples > 0) {
+        const unsigned to_pack =
+            total_samples < chunk_samples ? total_samples : chunk_samples;
+        unsigned char *output = buffer;
+        unsigned i;
+
+        switch (bytes_per_sample) {
+        case 1:
+            for (i = 0; i < to_pack; i++) {
+                *output++ = (unsigned char)(samples[i] + adjustment);
+            }
+            break;
+        case 2:
+            for (i = 0; i < to_pack; i++) {
+                const int sample = samples[i] + adjustment;
+                *output++ = (unsigned char)sample;
+                *output++ = (unsigned char)(sample >> 8);
+            }
+            break;
+        case 3:
+            for (i = 0; i < to_pack; i++) {
+                const int sample = samples[i] + adjustment;
+                *output++ = (unsigned char)sample;
+                *output++ = (unsigned char)(sample >> 8);
+                *output++ = (unsigned char)(sample >> 16);
+            }
+            break;
+        default:
+            for (i = 0; i < to_pack; i++) {
+                const int sample = samples[i] + adjustment;
+                *output++ = (unsigned char)sample;
+                *output++ = (unsigned char)(sample >> 8);
+                *output++ = (unsigned char)(sample >> 16);
+                *output++ = (unsigned char)(sample >> 24);
+            }
+            break;
+        }
+
+        audiotools__MD5Update(ctx, buffer, to_pack * bytes_per_sample);
+        samples += to_pack;
+        total_samples -= to_pack;
+    }
+}
+
 /*
  * Start MD5 accumulation.  Set bit count to 0 and buffer to mysterious
  * initialization constants.
@@ -49,4 +49,17 @@ audiotools__MD5Update(audiotools__MD5Context *ctx,
                       const void *buf,
                       unsigned long len);
 
+/*the size of the stack buffer MD5UpdateSamples packs samples through*/
+#define MD5_SAMPLE_BUFFER_SIZE 4096
+
+/*updates context with "total_samples" interleaved PCM samples
+  as little-endian bytes of the given size and signedness,
+  identical to hashing FrameList.to_bytes(False, is_signed)*/
+void
+audiotools__MD5UpdateSamples(audiotools__MD5Context *ctx,
+                             const int *samples,
+                             unsigned total_samples,
+                             unsigned bits_per_sample,
+                             int is_signed);
+
 #endif
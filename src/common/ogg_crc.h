@@ -5,3 +5,12 @@
 
 void
 ogg_crc(uint8_t byte, void *checksum);
+
+/*given a run of bytes and the previous checksum value,
+  returns the checksum updated with all of those bytes
+
+  this is equivalent to calling ogg_crc on each byte in turn,
+  but processes 8 bytes at a time*/
+
+uint32_t
+ogg_crc_update(const uint8_t *bytes, unsigned count, uint32_t checksum);
@@ -25,7 +25,8 @@ ALACDecoder_init(decoders_ALACDecoder *self,
                  PyObject *args, PyObject *kwds)
 {
     char *filename;
-    static char *kwlist[] = {"filename", NULL};
+    int use_mmap = 0;
+    static char *kwlist[] = {"filename", "mmap", NULL};
     unsigned i;
 
     self->filename = NULL;
@@ -42,14 +43,18 @@ ALACDecoder_init(decoders_ALACDecoder *self,
         self->subframe_headers[i].qlp_coeff = array_i_new();
     }
 
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "s", kwlist, &filename))
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "s|i", kwlist,
+                                     &filename, &use_mmap))
         return -1;
 
-    /*open the alac file as a BitstreamReader*/
+    /*open the alac file as a BitstreamReader,
+      mapping its contents if requested and possible*/
     if ((self->file = fopen(filename, "rb")) == NULL) {
         PyErr_SetFromErrnoWithFilename(PyExc_IOError, filename);
         return -1;
-    } else {
+    } else if ((!use_mmap) ||
+               ((self->bitstream =
+                 br_open_mmap(self->file, BS_BIG_ENDIAN)) == NULL)) {
         self->bitstream = br_open(self->file, BS_BIG_ENDIAN);
     }
     self->filename = strdup(filename);
@@ -1,5 +1,6 @@
 #include "flac.h"
 #include "../pcmconv.h"
+#include <limits.h>
 
 /********************************************************
  Audio Tools, a module and set of tools for manipulating audio data
@@ -26,6 +27,14 @@ FlacDecoder_init(decoders_FlacDecoder *self,
 {
     char* filename;
     int stream_offset = 0;
+    int use_mmap = 0;
+    static char *kwlist[] = {"filename",
+                             "channel_mask",
+                             "stream_offset",
+                             "threads",
+                             "mmap",
+                             "verify_md5",
+                             NULL};
 
     self->filename = NULL;
     self->file = NULL;
@@ -36,13 +45,29 @@ FlacDecoder_init(decoders_FlacDecoder *self,
     self->framelist_data = array_i_new();
     self->audiotools_pcm = NULL;
     self->remaining_samples = 0;
-
-    if (!PyArg_ParseTuple(args, "si|i",
-                          &filename,
-                          &(self->channel_mask),
-                          &stream_offset))
+    self->seektable.total_points = 0;
+    self->seektable.points = NULL;
+    self->stream_start = 0;
+    self->fixed_block_size = 0;
+    self->skip_samples = 0;
+    self->md5_verifiable = 1;
+    self->verify_md5 = 1;
+    self->threads = 1;
+    self->frame_data = NULL;
+    self->frame_data_size = 0;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "si|iiii", kwlist,
+                                     &filename,
+                                     &(self->channel_mask),
+                                     &stream_offset,
+                                     &(self->threads),
+                                     &use_mmap,
+                                     &(self->verify_md5)))
         return -1;
 
+    /*a decoder which skips MD5 verification never calculates the sum*/
+    self->md5_verifiable = self->verify_md5;
+
     if (self->channel_mask < 0) {
         PyErr_SetString(PyExc_ValueError, "channel_mask must be >= 0");
         return -1;
@@ -51,36 +76,48 @@ FlacDecoder_init(decoders_FlacDecoder *self,
         PyErr_SetString(PyExc_ValueError, "stream offset must be >= 0");
         return -1;
     }
+    if (self->threads < 1) {
+        PyErr_SetString(PyExc_ValueError, "threads must be >= 1");
+        return -1;
+    }
 
     /*open the flac file*/
     self->file = fopen(filename, "rb");
     if (self->file == NULL) {
         PyErr_SetFromErrnoWithFilename(PyExc_IOError, filename);
         return -1;
-    } else {
-        self->bitstream = br_open(self->file, BS_BIG_ENDIAN);
     }
 
     /*skip the given number of bytes, if any*/
     if (stream_offset != 0)
         fseek(self->file, stream_offset, SEEK_SET);
 
+    /*map the file's contents, if requested and possible*/
+    if ((!use_mmap) ||
+        ((self->bitstream = br_open_mmap(self->file, BS_BIG_ENDIAN)) == NULL))
+        self->bitstream = br_open(self->file, BS_BIG_ENDIAN);
+
     self->filename = strdup(filename);
 
     /*read the STREAMINFO block and setup the total number of samples to read*/
-    if (flacdec_read_metadata(self->bitstream, &(self->streaminfo))) {
+    if (flacdec_read_metadata(self->bitstream,
+                              &(self->streaminfo),
+                              &(self->seektable))) {
         self->streaminfo.channels = 0;
         return -1;
     }
 
     self->remaining_samples = self->streaminfo.total_samples;
+    self->stream_start = br_ftell(self->bitstream);
 
     /*initialize the output MD5 sum*/
     audiotools__MD5Init(&(self->md5));
     self->stream_finalized = 0;
 
-    /*add callback for CRC16 calculation*/
-    br_add_callback(self->bitstream, flac_crc16, &(self->crc16));
+    /*add callback for CRC16 calculation,
+      unless the file is mapped and frames can be checksummed in bulk*/
+    if (br_buffer_pointer(self->bitstream) == NULL)
+        br_add_callback(self->bitstream, flac_crc16, &(self->crc16));
 
     /*setup a framelist generator function*/
     if ((self->audiotools_pcm = open_audiotools_pcm()) == NULL)
@@ -110,6 +147,12 @@ FlacDecoder_dealloc(decoders_FlacDecoder *self)
     if (self->filename != NULL)
         free(self->filename);
 
+    if (self->seektable.points != NULL)
+        free(self->seektable.points);
+
+    if (self->frame_data != NULL)
+        free(self->frame_data);
+
     if (self->bitstream != NULL)
         self->bitstream->close(self->bitstream);
 
@@ -129,11 +172,13 @@ FlacDecoder_new(PyTypeObject *type,
 
 int
 flacdec_read_metadata(BitstreamReader *bitstream,
-                      struct flac_STREAMINFO *streaminfo)
+                      struct flac_STREAMINFO *streaminfo,
+                      struct flac_SEEKTABLE *seektable)
 {
     unsigned int last_block;
     unsigned int block_type;
     unsigned int block_length;
+    unsigned int i;
 
     if (!setjmp(*br_try(bitstream))) {
         if (bitstream->read(bitstream, 32) != 0x664C6143u) {
@@ -166,6 +211,19 @@ flacdec_read_metadata(BitstreamReader *bitstream,
                     bitstream->read_64(bitstream, 36);
 
                 bitstream->read_bytes(bitstream, streaminfo->md5sum, 16);
+            } else if ((block_type == 3) && (seektable->points == NULL)) {
+                seektable->total_points = block_length / 18;
+                seektable->points = malloc(sizeof(struct flac_SEEKPOINT) *
+                                           seektable->total_points);
+                for (i = 0; i < seektable->total_points; i++) {
+                    seektable->points[i].sample_number =
+                        bitstream->read_64(bitstream, 64);
+                    seektable->points[i].byte_offset =
+                        bitstream->read_64(bitstream, 64);
+                    seektable->points[i].samples =
+                        bitstream->read(bitstream, 16);
+                }
+                bitstream->skip_bytes(bitstream, block_length % 18);
             } else {
                 bitstream->skip(bitstream, block_length * 8);
             }
@@ -213,7 +271,9 @@ FlacDecoder_read(decoders_FlacDecoder* self, PyObject *args)
     PyObject* framelist;
     PyThreadState *thread_state;
     flac_status error;
+    const uint8_t *frame_start;
 
+next_frame:
     self->subframe_data->reset(self->subframe_data);
 
     /*if all samples have been read, return an empty FrameList*/
@@ -237,8 +297,18 @@ FlacDecoder_read(decoders_FlacDecoder* self, PyObject *args)
         }
     }
 
+    /*decode a batch of frames in parallel, if possible*/
+    if ((self->threads > 1) && (self->skip_samples == 0)) {
+        framelist = FlacDecoder_read_frames(self);
+        if (framelist != Py_None)
+            return framelist;
+        else
+            Py_DECREF(framelist);
+    }
+
     thread_state = PyEval_SaveThread();
     self->crc16 = 0;
+    frame_start = br_buffer_pointer(self->bitstream);
 
     if (!setjmp(*br_try(self->bitstream))) {
         /*read frame header*/
@@ -275,6 +345,11 @@ FlacDecoder_read(decoders_FlacDecoder* self, PyObject *args)
         /*check CRC-16*/
         self->bitstream->byte_align(self->bitstream);
         self->bitstream->read(self->bitstream, 16);
+        if (frame_start != NULL)
+            self->crc16 = flac_crc16_update(
+                frame_start,
+                (unsigned)(br_buffer_pointer(self->bitstream) - frame_start),
+                0);
         if (self->crc16 != 0) {
             PyEval_RestoreThread(thread_state);
             PyErr_SetString(PyExc_ValueError, "invalid checksum in frame");
@@ -293,23 +368,31 @@ FlacDecoder_read(decoders_FlacDecoder* self, PyObject *args)
     br_etry(self->bitstream);
     PyEval_RestoreThread(thread_state);
 
-    framelist = array_i_to_FrameList(self->audiotools_pcm,
-                                     self->framelist_data,
-                                     frame_header.channel_count,
-                                     frame_header.bits_per_sample);
-    if (framelist != NULL) {
-        /*update MD5 sum*/
-        if (FlacDecoder_update_md5sum(self, framelist) == OK)
-            /*return pcm.FrameList Python object*/
-            return framelist;
-        else {
-            Py_DECREF(framelist);
-            return NULL;
+    /*discard any leading PCM frames left over from a seek()*/
+    if (self->skip_samples > 0) {
+        if (self->skip_samples >= frame_header.block_size) {
+            self->skip_samples -= frame_header.block_size;
+            goto next_frame;
+        } else {
+            self->framelist_data->de_head(
+                self->framelist_data,
+                (unsigned)(self->skip_samples * frame_header.channel_count),
+                self->framelist_data);
+            self->skip_samples = 0;
         }
-    } else {
-        return NULL;
     }
 
+    /*update MD5 sum*/
+    FlacDecoder_update_md5sum(self,
+                              self->framelist_data,
+                              frame_header.bits_per_sample);
+
+    /*return pcm.FrameList Python object*/
+    return array_i_to_FrameList(self->audiotools_pcm,
+                                self->framelist_data,
+                                frame_header.channel_count,
+                                frame_header.bits_per_sample);
+
  error:
     br_etry(self->bitstream);
     return NULL;
@@ -395,26 +478,635 @@ FlacDecoder_offsets(decoders_FlacDecoder* self, PyObject *args)
     return NULL;
 }
 
+static PyObject*
+FlacDecoder_seek(decoders_FlacDecoder* self, PyObject *args)
+{
+    long long pcm_frame;
+    uint64_t target;
+    uint64_t frame_sample;
+    PyThreadState *thread_state;
+
+    if (!PyArg_ParseTuple(args, "L", &pcm_frame))
+        return NULL;
+
+    if (pcm_frame < 0) {
+        PyErr_SetString(PyExc_ValueError, "PCM frame must be >= 0");
+        return NULL;
+    }
+
+    target = MIN((uint64_t)pcm_frame, self->streaminfo.total_samples);
+
+    /*restart the MD5 sum,
+      which can only be verified if seeking to the start of the stream*/
+    audiotools__MD5Init(&(self->md5));
+    self->md5_verifiable = self->verify_md5 && (target == 0);
+    self->stream_finalized = 0;
+
+    if (target == self->streaminfo.total_samples) {
+        /*seeking to the end of the stream requires no decoding*/
+        self->remaining_samples = 0;
+        self->skip_samples = 0;
+        return Py_BuildValue("K", (unsigned PY_LONG_LONG)target);
+    }
+
+    thread_state = PyEval_SaveThread();
+    if (flacdec_seek_frame(self, target, &frame_sample)) {
+        /*if the frame headers can't be trusted to locate our target,
+          decode from the start of the stream and discard samples*/
+        br_fseek(self->bitstream, self->stream_start, SEEK_SET);
+        frame_sample = 0;
+    }
+    PyEval_RestoreThread(thread_state);
+
+    self->remaining_samples = (self->streaminfo.total_samples -
+                               frame_sample);
+    self->skip_samples = target - frame_sample;
+
+    return Py_BuildValue("K", (unsigned PY_LONG_LONG)target);
+}
+
+int
+flacdec_find_frame(decoders_FlacDecoder *self, long start, long end,
+                   long *frame_offset,
+                   uint64_t *frame_sample,
+                   uint32_t *block_size)
+{
+    BitstreamReader* bs = self->bitstream;
+    struct bs_callback* callbacks = bs->callbacks;
+    struct flac_frame_header header;
+    flac_status status;
+    uint8_t buffer[4096];
+    size_t buffer_size;
+    size_t i;
+    uint8_t previous = 0;
+    long position = start;
+
+    while (position < end) {
+        /*scan for a sync code, tracking the position of its first byte*/
+        br_fseek(bs, position, SEEK_SET);
+        buffer_size = br_fread(bs, buffer,
+                               MIN(sizeof(buffer), (size_t)(end - position)));
+        if (buffer_size == 0)
+            return 1;
+
+        for (i = 0; i < buffer_size; i++) {
+            if ((previous == 0xFF) && ((buffer[i] & 0xFE) == 0xF8))
+                break;
+            else
+                previous = buffer[i];
+        }
+
+        if (i == buffer_size) {
+            position += buffer_size;
+            continue;
+        }
+
+        /*try to read a frame header at the potential sync code*/
+        position += (long)i - 1;
+        br_fseek(bs, position, SEEK_SET);
+        if (!setjmp(*br_try(bs))) {
+            status = flacdec_read_frame_header(bs, &(self->streaminfo),
+                                               &header);
+        } else {
+            status = ERROR;
+        }
+        br_etry(bs);
+
+        /*a failed read may leave the CRC-8 callback in place*/
+        while (bs->callbacks != callbacks)
+            br_pop_callback(bs, NULL);
+
+        if (status == OK) {
+            if (header.blocking_strategy == 0)
+                *frame_sample = ((uint64_t)header.frame_number *
+                                 self->fixed_block_size);
+            else
+                *frame_sample = header.frame_number;
+
+            if (*frame_sample < self->streaminfo.total_samples) {
+                /*leave the stream positioned at the frame header*/
+                br_fseek(bs, position, SEEK_SET);
+                *frame_offset = position;
+                *block_size = header.block_size;
+                return 0;
+            }
+        }
+
+        /*not a valid frame header, so keep looking*/
+        position += 1;
+        previous = 0;
+    }
+
+    return 1;
+}
+
+int
+flacdec_seek_frame(decoders_FlacDecoder *self, uint64_t target,
+                   uint64_t *frame_sample)
+{
+    long lo_offset = self->stream_start;
+    uint64_t lo_sample = 0;
+    long hi_offset;
+    long mid_offset;
+    long search_offset;
+    long offset;
+    uint64_t sample;
+    uint32_t block_size;
+    long next_offset;
+    uint64_t next_sample;
+    uint32_t next_block_size;
+    const long linear_range = MAX(self->streaminfo.maximum_frame_size * 2,
+                                  0x10000);
+    struct flac_SEEKPOINT* points = self->seektable.points;
+    int low = 0;
+    int high = (int)self->seektable.total_points - 1;
+    int middle;
+
+    /*fixed-blocksize frames are numbered by frame rather than sample,
+      so determine that block size from the stream's first frame*/
+    if (self->fixed_block_size == 0) {
+        self->fixed_block_size = self->streaminfo.maximum_block_size;
+        if (flacdec_find_frame(self, self->stream_start,
+                               self->stream_start + 2,
+                               &offset, &sample, &block_size))
+            return 1;
+        self->fixed_block_size = block_size;
+    }
+
+    br_fseek(self->bitstream, 0, SEEK_END);
+    hi_offset = br_ftell(self->bitstream);
+
+    /*bisect the SEEKTABLE for the nearest points around our target
+      (placeholder points have the highest possible sample number
+       and so always sort to the end)*/
+    while (low <= high) {
+        middle = (low + high) / 2;
+        if (points[middle].sample_number <= target) {
+            lo_offset = (self->stream_start +
+                         (long)points[middle].byte_offset);
+            lo_sample = points[middle].sample_number;
+            low = middle + 1;
+        } else {
+            if (points[middle].sample_number <
+                self->streaminfo.total_samples)
+                hi_offset = MIN(hi_offset,
+                                self->stream_start +
+                                (long)points[middle].byte_offset);
+            high = middle - 1;
+        }
+    }
+
+    /*ignore the SEEKTABLE altogether if its point doesn't match a frame*/
+    if ((lo_offset != self->stream_start) &&
+        (flacdec_find_frame(self, lo_offset, lo_offset + 2,
+                            &offset, &sample, &block_size) ||
+         (sample != lo_sample))) {
+        lo_offset = self->stream_start;
+        lo_sample = 0;
+        br_fseek(self->bitstream, 0, SEEK_END);
+        hi_offset = br_ftell(self->bitstream);
+    }
+
+    /*bisect the remaining byte range using frame sync codes*/
+    while ((hi_offset - lo_offset) > linear_range) {
+        mid_offset = lo_offset + ((hi_offset - lo_offset) / 2);
+        if (flacdec_find_frame(self, mid_offset, hi_offset,
+                               &offset, &sample, &block_size) ||
+            (sample > target) ||
+            (sample < lo_sample)) {
+            hi_offset = mid_offset;
+        } else {
+            lo_offset = offset;
+            lo_sample = sample;
+        }
+    }
+
+    /*then walk frame-by-frame to the one containing our target*/
+    if (flacdec_find_frame(self, lo_offset, lo_offset + linear_range,
+                           &offset, &sample, &block_size) ||
+        (sample > target))
+        return 1;
+
+    search_offset = offset + MAX(self->streaminfo.minimum_frame_size, 1);
+    while (target >= (sample + block_size)) {
+        if (flacdec_find_frame(self, search_offset, LONG_MAX,
+                               &next_offset, &next_sample, &next_block_size))
+            return 1;
+
+        if (next_sample == (sample + block_size)) {
+            offset = next_offset;
+            sample = next_sample;
+            block_size = next_block_size;
+            search_offset = (offset +
+                             MAX(self->streaminfo.minimum_frame_size, 1));
+        } else {
+            /*a false sync code, so keep searching past it*/
+            search_offset = next_offset + 1;
+        }
+    }
+
+    /*finally, leave the stream positioned at the frame's start*/
+    br_fseek(self->bitstream, offset, SEEK_SET);
+    *frame_sample = sample;
+    return 0;
+}
+
+static PyObject*
+FlacDecoder_read_frames(decoders_FlacDecoder* self)
+{
+    const unsigned count = (unsigned)self->threads * FRAMES_PER_THREAD;
+    struct flac_located_frame* frames =
+        malloc(sizeof(struct flac_located_frame) * count);
+    struct flac_decode_thread* threads =
+        malloc(sizeof(struct flac_decode_thread) * self->threads);
+    unsigned thread_count;
+    unsigned located;
+    unsigned i;
+    uint64_t block_sizes = 0;
+    long start;
+    PyThreadState *thread_state;
+    PyObject* framelist;
+
+    /*without room for the batch, read() decodes serially instead*/
+    if ((frames == NULL) || (threads == NULL)) {
+        free(frames);
+        free(threads);
+        Py_INCREF(Py_None);
+        return Py_None;
+    }
+
+    thread_state = PyEval_SaveThread();
+    start = br_ftell(self->bitstream);
+
+    if ((located = flacdec_locate_frames(self, frames, count)) == 0) {
+        PyEval_RestoreThread(thread_state);
+        free(frames);
+        free(threads);
+        Py_INCREF(Py_None);
+        return Py_None;
+    }
+
+    for (i = 0; i < located; i++) {
+        frames[i].samples = array_i_new();
+        frames[i].status = OK;
+    }
+
+    /*each thread decodes every Nth frame,
+      or the frames are decoded inline if a thread can't be started*/
+    thread_count = MIN((unsigned)self->threads, located);
+    for (i = 0; i < thread_count; i++) {
+        threads[i].streaminfo = &(self->streaminfo);
+        threads[i].data = self->frame_data;
+        threads[i].frames = frames;
+        threads[i].first = i;
+        threads[i].stride = thread_count;
+        threads[i].total = located;
+        threads[i].started = (pthread_create(&(threads[i].thread),
+                                             NULL,
+                                             flacdec_decode_thread,
+                                             &(threads[i])) == 0);
+    }
+    for (i = 0; i < thread_count; i++)
+        if (!threads[i].started)
+            flacdec_decode_thread(&(threads[i]));
+    for (i = 0; i < thread_count; i++)
+        if (threads[i].started)
+            pthread_join(threads[i].thread, NULL);
+
+    /*any frame which fails to decode is left for read()
+      which decodes the batch again serially and reports the error*/
+    for (i = 0; i < located; i++)
+        if (frames[i].status != OK) {
+            br_fseek(self->bitstream, start, SEEK_SET);
+            framelist = Py_None;
+            goto done;
+        }
+
+    /*then combine the frames' samples in order*/
+    self->framelist_data->reset(self->framelist_data);
+    for (i = 0; i < located; i++) {
+        self->framelist_data->extend(self->framelist_data,
+                                     frames[i].samples);
+        block_sizes += frames[i].block_size;
+    }
+    self->remaining_samples -= block_sizes;
+    framelist = NULL;
+
+    /*the MD5 sum is updated in stream order, once the batch is done*/
+    FlacDecoder_update_md5sum(self,
+                              self->framelist_data,
+                              self->streaminfo.bits_per_sample);
+
+done:
+    for (i = 0; i < located; i++)
+        frames[i].samples->del(frames[i].samples);
+    free(frames);
+    free(threads);
+    PyEval_RestoreThread(thread_state);
+
+    if (framelist == Py_None) {
+        Py_INCREF(Py_None);
+        return Py_None;
+    }
+
+    return array_i_to_FrameList(self->audiotools_pcm,
+                                self->framelist_data,
+                                self->streaminfo.channels,
+                                self->streaminfo.bits_per_sample);
+}
+
+int
+flacdec_read_frame_data(decoders_FlacDecoder *self,
+                        unsigned *size, unsigned needed)
+{
+    size_t bytes_read;
+    unsigned new_size;
+    uint8_t *new_data;
+
+    while (*size < needed) {
+        if (self->frame_data_size < needed) {
+            /*on failure, the old frame_data is left as-is*/
+            new_size = MAX(needed, self->frame_data_size * 2);
+            if ((new_data = realloc(self->frame_data, new_size)) == NULL)
+                return 0;
+            self->frame_data = new_data;
+            self->frame_data_size = new_size;
+        }
+        bytes_read = br_fread(self->bitstream, self->frame_data + *size,
+                              self->frame_data_size - *size);
+        if (bytes_read == 0)
+            return 0;
+        else
+            *size += (unsigned)bytes_read;
+    }
+
+    return 1;
+}
+
+unsigned
+flacdec_locate_frames(decoders_FlacDecoder *self,
+                      struct flac_located_frame *frames,
+                      unsigned count)
+{
+    const long start = br_ftell(self->bitstream);
+    unsigned size = 0;
+    unsigned frame_start = 0;
+    unsigned position;
+    unsigned checksummed;
+    unsigned located = 0;
+    uint64_t remaining_samples = self->remaining_samples;
+    uint64_t next_frame_number;
+    uint32_t crc16;
+    struct flac_frame_header header;
+    struct flac_frame_header next_header;
+    int found;
+
+    while (located < count) {
+        if (!flacdec_read_frame_data(self, &size,
+                                     frame_start + MAX_FRAME_HEADER_SIZE))
+            break;
+        if (flacdec_parse_frame_header(&(self->streaminfo),
+                                       self->frame_data + frame_start,
+                                       size - frame_start,
+                                       &header) != OK)
+            break;
+
+        /*the final frame has no following header to confirm its end*/
+        if (header.block_size >= remaining_samples)
+            break;
+
+        if (header.blocking_strategy == 0)
+            next_frame_number = header.frame_number + 1;
+        else
+            next_frame_number = header.frame_number + header.block_size;
+
+        /*scan for the next frame's sync code,
+          where the CRC-16 of this frame's bytes so far is 0
+          if it's actually the frame's end
+
+          that CRC-16 is only brought up to date in bulk
+          as each potential sync code is found*/
+        crc16 = 0;
+        checksummed = frame_start;
+        found = 0;
+        for (position = frame_start; !found; position++) {
+            if (((position + 1 + MAX_FRAME_HEADER_SIZE) > size) &&
+                (!flacdec_read_frame_data(
+                    self, &size, position + 1 + MAX_FRAME_HEADER_SIZE)))
+                break;
+
+            if ((position > (frame_start + 1)) &&
+                (self->frame_data[position] == 0xFF) &&
+                ((self->frame_data[position + 1] & 0xFE) == 0xF8)) {
+                crc16 = flac_crc16_update(self->frame_data + checksummed,
+                                          position - checksummed,
+                                          crc16);
+                checksummed = position;
+
+                if ((crc16 == 0) &&
+                    (flacdec_parse_frame_header(&(self->streaminfo),
+                                                self->frame_data + position,
+                                                size - position,
+                                                &next_header) == OK) &&
+                    (next_header.frame_number == next_frame_number)) {
+                    frames[located].offset = frame_start;
+                    frames[located].size = position - frame_start;
+                    frames[located].block_size = header.block_size;
+                    located++;
+                    remaining_samples -= header.block_size;
+                    frame_start = position;
+                    found = 1;
+                }
+            }
+        }
+
+        if (!found)
+            break;
+    }
+
+    /*leave the stream positioned after the last located frame*/
+    br_fseek(self->bitstream, start + (long)frame_start, SEEK_SET);
+
+    return located;
+}
+
+void*
+flacdec_decode_thread(void *thread)
+{
+    struct flac_decode_thread* decoder = thread;
+    array_ia* subframe_data = array_ia_new();
+    array_i* residuals = array_i_new();
+    array_i* qlp_coeffs = array_i_new();
+    unsigned i;
+
+    for (i = decoder->first; i < decoder->total; i += decoder->stride)
+        decoder->frames[i].status =
+            flacdec_decode_located_frame(decoder->streaminfo,
+                                         decoder->data,
+                                         &(decoder->frames[i]),
+                                         subframe_data,
+                                         residuals,
+                                         qlp_coeffs);
+
+    subframe_data->del(subframe_data);
+    residuals->del(residuals);
+    qlp_coeffs->del(qlp_coeffs);
+    return NULL;
+}
+
+flac_status
+flacdec_decode_located_frame(struct flac_STREAMINFO *streaminfo,
+                             uint8_t *data,
+                             struct flac_located_frame *frame,
+                             array_ia *subframe_data,
+                             array_i *residuals,
+                             array_i *qlp_coeffs)
+{
+    struct bs_buffer buffer;
+    BitstreamReader* bitstream;
+    struct flac_frame_header frame_header;
+    int channel;
+    flac_status status;
+
+    buffer.buffer = data + frame->offset;
+    buffer.buffer_size = frame->size;
+    buffer.buffer_total_size = frame->size;
+    buffer.buffer_position = 0;
+    buffer.mark_in_progress = 0;
+    bitstream = br_open_buffer(&buffer, BS_BIG_ENDIAN);
+    subframe_data->reset(subframe_data);
+
+    if (!setjmp(*br_try(bitstream))) {
+        status = flacdec_read_frame_header(bitstream, streaminfo,
+                                           &frame_header);
+
+        for (channel = 0;
+             (status == OK) && (channel < frame_header.channel_count);
+             channel++)
+            status = flacdec_read_subframe(
+                bitstream,
+                qlp_coeffs,
+                residuals,
+                frame_header.block_size,
+                flacdec_subframe_bits_per_sample(&frame_header, channel),
+                subframe_data->append(subframe_data));
+
+        if (status == OK) {
+            flacdec_decorrelate_channels(frame_header.channel_assignment,
+                                         subframe_data,
+                                         frame->samples);
+
+            /*the frame must end at its CRC-16 and nowhere else*/
+            bitstream->byte_align(bitstream);
+            bitstream->read(bitstream, 16);
+            if ((buffer.buffer_position != buffer.buffer_size) ||
+                (flac_crc16_update(buffer.buffer,
+                                   buffer.buffer_size,
+                                   0) != 0))
+                status = ERROR;
+        }
+    } else {
+        status = ERROR;
+    }
+
+    br_etry(bitstream);
+    bitstream->close(bitstream);
+    return status;
+}
+
+flac_status
+flacdec_parse_frame_header(struct flac_STREAMINFO *streaminfo,
+                           uint8_t *data, unsigned size,
+                           struct flac_frame_header *header)
+{
+    struct bs_buffer buffer;
+    BitstreamReader* bitstream;
+    flac_status status;
+
+    buffer.buffer = data;
+    buffer.buffer_size = size;
+    buffer.buffer_total_size = size;
+    buffer.buffer_position = 0;
+    buffer.mark_in_progress = 0;
+    bitstream = br_open_buffer(&buffer, BS_BIG_ENDIAN);
+
+    if (!setjmp(*br_try(bitstream))) {
+        status = flacdec_read_frame_header(bitstream, streaminfo, header);
+    } else {
+        status = ERROR;
+    }
+
+    br_etry(bitstream);
+    bitstream->close(bitstream);
+    return status;
+}
+
 flac_status
 flacdec_read_frame_header(BitstreamReader *bitstream,
                           struct flac_STREAMINFO *streaminfo,
                           struct flac_frame_header *header)
 {
-    uint32_t block_size_bits;
-    uint32_t sample_rate_bits;
+    const uint8_t *header_start = br_buffer_pointer(bitstream);
     uint32_t crc8 = 0;
+    flac_status status;
+
+    if (header_start != NULL) {
+        /*in-memory headers are checksummed in bulk once read*/
+        status = flacdec_read_frame_header_fields(bitstream,
+                                                  streaminfo,
+                                                  header);
+        if (status == OK)
+            crc8 = flac_crc8_update(
+                header_start,
+                (unsigned)(br_buffer_pointer(bitstream) - header_start),
+                0);
+    } else {
+        br_add_callback(bitstream, flac_crc8, &crc8);
+        status = flacdec_read_frame_header_fields(bitstream,
+                                                  streaminfo,
+                                                  header);
+        br_pop_callback(bitstream, NULL);
+    }
+
+    if (status != OK)
+        return status;
+    else if (crc8 != 0)
+        return ERR_INVALID_FRAME_CRC;
+
+    /*Once we've read everything,
+      ensure the values are compatible with STREAMINFO.*/
+
+    if (streaminfo->sample_rate != header->sample_rate) {
+        return ERR_SAMPLE_RATE_MISMATCH;
+    }
+    if (streaminfo->channels != header->channel_count) {
+        return ERR_CHANNEL_COUNT_MISMATCH;
+    }
+    if (streaminfo->bits_per_sample != header->bits_per_sample) {
+        return ERR_BITS_PER_SAMPLE_MISMATCH;
+    }
+    if (header->block_size > streaminfo->maximum_block_size) {
+        return ERR_MAXIMUM_BLOCK_SIZE_EXCEEDED;
+    }
 
-    br_add_callback(bitstream, flac_crc8, &crc8);
+    return OK;
+}
+
+flac_status
+flacdec_read_frame_header_fields(BitstreamReader *bitstream,
+                                 struct flac_STREAMINFO *streaminfo,
+                                 struct flac_frame_header *header)
+{
+    uint32_t block_size_bits;
+    uint32_t sample_rate_bits;
 
     /*read and verify sync code*/
-    if (bitstream->read(bitstream, 14) != 0x3FFE) {
+    if (bitstream->read(bitstream, 14) != 0x3FFE)
         return ERR_INVALID_SYNC_CODE;
-    }
 
     /*read and verify reserved bit*/
-    if (bitstream->read(bitstream, 1) != 0) {
+    if (bitstream->read(bitstream, 1) != 0)
         return ERR_INVALID_RESERVED_BIT;
-    }
 
     header->blocking_strategy = bitstream->read(bitstream, 1);
 
@@ -491,27 +1183,8 @@ flacdec_read_frame_header(BitstreamReader *bitstream,
         return ERR_INVALID_SAMPLE_RATE;
     }
 
-    /*check for valid CRC-8 value*/
+    /*read CRC-8 value, which checksums the whole header to 0*/
     bitstream->read(bitstream, 8);
-    br_pop_callback(bitstream, NULL);
-    if (crc8 != 0)
-        return ERR_INVALID_FRAME_CRC;
-
-    /*Once we've read everything,
-      ensure the values are compatible with STREAMINFO.*/
-
-    if (streaminfo->sample_rate != header->sample_rate) {
-        return ERR_SAMPLE_RATE_MISMATCH;
-    }
-    if (streaminfo->channels != header->channel_count) {
-        return ERR_CHANNEL_COUNT_MISMATCH;
-    }
-    if (streaminfo->bits_per_sample != header->bits_per_sample) {
-        return ERR_BITS_PER_SAMPLE_MISMATCH;
-    }
-    if (header->block_size > streaminfo->maximum_block_size) {
-        return ERR_MAXIMUM_BLOCK_SIZE_EXCEEDED;
-    }
 
     return OK;
 }
@@ -528,9 +1201,9 @@ flacdec_read_subframe(BitstreamReader* bitstream,
     uint32_t i;
     flac_status error = OK;
 
-    if (flacdec_read_subframe_header(bitstream,
-                                     &subframe_header) == ERROR)
-        return ERROR;
+    if ((error = flacdec_read_subframe_header(bitstream,
+                                              &subframe_header)) != OK)
+        return error;
 
     /*account for wasted bits-per-sample*/
     if (subframe_header.wasted_bits_per_sample > 0)
@@ -935,31 +1608,18 @@ flacdec_decorrelate_channels(uint8_t channel_assignment,
     }
 }
 
-flac_status
+void
 FlacDecoder_update_md5sum(decoders_FlacDecoder *self,
-                          PyObject *framelist)
+                          const array_i *framelist_data,
+                          unsigned bits_per_sample)
 {
-    PyObject *string = PyObject_CallMethod(framelist,
-                                           "to_bytes","ii",
-                                           0,
-                                           1);
-    char *string_buffer;
-    Py_ssize_t length;
-
-    if (string != NULL) {
-        if (PyString_AsStringAndSize(string, &string_buffer, &length) == 0) {
-            audiotools__MD5Update(&(self->md5),
-                                  (unsigned char *)string_buffer,
-                                  length);
-            Py_DECREF(string);
-            return OK;
-        } else {
-            Py_DECREF(string);
-            return ERROR;
-        }
-    } else {
-        return ERROR;
-    }
+    /*a sum which will never be checked needn't be calculated*/
+    if (self->md5_verifiable)
+        audiotools__MD5UpdateSamples(&(self->md5),
+                                     framelist_data->_,
+                                     framelist_data->len,
+                                     bits_per_sample,
+                                     1);
 }
 
 int
@@ -971,7 +1631,8 @@ FlacDecoder_verify_okay(decoders_FlacDecoder *self)
 
     audiotools__MD5Final(stream_md5sum, &(self->md5));
 
-    return ((memcmp(self->streaminfo.md5sum, blank_md5sum, 16) == 0) ||
+    return ((!self->md5_verifiable) ||
+            (memcmp(self->streaminfo.md5sum, blank_md5sum, 16) == 0) ||
             (memcmp(stream_md5sum, self->streaminfo.md5sum, 16) == 0));
 }
 
@@ -36,6 +36,17 @@ struct flac_STREAMINFO {
     unsigned char md5sum[16];     /*128 bits*/
 };
 
+struct flac_SEEKPOINT {
+    uint64_t sample_number;       /*64 bits*/
+    uint64_t byte_offset;         /*64 bits*/
+    uint16_t samples;             /*16 bits*/
+};
+
+struct flac_SEEKTABLE {
+    unsigned total_points;
+    struct flac_SEEKPOINT* points;
+};
+
 struct flac_frame_header {
     uint8_t blocking_strategy;
     uint32_t block_size;
@@ -73,6 +84,14 @@ typedef enum {OK,
               ERR_INVALID_SUBFRAME_TYPE} flac_status;
 
 #ifndef OGG_FLAC
+#include <pthread.h>
+
+/*the number of FLAC frames each thread decodes per batch*/
+#define FRAMES_PER_THREAD 16
+
+/*the longest possible FLAC frame header, in bytes*/
+#define MAX_FRAME_HEADER_SIZE 16
+
 typedef struct {
     PyObject_HEAD
 
@@ -82,8 +101,28 @@ typedef struct {
     int channel_mask;
 
     struct flac_STREAMINFO streaminfo;
+    struct flac_SEEKTABLE seektable;
     uint64_t remaining_samples;
 
+    /*the file offset of the first FLAC frame*/
+    long stream_start;
+
+    /*the block size of fixed-blocksize streams, taken from the first frame
+      or 0 if not yet determined*/
+    uint32_t fixed_block_size;
+
+    /*the number of PCM frames to discard from the next decoded frame
+      in order to complete a seek() to a point within that frame*/
+    uint64_t skip_samples;
+
+    /*0 if the stream has been seeked to a point other than its start,
+      in which case the MD5 sum can no longer be verified*/
+    int md5_verifiable;
+
+    /*0 if the decoder was opened to skip MD5 verification entirely,
+      such as for playback or analysis*/
+    int verify_md5;
+
     uint32_t crc16;
     audiotools__MD5Context md5;
     int stream_finalized;
@@ -94,10 +133,39 @@ typedef struct {
     array_i* qlp_coeffs;
     array_i* framelist_data;
 
+    /*the number of threads to decode batches of frames with*/
+    int threads;
+
+    /*raw frame data read ahead of the stream for threaded decoding*/
+    uint8_t* frame_data;
+    unsigned frame_data_size;
+
     /*a framelist generator*/
     PyObject* audiotools_pcm;
 } decoders_FlacDecoder;
 
+/*a complete FLAC frame located within FlacDecoder's frame_data*/
+struct flac_located_frame {
+    unsigned offset;      /*the frame's position in frame_data*/
+    unsigned size;        /*the frame's size in bytes*/
+    uint32_t block_size;  /*the frame's size in PCM frames*/
+    array_i* samples;     /*the frame's decoded, interleaved samples*/
+    flac_status status;
+};
+
+/*a thread which decodes every "stride" frame of "frames"
+  starting from "first" up to "total"*/
+struct flac_decode_thread {
+    pthread_t thread;
+    int started;
+    struct flac_STREAMINFO* streaminfo;
+    uint8_t* data;
+    struct flac_located_frame* frames;
+    unsigned first;
+    unsigned stride;
+    unsigned total;
+};
+
 /*the FlacDecoder.sample_rate attribute getter*/
 static PyObject*
 FlacDecoder_sample_rate(decoders_FlacDecoder *self, void *closure);
@@ -121,6 +189,10 @@ FlacDecoder_read(decoders_FlacDecoder* self, PyObject *args);
 static PyObject*
 FlacDecoder_offsets(decoders_FlacDecoder* self, PyObject *args);
 
+/*the FlacDecoder.seek() method*/
+static PyObject*
+FlacDecoder_seek(decoders_FlacDecoder* self, PyObject *args);
+
 /*the FlacDecoder.close() method*/
 static PyObject*
 FlacDecoder_close(decoders_FlacDecoder* self, PyObject *args);
@@ -148,6 +220,8 @@ PyMethodDef FlacDecoder_methods[] = {
      "Reads the given number of bytes from the FLAC file, if possible"},
     {"offsets", (PyCFunction)FlacDecoder_offsets,
      METH_NOARGS, "Returns a list of (offset, PCM frame count) values"},
+    {"seek", (PyCFunction)FlacDecoder_seek,
+     METH_VARARGS, "Seeks to the given PCM frame and returns the new offset"},
     {"close", (PyCFunction)FlacDecoder_close,
      METH_NOARGS, "Closes the FLAC decoder stream"},
     {NULL}
@@ -160,13 +234,94 @@ static PyObject*
 FlacDecoder_new(PyTypeObject *type,
                 PyObject *args, PyObject *kwds);
 
-/*reads the STREAMINFO block and skips any other metadata blocks,
+/*reads the STREAMINFO and SEEKTABLE blocks
+  and skips any other metadata blocks,
   placing our internal stream at the first FLAC frame
 
+  if present, "seektable" has its points allocated
+  which must be freed later
+
   returns 0 on success, 1 on failure with PyErr set*/
 int
 flacdec_read_metadata(BitstreamReader *bitstream,
-                      struct flac_STREAMINFO *streaminfo);
+                      struct flac_STREAMINFO *streaminfo,
+                      struct flac_SEEKTABLE *seektable);
+
+/*searches for the next valid frame header between "start" and "end"
+  and places its byte offset, first PCM frame and block size
+  in the given arguments while leaving the stream positioned at it
+
+  returns 0 on success, 1 if no frame header is found*/
+int
+flacdec_find_frame(decoders_FlacDecoder *self, long start, long end,
+                   long *frame_offset,
+                   uint64_t *frame_sample,
+                   uint32_t *block_size);
+
+/*positions the stream at the start of the frame containing "target"
+  and places that frame's first PCM frame in "frame_sample"
+
+  returns 0 on success, 1 if the frame cannot be found*/
+int
+flacdec_seek_frame(decoders_FlacDecoder *self, uint64_t target,
+                   uint64_t *frame_sample);
+
+/*decodes a batch of frames from the current position in parallel
+  and returns them as a single FrameList, with the MD5 sum updated
+
+  returns a new reference to None if no frames can be decoded this way,
+  leaving the stream where it was so that read() can decode serially,
+  or NULL with an exception set on error*/
+static PyObject*
+FlacDecoder_read_frames(decoders_FlacDecoder* self);
+
+/*reads raw frame data from the stream into frame_data,
+  following the "*size" bytes already there,
+  until it holds at least "needed" bytes
+
+  returns 1 if "needed" bytes are available,
+  0 if EOF is reached first or frame_data can't be enlarged*/
+int
+flacdec_read_frame_data(decoders_FlacDecoder *self,
+                        unsigned *size, unsigned needed);
+
+/*reads up to "count" complete frames from the stream into frame_data
+  and places their boundaries in "frames"
+
+  a frame is only considered complete once the following frame header
+  is found with the expected frame number and the CRC-16 of the bytes
+  between them checks out, so the stream's final frame is never located
+
+  returns the number of frames located
+  and leaves the stream positioned after the last of them*/
+unsigned
+flacdec_locate_frames(decoders_FlacDecoder *self,
+                      struct flac_located_frame *frames,
+                      unsigned count);
+
+/*the body of a decoding thread, which takes a flac_decode_thread*/
+void*
+flacdec_decode_thread(void *thread);
+
+/*decodes a located frame from "data" into its samples array
+  using the given temporary buffers
+
+  returns OK on success, or an error if the frame doesn't decode
+  to exactly its located size*/
+flac_status
+flacdec_decode_located_frame(struct flac_STREAMINFO *streaminfo,
+                             uint8_t *data,
+                             struct flac_located_frame *frame,
+                             array_ia *subframe_data,
+                             array_i *residuals,
+                             array_i *qlp_coeffs);
+
+/*reads a FLAC frame header from the "size" bytes at "data"
+  and places the result in "header"*/
+flac_status
+flacdec_parse_frame_header(struct flac_STREAMINFO *streaminfo,
+                           uint8_t *data, unsigned size,
+                           struct flac_frame_header *header);
 #endif
 
 /*reads a FLAC frame header from the sync code to the CRC-8
@@ -176,6 +331,13 @@ flacdec_read_frame_header(BitstreamReader *bitstream,
                           struct flac_STREAMINFO *streaminfo,
                           struct flac_frame_header *header);
 
+/*reads the fields of a FLAC frame header, including its CRC-8,
+  without checksumming them or checking them against STREAMINFO*/
+flac_status
+flacdec_read_frame_header_fields(BitstreamReader *bitstream,
+                                 struct flac_STREAMINFO *streaminfo,
+                                 struct flac_frame_header *header);
+
 /*reads a FLAC subframe header from the padding bit to the wasted bps (if any)
   and places the result in "subframe_header"*/
 flac_status
@@ -252,9 +414,12 @@ FlacDecoder_strerror(flac_status error);
 
 #ifndef OGG_FLAC
 
-flac_status
+/*updates the stream's MD5 sum with the given interleaved samples
+  directly from C, unless the sum is no longer verifiable*/
+void
 FlacDecoder_update_md5sum(decoders_FlacDecoder *self,
-                          PyObject *framelist);
+                          const array_i *framelist_data,
+                          unsigned bits_per_sample);
 
 int
 FlacDecoder_verify_okay(decoders_FlacDecoder *self);
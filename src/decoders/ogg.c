@@ -92,19 +92,31 @@ oggreader_next_segment(OggReader *reader,
                        BitstreamReader *packet,
                        uint8_t *segment_size) {
     ogg_status status;
+    struct bs_callback callback;
+    struct bs_buffer *buffer = packet->input.substream;
 
     if (reader->current_segment < reader->current_header.page_segment_count) {
         /*return an Ogg segment from the current page*/
         *segment_size = reader->current_header.page_segment_lengths[
                                                 reader->current_segment++];
+
+        /*rather than checksum the segment's bytes one at a time
+          as they're transferred, checksum them in bulk afterward*/
+        br_pop_callback(reader->ogg_stream, &callback);
         if (!setjmp(*br_try(reader->ogg_stream))) {
             reader->ogg_stream->substream_append(reader->ogg_stream,
                                                  packet,
                                                  *segment_size);
             br_etry(reader->ogg_stream);
+            br_push_callback(reader->ogg_stream, &callback);
+            reader->checksum = ogg_crc_update(
+                buffer->buffer + buffer->buffer_size - *segment_size,
+                *segment_size,
+                reader->checksum);
             return OGG_OK;
         } else {
             br_etry(reader->ogg_stream);
+            br_push_callback(reader->ogg_stream, &callback);
             return OGG_PREMATURE_EOF;
         }
     } else {
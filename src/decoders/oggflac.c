@@ -60,8 +60,12 @@ OggFlacDecoder_init(decoders_OggFlacDecoder *self,
     self->framelist_data = array_i_new();
     self->audiotools_pcm = NULL;
     self->packet = br_substream_new(BS_BIG_ENDIAN);
+    self->verify_md5 = 1;
 
-    if (!PyArg_ParseTuple(args, "si", &filename, &(self->channel_mask)))
+    if (!PyArg_ParseTuple(args, "si|i",
+                          &filename,
+                          &(self->channel_mask),
+                          &(self->verify_md5)))
         return -1;
 
     if (self->channel_mask < 0) {
@@ -101,9 +105,6 @@ OggFlacDecoder_init(decoders_OggFlacDecoder *self,
     /*initialize the output MD5 sum*/
     audiotools__MD5Init(&(self->md5));
 
-    /*add callback for CRC16 calculation*/
-    br_add_callback(self->packet, flac_crc16, &(self->crc16));
-
     /*setup a framelist generator function*/
     if ((self->audiotools_pcm = open_audiotools_pcm()) == NULL)
         return -1;
@@ -137,8 +138,8 @@ OggFlacDecoder_read(decoders_OggFlacDecoder *self, PyObject *args) {
     flac_status flac_status;
     struct flac_frame_header frame_header;
     int channel;
-    PyObject *framelist;
     PyThreadState *thread_state;
+    const uint8_t *frame_start;
 
     self->subframe_data->reset(self->subframe_data);
 
@@ -150,7 +151,10 @@ OggFlacDecoder_read(decoders_OggFlacDecoder *self, PyObject *args) {
         /*decode the next FrameList from the stream*/
 
         thread_state = PyEval_SaveThread();
-        self->crc16 = 0;
+
+        /*each packet is held in memory in its entirety,
+          so its CRC-16 is calculated in bulk once decoded*/
+        frame_start = br_buffer_pointer(self->packet);
 
         if (!setjmp(*br_try(self->packet))) {
             /*read frame header*/
@@ -193,31 +197,28 @@ OggFlacDecoder_read(decoders_OggFlacDecoder *self, PyObject *args) {
             /*check CRC-16*/
             self->packet->byte_align(self->packet);
             self->packet->read(self->packet, 16);
+            self->crc16 = flac_crc16_update(
+                frame_start,
+                (unsigned)(br_buffer_pointer(self->packet) - frame_start),
+                0);
             if (self->crc16 != 0) {
                 PyEval_RestoreThread(thread_state);
                 PyErr_SetString(PyExc_ValueError, "invalid checksum in frame");
                 return NULL;
             }
 
+            /*update MD5 sum*/
+            OggFlacDecoder_update_md5sum(self,
+                                         self->framelist_data,
+                                         frame_header.bits_per_sample);
+
             PyEval_RestoreThread(thread_state);
 
-            framelist = array_i_to_FrameList(self->audiotools_pcm,
-                                             self->framelist_data,
-                                             frame_header.channel_count,
-                                             frame_header.bits_per_sample);
-
-            if (framelist != NULL) {
-                /*update MD5 sum*/
-                if (OggFlacDecoder_update_md5sum(self, framelist) == 1)
-                    /*return pcm.FrameList Python object*/
-                    return framelist;
-                else {
-                    Py_DECREF(framelist);
-                    return NULL;
-                }
-            } else {
-                return NULL;
-            }
+            /*return pcm.FrameList Python object*/
+            return array_i_to_FrameList(self->audiotools_pcm,
+                                        self->framelist_data,
+                                        frame_header.channel_count,
+                                        frame_header.bits_per_sample);
         } else {
             /*read error decoding FLAC frame*/
             PyEval_RestoreThread(thread_state);
@@ -313,30 +314,16 @@ oggflac_read_streaminfo(BitstreamReader *packet,
     return 0;
 }
 
-int
+void
 OggFlacDecoder_update_md5sum(decoders_OggFlacDecoder *self,
-                             PyObject *framelist) {
-    PyObject *string = PyObject_CallMethod(framelist,
-                                           "to_bytes","ii",
-                                           0,
-                                           1);
-    char *string_buffer;
-    Py_ssize_t length;
-
-    if (string != NULL) {
-        if (PyString_AsStringAndSize(string, &string_buffer, &length) == 0) {
-            audiotools__MD5Update(&(self->md5),
-                                  (unsigned char *)string_buffer,
-                                  length);
-            Py_DECREF(string);
-            return 1;
-        } else {
-            Py_DECREF(string);
-            return 0;
-        }
-    } else {
-        return 0;
-    }
+                             const array_i *framelist_data,
+                             unsigned bits_per_sample) {
+    if (self->verify_md5)
+        audiotools__MD5UpdateSamples(&(self->md5),
+                                     framelist_data->_,
+                                     framelist_data->len,
+                                     bits_per_sample,
+                                     1);
 }
 
 int
@@ -347,6 +334,7 @@ OggFlacDecoder_verify_okay(decoders_OggFlacDecoder *self) {
 
     audiotools__MD5Final(stream_md5sum, &(self->md5));
 
-    return ((memcmp(self->streaminfo.md5sum, blank_md5sum, 16) == 0) ||
+    return ((!self->verify_md5) ||
+            (memcmp(self->streaminfo.md5sum, blank_md5sum, 16) == 0) ||
             (memcmp(stream_md5sum, self->streaminfo.md5sum, 16) == 0));
 }
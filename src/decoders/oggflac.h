@@ -38,6 +38,9 @@ typedef struct {
     uint32_t crc16;
     audiotools__MD5Context md5;
 
+    /*0 if the stream's MD5 sum is neither calculated nor verified*/
+    int verify_md5;
+
     /*temporary buffers we don't want to reallocate each time*/
     array_ia* subframe_data;
     array_i* residuals;
@@ -136,9 +139,10 @@ int
 oggflac_read_streaminfo(BitstreamReader *bitstream,
                         struct flac_STREAMINFO *streaminfo,
                         uint16_t *header_packets);
-int
+void
 OggFlacDecoder_update_md5sum(decoders_OggFlacDecoder *self,
-                             PyObject *framelist);
+                             const array_i *framelist_data,
+                             unsigned bits_per_sample);
 
 int
 OggFlacDecoder_verify_okay(decoders_OggFlacDecoder *self);
@@ -25,6 +25,8 @@ WavPackDecoder_init(decoders_WavPackDecoder *self,
                     PyObject *args, PyObject *kwds) {
     struct block_header header;
     char* filename;
+    int use_mmap = 0;
+    int verify_md5 = 1;
     status error;
 
     self->filename = NULL;
@@ -44,21 +46,28 @@ WavPackDecoder_init(decoders_WavPackDecoder *self,
     self->decorrelated = array_ia_new();
     self->left_right = array_ia_new();
     self->un_shifted = array_ia_new();
+    self->md5_samples = array_i_new();
     self->block_data = br_substream_new(BS_LITTLE_ENDIAN);
     self->sub_block_data = br_substream_new(BS_LITTLE_ENDIAN);
 
     if ((self->audiotools_pcm = open_audiotools_pcm()) == NULL)
         return -1;
 
-    if (!PyArg_ParseTuple(args, "s", &filename))
+    if (!PyArg_ParseTuple(args, "s|ii", &filename, &use_mmap, &verify_md5))
         return -1;
 
+    /*a decoder which skips MD5 verification treats the sum as checked*/
+    self->verify_md5 = verify_md5;
+    self->md5sum_checked = !verify_md5;
+
     /*open the WavPack file*/
     self->file = fopen(filename, "rb");
     if (self->file == NULL) {
         PyErr_SetFromErrnoWithFilename(PyExc_IOError, filename);
         return -1;
-    } else {
+    } else if ((!use_mmap) ||
+               ((self->bitstream =
+                 br_open_mmap(self->file, BS_LITTLE_ENDIAN)) == NULL)) {
         self->bitstream = br_open(self->file, BS_LITTLE_ENDIAN);
     }
 
@@ -69,6 +78,7 @@ WavPackDecoder_init(decoders_WavPackDecoder *self,
     self->channels = 0;
     self->channel_mask = 0;
     self->remaining_pcm_samples = 0;
+    self->skip_pcm_samples = 0;
 
     /*read initial block to populate
       sample_rate, bits_per_sample, channels, and channel_mask*/
@@ -160,6 +170,7 @@ WavPackDecoder_dealloc(decoders_WavPackDecoder *self) {
     self->decorrelated->del(self->decorrelated);
     self->left_right->del(self->left_right);
     self->un_shifted->del(self->un_shifted);
+    self->md5_samples->del(self->md5_samples);
     self->block_data->close(self->block_data);
     self->sub_block_data->close(self->sub_block_data);
 
@@ -218,8 +229,8 @@ WavPackDecoder_read(decoders_WavPackDecoder* self, PyObject *args) {
     struct block_header block_header;
     BitstreamReader* block_data = self->block_data;
     PyThreadState *thread_state;
-    PyObject* framelist;
 
+next_block:
     channels_data->reset(channels_data);
 
 
@@ -268,17 +279,28 @@ WavPackDecoder_read(decoders_WavPackDecoder* self, PyObject *args) {
         self->remaining_pcm_samples -= MIN(channels_data->_[0]->len,
                                            self->remaining_pcm_samples);
 
-        /*convert all channels to single PCM framelist*/
-        framelist = array_ia_to_FrameList(self->audiotools_pcm,
-                                          channels_data,
-                                          self->bits_per_sample);
+        /*discard any leading PCM frames left over from a seek()*/
+        if (self->skip_pcm_samples > 0) {
+            if (self->skip_pcm_samples >= channels_data->_[0]->len) {
+                self->skip_pcm_samples -= channels_data->_[0]->len;
+                goto next_block;
+            } else {
+                unsigned c;
+                for (c = 0; c < channels_data->len; c++)
+                    channels_data->_[c]->de_head(channels_data->_[c],
+                                                 self->skip_pcm_samples,
+                                                 channels_data->_[c]);
+                self->skip_pcm_samples = 0;
+            }
+        }
 
         /*update stream's MD5 sum with framelist data*/
-        if (!WavPackDecoder_update_md5sum(self, framelist)) {
-            return framelist;
-        } else {
-            return NULL;
-        }
+        WavPackDecoder_update_md5sum(self, channels_data);
+
+        /*convert all channels to single PCM framelist*/
+        return array_ia_to_FrameList(self->audiotools_pcm,
+                                     channels_data,
+                                     self->bits_per_sample);
     } else {
         if (!self->md5sum_checked) {
             struct sub_block md5_sub_block;
@@ -314,6 +336,56 @@ WavPackDecoder_read(decoders_WavPackDecoder* self, PyObject *args) {
     }
 }
 
+static PyObject*
+WavPackDecoder_seek(decoders_WavPackDecoder* self, PyObject *args) {
+    long long pcm_frame;
+    BitstreamReader* bs = self->bitstream;
+    struct block_header block_header;
+    status error;
+
+    if (!PyArg_ParseTuple(args, "L", &pcm_frame))
+        return NULL;
+
+    if (pcm_frame < 0) {
+        PyErr_SetString(PyExc_ValueError, "PCM frame must be >= 0");
+        return NULL;
+    }
+
+    /*the stream's MD5 sum can only be verified
+      if seeking to the start of the stream*/
+    audiotools__MD5Init(&(self->md5));
+    self->md5sum_checked = (pcm_frame != 0) || (!self->verify_md5);
+
+    /*walk the block headers from the start of the file,
+      skipping each block's data until the one containing our frame*/
+    br_fseek(bs, 0, SEEK_SET);
+    while ((error = read_block_header(bs, &block_header)) == OK) {
+        if (pcm_frame >= block_header.total_samples) {
+            /*seeking to the end of the stream requires no decoding*/
+            pcm_frame = block_header.total_samples;
+            self->remaining_pcm_samples = 0;
+            self->skip_pcm_samples = 0;
+            return Py_BuildValue("L", pcm_frame);
+        } else if ((block_header.block_samples > 0) &&
+                   block_header.initial_block &&
+                   (pcm_frame < ((long long)block_header.block_index +
+                                 block_header.block_samples))) {
+            /*rewind to the start of the block header*/
+            br_fseek(bs, -32, SEEK_CUR);
+            self->remaining_pcm_samples = (block_header.total_samples -
+                                           block_header.block_index);
+            self->skip_pcm_samples = (unsigned)(pcm_frame -
+                                                block_header.block_index);
+            return Py_BuildValue("L", pcm_frame);
+        } else {
+            br_fseek(bs, block_header.block_size - 24, SEEK_CUR);
+        }
+    }
+
+    PyErr_SetString(wavpack_exception(error), wavpack_strerror(error));
+    return NULL;
+}
+
 const char*
 wavpack_strerror(status error)
 {
@@ -1712,30 +1784,33 @@ undo_extended_integers(const struct extended_integers* params,
     }
 }
 
-int
+void
 WavPackDecoder_update_md5sum(decoders_WavPackDecoder *self,
-                             PyObject *framelist)
+                             const array_ia *channels_data)
 {
-    PyObject *string_obj;
-    char *string_buffer;
-    Py_ssize_t length;
-    int sign = self->bits_per_sample >= 16;
-
-    if ((string_obj =
-         PyObject_CallMethod(framelist, "to_bytes","ii", 0, sign)) != NULL) {
-        if (PyString_AsStringAndSize(string_obj,
-                                     &string_buffer,
-                                     &length) == 0) {
-            audiotools__MD5Update(&(self->md5),
-                                  (unsigned char *)string_buffer,
-                                  length);
-            Py_DECREF(string_obj);
-            return 0;
-        } else {
-            Py_DECREF(string_obj);
-            return 1;
-        }
-    } else {
-        return 1;
+    array_i* interleaved = self->md5_samples;
+    const unsigned channels = channels_data->len;
+    const unsigned pcm_frames = channels_data->_[0]->len;
+    unsigned c;
+    unsigned i;
+
+    /*a sum which will never be checked needn't be calculated*/
+    if (self->md5sum_checked)
+        return;
+
+    /*interleave the channels into a reusable buffer*/
+    interleaved->reset(interleaved);
+    interleaved->resize(interleaved, channels * pcm_frames);
+    for (c = 0; c < channels; c++) {
+        const int *channel = channels_data->_[c]->_;
+        for (i = 0; i < pcm_frames; i++)
+            interleaved->_[i * channels + c] = channel[i];
     }
+    interleaved->len = channels * pcm_frames;
+
+    audiotools__MD5UpdateSamples(&(self->md5),
+                                 interleaved->_,
+                                 interleaved->len,
+                                 self->bits_per_sample,
+                                 self->bits_per_sample >= 16);
 }
@@ -63,11 +63,15 @@ typedef struct {
     audiotools__MD5Context md5;
     int md5sum_checked;
 
+    /*0 if the stream's MD5 sum is neither calculated nor verified*/
+    int verify_md5;
+
     int sample_rate;
     int bits_per_sample;
     int channels;
     int channel_mask;
     unsigned remaining_pcm_samples;
+    unsigned skip_pcm_samples;
 
     /*reusable buffers*/
     array_ia* channels_data;
@@ -80,6 +84,9 @@ typedef struct {
     array_ia* decorrelated;
     array_ia* left_right;
     array_ia* un_shifted;
+
+    /*interleaved samples for updating the MD5 sum*/
+    array_i* md5_samples;
 } decoders_WavPackDecoder;
 
 /*the WavPackDecoder.__init__() method*/
@@ -122,10 +129,15 @@ WavPackDecoder_close(decoders_WavPackDecoder* self, PyObject *args);
 PyObject*
 WavPackDecoder_read(decoders_WavPackDecoder* self, PyObject *args);
 
+/*the WavPackDecoder.seek() method*/
+static PyObject*
+WavPackDecoder_seek(decoders_WavPackDecoder* self, PyObject *args);
 
 PyMethodDef WavPackDecoder_methods[] = {
     {"read", (PyCFunction)WavPackDecoder_read,
      METH_VARARGS, "Returns a decoded frame"},
+    {"seek", (PyCFunction)WavPackDecoder_seek,
+     METH_VARARGS, "Seeks to the given PCM frame and returns the new offset"},
     {"close", (PyCFunction)WavPackDecoder_close,
      METH_NOARGS, "Closes the stream"},
     {NULL}
@@ -378,6 +390,8 @@ undo_extended_integers(const struct extended_integers* params,
                        const array_ia* extended_integers,
                        array_ia* un_extended_integers);
 
-int
+/*updates the stream's MD5 sum with the given channels of samples
+  directly from C, unless the sum has already been checked*/
+void
 WavPackDecoder_update_md5sum(decoders_WavPackDecoder *self,
-                             PyObject *framelist);
+                             const array_ia *channels_data);
@@ -64,6 +64,7 @@ encoders_encode_flac(PyObject *dummy, PyObject *args, PyObject *keywds)
                              "disable_constant_subframes",
                              "disable_fixed_subframes",
                              "disable_lpc_subframes",
+                             "threads",
                              NULL};
     audiotools__MD5Context md5sum;
 
@@ -73,6 +74,7 @@ encoders_encode_flac(PyObject *dummy, PyObject *args, PyObject *keywds)
     PyObject *offset = NULL;
 
     unsigned block_size = 0;
+    int threads = 1;
 
     encoder.options.mid_side = 0;
     encoder.options.adaptive_mid_side = 0;
@@ -86,7 +88,7 @@ encoders_encode_flac(PyObject *dummy, PyObject *args, PyObject *keywds)
     /*extract a filename, PCMReader-compatible object and encoding options:
       blocksize int*/
     if (!PyArg_ParseTupleAndKeywords(
-            args, keywds, "sOIIII|iiiiiii",
+            args, keywds, "sOIIII|iiiiiiii",
             kwlist,
             &filename,
             &pcmreader_obj,
@@ -101,7 +103,8 @@ encoders_encode_flac(PyObject *dummy, PyObject *args, PyObject *keywds)
             &(encoder.options.no_verbatim_subframes),
             &(encoder.options.no_constant_subframes),
             &(encoder.options.no_fixed_subframes),
-            &(encoder.options.no_lpc_subframes)))
+            &(encoder.options.no_lpc_subframes),
+            &threads))
         return NULL;
 
     block_size = encoder.options.block_size;
@@ -243,6 +246,19 @@ encoders_encode_flac(char *filename,
       which updates STREAMINFO in the process*/
     samples = array_ia_new();
 
+#ifndef STANDALONE
+    if (threads > 1) {
+        if (flacenc_encode_frames_threaded(output_stream,
+                                           &encoder,
+                                           pcmreader,
+                                           (unsigned)threads,
+                                           frame_offsets))
+            goto error;
+        else
+            goto finished;
+    }
+#endif
+
     if (pcmreader->read(pcmreader, block_size, samples))
         goto error;
 
@@ -274,6 +290,9 @@ encoders_encode_flac(char *filename,
             goto error;
     }
 
+#ifndef STANDALONE
+ finished:
+#endif
     /*go back and re-write STREAMINFO with complete values*/
     audiotools__MD5Final(encoder.streaminfo.md5sum, &md5sum);
     fseek(output_stream->output.file, 4 + 4, SEEK_SET);
@@ -308,6 +327,127 @@ encoders_encode_flac(char *filename,
 #endif
 
 
+#ifndef STANDALONE
+int
+flacenc_encode_frames_threaded(BitstreamWriter* output,
+                               struct flac_context* encoder,
+                               struct pcmreader_s* pcmreader,
+                               unsigned threads,
+                               PyObject* frame_offsets)
+{
+    const unsigned batch_size = threads * FRAMES_PER_THREAD;
+    struct flac_thread* thread = malloc(sizeof(struct flac_thread) * threads);
+    array_ia** samples = malloc(sizeof(array_ia*) * batch_size);
+    BitstreamWriter** frames = malloc(sizeof(BitstreamWriter*) * batch_size);
+    unsigned count;
+    unsigned frame_bytes;
+    unsigned i;
+    int finished = 0;
+    int result = 0;
+    PyObject* offset;
+
+    for (i = 0; i < batch_size; i++) {
+        samples[i] = array_ia_new();
+        frames[i] = bw_open_recorder(BS_BIG_ENDIAN);
+    }
+
+    for (i = 0; i < threads; i++) {
+        thread[i].encoder.options = encoder->options;
+        thread[i].encoder.streaminfo = encoder->streaminfo;
+        flacenc_init_encoder(&(thread[i].encoder));
+        thread[i].first = i;
+        thread[i].stride = threads;
+        thread[i].samples = samples;
+        thread[i].frames = frames;
+    }
+
+    while (!finished) {
+        /*read a batch of frames from the reader, in order*/
+        for (count = 0; count < batch_size; count++) {
+            if (pcmreader->read(pcmreader,
+                                encoder->options.block_size,
+                                samples[count])) {
+                result = 1;
+                goto done;
+            } else if (samples[count]->_[0]->len == 0) {
+                finished = 1;
+                break;
+            }
+        }
+
+        if (count == 0)
+            break;
+
+        /*encode the batch's frames in parallel,
+          each with the frame number it would have if encoded serially*/
+        Py_BEGIN_ALLOW_THREADS
+        for (i = 0; i < threads; i++) {
+            thread[i].count = count;
+            thread[i].first_frame_number = encoder->total_flac_frames;
+            thread[i].started = !pthread_create(&(thread[i].thread),
+                                                NULL,
+                                                flacenc_encode_thread,
+                                                &(thread[i]));
+            if (!thread[i].started) {
+                /*if the thread can't be started,
+                  encode its frames in this thread instead*/
+                flacenc_encode_thread(&(thread[i]));
+            }
+        }
+        for (i = 0; i < threads; i++) {
+            if (thread[i].started)
+                pthread_join(thread[i].thread, NULL);
+        }
+        Py_END_ALLOW_THREADS
+
+        /*then write the encoded frames in order*/
+        for (i = 0; i < count; i++) {
+            offset = Py_BuildValue("(i, i)",
+                                   bw_ftell(output),
+                                   samples[i]->_[0]->len);
+            PyList_Append(frame_offsets, offset);
+            Py_DECREF(offset);
+
+            frame_bytes = frames[i]->bits_written(frames[i]) / 8;
+            encoder->streaminfo.total_samples += samples[i]->_[0]->len;
+            encoder->streaminfo.minimum_frame_size =
+                MIN(encoder->streaminfo.minimum_frame_size, frame_bytes);
+            encoder->streaminfo.maximum_frame_size =
+                MAX(encoder->streaminfo.maximum_frame_size, frame_bytes);
+            bw_rec_copy(output, frames[i]);
+        }
+        encoder->total_flac_frames += count;
+    }
+
+ done:
+    for (i = 0; i < threads; i++)
+        flacenc_free_encoder(&(thread[i].encoder));
+    for (i = 0; i < batch_size; i++) {
+        samples[i]->del(samples[i]);
+        frames[i]->close(frames[i]);
+    }
+    free(thread);
+    free(samples);
+    free(frames);
+    return result;
+}
+
+void*
+flacenc_encode_thread(void* thread)
+{
+    struct flac_thread* t = thread;
+    unsigned i;
+
+    for (i = t->first; i < t->count; i += t->stride) {
+        t->encoder.total_flac_frames = t->first_frame_number + i;
+        bw_reset_recorder(t->frames[i]);
+        flacenc_write_frame(t->frames[i], &(t->encoder), t->samples[i]);
+    }
+
+    return NULL;
+}
+#endif
+
 void
 flacenc_init_encoder(struct flac_context* encoder)
 {
@@ -132,6 +132,51 @@ void
 flacenc_write_streaminfo(BitstreamWriter* bs,
                          const struct flac_STREAMINFO* streaminfo);
 
+#ifndef STANDALONE
+#include <pthread.h>
+
+/*the number of frames each thread encodes per batch
+  when encoding with multiple threads*/
+#define FRAMES_PER_THREAD 16
+
+struct flac_thread {
+    pthread_t thread;
+    int started;                  /*whether the thread has been started*/
+    struct flac_context encoder;  /*the thread's own encoder and buffers*/
+
+    unsigned first;               /*the first batch frame to encode*/
+    unsigned stride;              /*the distance between batch frames*/
+    unsigned count;               /*the total number of batch frames*/
+    unsigned first_frame_number;  /*the frame number of batch frame 0*/
+    array_ia** samples;           /*the batch's input samples*/
+    BitstreamWriter** frames;     /*the batch's encoded frames*/
+};
+
+struct pcmreader_s;
+
+/*reads samples from "pcmreader" in batches of
+  FRAMES_PER_THREAD * "threads" frames,
+  encodes each batch's frames in parallel across "threads" threads
+  and writes them to "output" in order
+
+  as with the single-threaded encoder, appends (offset, PCM frames)
+  tuples to "frame_offsets" and updates encoder's STREAMINFO
+  so the output is identical to encoding with a single thread
+
+  returns 0 on success, 1 if an error occurs reading from pcmreader*/
+int
+flacenc_encode_frames_threaded(BitstreamWriter* output,
+                               struct flac_context* encoder,
+                               struct pcmreader_s* pcmreader,
+                               unsigned threads,
+                               PyObject* frame_offsets);
+
+/*the pthread entry point for encoding a batch's frames
+  takes a struct flac_thread pointer and returns NULL*/
+void*
+flacenc_encode_thread(void* thread);
+#endif
+
 /*given a set of output samples
   along with STREAMINFO information and encoding parameters
   writes a complete frame to the given BitstreamWriter*/
@@ -502,6 +502,27 @@ BitstreamReader_substream_meth(bitstream_BitstreamReader *self, PyObject *args)
     obj = (bitstream_BitstreamReader *)type->tp_alloc(type, 0);
     obj->file_obj = NULL;
     obj->little_endian = self->little_endian;
+
+    if (self->bitstream->type == BR_MMAP) {
+        /*mapped streams return a view of their mapped data
+          rather than copying it*/
+        obj->bitstream = NULL;
+        if (!setjmp(*br_try(self->bitstream))) {
+            obj->bitstream = br_mmap_substream(self->bitstream,
+                                               bytes,
+                                               obj->little_endian ?
+                                               BS_LITTLE_ENDIAN :
+                                               BS_BIG_ENDIAN);
+            br_etry(self->bitstream);
+            return (PyObject *)obj;
+        } else {
+            br_etry(self->bitstream);
+            Py_DECREF((PyObject *)obj);
+            PyErr_SetString(PyExc_IOError, "I/O error creating substream");
+            return NULL;
+        }
+    }
+
     obj->bitstream = br_substream_new(obj->little_endian ?
                                       BS_LITTLE_ENDIAN : BS_BIG_ENDIAN);
 
@@ -674,15 +695,19 @@ BitstreamReader_new(PyTypeObject *type,
 
 int
 BitstreamReader_init(bitstream_BitstreamReader *self,
-                     PyObject *args)
+                     PyObject *args, PyObject *kwds)
 {
+    static char *kwlist[] = {"file", "little_endian",
+                             "buffer_size", "mmap", NULL};
     PyObject *file_obj;
     unsigned int buffer_size = 4096;
+    int use_mmap = 0;
 
     self->file_obj = NULL;
 
-    if (!PyArg_ParseTuple(args, "Oi|I", &file_obj, &(self->little_endian),
-                          &buffer_size))
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "Oi|Ii", kwlist,
+                                     &file_obj, &(self->little_endian),
+                                     &buffer_size, &use_mmap))
         return -1;
 
     /*store a reference to the Python object so that it doesn't decref
@@ -691,9 +716,16 @@ BitstreamReader_init(bitstream_BitstreamReader *self,
     self->file_obj = file_obj;
 
     if (PyFile_CheckExact(file_obj)) {
-        self->bitstream = br_open(PyFile_AsFile(self->file_obj),
-                                  self->little_endian ?
-                                  BS_LITTLE_ENDIAN : BS_BIG_ENDIAN);
+        /*map the file's contents, if requested and possible,
+          and fall back to reading it a byte at a time otherwise*/
+        if ((!use_mmap) ||
+            ((self->bitstream =
+              br_open_mmap(PyFile_AsFile(self->file_obj),
+                           self->little_endian ?
+                           BS_LITTLE_ENDIAN : BS_BIG_ENDIAN)) == NULL))
+            self->bitstream = br_open(PyFile_AsFile(self->file_obj),
+                                      self->little_endian ?
+                                      BS_LITTLE_ENDIAN : BS_BIG_ENDIAN);
 
         /*swap the regular FILE-based close_substream method
           with a specialized one that does *not* perform fclose
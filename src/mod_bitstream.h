@@ -133,7 +133,8 @@ static PyObject*
 BitstreamReader_parse(bitstream_BitstreamReader *self, PyObject *args);
 
 int
-BitstreamReader_init(bitstream_BitstreamReader *self, PyObject *args);
+BitstreamReader_init(bitstream_BitstreamReader *self,
+                     PyObject *args, PyObject *kwds);
 
 PyMethodDef BitstreamReader_methods[] = {
     {"read", (PyCFunction)BitstreamReader_read, METH_VARARGS,
@@ -2,6 +2,7 @@
 #include <Python.h>
 #endif
 #include <stdlib.h>
+#include <string.h>
 
 /********************************************************
  Audio Tools, a module and set of tools for manipulating audio data
@@ -49,6 +50,12 @@ PyMethodDef module_methods[] = {
     {"from_float_channels", (PyCFunction)FloatFrameList_from_channels,
      METH_VARARGS,
      "from_float_channels(floatframelist_list) -> FloatFrameList"},
+    {"from_buffer", (PyCFunction)FrameList_from_buffer,
+     METH_VARARGS,
+     "from_buffer(int_buffer, channels, bits_per_sample) -> FrameList"},
+    {"from_float_buffer", (PyCFunction)FloatFrameList_from_buffer,
+     METH_VARARGS,
+     "from_float_buffer(double_buffer, channels) -> FloatFrameList"},
     {"__blank__", (PyCFunction)FrameList_blank,
      METH_NOARGS, "__blank__() -> FrameList"},
     {"__blank_float__", (PyCFunction)FloatFrameList_blank,
@@ -106,6 +113,15 @@ static PySequenceMethods pcm_FrameListType_as_sequence = {
     (ssizeargfunc)NULL,             /* sq_inplace_repeat */
 };
 
+static PyBufferProcs pcm_FrameListType_as_buffer = {
+    (readbufferproc)FrameList_getreadbuffer, /* bf_getreadbuffer */
+    (writebufferproc)NULL,                   /* bf_getwritebuffer */
+    (segcountproc)FrameList_getsegcount,     /* bf_getsegcount */
+    (charbufferproc)NULL,                    /* bf_getcharbuffer */
+    (getbufferproc)FrameList_getbuffer,      /* bf_getbuffer */
+    (releasebufferproc)NULL,                 /* bf_releasebuffer */
+};
+
 PyTypeObject pcm_FrameListType = {
     PyObject_HEAD_INIT(NULL)
     0,                         /*ob_size*/
@@ -126,8 +142,9 @@ PyTypeObject pcm_FrameListType = {
     0,                         /*tp_str*/
     0,                         /*tp_getattro*/
     0,                         /*tp_setattro*/
-    0,                         /*tp_as_buffer*/
-    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE, /*tp_flags*/
+    &pcm_FrameListType_as_buffer, /*tp_as_buffer*/
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE |
+    Py_TPFLAGS_HAVE_NEWBUFFER, /*tp_flags*/
     "FrameList(string, channels, bits_per_sample, is_big_endian, is_signed)",
     /* tp_doc */
     0,                         /* tp_traverse */
@@ -403,7 +420,11 @@ FrameList_to_bytes(pcm_FrameList *self, PyObject *args)
         return NULL;
 
     bytes_size = (self->bits_per_sample / 8) * self->samples_length;
-    bytes = malloc(bytes_size);
+
+    /*convert samples directly into the new string's buffer*/
+    if ((bytes_obj = PyString_FromStringAndSize(NULL, bytes_size)) == NULL)
+        return NULL;
+    bytes = (unsigned char*)PyString_AS_STRING(bytes_obj);
 
     if (bytes_size > 0) {
         FrameList_samples_to_char(
@@ -415,11 +436,69 @@ FrameList_to_bytes(pcm_FrameList *self, PyObject *args)
              self->bits_per_sample);
     }
 
-    bytes_obj = PyString_FromStringAndSize((char*)bytes, bytes_size);
-    free(bytes);
     return bytes_obj;
 }
 
+Py_ssize_t
+FrameList_getreadbuffer(pcm_FrameList *self, Py_ssize_t segment, void **ptr)
+{
+    if (segment != 0) {
+        PyErr_SetString(PyExc_SystemError,
+                        "accessing non-existent FrameList segment");
+        return -1;
+    }
+
+    *ptr = self->samples;
+    return self->samples_length * sizeof(int);
+}
+
+Py_ssize_t
+FrameList_getsegcount(pcm_FrameList *self, Py_ssize_t *lenp)
+{
+    if (lenp != NULL)
+        *lenp = self->samples_length * sizeof(int);
+    return 1;
+}
+
+int
+FrameList_getbuffer(pcm_FrameList *self, Py_buffer *view, int flags)
+{
+    if (view == NULL)
+        return 0;
+
+    if ((flags & PyBUF_WRITABLE) == PyBUF_WRITABLE) {
+        PyErr_SetString(PyExc_BufferError, "FrameList is read-only");
+        return -1;
+    }
+
+    /*samples are exported as a C-contiguous, frames x channels array*/
+    self->buffer_shape[0] = self->frames;
+    self->buffer_shape[1] = self->channels;
+    self->buffer_strides[0] = self->channels * sizeof(int);
+    self->buffer_strides[1] = sizeof(int);
+
+    view->obj = (PyObject*)self;
+    Py_INCREF(self);
+    view->buf = self->samples;
+    view->len = self->samples_length * sizeof(int);
+    view->readonly = 1;
+    view->itemsize = sizeof(int);
+    view->format = ((flags & PyBUF_FORMAT) == PyBUF_FORMAT) ? "i" : NULL;
+    if ((flags & PyBUF_ND) == PyBUF_ND) {
+        view->ndim = 2;
+        view->shape = self->buffer_shape;
+    } else {
+        view->ndim = 1;
+        view->shape = NULL;
+    }
+    view->strides = (((flags & PyBUF_STRIDES) == PyBUF_STRIDES) ?
+                     self->buffer_strides : NULL);
+    view->suboffsets = NULL;
+    view->internal = NULL;
+
+    return 0;
+}
+
 PyObject*
 FrameList_split(pcm_FrameList *self, PyObject *args)
 {
@@ -651,6 +730,59 @@ FrameList_from_list(PyObject *dummy, PyObject *args)
     return NULL;
 }
 
+PyObject*
+FrameList_from_buffer(PyObject *dummy, PyObject *args)
+{
+    pcm_FrameList *framelist;
+    PyObject *buffer;
+    const void *data;
+    Py_ssize_t data_size;
+    unsigned int channels;
+    unsigned int bits_per_sample;
+
+    if (!PyArg_ParseTuple(args, "OII", &buffer,
+                          &channels,
+                          &bits_per_sample))
+        return NULL;
+
+    if (PyObject_AsReadBuffer(buffer, &data, &data_size))
+        return NULL;
+
+    if (channels < 1) {
+        PyErr_SetString(PyExc_ValueError,
+                        "number of channels must be > 0");
+        return NULL;
+    }
+
+    switch (bits_per_sample) {
+    case 8:
+    case 16:
+    case 24:
+        break;
+    default:
+        PyErr_SetString(PyExc_ValueError,
+                        "unsupported number of bits per sample");
+        return NULL;
+    }
+
+    if (data_size % (sizeof(int) * channels)) {
+        PyErr_SetString(PyExc_ValueError,
+                        "buffer size must be divisible by "
+                        "int size and number of channels");
+        return NULL;
+    }
+
+    framelist = FrameList_create();
+    framelist->channels = channels;
+    framelist->bits_per_sample = bits_per_sample;
+    framelist->samples_length = (unsigned int)(data_size / sizeof(int));
+    framelist->frames = framelist->samples_length / channels;
+    framelist->samples = malloc(data_size);
+    memcpy(framelist->samples, data, data_size);
+
+    return (PyObject*)framelist;
+}
+
 PyObject*
 FrameList_from_frames(PyObject *dummy, PyObject *args)
 {
@@ -866,6 +998,15 @@ static PySequenceMethods pcm_FloatFrameListType_as_sequence = {
     (ssizeargfunc)NULL,                   /* sq_inplace_repeat */
 };
 
+static PyBufferProcs pcm_FloatFrameListType_as_buffer = {
+    (readbufferproc)FloatFrameList_getreadbuffer, /* bf_getreadbuffer */
+    (writebufferproc)NULL,                        /* bf_getwritebuffer */
+    (segcountproc)FloatFrameList_getsegcount,     /* bf_getsegcount */
+    (charbufferproc)NULL,                         /* bf_getcharbuffer */
+    (getbufferproc)FloatFrameList_getbuffer,      /* bf_getbuffer */
+    (releasebufferproc)NULL,                      /* bf_releasebuffer */
+};
+
 PyTypeObject pcm_FloatFrameListType = {
     PyObject_HEAD_INIT(NULL)
     0,                         /*ob_size*/
@@ -886,8 +1027,9 @@ PyTypeObject pcm_FloatFrameListType = {
     0,                         /*tp_str*/
     0,                         /*tp_getattro*/
     0,                         /*tp_setattro*/
-    0,                         /*tp_as_buffer*/
-    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE, /*tp_flags*/
+    &pcm_FloatFrameListType_as_buffer, /*tp_as_buffer*/
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE |
+    Py_TPFLAGS_HAVE_NEWBUFFER, /*tp_flags*/
     "FloatFrameList(float_list, channels)",  /* tp_doc */
     0,                         /* tp_traverse */
     0,                         /* tp_clear */
@@ -1112,6 +1254,68 @@ FloatFrameList_to_int(pcm_FloatFrameList *self, PyObject *args)
     return (PyObject*)framelist;
 }
 
+Py_ssize_t
+FloatFrameList_getreadbuffer(pcm_FloatFrameList *self,
+                             Py_ssize_t segment, void **ptr)
+{
+    if (segment != 0) {
+        PyErr_SetString(PyExc_SystemError,
+                        "accessing non-existent FloatFrameList segment");
+        return -1;
+    }
+
+    *ptr = self->samples;
+    return self->samples_length * sizeof(double);
+}
+
+Py_ssize_t
+FloatFrameList_getsegcount(pcm_FloatFrameList *self, Py_ssize_t *lenp)
+{
+    if (lenp != NULL)
+        *lenp = self->samples_length * sizeof(double);
+    return 1;
+}
+
+int
+FloatFrameList_getbuffer(pcm_FloatFrameList *self, Py_buffer *view,
+                         int flags)
+{
+    if (view == NULL)
+        return 0;
+
+    if ((flags & PyBUF_WRITABLE) == PyBUF_WRITABLE) {
+        PyErr_SetString(PyExc_BufferError, "FloatFrameList is read-only");
+        return -1;
+    }
+
+    /*samples are exported as a C-contiguous, frames x channels array*/
+    self->buffer_shape[0] = self->frames;
+    self->buffer_shape[1] = self->channels;
+    self->buffer_strides[0] = self->channels * sizeof(double);
+    self->buffer_strides[1] = sizeof(double);
+
+    view->obj = (PyObject*)self;
+    Py_INCREF(self);
+    view->buf = self->samples;
+    view->len = self->samples_length * sizeof(double);
+    view->readonly = 1;
+    view->itemsize = sizeof(double);
+    view->format = ((flags & PyBUF_FORMAT) == PyBUF_FORMAT) ? "d" : NULL;
+    if ((flags & PyBUF_ND) == PyBUF_ND) {
+        view->ndim = 2;
+        view->shape = self->buffer_shape;
+    } else {
+        view->ndim = 1;
+        view->shape = NULL;
+    }
+    view->strides = (((flags & PyBUF_STRIDES) == PyBUF_STRIDES) ?
+                     self->buffer_strides : NULL);
+    view->suboffsets = NULL;
+    view->internal = NULL;
+
+    return 0;
+}
+
 PyObject*
 FloatFrameList_split(pcm_FloatFrameList *self, PyObject *args)
 {
@@ -1210,6 +1414,44 @@ FloatFrameList_concat(pcm_FloatFrameList *a, PyObject *bb)
     return NULL;
 }
 
+PyObject*
+FloatFrameList_from_buffer(PyObject *dummy, PyObject *args)
+{
+    pcm_FloatFrameList *framelist;
+    PyObject *buffer;
+    const void *data;
+    Py_ssize_t data_size;
+    unsigned int channels;
+
+    if (!PyArg_ParseTuple(args, "OI", &buffer, &channels))
+        return NULL;
+
+    if (PyObject_AsReadBuffer(buffer, &data, &data_size))
+        return NULL;
+
+    if (channels < 1) {
+        PyErr_SetString(PyExc_ValueError,
+                        "number of channels must be > 0");
+        return NULL;
+    }
+
+    if (data_size % (sizeof(double) * channels)) {
+        PyErr_SetString(PyExc_ValueError,
+                        "buffer size must be divisible by "
+                        "double size and number of channels");
+        return NULL;
+    }
+
+    framelist = FloatFrameList_create();
+    framelist->channels = channels;
+    framelist->samples_length = (unsigned int)(data_size / sizeof(double));
+    framelist->frames = framelist->samples_length / channels;
+    framelist->samples = malloc(data_size);
+    memcpy(framelist->samples, data, data_size);
+
+    return (PyObject*)framelist;
+}
+
 PyObject*
 FloatFrameList_from_frames(PyObject *dummy, PyObject *args)
 {
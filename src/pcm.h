@@ -53,6 +53,10 @@ typedef struct {
     unsigned samples_length; /*the total number of samples
                                which must be evenly distributable
                                between channels and bits-per-sample*/
+
+    Py_ssize_t buffer_shape[2];   /*the shape and strides of "samples"
+                                    when exported via the buffer protocol*/
+    Py_ssize_t buffer_strides[2];
 } pcm_FrameList;
 
 void
@@ -125,6 +129,22 @@ FrameList_from_frames(PyObject *dummy, PyObject *args);
 PyObject*
 FrameList_from_channels(PyObject *dummy, PyObject *args);
 
+/*builds a FrameList from any object exporting a buffer
+  of native-endian signed ints, such as array.array("i")*/
+PyObject*
+FrameList_from_buffer(PyObject *dummy, PyObject *args);
+
+/*the FrameList's read-only buffer interface,
+  which exports its samples as native ints without copying*/
+Py_ssize_t
+FrameList_getreadbuffer(pcm_FrameList *self, Py_ssize_t segment, void **ptr);
+
+Py_ssize_t
+FrameList_getsegcount(pcm_FrameList *self, Py_ssize_t *lenp);
+
+int
+FrameList_getbuffer(pcm_FrameList *self, Py_buffer *view, int flags);
+
 
 /***********************
   FloatFrameList Object
@@ -143,6 +163,10 @@ typedef struct {
     unsigned samples_length;  /*the total number of samples
                                 which must be evenly distributable
                                 between channels*/
+
+    Py_ssize_t buffer_shape[2];   /*the shape and strides of "samples"
+                                    when exported via the buffer protocol*/
+    Py_ssize_t buffer_strides[2];
 } pcm_FloatFrameList;
 
 void
@@ -196,6 +220,24 @@ FloatFrameList_from_frames(PyObject *dummy, PyObject *args);
 PyObject*
 FloatFrameList_from_channels(PyObject *dummy, PyObject *args);
 
+/*builds a FloatFrameList from any object exporting a buffer
+  of native doubles, such as array.array("d")*/
+PyObject*
+FloatFrameList_from_buffer(PyObject *dummy, PyObject *args);
+
+/*the FloatFrameList's read-only buffer interface,
+  which exports its samples as native doubles without copying*/
+Py_ssize_t
+FloatFrameList_getreadbuffer(pcm_FloatFrameList *self,
+                             Py_ssize_t segment, void **ptr);
+
+Py_ssize_t
+FloatFrameList_getsegcount(pcm_FloatFrameList *self, Py_ssize_t *lenp);
+
+int
+FloatFrameList_getbuffer(pcm_FloatFrameList *self, Py_buffer *view,
+                         int flags);
+
 #endif
 
 typedef int (*FrameList_char_to_int_converter)(unsigned char *s);
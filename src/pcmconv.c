@@ -145,6 +145,8 @@ struct pcmreader_s* open_pcmreader(PyObject* pcmreader_obj)
     pcmreader->bits_per_sample = 0;
     pcmreader->bytes_per_sample = 0;
     pcmreader->callbacks = NULL;
+    pcmreader->callback_buffer = NULL;
+    pcmreader->callback_buffer_size = 0;
 
     pcmreader->read = pcmreader_read;
     pcmreader->close = pcmreader_close;
@@ -209,6 +211,32 @@ struct pcmreader_s* open_pcmreader(PyObject* pcmreader_obj)
     return NULL;
 }
 
+/*packs "count" samples to "output" as FrameList.to_bytes() would*/
+static void
+pcmreader_pack_samples(const int* samples,
+                       unsigned count,
+                       unsigned bytes_per_sample,
+                       int big_endian,
+                       int is_signed,
+                       uint8_t* output)
+{
+    const int adjustment =
+        is_signed ? 0 : (1 << ((bytes_per_sample * 8) - 1));
+    unsigned i;
+    unsigned b;
+
+    for (i = 0; i < count; i++) {
+        const int sample = samples[i] + adjustment;
+        if (big_endian) {
+            for (b = bytes_per_sample; b > 0; b--)
+                *output++ = (uint8_t)(sample >> ((b - 1) * 8));
+        } else {
+            for (b = 0; b < bytes_per_sample; b++)
+                *output++ = (uint8_t)(sample >> (b * 8));
+        }
+    }
+}
+
 int pcmreader_read(struct pcmreader_s* reader,
                     unsigned pcm_frames,
                     array_ia* channels)
@@ -220,9 +248,8 @@ int pcmreader_read(struct pcmreader_s* reader,
     array_i* channel_a;
 
     struct pcmreader_callback* callback;
-    PyObject* string_obj;
-    unsigned char* string;
-    Py_ssize_t string_length;
+    unsigned samples_length;
+    unsigned bytes_per_sample;
 
     /*make a call to "pcmreader.read(bytes)"
       where "bytes" is set to the proper PCM frame count*/
@@ -257,32 +284,29 @@ int pcmreader_read(struct pcmreader_s* reader,
         }
     }
 
-    /*apply all callbacks to pcm.FrameList object*/
+    /*apply all callbacks to the FrameList's samples,
+      packed to bytes in a buffer reused between reads*/
+    bytes_per_sample = framelist->bits_per_sample / 8;
+    samples_length = framelist->samples_length * bytes_per_sample;
+    if ((reader->callbacks != NULL) &&
+        (reader->callback_buffer_size < samples_length)) {
+        reader->callback_buffer = realloc(reader->callback_buffer,
+                                          samples_length);
+        reader->callback_buffer_size = samples_length;
+    }
     for (callback = reader->callbacks;
          callback != NULL;
          callback = callback->next) {
-        string_obj = PyObject_CallMethod(framelist_obj,
-                                         "to_bytes", "(ii)",
-                                         !callback->little_endian,
-                                         callback->is_signed);
-        if (string_obj == NULL) {
-            Py_DECREF(framelist_obj);
-            return 1;
-        }
-
-        if (PyString_AsStringAndSize(string_obj,
-                                     (char**)(&string),
-                                     &string_length) == -1) {
-            Py_DECREF(framelist_obj);
-            Py_DECREF(string_obj);
-            return 1;
-        }
+        pcmreader_pack_samples(framelist->samples,
+                               framelist->samples_length,
+                               bytes_per_sample,
+                               !callback->little_endian,
+                               callback->is_signed,
+                               reader->callback_buffer);
 
         callback->callback(callback->user_data,
-                           string,
-                           (unsigned long)string_length);
-
-        Py_DECREF(string_obj);
+                           reader->callback_buffer,
+                           (unsigned long)samples_length);
     }
 
     /*free any allocated buffers and Python objects*/
@@ -307,6 +331,9 @@ void pcmreader_del(struct pcmreader_s* reader)
         free(callback);
     }
 
+    /*free packed callback data*/
+    free(reader->callback_buffer);
+
     /*decref wrapped PCMReader object*/
     Py_XDECREF(reader->pcmreader_obj);
 
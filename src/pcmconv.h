@@ -91,6 +91,10 @@ typedef struct pcmreader_s {
 
     struct pcmreader_callback* callbacks;
 
+    /*PCM data packed for callbacks, reused between reads*/
+    uint8_t* callback_buffer;
+    unsigned callback_buffer_size;
+
     /*reads up to the given number of PCM frames
       to the given set of channel data
       which is reset and appended to as needed
@@ -0,0 +1,663 @@
+#include "pcmconverter.h"
+#include <math.h>
+#include <time.h>
+#include <string.h>
+
+/********************************************************
+ Audio Tools, a module and set of tools for manipulating audio data
+ Copyright (C) 2007-2012  Brian Langenberger
+
+ This program is free software; you can redistribute it and/or modify
+ it under the terms of the GNU General Public License as published by
+ the Free Software Foundation; either version 2 of the License, or
+ (at your option) any later version.
+
+ This program is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU General Public License for more details.
+
+ You should have received a copy of the GNU General Public License
+ along with this program; if not, write to the Free Software
+ Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+*******************************************************/
+
+/*the same as audiotools.BUFFER_SIZE*/
+#define BUFFER_SIZE 0x100000
+
+#ifndef MIN
+#define MIN(x, y) ((x) < (y) ? (x) : (y))
+#endif
+#ifndef MAX
+#define MAX(x, y) ((x) > (y) ? (x) : (y))
+#endif
+
+/*the audiotools.pcm module, used for building new FrameLists*/
+static PyObject* pcm_module = NULL;
+
+/*the audiotools.pcm.FrameList type, used for checking arguments*/
+static PyObject* framelist_type = NULL;
+
+/*the PRNG's state, which must never be 0*/
+static uint64_t random_state = 0x9E3779B97F4A7C15ULL;
+
+static PyObject*
+pcmconverter_apply_gain(PyObject *dummy, PyObject *args)
+{
+    PyObject *framelist_obj;
+    pcm_FrameList *framelist;
+    pcm_FrameList *output;
+    double multiplier;
+    int max_value;
+    int min_value;
+    unsigned i;
+
+    if (!PyArg_ParseTuple(args, "Od", &framelist_obj, &multiplier))
+        return NULL;
+
+    if ((framelist = pcmconverter_as_FrameList(framelist_obj)) == NULL)
+        return NULL;
+
+    if ((output = pcmconverter_copy_attributes(framelist)) == NULL)
+        return NULL;
+
+    max_value = (1 << (framelist->bits_per_sample - 1)) - 1;
+    min_value = -(1 << (framelist->bits_per_sample - 1));
+
+    for (i = 0; i < framelist->samples_length; i++) {
+        const double sample = round(framelist->samples[i] * multiplier);
+        output->samples[i] = (int)MIN(MAX(sample, min_value), max_value);
+    }
+
+    return (PyObject*)output;
+}
+
+static PyObject*
+pcmconverter_add_dither(PyObject *dummy, PyObject *args)
+{
+    PyObject *framelist_obj;
+    pcm_FrameList *framelist;
+    pcm_FrameList *output;
+    int triangular;
+    int max_value;
+    int min_value;
+    uint64_t noise = 0;
+    unsigned noise_bits = 0;
+    unsigned i;
+
+    if (!PyArg_ParseTuple(args, "Oi", &framelist_obj, &triangular))
+        return NULL;
+
+    if ((framelist = pcmconverter_as_FrameList(framelist_obj)) == NULL)
+        return NULL;
+
+    if ((output = pcmconverter_copy_attributes(framelist)) == NULL)
+        return NULL;
+
+    if (!triangular) {
+        /*toggle each sample's lowest bit at random*/
+        for (i = 0; i < framelist->samples_length; i++) {
+            if (noise_bits == 0) {
+                noise = pcmconverter_random();
+                noise_bits = 64;
+            }
+            output->samples[i] = framelist->samples[i] ^ (int)(noise & 1);
+            noise >>= 1;
+            noise_bits--;
+        }
+    } else {
+        /*add the difference of two random bits to each sample,
+          which is distributed triangularly between -1 and 1*/
+        max_value = (1 << (framelist->bits_per_sample - 1)) - 1;
+        min_value = -(1 << (framelist->bits_per_sample - 1));
+
+        for (i = 0; i < framelist->samples_length; i++) {
+            if (noise_bits == 0) {
+                noise = pcmconverter_random();
+                noise_bits = 64;
+            }
+            output->samples[i] =
+                MIN(MAX(framelist->samples[i] +
+                        (int)(noise & 1) - (int)((noise >> 1) & 1),
+                        min_value),
+                    max_value);
+            noise >>= 2;
+            noise_bits -= 2;
+        }
+    }
+
+    return (PyObject*)output;
+}
+
+static PyObject*
+pcmconverter_mix_channels(PyObject *dummy, PyObject *args)
+{
+    PyObject *framelist_obj;
+    PyObject *matrix;
+    pcm_FrameList *framelist;
+    pcm_FrameList *output;
+    Py_ssize_t output_channels;
+    struct mix_term *terms;
+    unsigned *term_counts;
+    int max_value;
+    int min_value;
+    unsigned frame;
+    unsigned channel;
+    int *samples;
+    unsigned i;
+
+    if (!PyArg_ParseTuple(args, "OO", &framelist_obj, &matrix))
+        return NULL;
+
+    if ((framelist = pcmconverter_as_FrameList(framelist_obj)) == NULL)
+        return NULL;
+
+    if ((output_channels = PySequence_Length(matrix)) == -1) {
+        return NULL;
+    } else if (output_channels < 1) {
+        PyErr_SetString(PyExc_ValueError,
+                        "matrix must have at least 1 row");
+        return NULL;
+    }
+
+    terms = malloc(sizeof(struct mix_term) *
+                   output_channels * framelist->channels);
+    term_counts = malloc(sizeof(unsigned) * output_channels);
+
+    if (pcmconverter_parse_matrix(matrix,
+                                  framelist->channels,
+                                  (unsigned)output_channels,
+                                  terms,
+                                  term_counts)) {
+        free(terms);
+        free(term_counts);
+        return NULL;
+    }
+
+    if ((output = pcmconverter_copy_attributes(framelist)) == NULL) {
+        free(terms);
+        free(term_counts);
+        return NULL;
+    }
+
+    output->channels = (unsigned)output_channels;
+    if ((samples = realloc(output->samples,
+                           sizeof(int) *
+                           MAX(framelist->frames * output->channels,
+                               1))) == NULL) {
+        free(terms);
+        free(term_counts);
+        Py_DECREF(output);
+        return PyErr_NoMemory();
+    }
+    output->samples = samples;
+    output->samples_length = framelist->frames * output->channels;
+
+    max_value = (1 << (framelist->bits_per_sample - 1)) - 1;
+    min_value = -(1 << (framelist->bits_per_sample - 1));
+
+    for (frame = 0; frame < framelist->frames; frame++) {
+        const int *input = framelist->samples + (frame * framelist->channels);
+        int *mixed = output->samples + (frame * output->channels);
+
+        for (channel = 0; channel < output->channels; channel++) {
+            const struct mix_term *row =
+                terms + (channel * framelist->channels);
+
+            if ((term_counts[channel] == 1) && (row[0].coefficient == 1.0)) {
+                /*a channel copied as-is needs no rounding or clipping*/
+                mixed[channel] = input[row[0].channel];
+            } else {
+                double sample = 0.0;
+                for (i = 0; i < term_counts[channel]; i++)
+                    sample += row[i].coefficient * input[row[i].channel];
+                sample = round(sample);
+                mixed[channel] = (int)MIN(MAX(sample, min_value), max_value);
+            }
+        }
+    }
+
+    free(terms);
+    free(term_counts);
+    return (PyObject*)output;
+}
+
+static PyObject*
+BufferedPCMReader_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
+{
+    pcmconverter_BufferedPCMReader *self;
+
+    self = (pcmconverter_BufferedPCMReader *)type->tp_alloc(type, 0);
+
+    return (PyObject *)self;
+}
+
+int
+BufferedPCMReader_init(pcmconverter_BufferedPCMReader *self,
+                       PyObject *args, PyObject *kwds)
+{
+    PyObject *pcmreader;
+    PyObject *attr;
+    long values[4];
+    const char *names[] = {"sample_rate",
+                           "channels",
+                           "channel_mask",
+                           "bits_per_sample"};
+    int i;
+
+    self->pcmreader = NULL;
+    self->ring = NULL;
+    self->capacity = 0;
+    self->start = 0;
+    self->length = 0;
+    self->reader_finished = 0;
+
+    if (!PyArg_ParseTuple(args, "O", &pcmreader))
+        return -1;
+
+    for (i = 0; i < 4; i++) {
+        if ((attr = PyObject_GetAttrString(pcmreader, names[i])) == NULL)
+            return -1;
+        values[i] = PyInt_AsLong(attr);
+        Py_DECREF(attr);
+        if ((values[i] == -1) && PyErr_Occurred())
+            return -1;
+    }
+
+    self->sample_rate = (int)values[0];
+    self->channels = (int)values[1];
+    self->channel_mask = (int)values[2];
+    self->bits_per_sample = (int)values[3];
+
+    if (self->channels < 1) {
+        PyErr_SetString(PyExc_ValueError, "channels must be > 0");
+        return -1;
+    }
+    if ((self->bits_per_sample != 8) &&
+        (self->bits_per_sample != 16) &&
+        (self->bits_per_sample != 24)) {
+        PyErr_SetString(PyExc_ValueError,
+                        "bits_per_sample must be 8, 16 or 24");
+        return -1;
+    }
+
+    Py_INCREF(pcmreader);
+    self->pcmreader = pcmreader;
+
+    return 0;
+}
+
+void
+BufferedPCMReader_dealloc(pcmconverter_BufferedPCMReader *self)
+{
+    free(self->ring);
+    Py_XDECREF(self->pcmreader);
+    self->ob_type->tp_free((PyObject*)self);
+}
+
+static PyObject*
+BufferedPCMReader_sample_rate(pcmconverter_BufferedPCMReader *self,
+                              void *closure)
+{
+    return Py_BuildValue("i", self->sample_rate);
+}
+
+static PyObject*
+BufferedPCMReader_channels(pcmconverter_BufferedPCMReader *self,
+                           void *closure)
+{
+    return Py_BuildValue("i", self->channels);
+}
+
+static PyObject*
+BufferedPCMReader_channel_mask(pcmconverter_BufferedPCMReader *self,
+                               void *closure)
+{
+    return Py_BuildValue("i", self->channel_mask);
+}
+
+static PyObject*
+BufferedPCMReader_bits_per_sample(pcmconverter_BufferedPCMReader *self,
+                                  void *closure)
+{
+    return Py_BuildValue("i", self->bits_per_sample);
+}
+
+static PyObject*
+BufferedPCMReader_read(pcmconverter_BufferedPCMReader *self, PyObject *args)
+{
+    int bytes;
+    const int bytes_per_frame = (self->channels *
+                                 (self->bits_per_sample / 8));
+    unsigned frames;
+    unsigned head;
+    pcm_FrameList *output;
+    int *samples;
+
+    if (!PyArg_ParseTuple(args, "i", &bytes))
+        return NULL;
+
+    if (self->pcmreader == NULL) {
+        PyErr_SetString(PyExc_ValueError, "cannot read from closed stream");
+        return NULL;
+    }
+
+    /*like FrameList.frame_count(), always return at least 1 frame*/
+    frames = (bytes >= bytes_per_frame) ? bytes / bytes_per_frame : 1;
+
+    if (BufferedPCMReader_fill(self, frames))
+        return NULL;
+
+    frames = MIN(frames, self->length);
+
+    if ((output = (pcm_FrameList*)PyObject_CallMethod(pcm_module,
+                                                      "__blank__",
+                                                      NULL)) == NULL)
+        return NULL;
+
+    /*the old samples are kept for the FrameList to free
+      if they can't be resized*/
+    if ((samples = realloc(output->samples,
+                           sizeof(int) *
+                           MAX(frames * self->channels, 1))) == NULL) {
+        Py_DECREF(output);
+        return PyErr_NoMemory();
+    }
+
+    output->frames = frames;
+    output->channels = self->channels;
+    output->bits_per_sample = self->bits_per_sample;
+    output->samples_length = frames * self->channels;
+    output->samples = samples;
+
+    if (frames == 0)
+        return (PyObject*)output;
+
+    /*copy the oldest buffered frames to the output FrameList
+      in up to two pieces, depending on whether they wrap around*/
+    head = MIN(frames, self->capacity - self->start);
+    memcpy(output->samples,
+           self->ring + (self->start * self->channels),
+           head * self->channels * sizeof(int));
+    memcpy(output->samples + (head * self->channels),
+           self->ring,
+           (frames - head) * self->channels * sizeof(int));
+
+    self->start = (self->start + frames) % self->capacity;
+    self->length -= frames;
+
+    return (PyObject*)output;
+}
+
+static PyObject*
+BufferedPCMReader_close(pcmconverter_BufferedPCMReader *self, PyObject *args)
+{
+    PyObject *result;
+
+    if (self->pcmreader == NULL) {
+        Py_INCREF(Py_None);
+        return Py_None;
+    }
+
+    free(self->ring);
+    self->ring = NULL;
+    self->capacity = 0;
+    self->start = 0;
+    self->length = 0;
+
+    result = PyObject_CallMethod(self->pcmreader, "close", NULL);
+    Py_DECREF(self->pcmreader);
+    self->pcmreader = NULL;
+    return result;
+}
+
+static int
+BufferedPCMReader_fill(pcmconverter_BufferedPCMReader *self, unsigned frames)
+{
+    const int bytes_per_frame = (self->channels *
+                                 (self->bits_per_sample / 8));
+    PyObject *framelist_obj;
+    pcm_FrameList *framelist;
+    unsigned end;
+    unsigned tail;
+
+    while ((self->length < frames) && (!self->reader_finished)) {
+        /*request as many bytes as we're short,
+          but no fewer than audiotools.BUFFER_SIZE*/
+        if ((framelist_obj =
+             PyObject_CallMethod(self->pcmreader, "read", "i",
+                                 MAX((int)(frames - self->length) *
+                                     bytes_per_frame,
+                                     BUFFER_SIZE))) == NULL)
+            return 1;
+
+        if ((framelist = pcmconverter_as_FrameList(framelist_obj)) == NULL) {
+            Py_DECREF(framelist_obj);
+            return 1;
+        }
+
+        if (framelist->frames == 0) {
+            self->reader_finished = 1;
+            Py_DECREF(framelist_obj);
+            break;
+        }
+
+        if ((framelist->channels != self->channels) ||
+            (framelist->bits_per_sample != self->bits_per_sample)) {
+            PyErr_SetString(PyExc_ValueError,
+                            "FrameList attributes do not match reader's");
+            Py_DECREF(framelist_obj);
+            return 1;
+        }
+
+        if (BufferedPCMReader_reserve(self,
+                                      self->length + framelist->frames)) {
+            Py_DECREF(framelist_obj);
+            return 1;
+        }
+
+        /*append the new frames to the end of the ring
+          in up to two pieces, depending on whether they wrap around*/
+        end = (self->start + self->length) % self->capacity;
+        tail = MIN(framelist->frames, self->capacity - end);
+        memcpy(self->ring + (end * self->channels),
+               framelist->samples,
+               tail * self->channels * sizeof(int));
+        memcpy(self->ring,
+               framelist->samples + (tail * self->channels),
+               (framelist->frames - tail) * self->channels * sizeof(int));
+        self->length += framelist->frames;
+
+        Py_DECREF(framelist_obj);
+    }
+
+    return 0;
+}
+
+static int
+BufferedPCMReader_reserve(pcmconverter_BufferedPCMReader *self,
+                          unsigned frames)
+{
+    unsigned capacity;
+    unsigned wrapped;
+    int *ring;
+
+    if (frames <= self->capacity)
+        return 0;
+
+    for (capacity = MAX(self->capacity, 4096); capacity < frames;)
+        capacity *= 2;
+
+    /*on failure, the old ring and its buffered frames are left as-is*/
+    if ((ring = realloc(self->ring,
+                        capacity * self->channels * sizeof(int))) == NULL) {
+        PyErr_NoMemory();
+        return 1;
+    }
+    self->ring = ring;
+
+    /*if the buffered frames wrapped around the end of the old ring,
+      move the wrapped portion past the old end
+      so they're contiguous again*/
+    if ((self->start + self->length) > self->capacity) {
+        wrapped = (self->start + self->length) - self->capacity;
+        memcpy(self->ring + (self->capacity * self->channels),
+               self->ring,
+               wrapped * self->channels * sizeof(int));
+    }
+
+    self->capacity = capacity;
+    return 0;
+}
+
+static pcm_FrameList*
+pcmconverter_copy_attributes(pcm_FrameList *framelist)
+{
+    pcm_FrameList *output;
+    int *samples;
+
+    if ((output = (pcm_FrameList*)PyObject_CallMethod(pcm_module,
+                                                      "__blank__",
+                                                      NULL)) == NULL)
+        return NULL;
+
+    output->frames = framelist->frames;
+    output->channels = framelist->channels;
+    output->bits_per_sample = framelist->bits_per_sample;
+    if ((samples = realloc(output->samples,
+                           sizeof(int) *
+                           MAX(framelist->samples_length, 1))) == NULL) {
+        Py_DECREF(output);
+        PyErr_NoMemory();
+        return NULL;
+    }
+    output->samples_length = framelist->samples_length;
+    output->samples = samples;
+
+    return output;
+}
+
+static pcm_FrameList*
+pcmconverter_as_FrameList(PyObject *obj)
+{
+    if (obj->ob_type == (PyTypeObject*)framelist_type) {
+        return (pcm_FrameList*)obj;
+    } else {
+        PyErr_SetString(PyExc_TypeError, "argument must be a FrameList");
+        return NULL;
+    }
+}
+
+static int
+pcmconverter_parse_matrix(PyObject *matrix,
+                          unsigned input_channels,
+                          unsigned output_channels,
+                          struct mix_term *terms,
+                          unsigned *term_counts)
+{
+    unsigned channel;
+    unsigned i;
+
+    for (channel = 0; channel < output_channels; channel++) {
+        PyObject *row;
+        PyObject *coefficient_obj;
+        double coefficient;
+
+        if ((row = PySequence_GetItem(matrix, channel)) == NULL)
+            return 1;
+        if (PySequence_Length(row) != (Py_ssize_t)input_channels) {
+            Py_DECREF(row);
+            if (!PyErr_Occurred())
+                PyErr_SetString(PyExc_ValueError,
+                                "each matrix row must have "
+                                "one value per input channel");
+            return 1;
+        }
+
+        term_counts[channel] = 0;
+        for (i = 0; i < input_channels; i++) {
+            if ((coefficient_obj = PySequence_GetItem(row, i)) == NULL) {
+                Py_DECREF(row);
+                return 1;
+            }
+            coefficient = PyFloat_AsDouble(coefficient_obj);
+            Py_DECREF(coefficient_obj);
+            if ((coefficient == -1.0) && PyErr_Occurred()) {
+                Py_DECREF(row);
+                return 1;
+            }
+
+            /*only non-zero coefficients need to be summed*/
+            if (coefficient != 0.0) {
+                struct mix_term *term =
+                    terms + (channel * input_channels) + term_counts[channel];
+                term->channel = i;
+                term->coefficient = coefficient;
+                term_counts[channel]++;
+            }
+        }
+        Py_DECREF(row);
+    }
+
+    return 0;
+}
+
+static uint64_t
+pcmconverter_random(void)
+{
+    random_state ^= random_state >> 12;
+    random_state ^= random_state << 25;
+    random_state ^= random_state >> 27;
+    return random_state * 0x2545F4914F6CDD1DULL;
+}
+
+PyMODINIT_FUNC
+initpcmconverter(void)
+{
+    PyObject* m;
+    PyObject* os_module;
+    PyObject* seed_obj;
+    char* seed;
+    Py_ssize_t seed_length;
+    Py_ssize_t i;
+
+    pcmconverter_BufferedPCMReaderType.tp_new = BufferedPCMReader_new;
+    if (PyType_Ready(&pcmconverter_BufferedPCMReaderType) < 0)
+        return;
+
+    m = Py_InitModule3("pcmconverter", module_methods,
+                       "A PCM FrameList conversion module.");
+    if (m == NULL)
+        return;
+
+    Py_INCREF(&pcmconverter_BufferedPCMReaderType);
+    PyModule_AddObject(m, "BufferedPCMReader",
+                       (PyObject *)&pcmconverter_BufferedPCMReaderType);
+
+    if ((pcm_module = PyImport_ImportModule("audiotools.pcm")) == NULL)
+        return;
+
+    if ((framelist_type = PyObject_GetAttrString(pcm_module,
+                                                 "FrameList")) == NULL)
+        return;
+
+    /*seed the PRNG from os.urandom, if possible,
+      or from the current time if not*/
+    random_state ^= (uint64_t)time(NULL);
+    if ((os_module = PyImport_ImportModule("os")) != NULL) {
+        if ((seed_obj = PyObject_CallMethod(os_module,
+                                            "urandom", "i", 8)) != NULL) {
+            if (PyString_AsStringAndSize(seed_obj,
+                                         &seed, &seed_length) == 0) {
+                for (i = 0; i < seed_length; i++)
+                    random_state ^= ((uint64_t)(uint8_t)seed[i]) << (i * 8);
+            }
+            Py_DECREF(seed_obj);
+        }
+        Py_DECREF(os_module);
+    }
+    PyErr_Clear();
+
+    if (random_state == 0)
+        random_state = 0x9E3779B97F4A7C15ULL;
+}
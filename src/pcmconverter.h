@@ -0,0 +1,218 @@
+#include <Python.h>
+#include <stdint.h>
+#include "pcm.h"
+
+/********************************************************
+ Audio Tools, a module and set of tools for manipulating audio data
+ Copyright (C) 2007-2012  Brian Langenberger
+
+ This program is free software; you can redistribute it and/or modify
+ it under the terms of the GNU General Public License as published by
+ the Free Software Foundation; either version 2 of the License, or
+ (at your option) any later version.
+
+ This program is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU General Public License for more details.
+
+ You should have received a copy of the GNU General Public License
+ along with this program; if not, write to the Free Software
+ Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+*******************************************************/
+
+/*pcmconverter.apply_gain(framelist, multiplier) -> FrameList*/
+static PyObject*
+pcmconverter_apply_gain(PyObject *dummy, PyObject *args);
+
+/*pcmconverter.add_dither(framelist, triangular) -> FrameList*/
+static PyObject*
+pcmconverter_add_dither(PyObject *dummy, PyObject *args);
+
+/*pcmconverter.mix_channels(framelist, matrix) -> FrameList*/
+static PyObject*
+pcmconverter_mix_channels(PyObject *dummy, PyObject *args);
+
+PyMethodDef module_methods[] = {
+    {"apply_gain", (PyCFunction)pcmconverter_apply_gain,
+     METH_VARARGS,
+     "apply_gain(framelist, multiplier) -> FrameList -- "
+     "multiplies each sample, rounding and clipping the results"},
+    {"add_dither", (PyCFunction)pcmconverter_add_dither,
+     METH_VARARGS,
+     "add_dither(framelist, triangular) -> FrameList -- "
+     "applies rectangular or triangular white noise to the lowest bit"},
+    {"mix_channels", (PyCFunction)pcmconverter_mix_channels,
+     METH_VARARGS,
+     "mix_channels(framelist, matrix) -> FrameList -- "
+     "builds each output channel from a weighted sum of input channels"},
+    {NULL}
+};
+
+typedef struct {
+    PyObject_HEAD
+
+    PyObject* pcmreader;
+    int sample_rate;
+    int channels;
+    int channel_mask;
+    int bits_per_sample;
+
+    /*a ring of interleaved samples, "capacity" PCM frames long*/
+    int* ring;
+    unsigned capacity;
+    unsigned start;  /*index of the first buffered frame in the ring*/
+    unsigned length; /*the number of buffered frames*/
+
+    int reader_finished;
+} pcmconverter_BufferedPCMReader;
+
+static PyObject*
+BufferedPCMReader_new(PyTypeObject *type, PyObject *args, PyObject *kwds);
+
+int
+BufferedPCMReader_init(pcmconverter_BufferedPCMReader *self,
+                       PyObject *args, PyObject *kwds);
+
+void
+BufferedPCMReader_dealloc(pcmconverter_BufferedPCMReader *self);
+
+static PyObject*
+BufferedPCMReader_sample_rate(pcmconverter_BufferedPCMReader *self,
+                              void *closure);
+
+static PyObject*
+BufferedPCMReader_channels(pcmconverter_BufferedPCMReader *self,
+                           void *closure);
+
+static PyObject*
+BufferedPCMReader_channel_mask(pcmconverter_BufferedPCMReader *self,
+                               void *closure);
+
+static PyObject*
+BufferedPCMReader_bits_per_sample(pcmconverter_BufferedPCMReader *self,
+                                  void *closure);
+
+/*BufferedPCMReader.read(bytes) -> FrameList*/
+static PyObject*
+BufferedPCMReader_read(pcmconverter_BufferedPCMReader *self, PyObject *args);
+
+/*BufferedPCMReader.close() -> None*/
+static PyObject*
+BufferedPCMReader_close(pcmconverter_BufferedPCMReader *self, PyObject *args);
+
+/*reads FrameLists from the wrapped PCMReader into the ring
+  until at least "frames" frames are buffered or the reader is finished
+
+  returns 0 on success, or 1 with an exception set on error*/
+static int
+BufferedPCMReader_fill(pcmconverter_BufferedPCMReader *self, unsigned frames);
+
+/*ensures the ring can hold at least "frames" frames,
+  preserving any buffered samples
+
+  returns 0 on success, or 1 with MemoryError set
+  if the ring can't be enlarged*/
+static int
+BufferedPCMReader_reserve(pcmconverter_BufferedPCMReader *self,
+                          unsigned frames);
+
+PyGetSetDef BufferedPCMReader_getseters[] = {
+    {"sample_rate",
+     (getter)BufferedPCMReader_sample_rate, NULL, "sample rate", NULL},
+    {"channels",
+     (getter)BufferedPCMReader_channels, NULL, "channels", NULL},
+    {"channel_mask",
+     (getter)BufferedPCMReader_channel_mask, NULL, "channel mask", NULL},
+    {"bits_per_sample",
+     (getter)BufferedPCMReader_bits_per_sample, NULL, "bits per sample", NULL},
+    {NULL}
+};
+
+PyMethodDef BufferedPCMReader_methods[] = {
+    {"read", (PyCFunction)BufferedPCMReader_read,
+     METH_VARARGS,
+     "read(bytes) -> FrameList -- "
+     "reads as close to \"bytes\" number of bytes without going over"},
+    {"close", (PyCFunction)BufferedPCMReader_close,
+     METH_NOARGS,
+     "close() -- closes the sub-pcmreader and frees our internal buffer"},
+    {NULL}
+};
+
+PyTypeObject pcmconverter_BufferedPCMReaderType = {
+    PyObject_HEAD_INIT(NULL)
+    0,                         /*ob_size*/
+    "pcmconverter.BufferedPCMReader", /*tp_name*/
+    sizeof(pcmconverter_BufferedPCMReader), /*tp_basicsize*/
+    0,                         /*tp_itemsize*/
+    (destructor)BufferedPCMReader_dealloc, /*tp_dealloc*/
+    0,                         /*tp_print*/
+    0,                         /*tp_getattr*/
+    0,                         /*tp_setattr*/
+    0,                         /*tp_compare*/
+    0,                         /*tp_repr*/
+    0,                         /*tp_as_number*/
+    0,                         /*tp_as_sequence*/
+    0,                         /*tp_as_mapping*/
+    0,                         /*tp_hash */
+    0,                         /*tp_call*/
+    0,                         /*tp_str*/
+    0,                         /*tp_getattro*/
+    0,                         /*tp_setattro*/
+    0,                         /*tp_as_buffer*/
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE, /*tp_flags*/
+    "A PCMReader which reads exact counts of bytes", /* tp_doc */
+    0,                         /* tp_traverse */
+    0,                         /* tp_clear */
+    0,                         /* tp_richcompare */
+    0,                         /* tp_weaklistoffset */
+    0,                         /* tp_iter */
+    0,                         /* tp_iternext */
+    BufferedPCMReader_methods, /* tp_methods */
+    0,                         /* tp_members */
+    BufferedPCMReader_getseters, /* tp_getset */
+    0,                         /* tp_base */
+    0,                         /* tp_dict */
+    0,                         /* tp_descr_get */
+    0,                         /* tp_descr_set */
+    0,                         /* tp_dictoffset */
+    (initproc)BufferedPCMReader_init, /* tp_init */
+    0,                         /* tp_alloc */
+    BufferedPCMReader_new,     /* tp_new */
+};
+
+/*returns a new, uninitialized FrameList with the same attributes
+  as "framelist", or NULL with an exception set on error*/
+static pcm_FrameList*
+pcmconverter_copy_attributes(pcm_FrameList *framelist);
+
+/*given a Python object, returns it as a FrameList
+  or NULL with an exception set if it isn't one*/
+static pcm_FrameList*
+pcmconverter_as_FrameList(PyObject *obj);
+
+/*a single non-zero coefficient of a mixing matrix row*/
+struct mix_term {
+    unsigned channel;
+    double coefficient;
+};
+
+/*parses a mixing matrix of "output_channels" rows,
+  each a sequence of "input_channels" floats,
+  into "terms" and "term_counts"
+  where "terms" holds input_channels terms per row
+  and "term_counts" holds the number of non-zero terms per row
+
+  returns 0 on success, or 1 with an exception set on error*/
+static int
+pcmconverter_parse_matrix(PyObject *matrix,
+                          unsigned input_channels,
+                          unsigned output_channels,
+                          struct mix_term *terms,
+                          unsigned *term_counts);
+
+/*returns the next value from a xorshift64* pseudo-random
+  number generator, which is more than adequate for dithering*/
+static uint64_t
+pcmconverter_random(void);
@@ -48,6 +48,10 @@ PyMethodDef ReplayGain_methods[] = {
      METH_NOARGS,"Returns a (title gain,title peak) tuple and resets"},
     {"album_gain",(PyCFunction)ReplayGain_album_gain,
      METH_NOARGS,"Returns an (album gain,album peak) tuple"},
+    {"album_histogram",(PyCFunction)ReplayGain_album_histogram,
+     METH_NOARGS,"Returns an (album histogram,album peak) tuple"},
+    {"add_album_histogram",(PyCFunction)ReplayGain_add_album_histogram,
+     METH_VARARGS,"Merges an (album histogram,album peak) pair into album"},
     {NULL}
 };
 
@@ -196,6 +200,7 @@ ReplayGain_update(replaygain_ReplayGain *self, PyObject *args)
     unsigned sample;
     double peak;
     int32_t peak_shift;
+    gain_calc_status status;
 
     /*receive a (presumably) FrameList from our arguments*/
     if (!PyArg_ParseTuple(args,"O",&framelist_obj))
@@ -292,12 +297,16 @@ ReplayGain_update(replaygain_ReplayGain *self, PyObject *args)
         goto error;
     }
 
-    /*perform actual gain analysis on channels*/
-    if (ReplayGain_analyze_samples(self,
-                                   channel_l_buffer,
-                                   channel_r_buffer,
-                                   channel_l->frames,
-                                   2) == GAIN_ANALYSIS_ERROR) {
+    /*perform actual gain analysis on channels,
+      which touches no Python objects*/
+    Py_BEGIN_ALLOW_THREADS
+    status = ReplayGain_analyze_samples(self,
+                                        channel_l_buffer,
+                                        channel_r_buffer,
+                                        channel_l->frames,
+                                        2);
+    Py_END_ALLOW_THREADS
+    if (status == GAIN_ANALYSIS_ERROR) {
         PyErr_SetString(PyExc_ValueError,"ReplayGain calculation error");
         goto error;
     }
@@ -353,6 +362,67 @@ ReplayGain_album_gain(replaygain_ReplayGain *self)
     }
 }
 
+PyObject*
+ReplayGain_album_histogram(replaygain_ReplayGain *self)
+{
+    const Py_ssize_t size = sizeof(self->B) / sizeof(*(self->B));
+    PyObject *histogram;
+    PyObject *count;
+    Py_ssize_t i;
+
+    if ((histogram = PyList_New(size)) == NULL)
+        return NULL;
+
+    for (i = 0; i < size; i++) {
+        if ((count = PyLong_FromUnsignedLong(self->B[i])) == NULL) {
+            Py_DECREF(histogram);
+            return NULL;
+        }
+        PyList_SET_ITEM(histogram, i, count);
+    }
+
+    return Py_BuildValue("(N,d)", histogram, self->album_peak);
+}
+
+PyObject*
+ReplayGain_add_album_histogram(replaygain_ReplayGain *self, PyObject *args)
+{
+    const Py_ssize_t size = sizeof(self->B) / sizeof(*(self->B));
+    PyObject *histogram_obj;
+    PyObject *histogram;
+    double peak;
+    unsigned long count;
+    Py_ssize_t i;
+
+    if (!PyArg_ParseTuple(args, "Od", &histogram_obj, &peak))
+        return NULL;
+
+    if ((histogram = PySequence_Fast(histogram_obj,
+                                     "histogram must be a sequence")) == NULL)
+        return NULL;
+
+    if (PySequence_Fast_GET_SIZE(histogram) != size) {
+        PyErr_SetString(PyExc_ValueError, "invalid histogram length");
+        Py_DECREF(histogram);
+        return NULL;
+    }
+
+    for (i = 0; i < size; i++) {
+        count = PyInt_AsUnsignedLongMask(
+            PySequence_Fast_GET_ITEM(histogram, i));
+        if ((count == (unsigned long)-1) && PyErr_Occurred()) {
+            Py_DECREF(histogram);
+            return NULL;
+        }
+        self->B[i] += (uint32_t)count;
+    }
+
+    Py_DECREF(histogram);
+    self->album_peak = MAX(self->album_peak, peak);
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
 
 PyGetSetDef ReplayGainReader_getseters[] = {
     {"sample_rate",
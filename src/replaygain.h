@@ -95,6 +95,12 @@ ReplayGain_title_gain(replaygain_ReplayGain *self);
 PyObject*
 ReplayGain_album_gain(replaygain_ReplayGain *self);
 
+PyObject*
+ReplayGain_album_histogram(replaygain_ReplayGain *self);
+
+PyObject*
+ReplayGain_add_album_histogram(replaygain_ReplayGain *self, PyObject *args);
+
 gain_calc_status
 ReplayGain_analyze_samples(replaygain_ReplayGain* self,
                            const double* left_samples,
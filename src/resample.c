@@ -80,7 +80,9 @@ initresample(void)
 void
 Resampler_dealloc(resample_Resampler* self)
 {
-    src_delete(self->src_state);
+    if (self->src_state != NULL)
+        src_delete(self->src_state);
+    free(self->data_in);
     Py_TYPE(self)->tp_free((PyObject*)self);
 }
 
@@ -89,7 +91,9 @@ Resampler_dealloc(resample_Resampler* self)
 void
 Resampler_dealloc(resample_Resampler* self)
 {
-    src_delete(self->src_state);
+    if (self->src_state != NULL)
+        src_delete(self->src_state);
+    free(self->data_in);
     Py_XDECREF(self->pcm_module);
     self->ob_type->tp_free((PyObject*)self);
 }
@@ -103,7 +107,12 @@ Resampler_new(PyTypeObject *type,
     resample_Resampler *self;
 
     self = (resample_Resampler *)type->tp_alloc(type, 0);
+    self->src_state = NULL;
     self->pcm_module = NULL;
+    self->data_in = NULL;
+    self->data_in_size = 0;
+    self->gain = 1.0;
+    self->peak = 0.0;
 
     return (PyObject *)self;
 }
@@ -116,8 +125,9 @@ Resampler_init(resample_Resampler *self,
     int channels;
     int quality;
     double ratio;
+    double gain = 1.0;
 
-    if (!PyArg_ParseTuple(args, "idi", &channels, &ratio, &quality))
+    if (!PyArg_ParseTuple(args, "idi|d", &channels, &ratio, &quality, &gain))
         return -1;
 
     if ((self->pcm_module = PyImport_ImportModule("audiotools.pcm")) == NULL)
@@ -134,9 +144,16 @@ Resampler_init(resample_Resampler *self,
         return -1;
     }
 
-    self->src_state = src_new(0, channels, &error);
+    /*quality doubles as libsamplerate's converter type,
+      from SRC_SINC_BEST_QUALITY (0) to SRC_LINEAR (4)*/
+    if ((self->src_state = src_new(quality, channels, &error)) == NULL) {
+        PyErr_SetString(PyExc_ValueError, src_strerror(error));
+        return -1;
+    }
     self->channels = channels;
     self->ratio = ratio;
+    self->gain = gain;
+    self->peak = 0.0;
 
     return 0;
 }
@@ -158,7 +175,14 @@ Resampler_process(resample_Resampler* self, PyObject *args)
 
     static float data_out[OUTPUT_SAMPLES_LENGTH];
 
-    Py_ssize_t i, j;
+    const double *samples_in;
+    float *data_in;
+    const float *data_in_end;
+    double *samples_out;
+    double gain;
+    double peak;
+    Py_ssize_t i;
+    Py_ssize_t samples_length;
 
     PyObject *framelist_type_obj = NULL;
     pcm_FloatFrameList *framelist;
@@ -166,8 +190,6 @@ Resampler_process(resample_Resampler* self, PyObject *args)
     pcm_FloatFrameList *unprocessed_samples = NULL;
     PyObject *toreturn;
 
-    src_data.data_in = NULL;
-
     /*grab (framelist,last) passed in from the method call*/
     if (!PyArg_ParseTuple(args, "Oi", &framelist_obj, &last))
         goto error;
@@ -191,23 +213,31 @@ Resampler_process(resample_Resampler* self, PyObject *args)
         goto error;
     }
 
-    /*build SRC_DATA from our inputs*/
-    if ((src_data.data_in = malloc(framelist->samples_length *
-                                   sizeof(float))) == NULL) {
-        PyErr_SetString(PyExc_MemoryError, "out of memory");
-        goto error;
+    /*convert our input to floats in a buffer kept between calls
+      which only grows when a larger FrameList comes along*/
+    samples_length = framelist->samples_length;
+    if (samples_length > self->data_in_size) {
+        if ((data_in = realloc(self->data_in,
+                               samples_length * sizeof(float))) == NULL) {
+            PyErr_SetString(PyExc_MemoryError, "out of memory");
+            goto error;
+        }
+        self->data_in = data_in;
+        self->data_in_size = samples_length;
     }
+    data_in = self->data_in;
+    samples_in = framelist->samples;
+    for (i = 0; i < samples_length; i++)
+        data_in[i] = (float)samples_in[i];
 
+    /*build SRC_DATA from our inputs*/
+    src_data.data_in = data_in;
     src_data.data_out = data_out;
     src_data.input_frames = framelist->frames;
     src_data.output_frames = OUTPUT_SAMPLES_LENGTH / self->channels;
     src_data.end_of_input = last;
     src_data.src_ratio = self->ratio;
 
-    for (i = 0; i < framelist->samples_length; i++) {
-        src_data.data_in[i] = (float)framelist->samples[i];
-    }
-
     /*run src_process() on our self->SRC_STATE and SRC_DATA*/
     if ((processing_error = src_process(self->src_state, &src_data)) != 0) {
         /*some sort of processing error raises ValueError*/
@@ -245,24 +275,42 @@ Resampler_process(resample_Resampler* self, PyObject *args)
                 sizeof(double) * unprocessed_samples->samples_length);
 
 
-    /*successfully processed samples*/
-    for (i = 0; i < src_data.output_frames_gen * self->channels; i++) {
-        processed_samples->samples[i] = src_data.data_out[i];
+    /*successfully processed samples, scaled by our gain
+      with their absolute peak tracked alongside
+
+      both are plain passes over contiguous arrays
+      without any calls or early exits
+      so that the compiler is free to vectorize them*/
+    samples_out = processed_samples->samples;
+    samples_length = (Py_ssize_t)processed_samples->samples_length;
+    gain = self->gain;
+    if (gain == 1.0) {
+        for (i = 0; i < samples_length; i++)
+            samples_out[i] = data_out[i];
+    } else {
+        for (i = 0; i < samples_length; i++)
+            samples_out[i] = data_out[i] * gain;
     }
 
-    /*not-yet-successfully processed samples*/
-    for (i = src_data.input_frames_used * self->channels, j=0;
-         i < (src_data.input_frames * self->channels);
-         i++, j++) {
-        unprocessed_samples->samples[j] = src_data.data_in[i];
+    peak = self->peak;
+    for (i = 0; i < samples_length; i++) {
+        const double sample = samples_out[i];
+        const double magnitude = sample < 0.0 ? -sample : sample;
+        peak = magnitude > peak ? magnitude : peak;
     }
+    self->peak = peak;
+
+    /*not-yet-successfully processed samples*/
+    data_in_end = data_in + (src_data.input_frames * self->channels);
+    data_in += (src_data.input_frames_used * self->channels);
+    for (i = 0; data_in < data_in_end; i++)
+        unprocessed_samples->samples[i] = *data_in++;
 
 
     /*return those two arrays as a tuple*/
     toreturn = Py_BuildValue("(O,O)", processed_samples, unprocessed_samples);
 
     /*cleanup anything allocated*/
-    free(src_data.data_in);
     Py_DECREF(framelist_type_obj);
     Py_DECREF(processed_samples);
     Py_DECREF(unprocessed_samples);
@@ -270,11 +318,15 @@ Resampler_process(resample_Resampler* self, PyObject *args)
     return toreturn;
 
  error:
-    if (src_data.data_in != NULL)
-        free(src_data.data_in);
     Py_XDECREF(framelist_type_obj);
     Py_XDECREF(processed_samples);
     Py_XDECREF(unprocessed_samples);
 
     return NULL;
 }
+
+PyObject*
+Resampler_peak(resample_Resampler* self, PyObject *args)
+{
+    return PyFloat_FromDouble(self->peak);
+}
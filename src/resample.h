@@ -40,6 +40,10 @@ typedef struct {
     SRC_STATE *src_state;
     int channels;
     double ratio;
+    double gain;
+    double peak;
+    float *data_in;
+    Py_ssize_t data_in_size;
     PyObject *pcm_module;
 } resample_Resampler;
 
@@ -57,9 +61,14 @@ Resampler_init(resample_Resampler *self,
 PyObject*
 Resampler_process(resample_Resampler* self, PyObject *args);
 
+PyObject*
+Resampler_peak(resample_Resampler* self, PyObject *args);
+
 PyMethodDef Resampler_methods[] = {
     {"process", (PyCFunction)Resampler_process,
      METH_VARARGS, "Processes PCM samples into the new sample rate"},
+    {"peak", (PyCFunction)Resampler_peak,
+     METH_NOARGS, "Returns the largest absolute processed sample so far"},
     {NULL}
 };
 
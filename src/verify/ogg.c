@@ -28,7 +28,6 @@ verifymodule_ogg(PyObject *dummy, PyObject *args) {
     struct ogg_header header;
     uint8_t *data_buffer = NULL;
     int data_buffer_size = 0;
-    int i;
     uint32_t checksum;
 
     /*fixes a "may be used unitialized" warning*/
@@ -67,8 +66,9 @@ verifymodule_ogg(PyObject *dummy, PyObject *args) {
                     goto error;
                 }
 
-                for (i = 0; i < header.segment_length_total; i++)
-                    ogg_crc(data_buffer[i], &checksum);
+                checksum = ogg_crc_update(data_buffer,
+                                          header.segment_length_total,
+                                          checksum);
                 if (header.checksum != checksum) {
                     PyErr_SetString(PyExc_ValueError,
                                     "checksum mismatch in stream");
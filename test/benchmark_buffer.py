@@ -0,0 +1,136 @@
+#!/usr/bin/python
+
+#Audio Tools, a module and set of tools for manipulating audio data
+#Copyright (C) 2007-2012  Brian Langenberger
+
+#This program is free software; you can redistribute it and/or modify
+#it under the terms of the GNU General Public License as published by
+#the Free Software Foundation; either version 2 of the License, or
+#(at your option) any later version.
+
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU General Public License for more details.
+
+#You should have received a copy of the GNU General Public License
+#along with this program; if not, write to the Free Software
+#Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+
+#compares audiotools.BufferedPCMReader against the list-of-FrameLists
+#buffer it replaced, using the read patterns of encode_flac
+#(fixed block-sized reads) and pcm_split (large, uneven reads)
+#
+#the number of times each output sample is copied is counted
+#for the old buffer, where every read concatenates everything buffered
+#and splits off the remainder; the ring buffer copies each sample
+#exactly twice (once in, once out) regardless of read sizes
+
+import time
+import operator
+import audiotools
+from audiotools import pcm
+
+
+class ChunkReader:
+    """yields FrameLists of "chunk_size" PCM frames,
+    "total_frames" in total, regardless of the requested size"""
+
+    def __init__(self, total_frames, chunk_size, channels=2,
+                 bits_per_sample=16):
+        self.sample_rate = 44100
+        self.channels = channels
+        self.channel_mask = 0x3
+        self.bits_per_sample = bits_per_sample
+        self.total_frames = total_frames
+        self.chunk = pcm.from_list(range(chunk_size * channels),
+                                   channels, bits_per_sample, True)
+
+    def read(self, bytes):
+        if (self.total_frames >= self.chunk.frames):
+            self.total_frames -= self.chunk.frames
+            return self.chunk
+        else:
+            (chunk, remainder) = self.chunk.split(self.total_frames)
+            self.total_frames = 0
+            return chunk
+
+    def close(self):
+        pass
+
+
+class ListBufferedPCMReader:
+    """the previous BufferedPCMReader implementation,
+    which also counts the samples it copies"""
+
+    def __init__(self, pcmreader):
+        self.pcmreader = pcmreader
+        self.channels = pcmreader.channels
+        self.bits_per_sample = pcmreader.bits_per_sample
+        self.buffer = []
+        self.reader_finished = False
+        self.copied = 0
+
+    def read(self, bytes):
+        self.__fill__(bytes)
+        framelist = reduce(operator.concat, self.buffer,
+                           pcm.from_list([], self.channels,
+                                         self.bits_per_sample, True))
+        #concatenation copies every sample of every buffered FrameList
+        self.copied += len(framelist)
+        (output, remainder) = framelist.split(framelist.frame_count(bytes))
+        #splitting copies them all again
+        self.copied += len(framelist)
+        self.buffer = [remainder]
+        return output
+
+    def __fill__(self, bytes):
+        while ((sum(map(len, self.buffer)) *
+                (self.bits_per_sample / 8) < bytes) and
+               (not self.reader_finished)):
+            s = self.pcmreader.read(audiotools.BUFFER_SIZE)
+            if (len(s) > 0):
+                self.buffer.append(s)
+            else:
+                self.reader_finished = True
+
+    def close(self):
+        self.pcmreader.close()
+
+
+def drain(reader, read_frames, bytes_per_frame):
+    frames = 0
+    framelist = reader.read(read_frames * bytes_per_frame)
+    while (len(framelist) > 0):
+        frames += framelist.frames
+        framelist = reader.read(read_frames * bytes_per_frame)
+    return frames
+
+
+if (__name__ == '__main__'):
+    TOTAL_FRAMES = 44100 * 60 * 5
+
+    print "%-28s %10s %10s %18s" % ("pattern", "old (s)", "new (s)",
+                                    "old copies/sample")
+    for (name, chunk_size, read_frames) in [
+        ("encode_flac 4096 <- 262144", 262144, 4096),
+        ("encode_flac 4096 <- 1152", 1152, 4096),
+        ("encode_flac 1152 <- 4096", 4096, 1152),
+        ("pcm_split 441000 <- 4096", 4096, 441000)]:
+        old = ListBufferedPCMReader(ChunkReader(TOTAL_FRAMES, chunk_size))
+        start = time.time()
+        frames = drain(old, read_frames, 4)
+        old_time = time.time() - start
+        assert(frames == TOTAL_FRAMES)
+
+        new = audiotools.BufferedPCMReader(ChunkReader(TOTAL_FRAMES,
+                                                       chunk_size))
+        start = time.time()
+        frames = drain(new, read_frames, 4)
+        new_time = time.time() - start
+        assert(frames == TOTAL_FRAMES)
+
+        print "%-28s %10.3f %10.3f %18.1f" % (
+            name, old_time, new_time,
+            float(old.copied) / (TOTAL_FRAMES * 2))
+    print "(the ring buffer always makes 2.0 copies per sample)"
@@ -0,0 +1,88 @@
+#!/usr/bin/python
+
+#Audio Tools, a module and set of tools for manipulating audio data
+#Copyright (C) 2007-2012  Brian Langenberger
+
+#This program is free software; you can redistribute it and/or modify
+#it under the terms of the GNU General Public License as published by
+#the Free Software Foundation; either version 2 of the License, or
+#(at your option) any later version.
+
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU General Public License for more details.
+
+#You should have received a copy of the GNU General Public License
+#along with this program; if not, write to the Free Software
+#Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+#times decoding a FLAC file in each of FlacDecoder's modes
+#and verifying an Ogg stream of the same size,
+#all of which are dominated by checksumming for noisy input
+#
+#previously, each byte was checksummed by its own callback
+#rather than in bulk once a whole frame or page was read
+
+import sys
+import time
+import tempfile
+import audiotools
+import audiotools.decoders
+import audiotools.verify
+from audiotools.bitstream import BitstreamWriter
+from audiotools.__ogg__ import OggStreamWriter
+from test import EXACT_RANDOM_PCM_Reader
+
+
+def decode(filename, threads, mmap):
+    pcmreader = audiotools.decoders.FlacDecoder(filename, 0x3, 0,
+                                                threads, mmap)
+    audiotools.transfer_framelist_data(pcmreader, lambda f: None)
+    pcmreader.close()
+
+
+def verify(filename):
+    f = open(filename, "rb")
+    audiotools.verify.ogg(f)
+    f.close()
+
+
+if (__name__ == '__main__'):
+    if (len(sys.argv) > 1):
+        SECONDS = int(sys.argv[1])
+    else:
+        SECONDS = 60
+
+    flac = tempfile.NamedTemporaryFile(suffix=".flac")
+    ogg = tempfile.NamedTemporaryFile(suffix=".ogg")
+    try:
+        audiotools.FlacAudio.from_pcm(
+            flac.name,
+            EXACT_RANDOM_PCM_Reader(44100 * SECONDS, 44100, 2, 16, 0x3))
+
+        #wrap the FLAC file's bytes in Ogg pages
+        #so the Ogg verifier has a similar amount of data to check
+        data = open(flac.name, "rb").read()
+        writer = OggStreamWriter(BitstreamWriter(ogg.file, 1), 1)
+        for i in xrange(0, len(data), 0xFF00):
+            writer.write_page(0,
+                              list(writer.packet_to_segments(
+                                  data[i:i + 0xFF00]))[0:0xFF],
+                              False,
+                              i == 0,
+                              (i + 0xFF00) >= len(data))
+        ogg.flush()
+
+        print "%d seconds of 16-bit, 44.1kHz noise" % (SECONDS)
+        for (name, function, args) in [
+            ("FLAC stdio", decode, (flac.name, 1, False)),
+            ("FLAC mmap", decode, (flac.name, 1, True)),
+            ("FLAC stdio, 4 threads", decode, (flac.name, 4, False)),
+            ("FLAC mmap, 4 threads", decode, (flac.name, 4, True)),
+            ("Ogg verify", verify, (ogg.name,))]:
+            start = time.time()
+            function(*args)
+            print "%-24s %10.3f" % (name, time.time() - start)
+    finally:
+        flac.close()
+        ogg.close()
@@ -0,0 +1,64 @@
+#!/usr/bin/python
+
+#Audio Tools, a module and set of tools for manipulating audio data
+#Copyright (C) 2007-2012  Brian Langenberger
+
+#This program is free software; you can redistribute it and/or modify
+#it under the terms of the GNU General Public License as published by
+#the Free Software Foundation; either version 2 of the License, or
+#(at your option) any later version.
+
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU General Public License for more details.
+
+#You should have received a copy of the GNU General Public License
+#along with this program; if not, write to the Free Software
+#Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+#compares decoding FLAC, WavPack and ALAC files
+#read a byte at a time through stdio
+#against decoding them from memory-mapped files
+#
+#previously, every decoder read its file through stdio
+
+import sys
+import time
+import tempfile
+import audiotools
+from test import EXACT_RANDOM_PCM_Reader
+
+
+def decode(track, mmap):
+    audiotools.MMAP_DECODING = mmap
+    pcmreader = track.to_pcm()
+    audiotools.transfer_framelist_data(pcmreader, lambda f: None)
+    pcmreader.close()
+
+
+if (__name__ == '__main__'):
+    if (len(sys.argv) > 1):
+        SECONDS = int(sys.argv[1])
+    else:
+        SECONDS = 60
+
+    print "%d seconds of 16-bit, 44.1kHz audio" % (SECONDS)
+    print "%-10s %10s %10s" % ("format", "stdio", "mmap")
+    for audio_class in [audiotools.FlacAudio,
+                        audiotools.WavPackAudio,
+                        audiotools.ALACAudio]:
+        temp = tempfile.NamedTemporaryFile(suffix="." + audio_class.SUFFIX)
+        try:
+            track = audio_class.from_pcm(
+                temp.name,
+                EXACT_RANDOM_PCM_Reader(44100 * SECONDS, 44100, 2, 16, 0x3))
+
+            times = []
+            for mmap in [False, True]:
+                start = time.time()
+                decode(track, mmap)
+                times.append(time.time() - start)
+            print "%-10s %10.3f %10.3f" % (audio_class.NAME,
+                                           times[0], times[1])
+        finally:
+            temp.close()
@@ -0,0 +1,118 @@
+#!/usr/bin/python
+
+#Audio Tools, a module and set of tools for manipulating audio data
+#Copyright (C) 2007-2012  Brian Langenberger
+
+#This program is free software; you can redistribute it and/or modify
+#it under the terms of the GNU General Public License as published by
+#the Free Software Foundation; either version 2 of the License, or
+#(at your option) any later version.
+
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU General Public License for more details.
+
+#You should have received a copy of the GNU General Public License
+#along with this program; if not, write to the Free Software
+#Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+#compares downmixing a 5.1 channel FLAC file to stereo with PCMConverter
+#against decoding it alone
+#
+#previously, each output channel was built frame by frame in Python
+#from FrameList.channel() lists and floating point sums
+#while now a single mixing matrix is applied to each FrameList
+#by pcmconverter.mix_channels()
+
+import sys
+import time
+import tempfile
+import audiotools
+from audiotools import pcm
+from itertools import izip
+from test import EXACT_RANDOM_PCM_Reader
+
+
+class previous_downmixer:
+    """audiotools.__downmixer__ as it was before mix_channels()
+    for a 5.1 channel stream"""
+
+    def __init__(self, old_channel_mask):
+        old_channel_mask = audiotools.ChannelMask(old_channel_mask)
+        self.channels_to_keep = [
+            old_channel_mask.index(channel) for channel in
+            ["front_left", "front_right", "front_center",
+             "back_left", "back_right"]]
+
+    def convert(self, frame_list):
+        REAR_GAIN = 0.6
+        CENTER_GAIN = 0.7
+
+        (Lf, Rf, C, Lr, Rr) = [frame_list.channel(i) for i in
+                               self.channels_to_keep]
+
+        mono_rear = [0.7 * (Lr_i + Rr_i) for Lr_i, Rr_i in izip(Lr, Rr)]
+
+        converter = lambda x: int(round(x))
+
+        left_channel = pcm.from_list(
+            [converter(Lf_i +
+                       (REAR_GAIN * mono_rear_i) +
+                       (CENTER_GAIN * C_i))
+             for Lf_i, mono_rear_i, C_i in izip(Lf, mono_rear, C)],
+            1,
+            frame_list.bits_per_sample,
+            True)
+
+        right_channel = pcm.from_list(
+            [converter(Rf_i -
+                       (REAR_GAIN * mono_rear_i) +
+                       (CENTER_GAIN * C_i))
+             for Rf_i, mono_rear_i, C_i in izip(Rf, mono_rear, C)],
+            1,
+            frame_list.bits_per_sample,
+            True)
+
+        return pcm.from_channels([left_channel, right_channel])
+
+
+def decode(track):
+    return track.to_pcm()
+
+
+def downmix(track):
+    return audiotools.PCMConverter(track.to_pcm(),
+                                   track.sample_rate(),
+                                   2, 0x3,
+                                   track.bits_per_sample())
+
+
+def previous_downmix(track):
+    converter = downmix(track)
+    converter.conversions = [previous_downmixer(track.channel_mask())]
+    return converter
+
+
+if (__name__ == '__main__'):
+    if (len(sys.argv) > 1):
+        SECONDS = int(sys.argv[1])
+    else:
+        SECONDS = 60
+
+    temp = tempfile.NamedTemporaryFile(suffix=".flac")
+    try:
+        track = audiotools.FlacAudio.from_pcm(
+            temp.name,
+            EXACT_RANDOM_PCM_Reader(44100 * SECONDS, 44100, 6, 16, 0x3F))
+
+        print "%d seconds of 5.1 channel audio" % (SECONDS)
+        for (name, to_pcm) in [("decode only", decode),
+                               ("previous downmix", previous_downmix),
+                               ("current downmix", downmix)]:
+            start = time.time()
+            pcmreader = to_pcm(track)
+            audiotools.transfer_framelist_data(pcmreader, lambda f: None)
+            pcmreader.close()
+            print "%-24s %10.3f" % (name, time.time() - start)
+    finally:
+        temp.close()
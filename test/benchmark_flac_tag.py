@@ -0,0 +1,153 @@
+#!/usr/bin/python
+
+#Audio Tools, a module and set of tools for manipulating audio data
+#Copyright (C) 2007-2012  Brian Langenberger
+
+#This program is free software; you can redistribute it and/or modify
+#it under the terms of the GNU General Public License as published by
+#the Free Software Foundation; either version 2 of the License, or
+#(at your option) any later version.
+
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU General Public License for more details.
+
+#You should have received a copy of the GNU General Public License
+#along with this program; if not, write to the Free Software
+#Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+
+#compares bulk tracktag-style retagging of a directory of FLAC files
+#which have no PADDING, as files from some encoders don't,
+#by setting a growing comment on every file over several passes
+#
+#the previous FlacAudio.update_metadata() copied the audio stream
+#out to a temporary file and back again whenever PADDING ran out
+#and left no PADDING behind, so every pass rewrote every file twice over
+#the current one builds the new file in a single pass
+#and reserves FLAC_PADDING bytes, so later passes are done in place
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import audiotools
+from audiotools.__flac__ import Flac_PADDING, InvalidFLAC
+from test import EXACT_RANDOM_PCM_Reader
+
+
+def previous_update_metadata(self, metadata):
+    """FlacAudio.update_metadata() as it was before FLAC_PADDING"""
+
+    from audiotools.bitstream import BitstreamWriter
+    from audiotools.bitstream import BitstreamReader
+
+    self.__uncache_metadata__()
+
+    total_padding_size = sum(
+        [b.size() for b in metadata.get_blocks(Flac_PADDING.BLOCK_ID)])
+    metadata_delta = metadata.size() - self.metadata_length()
+
+    if ((total_padding_size > 0) and (metadata_delta <= total_padding_size)):
+        for padding in metadata.get_blocks(Flac_PADDING.BLOCK_ID):
+            if (metadata_delta > 0):
+                if (metadata_delta <= padding.length):
+                    padding.length -= metadata_delta
+                    metadata_delta = 0
+                else:
+                    metadata_delta -= padding.length
+                    padding.length = 0
+            elif (metadata_delta < 0):
+                padding.length -= metadata_delta
+                metadata_delta = 0
+            else:
+                break
+
+        stream = file(self.filename, 'r+b')
+        stream.write('fLaC')
+        metadata.build(BitstreamWriter(stream, 0))
+        stream.close()
+    else:
+        stream = file(self.filename, 'rb')
+        if (stream.read(4) != 'fLaC'):
+            raise InvalidFLAC(u'Invalid FLAC file')
+
+        stop = 0
+        reader = BitstreamReader(stream, 0)
+        while (stop == 0):
+            (stop, length) = reader.parse("1u 7p 24u")
+            reader.skip_bytes(length)
+
+        file_data = tempfile.TemporaryFile()
+        audiotools.transfer_data(stream.read, file_data.write)
+        file_data.seek(0, 0)
+
+        stream = file(self.filename, 'wb')
+        stream.write('fLaC')
+        writer = BitstreamWriter(stream, 0)
+        metadata.build(writer)
+        writer.flush()
+        audiotools.transfer_data(file_data.read, stream.write)
+        file_data.close()
+        stream.close()
+
+
+def retag(filenames, passes):
+    times = []
+    for i in xrange(passes):
+        start = time.time()
+        for filename in filenames:
+            track = audiotools.open(filename)
+            metadata = track.get_metadata()
+            metadata.comment = u"retagged " * (10 * (i + 1))
+            track.set_metadata(metadata)
+        times.append(time.time() - start)
+    return times
+
+
+if (__name__ == '__main__'):
+    if (len(sys.argv) > 1):
+        TOTAL_FILES = int(sys.argv[1])
+    else:
+        TOTAL_FILES = 1000
+    PASSES = 3
+
+    directory = tempfile.mkdtemp()
+    try:
+        #a few seconds of noise, which FLAC can't compress much,
+        #with its PADDING stripped
+        template = os.path.join(directory, "template.flac")
+        track = audiotools.FlacAudio.from_pcm(
+            template, EXACT_RANDOM_PCM_Reader(44100 * 3))
+        metadata = track.get_metadata()
+        metadata.replace_blocks(Flac_PADDING.BLOCK_ID, [])
+        previous_update_metadata(track, metadata)
+
+        print "%d files of %d bytes each" % (TOTAL_FILES,
+                                             os.path.getsize(template))
+        print "%-24s %s" % ("update_metadata()",
+                            " ".join(["%10s" % ("pass %d" % (i + 1))
+                                      for i in xrange(PASSES)]))
+
+        current_update_metadata = audiotools.FlacAudio.update_metadata
+        for (name, update_metadata) in [("previous",
+                                         previous_update_metadata),
+                                        ("current",
+                                         current_update_metadata)]:
+            audiotools.FlacAudio.update_metadata = update_metadata
+            filenames = []
+            for i in xrange(TOTAL_FILES):
+                filename = os.path.join(directory, "%5.5d.flac" % (i))
+                shutil.copy(template, filename)
+                filenames.append(filename)
+
+            print "%-24s %s" % (name,
+                                " ".join(["%10.3f" % (t) for t in
+                                          retag(filenames, PASSES)]))
+
+            for filename in filenames:
+                os.unlink(filename)
+        audiotools.FlacAudio.update_metadata = current_update_metadata
+    finally:
+        shutil.rmtree(directory)
@@ -0,0 +1,71 @@
+#!/usr/bin/python
+
+#Audio Tools, a module and set of tools for manipulating audio data
+#Copyright (C) 2007-2012  Brian Langenberger
+
+#This program is free software; you can redistribute it and/or modify
+#it under the terms of the GNU General Public License as published by
+#the Free Software Foundation; either version 2 of the License, or
+#(at your option) any later version.
+
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU General Public License for more details.
+
+#You should have received a copy of the GNU General Public License
+#along with this program; if not, write to the Free Software
+#Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+#times importing audiotools and starting each of its scripts
+#by running them with --help, keeping the fastest of several runs
+#
+#previously, importing audiotools imported every format module
+#and searched the $PATH for every type's binaries
+
+import os
+import os.path
+import sys
+import time
+import subprocess
+
+SCRIPTS = ["cd2track", "cdinfo", "cdplay",
+           "track2track", "trackrename", "trackinfo",
+           "tracklength", "track2cd", "trackcmp", "trackplay",
+           "tracktag", "audiotools-config",
+           "trackcat", "tracksplit",
+           "tracklint", "trackverify",
+           "coverdump", "coverview", "record2track",
+           "dvdainfo", "dvda2track"]
+
+
+def fastest(arguments, runs):
+    devnull = open(os.devnull, "wb")
+    times = []
+    for i in xrange(runs):
+        start = time.time()
+        subprocess.call(arguments, stdout=devnull, stderr=devnull)
+        times.append(time.time() - start)
+    devnull.close()
+    return min(times)
+
+
+if (__name__ == '__main__'):
+    if (len(sys.argv) > 1):
+        RUNS = int(sys.argv[1])
+    else:
+        RUNS = 10
+
+    scripts_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    print "fastest of %d runs" % (RUNS)
+    print "%-20s %10s" % ("command", "seconds")
+    print "%-20s %10.3f" % ("python", fastest([sys.executable, "-c", ""],
+                                               RUNS))
+    print "%-20s %10.3f" % ("import audiotools",
+                            fastest([sys.executable, "-c",
+                                     "import audiotools"], RUNS))
+    for script in SCRIPTS:
+        print "%-20s %10.3f" % (script,
+                                fastest([sys.executable,
+                                         os.path.join(scripts_dir, script),
+                                         "--help"], RUNS))
@@ -0,0 +1,93 @@
+#!/usr/bin/python
+
+#Audio Tools, a module and set of tools for manipulating audio data
+#Copyright (C) 2007-2012  Brian Langenberger
+
+#This program is free software; you can redistribute it and/or modify
+#it under the terms of the GNU General Public License as published by
+#the Free Software Foundation; either version 2 of the License, or
+#(at your option) any later version.
+
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU General Public License for more details.
+
+#You should have received a copy of the GNU General Public License
+#along with this program; if not, write to the Free Software
+#Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+
+#compares a trackinfo-style scan of a directory of tagged tracks
+#(opening, sorting and reading each file's metadata)
+#without the library index, with an empty index (cold)
+#and with an index populated by a previous run (warm)
+#
+#with the files in the page cache, this measures parsing rather than I/O,
+#so the warm scan's advantage is larger still on a cold disk
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import audiotools
+from audiotools.index import LibraryIndex, RACY_SECONDS
+from test import BLANK_PCM_Reader
+
+
+def scan(directory, index):
+    tracks = list(audiotools.open_directory(directory, index=index))
+    for track in tracks:
+        metadata = track.get_metadata()
+        if (metadata is not None):
+            metadata.track_name
+            metadata.images()
+    return len(tracks)
+
+
+if (__name__ == '__main__'):
+    if (len(sys.argv) > 1):
+        TOTAL_FILES = int(sys.argv[1])
+    else:
+        TOTAL_FILES = 2000
+
+    directory = tempfile.mkdtemp()
+    index_file = tempfile.NamedTemporaryFile(suffix=".index")
+    try:
+        #one small track per available type which caches its metadata,
+        #tagged and with cover art, copied over and over again
+        cover = open("bigpng.png", "rb").read()
+        templates = []
+        for audioclass in [audiotools.FlacAudio, audiotools.ALACAudio]:
+            filename = os.path.join(directory, "template." + audioclass.SUFFIX)
+            track = audioclass.from_pcm(filename, BLANK_PCM_Reader(1))
+            metadata = audiotools.MetaData(track_name=u"Track Name",
+                                           album_name=u"Album Name",
+                                           artist_name=u"Artist Name")
+            metadata.add_image(audiotools.Image.new(cover, u"", 0))
+            track.set_metadata(metadata)
+            templates.append(filename)
+
+        #files modified too recently to trust aren't indexed
+        past = time.time() - RACY_SECONDS - 10
+        for i in xrange(TOTAL_FILES):
+            template = templates[i % len(templates)]
+            filename = os.path.join(directory, "%5.5d-%s" %
+                                    (i, os.path.basename(template)))
+            shutil.copy(template, filename)
+            os.utime(filename, (past, past))
+        for template in templates:
+            os.unlink(template)
+
+        print "%-12s %10s %10s" % ("scan", "files", "seconds")
+        for (name, index) in [("no index", None),
+                              ("cold index", LibraryIndex(index_file.name)),
+                              ("warm index", LibraryIndex(index_file.name))]:
+            start = time.time()
+            opened = scan(directory, index)
+            print "%-12s %10d %10.3f" % (name, opened, time.time() - start)
+            if (index is not None):
+                index.close()
+    finally:
+        shutil.rmtree(directory)
+        index_file.close()
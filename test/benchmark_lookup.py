@@ -0,0 +1,155 @@
+#!/usr/bin/python
+
+#Audio Tools, a module and set of tools for manipulating audio data
+#Copyright (C) 2007-2012  Brian Langenberger
+
+#This program is free software; you can redistribute it and/or modify
+#it under the terms of the GNU General Public License as published by
+#the Free Software Foundation; either version 2 of the License, or
+#(at your option) any later version.
+
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU General Public License for more details.
+
+#You should have received a copy of the GNU General Public License
+#along with this program; if not, write to the Free Software
+#Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+#times metadata_lookup() against a stub MusicBrainz/FreeDB server
+#on the local host which waits a fixed latency before each response
+#and before accepting each connection, keeping the fastest of several runs
+#
+#previously, MusicBrainz and FreeDB were queried one after the other
+#with a new connection per request and no cache between lookups
+
+import sys
+import time
+import threading
+import BaseHTTPServer
+import SocketServer
+import audiotools
+from cgi import parse_qs
+
+OFFSETS = [150, 21035, 42561]
+LEAD_OUT = 60632
+TOTAL_LENGTH = 60482
+
+
+def stub_server(latency):
+    from audiotools.musicbrainz import DiscID
+
+    disc_id = str(DiscID(first_track_number=1,
+                         last_track_number=len(OFFSETS),
+                         lead_out_offset=LEAD_OUT,
+                         offsets=OFFSETS))
+
+    musicbrainz_xml = (
+        '<?xml version="1.0" encoding="UTF-8"?>' +
+        '<metadata xmlns="http://musicbrainz.org/ns/mmd-2.0#">' +
+        '<disc id="%s"><release-list count="1"><release>' % (disc_id) +
+        '<title>Album Name</title><date>2012</date>' +
+        '<medium-list count="1"><medium>' +
+        '<disc-list><disc id="%s"/></disc-list><track-list>' % (disc_id) +
+        "".join(['<track><position>%d</position>' % (i + 1) +
+                 '<recording><title>Track %d</title></recording>' % (i + 1) +
+                 '</track>' for i in xrange(len(OFFSETS))]) +
+        '</track-list></medium></medium-list>' +
+        '</release></release-list></disc></metadata>')
+
+    freedb_query = "200 rock 1e0e2c03 Album Artist / Album Name\r\n"
+    freedb_read = ("210 rock 1e0e2c03\r\n" +
+                   "DTITLE=Album Artist / Album Name\r\n" +
+                   "".join(["TTITLE%d=Track %d\r\n" % (i, i + 1)
+                            for i in xrange(len(OFFSETS))]) +
+                   ".\r\n")
+
+    class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            #simulate the round trips of a new connection
+            time.sleep(latency)
+            BaseHTTPServer.BaseHTTPRequestHandler.setup(self)
+
+        def respond(self, data):
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            self.respond(musicbrainz_xml)
+
+        def do_POST(self):
+            body = parse_qs(self.rfile.read(
+                    int(self.headers["Content-Length"])))
+            if (body["cmd"][0].startswith("cddb query")):
+                self.respond(freedb_query)
+            else:
+                self.respond(freedb_read)
+
+        def log_message(self, *args):
+            pass
+
+    class Server(SocketServer.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+        daemon_threads = True
+
+    server = Server(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server
+
+
+def lookup(port):
+    return audiotools.metadata_lookup(first_track_number=1,
+                                      last_track_number=len(OFFSETS),
+                                      offsets=OFFSETS,
+                                      lead_out_offset=LEAD_OUT,
+                                      total_length=TOTAL_LENGTH,
+                                      musicbrainz_server="127.0.0.1",
+                                      musicbrainz_port=port,
+                                      freedb_server="127.0.0.1",
+                                      freedb_port=port)
+
+
+def fastest(function, runs):
+    times = []
+    for i in xrange(runs):
+        start = time.time()
+        function()
+        times.append(time.time() - start)
+    return min(times)
+
+
+if (__name__ == '__main__'):
+    if (len(sys.argv) > 1):
+        RUNS = int(sys.argv[1])
+    else:
+        RUNS = 5
+
+    if (len(sys.argv) > 2):
+        LATENCY = float(sys.argv[2])
+    else:
+        LATENCY = 0.05
+
+    server = stub_server(LATENCY)
+    port = server.server_address[1]
+    assert(len(lookup(port)) == 2)
+
+    def uncached():
+        if (hasattr(audiotools, "METADATA_CACHE")):
+            audiotools.METADATA_CACHE.clear()
+        lookup(port)
+
+    print "fastest of %d runs, %.3f seconds latency" % (RUNS, LATENCY)
+    print "%-20s %10s" % ("lookup", "seconds")
+    print "%-20s %10.3f" % ("uncached", fastest(uncached, RUNS))
+    print "%-20s %10.3f" % ("cached", fastest(lambda: lookup(port), RUNS))
+
+    if (hasattr(audiotools, "HTTP_CONNECTIONS")):
+        audiotools.HTTP_CONNECTIONS.close()
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,68 @@
+#!/usr/bin/python
+
+#Audio Tools, a module and set of tools for manipulating audio data
+#Copyright (C) 2007-2012  Brian Langenberger
+
+#This program is free software; you can redistribute it and/or modify
+#it under the terms of the GNU General Public License as published by
+#the Free Software Foundation; either version 2 of the License, or
+#(at your option) any later version.
+
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU General Public License for more details.
+
+#You should have received a copy of the GNU General Public License
+#along with this program; if not, write to the Free Software
+#Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+#compares encoding and decoding FLAC and WavPack files
+#with their MD5 sums calculated and verified
+#against decoding them with audiotools.FAST_DECODING set
+#
+#previously, each sum was calculated from a string
+#returned by FrameList.to_bytes() for every FrameList
+
+import sys
+import time
+import tempfile
+import audiotools
+from test import EXACT_RANDOM_PCM_Reader
+
+
+def decode(track, fast):
+    audiotools.FAST_DECODING = fast
+    pcmreader = track.to_pcm()
+    audiotools.transfer_framelist_data(pcmreader, lambda f: None)
+    pcmreader.close()
+    audiotools.FAST_DECODING = False
+
+
+if (__name__ == '__main__'):
+    if (len(sys.argv) > 1):
+        SECONDS = int(sys.argv[1])
+    else:
+        SECONDS = 60
+
+    print "%d seconds of 16-bit, 44.1kHz audio" % (SECONDS)
+    print "%-10s %10s %10s %10s" % ("format", "encode", "verified", "fast")
+    for audio_class in [audiotools.FlacAudio,
+                        audiotools.WavPackAudio]:
+        temp = tempfile.NamedTemporaryFile(suffix="." + audio_class.SUFFIX)
+        try:
+            pcmreader = EXACT_RANDOM_PCM_Reader(44100 * SECONDS,
+                                                44100, 2, 16, 0x3)
+            start = time.time()
+            track = audio_class.from_pcm(temp.name, pcmreader)
+            times = [time.time() - start]
+
+            for fast in [False, True]:
+                start = time.time()
+                decode(track, fast)
+                times.append(time.time() - start)
+            print "%-10s %10.3f %10.3f %10.3f" % (audio_class.NAME,
+                                                  times[0],
+                                                  times[1],
+                                                  times[2])
+        finally:
+            temp.close()
@@ -0,0 +1,123 @@
+#!/usr/bin/python
+
+#Audio Tools, a module and set of tools for manipulating audio data
+#Copyright (C) 2007-2012  Brian Langenberger
+
+#This program is free software; you can redistribute it and/or modify
+#it under the terms of the GNU General Public License as published by
+#the Free Software Foundation; either version 2 of the License, or
+#(at your option) any later version.
+
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU General Public License for more details.
+
+#You should have received a copy of the GNU General Public License
+#along with this program; if not, write to the Free Software
+#Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+
+#compares audiotools.open(), which dispatches on a file's magic numbers,
+#against the open() it replaced, which tried every type's is_type() in turn,
+#by scanning a directory of thousands of files of every available type
+#along with some non-audio files such as a library might contain
+#
+#with the files in the page cache, the time is mostly spent
+#in the AudioFile constructors, so the number of is_type() calls
+#(each doing its own reads and seeks) is the more telling figure
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import audiotools
+from test import BLANK_PCM_Reader
+
+
+def previous_open(filename):
+    """audiotools.open() as it was before the magic number lookup"""
+
+    f = file(filename, "rb")
+    try:
+        for audioclass in audiotools.TYPE_MAP.values():
+            f.seek(0, 0)
+            if (audioclass.is_type(f)):
+                return audioclass(filename)
+        else:
+            raise audiotools.UnsupportedFile(filename)
+    finally:
+        f.close()
+
+
+class CountingIsType:
+    """wraps an AudioFile class's is_type() and counts its calls"""
+
+    def __init__(self, audioclass, counter):
+        self.is_type = audioclass.is_type
+        self.counter = counter
+
+    def __call__(self, file):
+        self.counter[0] += 1
+        return self.is_type(file)
+
+
+def scan(open_function, filenames):
+    opened = 0
+    for filename in filenames:
+        try:
+            open_function(filename)
+            opened += 1
+        except audiotools.UnsupportedFile:
+            pass
+    return opened
+
+
+if (__name__ == '__main__'):
+    if (len(sys.argv) > 1):
+        TOTAL_FILES = int(sys.argv[1])
+    else:
+        TOTAL_FILES = 5000
+
+    directory = tempfile.mkdtemp()
+    try:
+        #one small track of each type plus some non-audio files,
+        #copied over and over again to fill out the directory
+        templates = []
+        for audioclass in audiotools.TYPE_MAP.values():
+            filename = os.path.join(directory, "template." + audioclass.SUFFIX)
+            audioclass.from_pcm(filename, BLANK_PCM_Reader(1))
+            templates.append(filename)
+        for (name, data) in [("cover.jpg", "\xFF\xD8\xFF\xE0" + "\x00" * 4096),
+                             ("album.cue", "FILE \"album.wav\" WAVE\n" * 10),
+                             ("notes.txt", "liner notes\n" * 100)]:
+            filename = os.path.join(directory, "template-" + name)
+            f = open(filename, "wb")
+            f.write(data)
+            f.close()
+            templates.append(filename)
+
+        filenames = []
+        for i in xrange(TOTAL_FILES):
+            template = templates[i % len(templates)]
+            filename = os.path.join(directory, "%5.5d-%s" %
+                                    (i, os.path.basename(template)))
+            shutil.copy(template, filename)
+            filenames.append(filename)
+
+        counter = [0]
+        for audioclass in audiotools.TYPE_MAP.values():
+            audioclass.is_type = CountingIsType(audioclass, counter)
+
+        print "%-24s %10s %10s %16s" % ("open()", "files", "seconds",
+                                        "is_type()/file")
+        for (name, open_function) in [("previous", previous_open),
+                                      ("magic numbers", audiotools.open)]:
+            counter[0] = 0
+            start = time.time()
+            opened = scan(open_function, filenames)
+            print "%-24s %10d %10.3f %16.2f" % (
+                name, opened, time.time() - start,
+                float(counter[0]) / len(filenames))
+    finally:
+        shutil.rmtree(directory)
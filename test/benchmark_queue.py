@@ -0,0 +1,129 @@
+#!/usr/bin/python
+
+#Audio Tools, a module and set of tools for manipulating audio data
+#Copyright (C) 2007-2012  Brian Langenberger
+
+#This program is free software; you can redistribute it and/or modify
+#it under the terms of the GNU General Public License as published by
+#the Free Software Foundation; either version 2 of the License, or
+#(at your option) any later version.
+
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU General Public License for more details.
+
+#You should have received a copy of the GNU General Public License
+#along with this program; if not, write to the Free Software
+#Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+
+#compares the throughput of audiotools.ExecProgressQueue's worker pool
+#against the fork-per-job queue it replaced,
+#using many short jobs which report their progress frequently
+#as "track2track -j" and "trackverify -j" do on short files
+
+import os
+import sys
+import time
+import cPickle
+import audiotools
+
+
+def short_job(work, progress):
+    total = 0
+    for i in xrange(work):
+        total += i
+        if ((i % 100) == 0):
+            progress(i, work)
+    return total
+
+
+class ForkPerJobQueue(audiotools.ExecProgressQueue):
+    """ExecProgressQueue as it was before the worker pool,
+    forking a new child and pipe for every job"""
+
+    def execute_next_job(self):
+        (job_id,
+         progress_text,
+         completion_output,
+         function,
+         args,
+         kwargs) = self.queued_jobs.pop(0)
+
+        if (progress_text is not None):
+            self.progress_display.add_row(job_id, progress_text)
+
+        (read_end, write_end) = os.pipe()
+        pid = os.fork()
+        if (pid > 0):
+            os.close(write_end)
+            self.running_job_pool[job_id] = (pid,
+                                             os.fdopen(read_end, 'rb'),
+                                             completion_output)
+        else:
+            os.close(read_end)
+            output = os.fdopen(write_end, 'wb')
+
+            def progress(current, total):
+                cPickle.dump(("progress", [job_id, current, total]), output)
+                output.flush()
+
+            try:
+                cPickle.dump(("completed",
+                              [job_id, function(*args,
+                                                progress=progress,
+                                                **kwargs)]),
+                             output, cPickle.HIGHEST_PROTOCOL)
+            finally:
+                output.close()
+                os._exit(0)
+
+    def completed(self, job_id, result):
+        (pid, output, completion_output) = self.running_job_pool[job_id]
+        output.close()
+        os.waitpid(pid, 0)
+        self.running_job_pool[job_id] = completion_output
+        audiotools.ExecProgressQueue.completed(self, job_id, result)
+
+    def run(self, max_processes=1):
+        import select
+
+        for i in xrange(min(max_processes, len(self.queued_jobs))):
+            self.execute_next_job()
+        try:
+            while (True):
+                readers = dict([(job[1], job_id) for (job_id, job) in
+                                self.running_job_pool.items()])
+                (rlist, wlist, xlist) = select.select(readers.keys(), [], [])
+                for reader in rlist:
+                    (command, args) = cPickle.load(reader)
+                    getattr(self, command)(*args)
+        except audiotools.ProgressJobQueueComplete:
+            return
+
+
+def throughput(queue_class, jobs, work, max_processes):
+    queue = queue_class(
+        audiotools.ProgressDisplay(audiotools.SilentMessenger("benchmark")))
+    for i in xrange(jobs):
+        queue.execute(short_job, None, None, work)
+    start = time.time()
+    queue.run(max_processes)
+    assert(len(queue.results) == jobs)
+    return jobs / (time.time() - start)
+
+
+if (__name__ == '__main__'):
+    if (len(sys.argv) > 1):
+        JOBS = int(sys.argv[1])
+    else:
+        JOBS = 2000
+
+    print "%-22s %16s %16s" % ("jobs x work", "fork-per-job/s", "worker pool/s")
+    for work in [1000, 100000]:
+        for max_processes in [2, 4]:
+            print "%-22s %16.1f %16.1f" % (
+                "%d x %d (-j %d)" % (JOBS, work, max_processes),
+                throughput(ForkPerJobQueue, JOBS, work, max_processes),
+                throughput(audiotools.ExecProgressQueue, JOBS, work,
+                           max_processes))
@@ -0,0 +1,70 @@
+#!/usr/bin/python
+
+#Audio Tools, a module and set of tools for manipulating audio data
+#Copyright (C) 2007-2012  Brian Langenberger
+
+#This program is free software; you can redistribute it and/or modify
+#it under the terms of the GNU General Public License as published by
+#the Free Software Foundation; either version 2 of the License, or
+#(at your option) any later version.
+
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU General Public License for more details.
+
+#You should have received a copy of the GNU General Public License
+#along with this program; if not, write to the Free Software
+#Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+#compares downconverting a 24-bit, 96kHz FLAC file to 16-bit, 44.1kHz
+#with each of PCMConverter's resampling presets
+#against decoding it alone
+#
+#previously, every conversion used the "best" preset
+#since Resampler's quality argument was ignored
+
+import sys
+import time
+import tempfile
+import audiotools
+from test import EXACT_RANDOM_PCM_Reader
+
+
+def decode(track, quality, normalize):
+    return track.to_pcm()
+
+
+def downconvert(track, quality, normalize):
+    return audiotools.PCMConverter(track.to_pcm(),
+                                   44100, 2, 0x3, 16,
+                                   resample_quality=quality,
+                                   normalize=normalize)
+
+
+if (__name__ == '__main__'):
+    if (len(sys.argv) > 1):
+        SECONDS = int(sys.argv[1])
+    else:
+        SECONDS = 60
+
+    temp = tempfile.NamedTemporaryFile(suffix=".flac")
+    try:
+        track = audiotools.FlacAudio.from_pcm(
+            temp.name,
+            EXACT_RANDOM_PCM_Reader(96000 * SECONDS, 96000, 2, 24, 0x3))
+
+        print "%d seconds of 24-bit, 96kHz audio" % (SECONDS)
+        for (name, to_pcm, quality, normalize) in [
+            ("decode only", decode, None, False),
+            ("linear", downconvert, "linear", False),
+            ("fast", downconvert, "fast", False),
+            ("medium", downconvert, "medium", False),
+            ("best", downconvert, "best", False),
+            ("best, normalized", downconvert, "best", True)]:
+            start = time.time()
+            pcmreader = to_pcm(track, quality, normalize)
+            audiotools.transfer_framelist_data(pcmreader, lambda f: None)
+            pcmreader.close()
+            print "%-24s %10.3f" % (name, time.time() - start)
+    finally:
+        temp.close()
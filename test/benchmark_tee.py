@@ -0,0 +1,84 @@
+#!/usr/bin/python
+
+#Audio Tools, a module and set of tools for manipulating audio data
+#Copyright (C) 2007-2012  Brian Langenberger
+
+#This program is free software; you can redistribute it and/or modify
+#it under the terms of the GNU General Public License as published by
+#the Free Software Foundation; either version 2 of the License, or
+#(at your option) any later version.
+
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU General Public License for more details.
+
+#You should have received a copy of the GNU General Public License
+#along with this program; if not, write to the Free Software
+#Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+
+#compares track2track-style conversion of an album of FLAC files
+#to WavPack with ReplayGain added afterward
+#
+#previously, add_replay_gain() decoded every converted file again
+#while now the PCM data is analyzed by a PCMReaderTee
+#as it's being encoded and the result passed to add_replay_gain()
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import audiotools
+from test import EXACT_RANDOM_PCM_Reader
+
+
+def convert_then_analyze(sources, directory):
+    targets = []
+    for (i, source) in enumerate(sources):
+        target = os.path.join(directory, "%2.2d.wv" % (i))
+        source.convert(target, audiotools.WavPackAudio)
+        targets.append(target)
+    audiotools.WavPackAudio.add_replay_gain(targets)
+
+
+def convert_and_analyze(sources, directory):
+    targets = []
+    analyses = {}
+    for (i, source) in enumerate(sources):
+        target = os.path.join(directory, "%2.2d.wv" % (i))
+        analysis = audiotools.ReplayGainAnalysis(source.sample_rate())
+        audiotools.WavPackAudio.from_pcm(
+            target,
+            audiotools.PCMReaderTee(source.to_pcm(), [analysis.update]))
+        targets.append(target)
+        analyses[target] = analysis.result()
+    audiotools.WavPackAudio.add_replay_gain(targets, analyses=analyses)
+
+
+if (__name__ == '__main__'):
+    if (len(sys.argv) > 1):
+        TOTAL_TRACKS = int(sys.argv[1])
+    else:
+        TOTAL_TRACKS = 10
+
+    directory = tempfile.mkdtemp()
+    try:
+        sources = [audiotools.FlacAudio.from_pcm(
+                os.path.join(directory, "%2.2d.flac" % (i)),
+                EXACT_RANDOM_PCM_Reader(44100 * 30))
+                   for i in xrange(TOTAL_TRACKS)]
+
+        print "%d tracks of 30 seconds each" % (TOTAL_TRACKS)
+        for (name, function) in [("convert, then analyze",
+                                  convert_then_analyze),
+                                 ("convert and analyze",
+                                  convert_and_analyze)]:
+            output = os.path.join(directory, "output")
+            os.mkdir(output)
+            start = time.time()
+            function(sources, output)
+            print "%-24s %10.3f" % (name, time.time() - start)
+            shutil.rmtree(output)
+    finally:
+        shutil.rmtree(directory)
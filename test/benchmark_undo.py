@@ -0,0 +1,138 @@
+#!/usr/bin/python
+
+#Audio Tools, a module and set of tools for manipulating audio data
+#Copyright (C) 2007-2012  Brian Langenberger
+
+#This program is free software; you can redistribute it and/or modify
+#it under the terms of the GNU General Public License as published by
+#the Free Software Foundation; either version 2 of the License, or
+#(at your option) any later version.
+
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU General Public License for more details.
+
+#You should have received a copy of the GNU General Public License
+#along with this program; if not, write to the Free Software
+#Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+
+#compares storing and applying tracktag-style undo entries
+#on files of several sizes whose metadata header has been edited,
+#both in place and grown
+#
+#the previous UndoDB read both files into memory,
+#XORed them a character at a time and stored the result as base64
+#the current one streams both files in blocks
+#and stores only the blocks which differ
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import sqlite3
+import base64
+from hashlib import sha1
+from audiotools.delta import UndoDB
+
+
+class PreviousUndoDB(UndoDB):
+    """UndoDB as it was before block-based patches"""
+
+    def add(self, old_file, new_file):
+        file_data1 = open(old_file, 'rb').read()
+        file_data2 = open(new_file, 'rb').read()
+        self.cursor.execute(
+            "INSERT INTO patch (patch_id, patch_data) VALUES (?, ?)",
+            [None,
+             base64.b64encode(
+                    UndoDB.build_patch(file_data1,
+                                       file_data2)).decode('ascii')])
+        patch_id = self.cursor.lastrowid
+        try:
+            for (data1, data2) in [(file_data1, file_data2),
+                                   (file_data2, file_data1)]:
+                self.cursor.execute("""INSERT INTO source_file (
+source_checksum, source_size, target_size, patch_id) values (?, ?, ?, ?)""",
+                                    [sha1(data1).hexdigest().decode('ascii'),
+                                     len(data1),
+                                     len(data2),
+                                     patch_id])
+            self.db.commit()
+        except sqlite3.IntegrityError:
+            self.db.rollback()
+
+    def undo(self, new_file):
+        file_data = open(new_file, 'rb').read()
+        self.cursor.execute("""SELECT target_size, patch_data FROM
+source_file, patch WHERE ((source_checksum = ?) AND
+                          (source_size = ?) AND
+                          (source_file.patch_id = patch.patch_id))""",
+                            [sha1(file_data).hexdigest().decode('ascii'),
+                             len(file_data)])
+        row = self.cursor.fetchone()
+        if (row is not None):
+            (target_size, patch) = row
+            f = open(new_file, 'wb')
+            f.write(UndoDB.apply_patch(file_data,
+                                       base64.b64decode(patch.encode('ascii')),
+                                       target_size))
+            f.close()
+            return True
+        else:
+            return False
+
+
+def time_undo(db_class, directory, old_data, new_data):
+    db_file = os.path.join(directory, "undo.db")
+    old_file = os.path.join(directory, "old.bin")
+    new_file = os.path.join(directory, "new.bin")
+    for (filename, data) in [(old_file, old_data), (new_file, new_data)]:
+        f = open(filename, "wb")
+        f.write(data)
+        f.close()
+
+    db = db_class(db_file)
+    try:
+        start = time.time()
+        db.add(old_file, new_file)
+        add_time = time.time() - start
+        start = time.time()
+        assert(db.undo(new_file))
+        undo_time = time.time() - start
+        assert(open(new_file, "rb").read() == old_data)
+    finally:
+        db.close()
+    patch_size = os.path.getsize(db_file)
+    os.unlink(db_file)
+    return (add_time, undo_time, patch_size)
+
+
+if (__name__ == '__main__'):
+    if (len(sys.argv) > 1):
+        SIZES = [int(arg) for arg in sys.argv[1:]]
+    else:
+        SIZES = [1000000, 5000000, 20000000]
+
+    directory = tempfile.mkdtemp()
+    try:
+        print "%-10s %-10s %-10s %10s %10s %12s" % \
+            ("size", "edit", "UndoDB", "add", "undo", "database")
+        for size in SIZES:
+            old_data = os.urandom(size)
+            for (edit, new_data) in [
+                ("in place", old_data[0:100] + os.urandom(500) +
+                 old_data[600:]),
+                ("grown", old_data[0:100] + os.urandom(5000) +
+                 old_data[600:])]:
+                for (name, db_class) in [("previous", PreviousUndoDB),
+                                         ("current", UndoDB)]:
+                    (add_time,
+                     undo_time,
+                     patch_size) = time_undo(db_class, directory,
+                                             old_data, new_data)
+                    print "%-10d %-10s %-10s %10.3f %10.3f %12d" % \
+                        (size, edit, name, add_time, undo_time, patch_size)
+    finally:
+        shutil.rmtree(directory)
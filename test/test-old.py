@@ -1414,6 +1414,8 @@ class TestAiffAudio(TestTextOutput):
 
     @TEST_PCM
     def testsplit(self):
+        from itertools import izip
+
         temp = tempfile.NamedTemporaryFile(suffix="." + self.audio_class.SUFFIX)
         try:
             new_file = self.audio_class.from_pcm(temp.name,
@@ -1425,10 +1427,10 @@ class TestAiffAudio(TestTextOutput):
                 self.assertEqual(sum(PCM_LENGTHS),
                                  new_file.total_frames())
 
-                for (sub_pcm, pcm_length) in zip(audiotools.pcm_split(
+                for (sub_pcm, pcm_length) in izip(audiotools.pcm_split(
                         new_file.to_pcm(),
                         PCM_LENGTHS),
-                                                PCM_LENGTHS):
+                                                 PCM_LENGTHS):
                     sub_temp = tempfile.NamedTemporaryFile(suffix="." + self.audio_class.SUFFIX)
                     try:
                         sub_file = self.audio_class.from_pcm(sub_temp.name,
@@ -31,7 +31,8 @@ from hashlib import md5
 
 from test import (parser, Variable_Reader, BLANK_PCM_Reader,
                   RANDOM_PCM_Reader,
-                  EXACT_BLANK_PCM_Reader, SHORT_PCM_COMBINATIONS,
+                  EXACT_BLANK_PCM_Reader, EXACT_RANDOM_PCM_Reader,
+                  SHORT_PCM_COMBINATIONS,
                   MD5_Reader, FrameCounter,
                   MiniFrameReader, Combinations,
                   TEST_COVER1, TEST_COVER2, TEST_COVER3, HUGE_BMP)
@@ -109,6 +110,36 @@ class BufferedPCMReader(unittest.TestCase):
             self.assertEqual(frame.frames, frames)
             total_frames -= frame.frames
 
+    @LIB_CORE
+    def test_data(self):
+        from hashlib import md5
+
+        #ensure samples pass through unchanged and in order
+        #regardless of how read sizes and input sizes line up
+        for (channels,
+             channel_mask,
+             bits_per_sample) in [(1, 0x4, 8), (2, 0x3, 16), (6, 0x3F, 24)]:
+            source = MD5_Reader(
+                EXACT_RANDOM_PCM_Reader(200000, 44100,
+                                        channels, bits_per_sample,
+                                        channel_mask))
+            reader = audiotools.BufferedPCMReader(Variable_Reader(source))
+            bytes_per_frame = channels * bits_per_sample / 8
+            output = md5()
+
+            frame = reader.read(bytes_per_frame)
+            self.assertEqual(frame.frames, 1)
+            while (len(frame) > 0):
+                output.update(frame.to_bytes(False, True))
+                frame = reader.read(random.choice(
+                        [0, 1, 100, 4096, 10000, 300000]) * bytes_per_frame)
+
+            self.assertEqual(output.hexdigest(), source.hexdigest())
+
+            #closing the reader closes its sub-reader
+            reader.close()
+            self.assertRaises(ValueError, reader.read, 4096)
+
 
 class CDDA(unittest.TestCase):
     @LIB_CORE
@@ -479,6 +510,97 @@ class PCMConverter(unittest.TestCase):
                 (decimal.Decimal(wave.cd_frames()) / 75).to_integral(),
                 5)
 
+    @LIB_CORE
+    def test_resample_qualities(self):
+        from audiotools.resample import Resampler
+
+        #each preset resamples to the same length
+        for quality in audiotools.RESAMPLE_QUALITIES:
+            converter = audiotools.PCMConverter(
+                EXACT_RANDOM_PCM_Reader(96000, 96000, 2, 16, 0x3),
+                44100, 2, 0x3, 16, resample_quality=quality)
+            wave = audiotools.WaveAudio.from_pcm(self.tempwav.name,
+                                                 converter)
+            converter.close()
+            self.assertEqual(wave.sample_rate(), 44100)
+            self.assertEqual(wave.total_frames(), 44100)
+
+        self.assertRaises(ValueError,
+                          audiotools.PCMConverter,
+                          BLANK_PCM_Reader(1, sample_rate=96000),
+                          44100, 2, 0x3, 16, resample_quality="foo")
+
+        #a Resampler's gain scales its output
+        #and its peak tracks the largest absolute output sample
+        framelist = audiotools.pcm.from_list([16384, -32768] * 1000,
+                                             2, 16, True).to_float()
+        for gain in [1.0, 0.5]:
+            resampler = Resampler(2, 1.0, 4, gain)
+            (output, unprocessed) = resampler.process(framelist, 1)
+            self.assertEqual(len(output) + len(unprocessed), 2000)
+            self.assertEqual(list(output)[:2], [0.5 * gain, -1.0 * gain])
+            self.assertEqual(resampler.peak(), gain)
+
+    @LIB_CORE
+    def test_normalize(self):
+        from audiotools.resample import Resampler
+
+        #a full-scale square wave overshoots when resampled
+        square = audiotools.pcm.from_list(
+            [32767, 32767] * 40 + [-32768, -32768] * 40,
+            2, 16, True).to_bytes(False, True) * 1200
+
+        temp = tempfile.NamedTemporaryFile(suffix=".wav")
+        try:
+            source = audiotools.WaveAudio.from_pcm(
+                temp.name,
+                audiotools.PCMReader(cStringIO.StringIO(square),
+                                     96000, 2, 0x3, 16))
+
+            #the peak is found with the same preset used for output,
+            #since each one overshoots by a different amount
+            for (quality, converter_type) in [("fast", 2), ("best", 0)]:
+                resampler = Resampler(2, 44100.0 / 96000.0, converter_type)
+                (output, unprocessed) = resampler.process(
+                    audiotools.pcm.FrameList(square,
+                                             2, 16, False, True).to_float(),
+                    1)
+                peak = resampler.peak()
+                self.assert_(peak > 1.0)
+
+                def convert(pcmreader, normalize):
+                    converter = audiotools.PCMConverter(
+                        pcmreader, 44100, 2, 0x3, 16,
+                        resample_quality=quality,
+                        normalize=normalize)
+                    samples = []
+                    framelist = converter.read(4096)
+                    while (len(framelist) > 0):
+                        samples.extend(list(framelist))
+                        framelist = converter.read(4096)
+                    converter.close()
+                    self.assertEqual(len(samples), len(output))
+                    return samples
+
+                def clipped(samples):
+                    return len([s for s in samples if s in (32767, -32768)])
+
+                #without normalization, overshooting samples are clipped
+                self.assert_(clipped(convert(source.to_pcm(), False)) > 10000)
+
+                #with it, every sample is scaled down by the peak
+                for (normalized, resampled) in zip(
+                    convert(source.to_pcm(), True), output):
+                    self.assert_(abs(normalized -
+                                     (resampled * 32768 / peak)) <= 1.0)
+
+                #readers which can't be rewound are clipped
+                unseekable = audiotools.PCMReader(cStringIO.StringIO(square),
+                                                  96000, 2, 0x3, 16)
+                self.assert_(clipped(convert(unseekable, True)) > 10000)
+        finally:
+            temp.close()
+
 
 class LimitedPCMReader(unittest.TestCase):
     @LIB_CORE
@@ -510,6 +632,34 @@ class PCMCat(unittest.TestCase):
         self.assertEqual(int(counter), 6)
 
 
+class PCMReaderTee(unittest.TestCase):
+    @LIB_CORE
+    def test_read(self):
+        from hashlib import md5
+
+        frames = []
+        tee_md5 = md5()
+        tee = audiotools.PCMReaderTee(
+            EXACT_BLANK_PCM_Reader(44100 * 3),
+            [lambda f: frames.append(f.frames),
+             lambda f: tee_md5.update(f.to_bytes(False, True))])
+        self.assertEqual(tee.sample_rate, 44100)
+        self.assertEqual(tee.bits_per_sample, 16)
+        self.assertEqual(tee.channels, 2)
+        self.assertEqual(tee.channel_mask, 0x3)
+
+        #every callback sees the same data as the reader's caller
+        counter = FrameCounter(2, 16, 44100)
+        pcm_md5 = md5()
+        audiotools.transfer_framelist_data(
+            tee,
+            lambda s: [f(s) for f in (counter.update, pcm_md5.update)])
+        tee.close()
+        self.assertEqual(int(counter), 3)
+        self.assertEqual(sum(frames), 44100 * 3)
+        self.assertEqual(tee_md5.digest(), pcm_md5.digest())
+
+
 class PCMReaderWindow(unittest.TestCase):
     @LIB_CORE
     def setUp(self):
@@ -742,6 +892,214 @@ class Test_open(unittest.TestCase):
                           audiotools.open,
                           self.dummy3.name)
 
+    @LIB_CORE
+    def test_magic_numbers(self):
+        for audio_class in audiotools.TYPE_MAP.values():
+            #files are identified by their contents, not their suffixes
+            for suffix in [audio_class.SUFFIX, "mp3", "flac", "txt"]:
+                temp = tempfile.NamedTemporaryFile(suffix="." + suffix)
+                try:
+                    audio_class.from_pcm(temp.name, BLANK_PCM_Reader(1))
+                    header = open(temp.name, "rb").read(
+                        audiotools.MAGIC_HEADER_SIZE)
+                    self.assert_(
+                        audio_class in
+                        audiotools.__magic_types__(temp.name, header))
+                    self.assert_(isinstance(audiotools.open(temp.name),
+                                            audio_class))
+                finally:
+                    temp.close()
+
+        #a FLAC file with a leading ID3v2 tag is still a FLAC file
+        temp = tempfile.NamedTemporaryFile(suffix=".mp3")
+        try:
+            temp.write("ID3\x03\x00\x00\x00\x00\x00\x0A" + chr(0) * 10)
+            temp.write(open("flac-allframes.flac", "rb").read())
+            temp.flush()
+            self.assert_(isinstance(audiotools.open(temp.name),
+                                    audiotools.FlacAudio))
+        finally:
+            temp.close()
+
+        #the type matching a file's suffix is tried first
+        self.assertEqual(audiotools.__magic_types__("file.flac", "ID3")[0],
+                         audiotools.FlacAudio)
+        if (("oga" in audiotools.TYPE_MAP) and
+            ("ogg" in audiotools.TYPE_MAP)):
+            self.assertEqual(
+                audiotools.__magic_types__("file.oga", "OggS")[0],
+                audiotools.OggFlacAudio)
+            self.assertEqual(
+                audiotools.__magic_types__("file.ogg", "OggS")[0],
+                audiotools.VorbisAudio)
+
+        #files with unknown headers aren't checked by any listed type
+        self.assertEqual(audiotools.__magic_types__("file.flac", "12345"),
+                         [])
+
+    @LIB_CORE
+    def test_lazy_formats(self):
+        import subprocess
+        import sys
+
+        def imported_formats(statement):
+            sub = subprocess.Popen(
+                [sys.executable, "-c",
+                 "import sys\n" +
+                 statement + "\n" +
+                 "print \" \".join(sorted([m for m in sys.modules " +
+                 "if (m.startswith('audiotools.__') and " +
+                 "(sys.modules[m] is not None))]))"],
+                stdout=subprocess.PIPE)
+            modules = sub.stdout.read().split()
+            self.assertEqual(sub.wait(), 0)
+            return modules
+
+        #importing audiotools imports no more than its default type
+        default_module = [module_name for (type_name, module_name, class_name)
+                          in audiotools.AUDIO_TYPES
+                          if (type_name == audiotools.DEFAULT_TYPE)][0]
+        self.assertEqual(imported_formats("import audiotools"),
+                         ["audiotools." + default_module])
+
+        #opening a file imports only the formats it may be
+        self.assert_("audiotools.__mp3__" not in
+                     imported_formats("import audiotools\n" +
+                                      "audiotools.open('flac-allframes.flac')"))
+
+        #each type's module and class are listed correctly
+        self.assertEqual(len(audiotools.AUDIO_TYPES),
+                         len(audiotools.AVAILABLE_TYPES))
+        for ((type_name, module_name, class_name),
+             audio_class) in zip(audiotools.AUDIO_TYPES,
+                                 audiotools.AVAILABLE_TYPES):
+            self.assertEqual(audio_class.NAME, type_name)
+            self.assertEqual(audio_class.__module__,
+                             "audiotools." + module_name)
+            self.assertEqual(getattr(audiotools, class_name), audio_class)
+
+        #DEFAULT_QUALITY lists each type with a choice of compression
+        self.assertEqual(
+            sorted(audiotools.DEFAULT_QUALITY.keys()),
+            sorted([audio_class.NAME for audio_class in
+                    audiotools.AVAILABLE_TYPES
+                    if (len(audio_class.COMPRESSION_MODES) > 1)]))
+        for (name, quality) in audiotools.DEFAULT_QUALITY.items():
+            self.assertEqual(
+                quality,
+                audiotools.config.get_default(
+                    "Quality", name,
+                    [c for c in audiotools.AVAILABLE_TYPES
+                     if (c.NAME == name)][0].DEFAULT_COMPRESSION))
+
+        #TYPE_MAP contains those types whose binaries are available
+        self.assertEqual(
+            sorted(audiotools.TYPE_MAP.keys()),
+            sorted([t.NAME for t in audiotools.AVAILABLE_TYPES
+                    if t.has_binaries(audiotools.BIN)]))
+        for (name, audio_class) in audiotools.TYPE_MAP.items():
+            self.assert_(name in audiotools.TYPE_MAP)
+            self.assertEqual(audiotools.TYPE_MAP[name], audio_class)
+        self.assert_("foo" not in audiotools.TYPE_MAP)
+        self.assertRaises(KeyError, audiotools.TYPE_MAP.__getitem__, "foo")
+
+        #names from format modules are available from audiotools
+        from audiotools import ID3v2Comment
+        self.assertEqual(ID3v2Comment, audiotools.__id3__.ID3v2Comment)
+        self.assertRaises(AttributeError, getattr, audiotools, "foo")
+
+        #setting an attribute sets it for the module's own functions
+        threads = audiotools.DECODING_THREADS
+        try:
+            audiotools.DECODING_THREADS = 3
+            self.assertEqual(audiotools.DECODING_THREADS, 3)
+            self.assertEqual(
+                audiotools.__real_module__.DECODING_THREADS, 3)
+        finally:
+            audiotools.DECODING_THREADS = threads
+
+    @LIB_CORE
+    def test_star_import(self):
+        import subprocess
+        import sys
+
+        #a star import binds the same names it did
+        #before format modules were imported lazily
+        sub = subprocess.Popen(
+            [sys.executable, "-c",
+             "from audiotools import *\n" +
+             "assert(issubclass(FlacAudio, AudioFile))\n" +
+             "assert(issubclass(VorbisAudio, AudioFile))\n" +
+             "assert(len(AVAILABLE_TYPES) == len(AUDIO_TYPES))\n" +
+             "assert(callable(open))\n" +
+             "assert(callable(transfer_framelist_data))\n" +
+             "assert(VorbisComment is not None)\n" +
+             "assert(ID3v22Comment is not None)\n"])
+        self.assertEqual(sub.wait(), 0)
+
+    @LIB_CORE
+    def test_lazy_exceptions(self):
+        import subprocess
+        import sys
+
+        #exceptions don't depend on any format module being imported
+        for statement in ["import audiotools",
+                          "import audiotools\naudiotools.VorbisAudio",
+                          "import audiotools\naudiotools.M4AAudio"]:
+            sub = subprocess.Popen(
+                [sys.executable, "-c",
+                 statement + "\n" +
+                 "e = audiotools.UnsupportedChannelMask('x', 3)\n" +
+                 "assert(isinstance(e, audiotools.EncodingError))\n" +
+                 "e = audiotools.UnsupportedChannelCount('x', 3)\n" +
+                 "e = audiotools.UnsupportedBitsPerSample('x', 24)\n"])
+            self.assertEqual(sub.wait(), 0)
+
+    @LIB_CORE
+    def test_binary_cache(self):
+        import sys
+
+        cache = tempfile.NamedTemporaryFile()
+        config = audiotools.RawConfigParser()
+        config.add_section("System")
+        config.set("System", "binary_cache", cache.name)
+        search_path = os.environ.get("PATH", None)
+        try:
+            os.environ["PATH"] = os.path.dirname(sys.executable)
+            python = os.path.basename(sys.executable)
+
+            #lookups are stored in the cache file
+            binaries = audiotools.__system_binaries__(config)
+            self.assertEqual(binaries.can_execute(python), True)
+            self.assertEqual(binaries.can_execute("foo-bar-baz"), False)
+            self.assert_(os.path.getsize(cache.name) > 0)
+
+            #and reused by the next instance while $PATH is unchanged
+            binaries = audiotools.__system_binaries__(config)
+            self.assertEqual(binaries.__executable__,
+                             {python: True, "foo-bar-baz": False})
+
+            #but discarded once it changes
+            os.environ["PATH"] = "/dev/null"
+            binaries = audiotools.__system_binaries__(config)
+            self.assertEqual(binaries.__executable__, {})
+            self.assertEqual(binaries.can_execute(python), False)
+
+            #as is a damaged cache file
+            for data in ["", "garbage", "c__builtin__\nnope\n."]:
+                f = open(cache.name, "wb")
+                f.write(data)
+                f.close()
+                binaries = audiotools.__system_binaries__(config)
+                self.assertEqual(binaries.__executable__, {})
+                self.assertEqual(binaries.can_execute("foo-bar-baz"), False)
+        finally:
+            if (search_path is None):
+                del(os.environ["PATH"])
+            else:
+                os.environ["PATH"] = search_path
+            cache.close()
+
 
 class Test_open_directory(unittest.TestCase):
     @LIB_CORE
@@ -833,6 +1191,414 @@ class Test_open_files(unittest.TestCase):
                          [t.filename for t in [track1, track2, track3]])
 
 
+class Test_LibraryIndex(unittest.TestCase):
+    @LIB_CORE
+    def setUp(self):
+        from audiotools.index import LibraryIndex
+
+        self.output_type = audiotools.FlacAudio
+        self.suffix = "." + self.output_type.SUFFIX
+        self.dir = tempfile.mkdtemp()
+        self.index_file = os.path.join(self.dir, "index.db")
+        self.index = LibraryIndex(self.index_file)
+
+    def make_track(self, track_number):
+        track = self.output_type.from_pcm(
+            os.path.join(self.dir, str(track_number) + self.suffix),
+            BLANK_PCM_Reader(1))
+        track.set_metadata(audiotools.MetaData(track_name=u"Track Name",
+                                               track_number=track_number))
+        self.age(track.filename)
+        return track
+
+    def age(self, filename):
+        #files modified too recently aren't indexed
+        import time
+        from audiotools.index import RACY_SECONDS
+
+        past = time.time() - RACY_SECONDS - 10
+        os.utime(filename, (past, past))
+
+    def reopen_index(self):
+        from audiotools.index import LibraryIndex
+
+        self.index.close()
+        self.index = LibraryIndex(self.index_file)
+
+    @LIB_CORE
+    def tearDown(self):
+        import shutil
+
+        self.index.close()
+        shutil.rmtree(self.dir)
+
+    @LIB_CORE
+    def test_open_files(self):
+        track1 = self.make_track(1)
+        track2 = self.make_track(2)
+        track3 = self.make_track(3)
+        dummy1_name = os.path.join(self.dir, "4" + self.suffix)
+        dummy1 = open(dummy1_name, "wb")
+        dummy1.write("Hello World")
+        dummy1.close()
+        filenames = [track3.filename, dummy1_name,
+                     track1.filename, track2.filename]
+
+        for i in xrange(2):
+            tracks = audiotools.open_files(filenames, index=self.index)
+            self.assertEqual([t.filename for t in tracks],
+                             [t.filename for t in [track1, track2, track3]])
+            for (track, indexed) in zip(tracks, [track1, track2, track3]):
+                self.assertEqual(track.__class__, indexed.__class__)
+                self.assertEqual(track.total_frames(), indexed.total_frames())
+                self.assertEqual(track.get_metadata(), indexed.get_metadata())
+                self.assertEqual(audiotools.pcm_frame_cmp(track.to_pcm(),
+                                                          indexed.to_pcm()),
+                                 None)
+            self.reopen_index()
+
+        #unchanged files are restored without being opened
+        def fail_open(filename):
+            raise audiotools.UnsupportedFile(filename)
+
+        real_open = audiotools.open
+        audiotools.open = fail_open
+        try:
+            tracks = list(audiotools.open_directory(self.dir,
+                                                    index=self.index))
+        finally:
+            audiotools.open = real_open
+        self.assertEqual([t.filename for t in tracks],
+                         [t.filename for t in [track1, track2, track3]])
+
+        #modified files are opened again
+        track2.set_metadata(audiotools.MetaData(track_name=u"New Name",
+                                                track_number=5))
+        self.age(track2.filename)
+        tracks = audiotools.open_files(filenames, index=self.index)
+        self.assertEqual([t.filename for t in tracks],
+                         [t.filename for t in [track1, track3, track2]])
+        self.assertEqual(tracks[2].get_metadata().track_name, u"New Name")
+
+        #as are files too recently modified to be sure of
+        track1.set_metadata(audiotools.MetaData(track_name=u"Newer Name",
+                                                track_number=1))
+        for i in xrange(2):
+            tracks = audiotools.open_files([track1.filename],
+                                           index=self.index)
+            self.assertEqual(tracks[0].get_metadata().track_name,
+                             u"Newer Name")
+
+    @LIB_CORE
+    def test_version(self):
+        track1 = self.make_track(1)
+        self.index.open(track1.filename)
+        self.index.set_verified(track1.filename)
+
+        opened = []
+        real_open = audiotools.open
+
+        def counted_open(filename):
+            opened.append(filename)
+            return real_open(filename)
+
+        real_version = audiotools.VERSION
+        audiotools.open = counted_open
+        try:
+            #entries from the same version are restored
+            self.index.open(track1.filename)
+            self.assertEqual(opened, [])
+
+            #but entries from another version are reindexed
+            #rather than restored with possibly stale attributes
+            audiotools.VERSION = real_version + "-upgraded"
+            self.reopen_index()
+            self.assertEqual(self.index.verified(track1.filename), False)
+            track = self.index.open(track1.filename)
+            self.assertEqual(opened, [track1.filename])
+            self.assertEqual(track.get_metadata().track_name, u"Track Name")
+            self.index.open(track1.filename)
+            self.assertEqual(opened, [track1.filename])
+        finally:
+            audiotools.open = real_open
+            audiotools.VERSION = real_version
+
+    @LIB_CORE
+    def test_unversioned(self):
+        import sqlite3
+        from audiotools.index import LibraryIndex
+
+        #an index without version stamps is discarded
+        track1 = self.make_track(1)
+        self.index.close()
+        os.unlink(self.index_file)
+        db = sqlite3.connect(self.index_file)
+        db.execute("""CREATE TABLE track (
+  path BLOB PRIMARY KEY,
+  inode INTEGER NOT NULL,
+  size INTEGER NOT NULL,
+  mtime REAL NOT NULL,
+  ctime REAL NOT NULL,
+  type TEXT NOT NULL,
+  attributes BLOB NOT NULL,
+  metadata BLOB,
+  verified INTEGER NOT NULL DEFAULT 0
+)""")
+        db.commit()
+        db.close()
+        self.index = LibraryIndex(self.index_file)
+        self.assertEqual(
+            self.index.open(track1.filename).get_metadata().track_name,
+            u"Track Name")
+        self.index.set_verified(track1.filename)
+        self.assertEqual(self.index.verified(track1.filename), True)
+
+    @LIB_CORE
+    def test_verified(self):
+        track1 = self.make_track(1)
+        track2 = self.make_track(2)
+
+        self.assertEqual(self.index.verified(track1.filename), False)
+        self.index.set_verified(track1.filename)
+        self.assertEqual(self.index.verified(track1.filename), True)
+        self.assertEqual(self.index.verified(track2.filename), False)
+        self.reopen_index()
+        self.assertEqual(self.index.verified(track1.filename), True)
+
+        #modifying a file discards its verification
+        track1.set_metadata(audiotools.MetaData(track_name=u"New Name"))
+        self.age(track1.filename)
+        self.assertEqual(self.index.verified(track1.filename), False)
+        self.index.open(track1.filename)
+        self.assertEqual(self.index.verified(track1.filename), False)
+
+        self.assertEqual(self.index.verified(
+                os.path.join(self.dir, "missing" + self.suffix)), False)
+
+        #a file modified while being verified isn't marked
+        stat = audiotools.__file_stat__(track2.filename)
+        track2.set_metadata(audiotools.MetaData(track_name=u"New Name"))
+        self.age(track2.filename)
+        self.index.set_verified(track2.filename, stat)
+        self.assertEqual(self.index.verified(track2.filename), False)
+
+        #while one which is unchanged is
+        stat = audiotools.__file_stat__(track2.filename)
+        self.index.set_verified(track2.filename, stat)
+        self.assertEqual(self.index.verified(track2.filename), True)
+
+
+class Test_replace_file(unittest.TestCase):
+    @LIB_CORE
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.dir, "file")
+        f = open(self.filename, "wb")
+        f.write("original")
+        f.close()
+
+    @LIB_CORE
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.dir)
+
+    def replace(self, filename, data):
+        audiotools.__replace_file__(filename, lambda f: f.write(data))
+
+    @LIB_CORE
+    def test_replace(self):
+        import stat
+
+        os.chmod(self.filename, 0640)
+        self.replace(self.filename, "replaced")
+        self.assertEqual(open(self.filename, "rb").read(), "replaced")
+        self.assertEqual(stat.S_IMODE(os.stat(self.filename).st_mode), 0640)
+        self.assertEqual(os.listdir(self.dir), ["file"])
+
+        #the original is left intact if writing fails
+        def failure(f):
+            f.write("partial")
+            raise ValueError("failure")
+
+        self.assertRaises(ValueError, audiotools.__replace_file__,
+                          self.filename, failure)
+        self.assertEqual(open(self.filename, "rb").read(), "replaced")
+        self.assertEqual(os.listdir(self.dir), ["file"])
+
+    @LIB_CORE
+    def test_links(self):
+        #symbolic links are followed rather than replaced
+        link = os.path.join(self.dir, "symlink")
+        os.symlink(self.filename, link)
+        self.replace(link, "via symlink")
+        self.assert_(os.path.islink(link))
+        self.assertEqual(open(self.filename, "rb").read(), "via symlink")
+
+        #and hard links still share the new contents
+        link = os.path.join(self.dir, "hardlink")
+        os.link(self.filename, link)
+        self.replace(self.filename, "via hard link")
+        self.assertEqual(open(link, "rb").read(), "via hard link")
+        self.assertEqual(os.stat(link).st_ino, os.stat(self.filename).st_ino)
+
+    @LIB_CORE
+    def test_failed_copy(self):
+        #a write which fails while copying over a hard-linked original
+        #raises IOError rather than truncating it and carrying on
+        link = os.path.join(self.dir, "hardlink")
+        os.link(self.filename, link)
+
+        class FullFile:
+            def __init__(self, f):
+                self.f = f
+                self.written = 0
+
+            def write(self, s):
+                if ((self.written + len(s)) > 4):
+                    raise IOError("No space left on device")
+                self.f.write(s)
+                self.written += len(s)
+
+            def __getattr__(self, attr):
+                return getattr(self.f, attr)
+
+        audiotools.file = lambda *args: FullFile(file(*args))
+        try:
+            self.assertRaises(IOError, self.replace, self.filename,
+                              "replaced contents")
+        finally:
+            del(audiotools.file)
+        self.assertNotEqual(open(self.filename, "rb").read(),
+                            "replaced contents")
+        self.assertEqual(sorted(os.listdir(self.dir)), ["file", "hardlink"])
+
+    @LIB_CORE
+    def test_permissions(self):
+        #a file which can't be written isn't replaced
+        #even if its directory is writable
+        if (os.getuid() == 0):
+            #check as an unprivileged user in a subprocess
+            os.chmod(self.dir, 0777)
+            os.chown(self.filename, 65534, 65534)
+            os.chmod(self.filename, 0400)
+            pid = os.fork()
+            if (pid == 0):
+                status = 1
+                try:
+                    os.setgid(65534)
+                    os.setuid(65534)
+                    try:
+                        self.replace(self.filename, "replaced")
+                    except IOError:
+                        status = 0
+                finally:
+                    os._exit(status)
+            self.assertEqual(os.waitpid(pid, 0)[1], 0)
+        else:
+            os.chmod(self.filename, 0400)
+            self.assertRaises(IOError, self.replace, self.filename,
+                              "replaced")
+        self.assertEqual(open(self.filename, "rb").read(), "original")
+        self.assertEqual(os.listdir(self.dir), ["file"])
+
+        #while one owned by someone else keeps its owner
+        if (os.getuid() == 0):
+            os.chmod(self.filename, 0644)
+            self.replace(self.filename, "replaced")
+            self.assertEqual(open(self.filename, "rb").read(), "replaced")
+            self.assertEqual((os.stat(self.filename).st_uid,
+                              os.stat(self.filename).st_gid),
+                             (65534, 65534))
+
+
+class Test_UndoDB(unittest.TestCase):
+    @LIB_CORE
+    def setUp(self):
+        from audiotools.delta import UndoDB
+
+        self.dir = tempfile.mkdtemp()
+        self.db = UndoDB(os.path.join(self.dir, "undo.db"))
+        self.old_file = os.path.join(self.dir, "old")
+        self.new_file = os.path.join(self.dir, "new")
+
+    @LIB_CORE
+    def tearDown(self):
+        import shutil
+
+        self.db.close()
+        shutil.rmtree(self.dir)
+
+    def assertUndoes(self, old_data, new_data, maximum_patch_size=None):
+        f = open(self.old_file, "wb")
+        f.write(old_data)
+        f.close()
+        f = open(self.new_file, "wb")
+        f.write(new_data)
+        f.close()
+
+        self.db.add(self.old_file, self.new_file)
+        self.db.cursor.execute(
+            "SELECT length(patch_data) FROM patch ORDER BY patch_id DESC")
+        if (maximum_patch_size is not None):
+            self.assert_(self.db.cursor.fetchone()[0] <= maximum_patch_size)
+
+        #undo and redo use the same patch
+        self.assertEqual(self.db.undo(self.new_file), True)
+        self.assertEqual(open(self.new_file, "rb").read(), old_data)
+        self.assertEqual(self.db.undo(self.new_file), True)
+        self.assertEqual(open(self.new_file, "rb").read(), new_data)
+
+    @LIB_CORE
+    def test_undo(self):
+        #each file's contents are unique, as patches are keyed by checksum
+        def data():
+            return os.urandom(3 * audiotools.BUFFER_SIZE + 1234)
+
+        #changes in place only store the changed blocks
+        d = data()
+        self.assertUndoes(d, d[0:100] + os.urandom(100) + d[200:], 1000)
+        d = data()
+        self.assertUndoes(d,
+                          d[0:2 * audiotools.BUFFER_SIZE] + os.urandom(10) +
+                          d[2 * audiotools.BUFFER_SIZE + 10:], 1000)
+
+        #as do resized headers, since the data after them is unchanged
+        d = data()
+        self.assertUndoes(d, os.urandom(5000) + d[3000:], 10000)
+        d = data()
+        self.assertUndoes(d, d[0:100] + d[200:], 10000)
+
+        #while other changes still round-trip
+        d = data()
+        self.assertUndoes(d, d + os.urandom(777))
+        d = data()
+        self.assertUndoes(d, d[0:-5000])
+        self.assertUndoes(data(), os.urandom(100))
+        self.assertUndoes("", os.urandom(10))
+
+    @LIB_CORE
+    def test_undo_large(self):
+        #a resized header in front of several megabytes of data
+        #stores only the header, whichever file is larger
+        d = os.urandom(1000) + os.urandom(8 * audiotools.BUFFER_SIZE)
+        self.assertUndoes(d, os.urandom(1500) + d[1000:], 10000)
+        d = os.urandom(1500) + os.urandom(8 * audiotools.BUFFER_SIZE)
+        self.assertUndoes(d, os.urandom(1000) + d[1500:], 10000)
+
+        #while a same-sized file with every block changed still round-trips
+        self.assertUndoes(os.urandom(4 * audiotools.BUFFER_SIZE),
+                          os.urandom(4 * audiotools.BUFFER_SIZE))
+
+    @LIB_CORE
+    def test_missing(self):
+        f = open(self.new_file, "wb")
+        f.write("Hello World")
+        f.close()
+        self.assertEqual(self.db.undo(self.new_file), False)
+        self.assertEqual(open(self.new_file, "rb").read(), "Hello World")
+
+
 class Test_pcm_frame_cmp(unittest.TestCase):
     @LIB_CORE
     def test_pcm_frame_cmp(self):
@@ -879,6 +1645,82 @@ class Test_pcm_split(unittest.TestCase):
             audiotools.transfer_framelist_data(sub_pcm, counter.update)
             self.assertEqual(sub_frames, int(counter) * 44100)
 
+    @LIB_CORE
+    def test_partial_reads(self):
+        def read_channels(pcmreader, bytes):
+            framelist = pcmreader.read(bytes)
+            return [list(framelist.channel(c))
+                    for c in xrange(framelist.channels)]
+
+        sub_readers = audiotools.pcm_split(
+            MiniFrameReader([range(0, 2000), range(2000, 0, -1)],
+                            44100, 3, 16),
+            [500, 300, 1000, 200])
+
+        #a sub-reader read in full
+        sub_reader = sub_readers.next()
+        counter = FrameCounter(2, 16, 44100)
+        audiotools.transfer_framelist_data(sub_reader, counter.update)
+        self.assertEqual(counter.value, 500 * 4)
+
+        #a sub-reader read in part and closed
+        sub_reader = sub_readers.next()
+        self.assertEqual(read_channels(sub_reader, 40),
+                         [range(500, 510), range(1500, 1490, -1)])
+        sub_reader.close()
+        self.assertRaises(ValueError, sub_reader.read, 40)
+
+        #a sub-reader read in part and abandoned
+        abandoned = sub_readers.next()
+        self.assertEqual(read_channels(abandoned, 40),
+                         [range(800, 810), range(1200, 1190, -1)])
+
+        #still start in the right place
+        sub_reader = sub_readers.next()
+        self.assertRaises(ValueError, abandoned.read, 40)
+        self.assertEqual(read_channels(sub_reader, 2000 * 4),
+                         [range(1800, 2000), range(200, 0, -1)])
+        self.assertRaises(StopIteration, sub_readers.next)
+
+    @LIB_CORE
+    def test_eager_consumption(self):
+        #sub-readers requested before the previous one is read
+        #raise ValueError rather than return no frames
+        sub_readers = list(audiotools.pcm_split(BLANK_PCM_Reader(3),
+                                                [44100] * 3))
+        self.assertEqual(len(sub_readers), 3)
+        for sub_reader in sub_readers:
+            self.assertRaises(ValueError, sub_reader.read, 4096)
+
+        sub_readers = audiotools.pcm_split(BLANK_PCM_Reader(3), [44100] * 3)
+        first = sub_readers.next()
+        second = sub_readers.next()
+        self.assertRaises(ValueError, first.read, 4096)
+        counter = FrameCounter(2, 16, 44100)
+        audiotools.transfer_framelist_data(second, counter.update)
+        self.assertEqual(counter.value, 44100 * 4)
+
+    @LIB_CORE
+    def test_early_stop(self):
+        #the full stream is closed when the caller stops early
+        class ClosedReader(BLANK_PCM_Reader):
+            closed = False
+
+            def close(self):
+                self.closed = True
+
+        reader = ClosedReader(3)
+        for sub_reader in audiotools.pcm_split(reader, [44100] * 3):
+            break
+        self.assertEqual(reader.closed, True)
+
+        reader = ClosedReader(3)
+        sub_readers = audiotools.pcm_split(reader, [44100] * 3)
+        sub_readers.next()
+        self.assertEqual(reader.closed, False)
+        sub_readers.close()
+        self.assertEqual(reader.closed, True)
+
 
 class Test_str_width(unittest.TestCase):
     @LIB_CORE
@@ -1380,6 +2222,67 @@ class TestFrameList(unittest.TestCase):
             finally:
                 temp_track.close()
 
+    @LIB_CORE
+    def test_buffer(self):
+        import array
+
+        for bps in [8, 16, 24]:
+            for channels in [1, 2, 3]:
+                f = audiotools.pcm.from_list(
+                    range(-(channels * 10), channels * 10),
+                    channels, bps, True)
+
+                #ensure the buffer interface exports native ints
+                view = memoryview(f)
+                self.assertEqual(view.format, "i")
+                self.assertEqual(view.itemsize, array.array("i").itemsize)
+                self.assertEqual(view.shape, (f.frames, f.channels))
+                self.assertEqual(view.readonly, True)
+                a = array.array("i")
+                a.fromstring(buffer(f))
+                self.assertEqual(list(a), list(f))
+
+                #ensure from_buffer round-trips those ints
+                f2 = audiotools.pcm.from_buffer(a, channels, bps)
+                self.assertEqual(f2, f)
+                self.assertEqual(f2.frames, f.frames)
+                self.assertEqual(f2.channels, f.channels)
+                self.assertEqual(f2.bits_per_sample, f.bits_per_sample)
+                self.assertEqual(audiotools.pcm.from_buffer(f, channels, bps),
+                                 f)
+
+        #check empty FrameLists
+        f = audiotools.pcm.from_list([], 2, 16, True)
+        self.assertEqual(len(buffer(f)), 0)
+        self.assertEqual(
+            len(audiotools.pcm.from_buffer(array.array("i"), 2, 16)), 0)
+
+        #check buffer that's not divisible by the channel count
+        self.assertRaises(ValueError,
+                          audiotools.pcm.from_buffer,
+                          array.array("i", [0] * 3), 2, 16)
+
+        #check buffer that's not divisible by the int size
+        self.assertRaises(ValueError,
+                          audiotools.pcm.from_buffer,
+                          chr(0) * 3, 1, 16)
+
+        #check channels <= 0
+        self.assertRaises(ValueError,
+                          audiotools.pcm.from_buffer,
+                          array.array("i", [0] * 4), 0, 16)
+
+        #check bps != 8,16,24
+        for bps in [0, 7, 9, 15, 17, 23, 25, 64]:
+            self.assertRaises(ValueError,
+                              audiotools.pcm.from_buffer,
+                              array.array("i", [0] * 4), 2, bps)
+
+        #check non-buffer objects
+        self.assertRaises(TypeError,
+                          audiotools.pcm.from_buffer,
+                          [0] * 4, 2, 16)
+
     @LIB_CORE
     def test_errors(self):
         #check list that's too large
@@ -1514,6 +2417,40 @@ class TestFloatFrameList(unittest.TestCase):
                 l,
                 list(audiotools.pcm.from_list(l, 1, bps, True).to_float().to_int(bps)))
 
+    @LIB_CORE
+    def test_buffer(self):
+        import array
+
+        for channels in [1, 2, 3]:
+            f = audiotools.pcm.FloatFrameList(
+                [i / 10.0 for i in xrange(-(channels * 5), channels * 5)],
+                channels)
+
+            #ensure the buffer interface exports native doubles
+            view = memoryview(f)
+            self.assertEqual(view.format, "d")
+            self.assertEqual(view.shape, (f.frames, f.channels))
+            self.assertEqual(view.readonly, True)
+            a = array.array("d")
+            a.fromstring(buffer(f))
+            self.assertEqual(list(a), list(f))
+
+            #ensure from_float_buffer round-trips those doubles
+            f2 = audiotools.pcm.from_float_buffer(a, channels)
+            self.assertEqual(list(f2), list(f))
+            self.assertEqual(f2.frames, f.frames)
+            self.assertEqual(f2.channels, f.channels)
+
+        #check buffer that's not divisible by the channel count
+        self.assertRaises(ValueError,
+                          audiotools.pcm.from_float_buffer,
+                          array.array("d", [0.0] * 3), 2)
+
+        #check channels <= 0
+        self.assertRaises(ValueError,
+                          audiotools.pcm.from_float_buffer,
+                          array.array("d", [0.0] * 4), 0)
+
     @LIB_CORE
     def test_errors(self):
         #check string that's too large
@@ -1542,6 +2479,279 @@ class TestFloatFrameList(unittest.TestCase):
                               chr(0) * 4, 2, bps, 1, 1)
 
 
+class ExecQueues(unittest.TestCase):
+    @LIB_CORE
+    def test_exec_queue2(self):
+        #queued functions are never pickled, so lambdas work
+        queue = audiotools.ExecQueue2()
+        for i in xrange(20):
+            queue.execute(lambda x: (x * 2, os.getpid()), [i])
+        results = list(queue.run(4))
+        self.assertEqual(sorted([r[0] for r in results]),
+                         range(0, 40, 2))
+
+        #workers are reused from one job to the next
+        self.assert_(len(set([r[1] for r in results])) <= 4)
+        self.assert_(os.getpid() not in set([r[1] for r in results]))
+
+        #failed jobs and jobs whose worker exits yield None
+        #without stopping the others
+        def failure(x):
+            raise ValueError(x)
+
+        queue = audiotools.ExecQueue2()
+        for i in xrange(10):
+            if (i == 3):
+                queue.execute(failure, [i])
+            elif (i == 6):
+                queue.execute(os._exit, [1])
+            else:
+                queue.execute(lambda x: x, [i])
+        self.assertEqual(sorted(queue.run(2)),
+                         [None, None, 0, 1, 2, 4, 5, 7, 8, 9])
+
+    @LIB_CORE
+    def test_exec_queue(self):
+        import sys
+
+        def touch(filename):
+            open(filename, "wb").close()
+
+        def failure(x):
+            raise ValueError(x)
+
+        directory = tempfile.mkdtemp()
+        stderr = tempfile.TemporaryFile()
+        old_stderr = os.dup(2)
+        try:
+            #jobs run in subprocesses, so their side effects are on disk
+            queue = audiotools.ExecQueue()
+            for i in xrange(10):
+                queue.execute(touch, [os.path.join(directory, str(i))])
+            queue.run(3)
+            self.assertEqual(sorted(map(int, os.listdir(directory))),
+                             range(10))
+            self.assertEqual(queue.return_values, set([0]))
+
+            #failed jobs print their traceback and add a nonzero status
+            #without stopping the others
+            queue = audiotools.ExecQueue()
+            for i in xrange(10, 20):
+                if (i in (13, 16)):
+                    queue.execute(failure, [i])
+                else:
+                    queue.execute(touch, [os.path.join(directory, str(i))])
+            sys.stderr.flush()
+            os.dup2(stderr.fileno(), 2)
+            try:
+                queue.run(2)
+            finally:
+                sys.stderr.flush()
+                os.dup2(old_stderr, 2)
+            self.assertEqual(len(os.listdir(directory)), 18)
+            self.assertEqual(queue.return_values, set([0, 256]))
+            stderr.seek(0, 0)
+            errors = stderr.read()
+            self.assertEqual(errors.count("ValueError: 13"), 1)
+            self.assertEqual(errors.count("ValueError: 16"), 1)
+        finally:
+            import shutil
+
+            os.close(old_stderr)
+            stderr.close()
+            shutil.rmtree(directory)
+
+    @LIB_CORE
+    def test_exec_progress_queue(self):
+        def job(x, progress):
+            for i in xrange(10):
+                progress(i, 10)
+            return (x + 1, os.getpid())
+
+        queue = audiotools.ExecProgressQueue(
+            audiotools.ProgressDisplay(audiotools.SilentMessenger("test")))
+        for i in xrange(50):
+            queue.execute(job, None, None, i)
+        queue.run(3)
+        self.assertEqual(sorted(queue.results.keys()), range(50))
+        self.assertEqual([queue.results[i][0] for i in xrange(50)],
+                         range(1, 51))
+        self.assert_(len(set([r[1] for r in queue.results.values()])) <= 3)
+
+        #an exception in a job is raised by run()
+        def failure(x, progress):
+            raise ValueError(x)
+
+        queue = audiotools.ExecProgressQueue(
+            audiotools.ProgressDisplay(audiotools.SilentMessenger("test")))
+        for i in xrange(10):
+            if (i == 5):
+                queue.execute(failure, None, None, i)
+            else:
+                queue.execute(job, None, None, i)
+        self.assertRaises(ValueError, queue.run, 3)
+
+
+class TestPCMConverter(unittest.TestCase):
+    @LIB_CORE
+    def test_apply_gain(self):
+        from audiotools.pcmconverter import apply_gain
+
+        for bps in [8, 16, 24]:
+            max_value = (1 << (bps - 1)) - 1
+            min_value = -(1 << (bps - 1))
+            samples = range(min_value, max_value + 1,
+                            max((max_value - min_value) / 1000, 1))
+            f = audiotools.pcm.from_list(samples, 1, bps, True)
+
+            for multiplier in [0.0, 0.25, 0.5, 1.0, 1.5, 3.0]:
+                g = apply_gain(f, multiplier)
+                self.assertEqual(g.frames, f.frames)
+                self.assertEqual(g.channels, f.channels)
+                self.assertEqual(g.bits_per_sample, f.bits_per_sample)
+
+                #results are rounded and clipped to the sample's range
+                self.assertEqual(
+                    list(g),
+                    [min(max(int(round(s * multiplier)), min_value),
+                         max_value) for s in samples])
+
+        #check empty FrameLists
+        self.assertEqual(
+            len(apply_gain(audiotools.pcm.from_list([], 2, 16, True), 2.0)),
+            0)
+
+        #check non-FrameList arguments
+        self.assertRaises(TypeError, apply_gain, [1, 2, 3], 1.0)
+        self.assertRaises(TypeError, apply_gain,
+                          audiotools.pcm.FloatFrameList([0.0], 1), 1.0)
+
+    @LIB_CORE
+    def test_add_dither(self):
+        from audiotools.pcmconverter import add_dither
+
+        for bps in [8, 16, 24]:
+            max_value = (1 << (bps - 1)) - 1
+            min_value = -(1 << (bps - 1))
+            samples = ([min_value] * 1000 +
+                       range(-100, 100) +
+                       [max_value] * 1000)
+            f = audiotools.pcm.from_list(samples, 2, bps, True)
+
+            #rectangular dither toggles only the lowest bit
+            d = add_dither(f, False)
+            self.assertEqual(d.frames, f.frames)
+            self.assertEqual(d.channels, f.channels)
+            self.assertEqual(d.bits_per_sample, f.bits_per_sample)
+            self.assert_(set([s ^ t for (s, t) in zip(f, d)]) ==
+                         set([0, 1]))
+
+            #triangular dither changes samples by at most 1
+            #without exceeding the sample's range
+            d = add_dither(f, True)
+            self.assertEqual(d.frames, f.frames)
+            self.assert_(set([t - s for (s, t) in zip(f, d)]) ==
+                         set([-1, 0, 1]))
+            self.assertEqual(max(d), max_value)
+            self.assertEqual(min(d), min_value)
+
+        #check non-FrameList arguments
+        self.assertRaises(TypeError, add_dither, [1, 2, 3], False)
+
+    @LIB_CORE
+    def test_mix_channels(self):
+        from audiotools.pcmconverter import mix_channels
+
+        for bps in [8, 16, 24]:
+            max_value = (1 << (bps - 1)) - 1
+            min_value = -(1 << (bps - 1))
+            samples = range(min_value, max_value + 1,
+                            max((max_value - min_value) / 999, 1))
+            samples = samples[0:len(samples) - (len(samples) % 3)]
+            f = audiotools.pcm.from_list(samples, 3, bps, True)
+            frames = [samples[i:i + 3] for i in xrange(0, len(samples), 3)]
+
+            for matrix in [[[1.0, 0.0, 0.0]],
+                           [[0.0, 0.0, 1.0],
+                            [0.0, 1.0, 0.0],
+                            [1.0, 0.0, 0.0]],
+                           [[1, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]],
+                           [[0.5, 0.5, 0.0]],
+                           [[1.0, 0.0, 0.7], [0.0, 1.0, 0.7]],
+                           [[0.42, -0.42, 0.0], [-2.0, 0.0, 2.0]],
+                           [[0.0, 0.0, 0.0]]]:
+                m = mix_channels(f, matrix)
+                self.assertEqual(m.frames, f.frames)
+                self.assertEqual(m.channels, len(matrix))
+                self.assertEqual(m.bits_per_sample, f.bits_per_sample)
+
+                #results are rounded and clipped to the sample's range
+                self.assertEqual(
+                    list(m),
+                    [min(max(int(round(sum([c * s for (c, s) in
+                                            zip(row, frame)]))),
+                             min_value), max_value)
+                     for frame in frames for row in matrix])
+
+        #check empty FrameLists
+        m = mix_channels(audiotools.pcm.from_list([], 2, 16, True),
+                         [[0.5, 0.5]])
+        self.assertEqual(m.channels, 1)
+        self.assertEqual(len(m), 0)
+
+        #check invalid arguments
+        f = audiotools.pcm.from_list([1, 2, 3, 4], 2, 16, True)
+        self.assertRaises(TypeError, mix_channels, [1, 2, 3], [[1.0]])
+        self.assertRaises(ValueError, mix_channels, f, [])
+        self.assertRaises(ValueError, mix_channels, f, [[1.0]])
+        self.assertRaises(ValueError, mix_channels, f, [[1.0, 0.0, 0.0]])
+        self.assertRaises(TypeError, mix_channels, f, [[1.0, "foo"]])
+        self.assertRaises(TypeError, mix_channels, f, [1.0, 0.0])
+
+    @LIB_CORE
+    def test_channel_mixing(self):
+        def convert(samples, channel_mask, new_channel_mask):
+            channel_mask = audiotools.ChannelMask(channel_mask)
+            new_channel_mask = audiotools.ChannelMask(new_channel_mask)
+            reader = audiotools.PCMConverter(
+                audiotools.PCMReader(
+                    cStringIO.StringIO(
+                        audiotools.pcm.from_list(
+                            samples, len(channel_mask), 16,
+                            True).to_bytes(False, True)),
+                    44100, len(channel_mask), int(channel_mask), 16),
+                44100, len(new_channel_mask), int(new_channel_mask), 16)
+            framelist = reader.read(4096)
+            reader.close()
+            self.assertEqual(framelist.channels, len(new_channel_mask))
+            return list(framelist)
+
+        #5.1 is downmixed to stereo with its center channel
+        #and its rear channels out of phase, and its LFE dropped
+        self.assertEqual(convert([1000, 2000, 100, 30000, 200, 300],
+                                 0x3F, 0x3),
+                         [1000 + 70 + 210, 2000 + 70 - 210])
+        self.assertEqual(convert([0, 0, 30000, 0, 30000, 30000],
+                                 0x3F, 0x3),
+                         [32767, -4200])
+
+        #side channels stand in for missing rear channels
+        self.assertEqual(convert([1000, 2000, 100, 200], 0x603, 0x3),
+                         [1000 + 126, 2000 - 126])
+
+        #stereo is averaged to mono and mono is copied to the center
+        self.assertEqual(convert([1000, 2001], 0x3, 0x4), [1501])
+        self.assertEqual(convert([1000], 0x4, 0x3), [700, 700])
+
+        #removed channels are picked by channel mask
+        self.assertEqual(convert([1, 2, 3, 4, 5, 6], 0x3F, 0x7), [1, 2, 3])
+        self.assertEqual(convert([1, 2, 3, 4, 5, 6], 0x3F, 0x33),
+                         [1, 2, 5, 6])
+
+        #added channels are copies of the first
+        self.assertEqual(convert([1, 2, 3], 0x7, 0x3F), [1, 2, 3, 1, 1, 1])
+
+
 class __SimpleChunkReader__:
     def __init__(self, chunks):
         self.chunks = chunks
@@ -2129,6 +3339,105 @@ class Bitstream(unittest.TestCase):
         finally:
             temp.close()
 
+    @LIB_BITSTREAM
+    def test_mmap_reader(self):
+        from audiotools.bitstream import BitstreamReader, HuffmanTree
+
+        table_be = HuffmanTree([[1, 1], 0,
+                                [1, 0], 1,
+                                [0, 1], 2,
+                                [0, 0, 1], 3,
+                                [0, 0, 0], 4], 0)
+        table_le = HuffmanTree([[1, 1], 0,
+                                [1, 0], 1,
+                                [0, 1], 2,
+                                [0, 0, 1], 3,
+                                [0, 0, 0], 4], 1)
+
+        temp = tempfile.TemporaryFile()
+        try:
+            temp.write(chr(0xFF))
+            temp.write(chr(0xFF))
+            temp.write(chr(0xB1))
+            temp.write(chr(0xED))
+            temp.write(chr(0x3B))
+            temp.write(chr(0xC1))
+            temp.flush()
+
+            #a mapped stream starts from the file's current position
+            temp.seek(2, 0)
+            reader = BitstreamReader(temp, 0, mmap=True)
+            self.__test_big_endian_reader__(reader, table_be)
+            self.__test_try__(reader, table_be)
+            self.__test_callbacks_reader__(reader, 14, 18, table_be, 14)
+
+            temp.seek(2, 0)
+            reader = BitstreamReader(temp, 1, mmap=True)
+            self.__test_little_endian_reader__(reader, table_le)
+            self.__test_try__(reader, table_le)
+            self.__test_callbacks_reader__(reader, 14, 18, table_le, 13)
+
+            #pad the stream with some additional data at the end
+            temp.seek(0, 2)
+            temp.write(chr(0xFF))
+            temp.write(chr(0xFF))
+            temp.flush()
+
+            #check substreams viewing a mapped stream
+            #and substreams viewing those substreams
+            for (endianness, test_reader, table) in [
+                (0, self.__test_big_endian_reader__, table_be),
+                (1, self.__test_little_endian_reader__, table_le)]:
+                temp.seek(0, 0)
+                reader = BitstreamReader(temp, endianness, mmap=True)
+                reader.mark()
+                reader.skip(16)
+                subreader = reader.substream(4)
+                self.assertEqual(reader.read(16), 0xFFFF)
+                test_reader(subreader, table)
+                self.__test_try__(subreader, table)
+                self.__test_callbacks_reader__(subreader, 14, 18, table, 13)
+
+                reader.rewind()
+                reader.skip(8)
+                subreader1 = reader.substream(6)
+                subreader1.skip(8)
+                subreader2 = subreader1.substream(4)
+                test_reader(subreader2, table)
+                reader.unmark()
+
+            #a substream remains readable after its parent is closed
+            temp.seek(0, 0)
+            reader = BitstreamReader(temp, 0, mmap=True)
+            reader.skip(16)
+            subreader = reader.substream(4)
+            reader.close()
+            del(reader)
+            self.assertEqual(subreader.read(32), 0xB1ED3BC1)
+
+            #and substreams beyond the end of the file are errors
+            temp.seek(0, 0)
+            reader = BitstreamReader(temp, 0, mmap=True)
+            self.assertRaises(IOError, reader.substream, 9)
+        finally:
+            temp.close()
+
+        #empty files and pipes can't be mapped
+        #and fall back to being read normally
+        temp = tempfile.TemporaryFile()
+        try:
+            reader = BitstreamReader(temp, 0, mmap=True)
+            self.assertRaises(IOError, reader.read, 8)
+        finally:
+            temp.close()
+
+        pipe = os.popen("printf '\\261'")
+        try:
+            reader = BitstreamReader(pipe, 0, mmap=True)
+            self.assertEqual(reader.read(8), 0xB1)
+        finally:
+            pipe.close()
+
     def __test_edge_reader_be__(self, reader):
         reader.mark()
 
@@ -3457,6 +4766,107 @@ class TestReplayGain(unittest.TestCase):
             dummy1.close()
             dummy2.close()
 
+    @LIB_CORE
+    def test_parallel(self):
+        import audiotools.replaygain
+
+        test_format = audiotools.WaveAudio
+
+        temp_files = [tempfile.NamedTemporaryFile(
+                suffix="." + test_format.SUFFIX) for i in xrange(4)]
+        try:
+            tracks = [test_format.from_pcm(
+                    temp_file.name,
+                    test_streams.Sine16_Stereo(44100 * (i + 1), 44100,
+                                               441.0 * (i + 1), 0.50,
+                                               4410.0, 0.49, 1.0))
+                      for (i, temp_file) in enumerate(temp_files)]
+
+            #analyzing every track with the same ReplayGain object
+            rg = audiotools.replaygain.ReplayGain(44100)
+            track_gains = []
+            for track in tracks:
+                pcm = track.to_pcm()
+                audiotools.transfer_data(pcm.read, rg.update)
+                pcm.close()
+                track_gains.append(rg.title_gain())
+            (album_gain, album_peak) = rg.album_gain()
+            expected = [(track, track_gain, track_peak,
+                         album_gain, album_peak)
+                        for (track, (track_gain, track_peak)) in
+                        zip(tracks, track_gains)]
+
+            #should match merging separate objects' histograms
+            merged = audiotools.replaygain.ReplayGain(44100)
+            for track in tracks:
+                rg = audiotools.replaygain.ReplayGain(44100)
+                pcm = track.to_pcm()
+                audiotools.transfer_data(pcm.read, rg.update)
+                pcm.close()
+                rg.title_gain()
+                (histogram, peak) = rg.album_histogram()
+                merged.add_album_histogram(histogram, peak)
+            self.assertEqual(merged.album_gain(), (album_gain, album_peak))
+            self.assertRaises(ValueError,
+                              merged.add_album_histogram, [0], 0.0)
+
+            #and calculating them with any number of processes
+            total_frames = sum([track.total_frames() for track in tracks])
+            for max_processes in [1, 2, 4]:
+                progress = []
+                self.assertEqual(
+                    list(audiotools.calculate_replay_gain(
+                            tracks,
+                            lambda current, total:
+                                progress.append((current, total)),
+                            max_processes)),
+                    expected)
+                self.assertEqual(progress[-1], (total_frames, total_frames))
+        finally:
+            for temp_file in temp_files:
+                temp_file.close()
+
+    @LIB_CORE
+    def test_analyses(self):
+        test_format = audiotools.WaveAudio
+
+        temp_files = [tempfile.NamedTemporaryFile(
+                suffix="." + test_format.SUFFIX) for i in xrange(3)]
+        try:
+            #analyze some tracks while they're being encoded
+            tracks = []
+            analyses = {}
+            for (i, temp_file) in enumerate(temp_files):
+                pcmreader = test_streams.Sine16_Stereo(44100 * (i + 1), 44100,
+                                                       441.0 * (i + 1), 0.50,
+                                                       4410.0, 0.49, 1.0)
+                if (i > 0):
+                    analysis = audiotools.ReplayGainAnalysis(44100)
+                    pcmreader = audiotools.PCMReaderTee(pcmreader,
+                                                        [analysis.update])
+                tracks.append(test_format.from_pcm(temp_file.name,
+                                                   pcmreader))
+                if (i > 0):
+                    analyses[temp_file.name] = analysis.result()
+
+            expected = list(audiotools.calculate_replay_gain(tracks))
+
+            #those tracks shouldn't be decoded again
+            for temp_file in temp_files[1:]:
+                f = open(temp_file.name, "wb")
+                f.close()
+
+            for max_processes in [1, 2]:
+                self.assertEqual(
+                    list(audiotools.calculate_replay_gain(
+                            tracks,
+                            max_processes=max_processes,
+                            analyses=analyses)),
+                    expected)
+        finally:
+            for temp_file in temp_files:
+                temp_file.close()
+
     @LIB_CORE
     def test_applicable(self):
         #build a bunch of test tracks
@@ -5281,6 +6691,243 @@ FILE "cue.wav" WAVE
                                              year=u"2010"))
 
 
+class Test_metadata_lookup(unittest.TestCase):
+    #a small disc whose MusicBrainz and FreeDB responses
+    #are served by a stub HTTP server on the local host
+    OFFSETS = [150, 21035, 42561]
+    LEAD_OUT = 60632
+    TOTAL_LENGTH = 60482
+
+    @LIB_CORE
+    def setUp(self):
+        import BaseHTTPServer
+        import SocketServer
+        import threading
+
+        self.cache = os.path.join(tempfile.mkdtemp(), "metadata")
+        config = audiotools.RawConfigParser()
+        config.add_section("System")
+        config.set("System", "metadata_cache", self.cache)
+        self.original_cache = audiotools.METADATA_CACHE
+        self.original_ttl = audiotools.METADATA_CACHE_TTL
+        audiotools.METADATA_CACHE = audiotools.__metadata_cache__(config)
+        audiotools.HTTP_CONNECTIONS.close()
+
+        from audiotools.musicbrainz import DiscID
+
+        disc_id = unicode(DiscID(
+                first_track_number=1,
+                last_track_number=len(self.OFFSETS),
+                lead_out_offset=self.LEAD_OUT,
+                offsets=self.OFFSETS))
+
+        musicbrainz_xml = (
+            u'<?xml version="1.0" encoding="UTF-8"?>' +
+            u'<metadata xmlns="http://musicbrainz.org/ns/mmd-2.0#">' +
+            u'<disc id="%s"><release-list count="1"><release>' % (disc_id) +
+            u'<title>Album Name</title><date>2012</date>' +
+            u'<medium-list count="1"><medium>' +
+            u'<disc-list><disc id="%s"/></disc-list>' % (disc_id) +
+            u'<track-list>' +
+            u"".join([u'<track><position>%d</position>' % (i + 1) +
+                      u'<recording><title>Track %d</title></recording>' %
+                      (i + 1) +
+                      u'</track>' for i in xrange(len(self.OFFSETS))]) +
+            u'</track-list></medium></medium-list>' +
+            u'</release></release-list></disc></metadata>').encode('utf-8')
+
+        freedb_query = "200 rock 1e0e2c03 Album Artist / Album Name\r\n"
+        freedb_read = ("210 rock 1e0e2c03\r\n" +
+                       "DTITLE=Album Artist / Album Name\r\n" +
+                       "DYEAR=2012\r\n" +
+                       "".join(["TTITLE%d=Track %d\r\n" % (i, i + 1)
+                                for i in xrange(len(self.OFFSETS))]) +
+                       ".\r\n")
+
+        test = self
+        self.requests = []
+        self.connections = []
+        self.freedb_queried = threading.Event()
+        self.concurrent = []
+
+        class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                BaseHTTPServer.BaseHTTPRequestHandler.setup(self)
+                test.connections.append(self.client_address)
+
+            def respond(self, data):
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                test.requests.append(("musicbrainz", self.path))
+                #MusicBrainz waits to see if FreeDB's query
+                #arrives at the same time
+                test.concurrent.append(test.freedb_queried.wait(5))
+                self.respond(musicbrainz_xml)
+
+            def do_POST(self):
+                from cgi import parse_qs
+
+                body = parse_qs(self.rfile.read(
+                        int(self.headers["Content-Length"])))
+                command = body["cmd"][0]
+                test.requests.append(("freedb", command))
+                if (command.startswith("cddb query")):
+                    test.freedb_queried.set()
+                    self.respond(freedb_query)
+                else:
+                    self.respond(freedb_read)
+
+            def log_message(self, *args):
+                pass
+
+        class Server(SocketServer.ThreadingMixIn,
+                     BaseHTTPServer.HTTPServer):
+            daemon_threads = True
+
+        self.Server = Server
+        self.server = Server(("127.0.0.1", 0), Handler)
+        self.port = self.server.server_address[1]
+        self.server_thread = threading.Thread(
+            target=self.server.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+
+    @LIB_CORE
+    def tearDown(self):
+        import shutil
+
+        self.server.shutdown()
+        self.server.server_close()
+        audiotools.HTTP_CONNECTIONS.close()
+        audiotools.METADATA_CACHE = self.original_cache
+        audiotools.METADATA_CACHE_TTL = self.original_ttl
+        shutil.rmtree(os.path.dirname(self.cache))
+
+    def lookup(self, **kwargs):
+        arguments = {"musicbrainz_server": "127.0.0.1",
+                     "musicbrainz_port": self.port,
+                     "freedb_server": "127.0.0.1",
+                     "freedb_port": self.port}
+        arguments.update(kwargs)
+        return audiotools.metadata_lookup(
+            first_track_number=1,
+            last_track_number=len(self.OFFSETS),
+            offsets=self.OFFSETS,
+            lead_out_offset=self.LEAD_OUT,
+            total_length=self.TOTAL_LENGTH,
+            **arguments)
+
+    def check_matches(self, matches):
+        #MusicBrainz's match comes before FreeDB's
+        self.assertEqual(len(matches), 2)
+        for choice in matches:
+            self.assertEqual(len(choice), len(self.OFFSETS))
+            for (i, track) in enumerate(choice):
+                self.assertEqual(track.track_name, u"Track %d" % (i + 1))
+                self.assertEqual(track.track_number, i + 1)
+                self.assertEqual(track.album_name, u"Album Name")
+                self.assertEqual(track.year, u"2012")
+        self.assertEqual(matches[0][0].artist_name, u"")
+        self.assertEqual(matches[1][0].artist_name, u"Album Artist")
+
+    @LIB_FREEDB
+    @LIB_MUSICBRAINZ
+    def test_concurrent_lookup(self):
+        self.check_matches(self.lookup())
+
+        #both services are queried at the same time
+        self.assertEqual(self.concurrent, [True])
+        self.assertEqual(sorted([service for (service, request)
+                                 in self.requests]),
+                         ["freedb", "freedb", "musicbrainz"])
+
+        #and FreeDB's query and read share one connection
+        self.assertEqual(len(self.connections), 2)
+
+        #which the next lookup reuses
+        audiotools.METADATA_CACHE.clear()
+        self.check_matches(self.lookup())
+        self.assertEqual(len(self.requests), 6)
+        self.assertEqual(len(self.connections), 2)
+
+    @LIB_FREEDB
+    @LIB_MUSICBRAINZ
+    def test_cache(self):
+        from urllib2 import URLError
+
+        self.check_matches(self.lookup())
+        self.assertEqual(len(self.requests), 3)
+        self.assertEqual(len(os.listdir(self.cache)), 2)
+
+        #a second lookup is answered from the cache
+        self.check_matches(self.lookup())
+        self.assertEqual(len(self.requests), 3)
+
+        #which persists between runs, even without the server
+        self.server.shutdown()
+        self.server.server_close()
+        audiotools.HTTP_CONNECTIONS.close()
+        config = audiotools.RawConfigParser()
+        config.add_section("System")
+        config.set("System", "metadata_cache", self.cache)
+        audiotools.METADATA_CACHE = audiotools.__metadata_cache__(config)
+        self.check_matches(self.lookup())
+        self.assertEqual(len(self.requests), 3)
+
+        #but each service is cached separately
+        self.assertEqual(len(self.lookup(use_musicbrainz=False)), 1)
+        self.assertEqual(len(self.lookup(use_freedb=False)), 1)
+
+        #and expired entries are looked up again
+        audiotools.METADATA_CACHE_TTL = 0
+        self.assertRaises(URLError, self.lookup)
+
+    @LIB_MUSICBRAINZ
+    def test_redirect(self):
+        import BaseHTTPServer
+        import threading
+
+        port = self.port
+
+        class Redirect(BaseHTTPServer.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                self.send_response(301)
+                self.send_header("Location",
+                                 "http://127.0.0.1:%d%s" % (port, self.path))
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        old_server = self.Server(("127.0.0.1", 0), Redirect)
+        thread = threading.Thread(target=old_server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        try:
+            #a server which has moved is followed to its new location
+            self.freedb_queried.set()
+            matches = self.lookup(
+                musicbrainz_port=old_server.server_address[1],
+                use_freedb=False)
+            self.assertEqual(len(matches), 1)
+            self.assertEqual(matches[0][0].track_name, u"Track 1")
+            self.assertEqual([service for (service, request)
+                              in self.requests], ["musicbrainz"])
+        finally:
+            audiotools.HTTP_CONNECTIONS.close()
+            old_server.shutdown()
+            old_server.server_close()
+
+
 class testcuesheet(unittest.TestCase):
     @LIB_CORE
     def setUp(self):
@@ -883,6 +883,123 @@ class LosslessFileTest(AudioFileTest):
         finally:
             temp.close()
 
+    @FORMAT_LOSSLESS
+    def test_seek(self):
+        if (self.audio_class is audiotools.AudioFile):
+            return
+
+        def read_all(pcmreader):
+            frames = []
+            framelist = pcmreader.read(4096)
+            while (len(framelist) > 0):
+                frames.append(framelist)
+                framelist = pcmreader.read(4096)
+            pcmreader.close()
+            return reduce(lambda x, y: x + y, frames,
+                          audiotools.pcm.from_list([], pcmreader.channels,
+                                                   pcmreader.bits_per_sample,
+                                                   True))
+
+        temp = tempfile.NamedTemporaryFile(suffix=self.suffix)
+        try:
+            track = self.audio_class.from_pcm(
+                temp.name,
+                EXACT_RANDOM_PCM_Reader(100000, 44100, 2, 16))
+            pcmreader = track.to_pcm()
+            if (not hasattr(pcmreader, "seek")):
+                pcmreader.close()
+                return
+            pcmreader.close()
+
+            data = read_all(track.to_pcm())
+            for pcm_frame in [0, 1, 4095, 4096, 4097, 50000,
+                              99999, 100000]:
+                pcmreader = track.to_pcm()
+                self.assertEqual(pcmreader.seek(pcm_frame), pcm_frame)
+                self.assertEqual(read_all(pcmreader),
+                                 data.split(pcm_frame)[1])
+
+            #seeking past the end of the stream is clamped to its length
+            pcmreader = track.to_pcm()
+            self.assertEqual(pcmreader.seek(200000), 100000)
+            self.assertEqual(len(read_all(pcmreader)), 0)
+
+            #seeking to a negative position is an error
+            pcmreader = track.to_pcm()
+            self.assertRaises(ValueError, pcmreader.seek, -1)
+            pcmreader.close()
+        finally:
+            temp.close()
+
+    @FORMAT_LOSSLESS
+    def test_concatenate(self):
+        if ((self.audio_class is audiotools.AudioFile) or
+            (not self.audio_class.can_concatenate())):
+            return
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            for (channels, channel_mask) in [(1, 0x4), (2, 0x3), (6, 0x3F)]:
+                sources = []
+                segments = []
+                for (i, pcm_frames) in enumerate([100000, 1, 44101]):
+                    sources.append(audiotools.WaveAudio.from_pcm(
+                            os.path.join(temp_dir, "%d.wav" % (i)),
+                            EXACT_RANDOM_PCM_Reader(
+                                pcm_frames, 44100, channels, 16,
+                                channel_mask)))
+                    segments.append(self.audio_class.from_pcm(
+                            os.path.join(temp_dir,
+                                         "%d%s" % (i, self.suffix)),
+                            sources[-1].to_pcm()))
+
+                track = self.audio_class.concatenate(
+                    os.path.join(temp_dir, "joined" + self.suffix),
+                    segments)
+                self.assertEqual(track.total_frames(), 144102)
+                self.assertEqual(track.channels(), channels)
+                self.assertEqual(int(track.channel_mask()), channel_mask)
+                self.assertEqual(
+                    audiotools.pcm_frame_cmp(
+                        track.to_pcm(),
+                        audiotools.PCMCat(iter([s.to_pcm()
+                                                for s in sources]))),
+                    None)
+                track.verify()
+                track = audiotools.open(track.filename)
+                self.assertEqual(track.total_frames(), 144102)
+
+                #the joined stream can be seeked within
+                pcmreader = track.to_pcm()
+                if (hasattr(pcmreader, "seek")):
+                    self.assertEqual(pcmreader.seek(100000), 100000)
+                    self.assertEqual(
+                        audiotools.pcm_frame_cmp(
+                            pcmreader,
+                            audiotools.PCMCat(iter([s.to_pcm()
+                                                    for s in sources[1:]]))),
+                        None)
+                else:
+                    pcmreader.close()
+
+                #files with different stream parameters can't be joined
+                self.assertRaises(ValueError,
+                                  self.audio_class.concatenate,
+                                  os.path.join(temp_dir,
+                                               "fail" + self.suffix),
+                                  segments + [self.audio_class.from_pcm(
+                            os.path.join(temp_dir, "misfit" + self.suffix),
+                            EXACT_RANDOM_PCM_Reader(100, 48000))])
+                self.assertRaises(ValueError,
+                                  self.audio_class.concatenate,
+                                  os.path.join(temp_dir,
+                                               "fail" + self.suffix),
+                                  [])
+        finally:
+            for f in os.listdir(temp_dir):
+                os.unlink(os.path.join(temp_dir, f))
+            os.rmdir(temp_dir)
+
     @FORMAT_LOSSLESS
     def test_pcm(self):
         if (self.audio_class is audiotools.AudioFile):
@@ -1992,6 +2109,22 @@ class ALACFileTest(LosslessFileTest):
 
         self.assertRaises(TypeError, self.decoder, None)
 
+    @FORMAT_ALAC
+    def test_mmap_decoding(self):
+        temp = tempfile.NamedTemporaryFile(suffix=self.suffix)
+        try:
+            self.audio_class.from_pcm(
+                temp.name,
+                test_streams.Sine16_Stereo(44100 * 5, 44100,
+                                           441.0, 0.50,
+                                           4410.0, 0.49, 1.0))
+            self.assertEqual(
+                audiotools.pcm_frame_cmp(self.decoder(temp.name),
+                                         self.decoder(temp.name, mmap=1)),
+                None)
+        finally:
+            temp.close()
+
     @FORMAT_ALAC
     def test_bits_per_sample(self):
         temp = tempfile.NamedTemporaryFile(suffix=self.suffix)
@@ -2142,6 +2275,122 @@ class ALACFileTest(LosslessFileTest):
         finally:
             temp.close()
 
+    @FORMAT_ALAC
+    def test_update_metadata_layout(self):
+        from audiotools.__m4a__ import get_m4a_atom_layout
+
+        temp = tempfile.NamedTemporaryFile(
+            suffix=self.suffix)
+        original = tempfile.NamedTemporaryFile(
+            suffix=self.suffix)
+        try:
+            self.audio_class.from_pcm(original.name,
+                                      EXACT_RANDOM_PCM_Reader(100000))
+            f = open(temp.name, "wb")
+            f.write(open(original.name, "rb").read())
+            f.close()
+            track = audiotools.open(temp.name)
+            layout = get_m4a_atom_layout(open(temp.name, "rb"))
+            self.assertEqual([atom[0] for atom in layout],
+                             ["ftyp", "moov", "free", "mdat"])
+            free_size = layout[2][2]
+            inode = os.stat(temp.name).st_ino
+
+            #metadata too large for the "meta" atom's "free" atom
+            #grows "moov" into the outer "free" atom in place
+            metadata = audiotools.MetaData(
+                track_name=u"Foo" * (free_size / 12))
+            track.set_metadata(metadata)
+            new_layout = get_m4a_atom_layout(open(temp.name, "rb"))
+            self.assertEqual(os.stat(temp.name).st_ino, inode)
+            self.assert_(new_layout[2][2] < free_size)
+            self.assertEqual(new_layout[3], layout[3])
+            self.assertEqual(track.get_metadata().track_name,
+                             metadata.track_name)
+            self.assertEqual(
+                audiotools.pcm_frame_cmp(
+                    audiotools.open(original.name).to_pcm(),
+                    audiotools.open(temp.name).to_pcm()), None)
+
+            #metadata too large for either "free" atom rewrites the file
+            #with the "mdat" atom moved and its chunk offsets updated
+            metadata = audiotools.MetaData(
+                track_name=u"Bar" * free_size)
+            track.set_metadata(metadata)
+            new_layout = get_m4a_atom_layout(open(temp.name, "rb"))
+            self.assertEqual([atom[0] for atom in new_layout],
+                             ["ftyp", "moov", "free", "mdat"])
+            self.assert_(new_layout[3][1] > layout[3][1])
+            self.assertEqual(new_layout[3][2], layout[3][2])
+            self.assertEqual(track.get_metadata().track_name,
+                             metadata.track_name)
+            self.assertEqual(
+                audiotools.pcm_frame_cmp(
+                    audiotools.open(original.name).to_pcm(),
+                    audiotools.open(temp.name).to_pcm()), None)
+        finally:
+            temp.close()
+            original.close()
+
+    @FORMAT_ALAC
+    def test_update_metadata_64bit_moov(self):
+        import struct
+        from audiotools.__m4a__ import get_m4a_atom_layout
+
+        temp = tempfile.NamedTemporaryFile(
+            suffix=self.suffix)
+        original = tempfile.NamedTemporaryFile(
+            suffix=self.suffix)
+        try:
+            self.audio_class.from_pcm(original.name,
+                                      EXACT_RANDOM_PCM_Reader(100000))
+            data = open(original.name, "rb").read()
+            layout = get_m4a_atom_layout(open(original.name, "rb"))
+            self.assertEqual([atom[3] for atom in layout], [8, 8, 8, 8])
+            ((ftyp_offset, ftyp_size),
+             (moov_offset, moov_size),
+             (free_offset, free_size),
+             (mdat_offset, mdat_size)) = [atom[1:3] for atom in layout]
+
+            #give "moov" a 64-bit size at the expense of "free"
+            #so that "mdat" stays where it is
+            f = open(temp.name, "wb")
+            f.write(data[ftyp_offset:moov_offset])
+            f.write(struct.pack(">I4sQ", 1, "moov", moov_size + 8))
+            f.write(data[moov_offset + 8:free_offset])
+            f.write(struct.pack(">I4s", free_size - 8, "free"))
+            f.write(chr(0) * (free_size - 16))
+            f.write(data[mdat_offset:])
+            f.close()
+            layout = get_m4a_atom_layout(open(temp.name, "rb"))
+            self.assertEqual([atom[3] for atom in layout], [8, 16, 8, 8])
+            self.assertEqual(layout[1][2], moov_size + 8)
+
+            track = audiotools.open(temp.name)
+            self.assertEqual(track.total_frames(), 100000)
+            self.assertEqual(track.get_metadata(),
+                             audiotools.open(original.name).get_metadata())
+
+            #"moov" is rewritten with a 32-bit size either way
+            for track_name in [u"Foo" * ((free_size - 8) / 12),
+                               u"Bar" * free_size]:
+                metadata = audiotools.MetaData(track_name=track_name)
+                track.set_metadata(metadata)
+                new_layout = get_m4a_atom_layout(open(temp.name, "rb"))
+                self.assertEqual([atom[0] for atom in new_layout],
+                                 ["ftyp", "moov", "free", "mdat"])
+                self.assertEqual([atom[3] for atom in new_layout],
+                                 [8, 8, 8, 8])
+                self.assertEqual(track.get_metadata().track_name,
+                                 metadata.track_name)
+                self.assertEqual(
+                    audiotools.pcm_frame_cmp(
+                        audiotools.open(original.name).to_pcm(),
+                        audiotools.open(temp.name).to_pcm()), None)
+        finally:
+            temp.close()
+            original.close()
+
     def __test_reader__(self, pcmreader, block_size=4096):
         if (not audiotools.BIN.can_execute(audiotools.BIN["alac"])):
             self.assert_(False,
@@ -3144,6 +3393,347 @@ class FlacFileTest(TestForeignAiffChunks,
             self.assertEqual(md5sum.digest(), g.digest())
             g.close()
 
+    @FORMAT_FLAC
+    def test_encoding_threads(self):
+        #frames encoded in parallel must yield the same file
+        #as frames encoded one after another
+        for pcm_frames in [1000, 44100, 44100 * 20]:
+            for compression in ["0", "5", "8"]:
+                single = tempfile.NamedTemporaryFile(suffix=self.suffix)
+                multi = tempfile.NamedTemporaryFile(suffix=self.suffix)
+                try:
+                    track1 = self.audio_class.from_pcm(
+                        single.name,
+                        test_streams.Sine16_Stereo(pcm_frames, 44100,
+                                                   441.0, 0.50,
+                                                   4410.0, 0.49, 1.0),
+                        compression,
+                        encoding_threads=1)
+                    track2 = self.audio_class.from_pcm(
+                        multi.name,
+                        test_streams.Sine16_Stereo(pcm_frames, 44100,
+                                                   441.0, 0.50,
+                                                   4410.0, 0.49, 1.0),
+                        compression,
+                        encoding_threads=4)
+                    self.assertEqual(track1.total_frames(), pcm_frames)
+                    self.assertEqual(open(single.name, "rb").read(),
+                                     open(multi.name, "rb").read())
+                    self.assertEqual(track2.verify(), True)
+                finally:
+                    single.close()
+                    multi.close()
+
+    @FORMAT_FLAC
+    def test_decoding_threads(self):
+        def decode(decoder):
+            data = md5()
+            framelist = decoder.read(4096)
+            while (len(framelist) > 0):
+                data.update(framelist.to_bytes(False, True))
+                framelist = decoder.read(4096)
+            decoder.close()
+            return data.digest()
+
+        temp = tempfile.NamedTemporaryFile(suffix=self.suffix)
+        try:
+            for pcm_frames in [1000, 44100, 44100 * 20]:
+                for compression in ["0", "8"]:
+                    self.audio_class.from_pcm(
+                        temp.name,
+                        test_streams.Sine16_Stereo(pcm_frames, 44100,
+                                                   441.0, 0.50,
+                                                   4410.0, 0.49, 1.0),
+                        compression)
+                    checksum = decode(self.decoder(temp.name, 0x3))
+                    for threads in [2, 4]:
+                        self.assertEqual(
+                            decode(self.decoder(temp.name, 0x3,
+                                                threads=threads)),
+                            checksum)
+
+                    #seeking works as before
+                    seeked = []
+                    for threads in [1, 4]:
+                        decoder = self.decoder(temp.name, 0x3,
+                                               threads=threads)
+                        decoder.seek(pcm_frames / 2)
+                        seeked.append(decode(decoder))
+                    self.assertEqual(seeked[0], seeked[1])
+
+            self.assertRaises(ValueError, self.decoder, temp.name, 0x3,
+                              threads=0)
+
+            #a corrupted frame raises the same error at the same point
+            #whether its checksum is calculated per-byte or in bulk
+            f = open(temp.name, "r+b")
+            f.seek(len(f.read()) / 2)
+            f.write(chr(0x00) * 4)
+            f.close()
+            for (threads, use_mmap) in [(1, 0), (4, 0), (1, 1), (4, 1)]:
+                decoder = self.decoder(temp.name, 0x3,
+                                       threads=threads,
+                                       mmap=use_mmap)
+                frames = 0
+                try:
+                    framelist = decoder.read(4096)
+                    while (len(framelist) > 0):
+                        frames += framelist.frames
+                        framelist = decoder.read(4096)
+                    self.assert_(False)
+                except ValueError, err:
+                    if ((threads == 1) and (use_mmap == 0)):
+                        serial = (frames, str(err))
+                    else:
+                        self.assertEqual((frames, str(err)), serial)
+        finally:
+            temp.close()
+
+    @FORMAT_FLAC
+    def test_mmap_decoding(self):
+        def decode(decoder):
+            data = md5()
+            framelist = decoder.read(4096)
+            while (len(framelist) > 0):
+                data.update(framelist.to_bytes(False, True))
+                framelist = decoder.read(4096)
+            decoder.close()
+            return data.digest()
+
+        temp = tempfile.NamedTemporaryFile(suffix=self.suffix)
+        try:
+            for pcm_frames in [1000, 44100 * 5]:
+                self.audio_class.from_pcm(
+                    temp.name,
+                    test_streams.Sine16_Stereo(pcm_frames, 44100,
+                                               441.0, 0.50,
+                                               4410.0, 0.49, 1.0))
+                checksum = decode(self.decoder(temp.name, 0x3))
+                for threads in [1, 4]:
+                    self.assertEqual(
+                        decode(self.decoder(temp.name, 0x3,
+                                            threads=threads,
+                                            mmap=1)),
+                        checksum)
+
+                #seeking works as before
+                seeked = []
+                for use_mmap in [0, 1]:
+                    decoder = self.decoder(temp.name, 0x3, mmap=use_mmap)
+                    decoder.seek(pcm_frames / 2)
+                    seeked.append(decode(decoder))
+                self.assertEqual(seeked[0], seeked[1])
+
+            #streams following an ID3v2 tag are mapped from their offset
+            f = open(temp.name, "rb")
+            flac_data = f.read()
+            f.close()
+            f = open(temp.name, "wb")
+            f.write("ID3\x03\x00\x00\x00\x00\x00\x10" + chr(0) * 16)
+            f.write(flac_data)
+            f.close()
+            self.assertEqual(
+                decode(self.decoder(temp.name, 0x3, stream_offset=26,
+                                    mmap=1)),
+                checksum)
+        finally:
+            temp.close()
+
+    @FORMAT_FLAC
+    def test_fast_decoding(self):
+        def decode(decoder):
+            data = md5()
+            framelist = decoder.read(4096)
+            while (len(framelist) > 0):
+                data.update(framelist.to_bytes(False, True))
+                framelist = decoder.read(4096)
+            decoder.close()
+            return data.digest()
+
+        temp = tempfile.NamedTemporaryFile(suffix=self.suffix)
+        try:
+            for bps in [8, 16, 24]:
+                track = self.audio_class.from_pcm(
+                    temp.name,
+                    EXACT_RANDOM_PCM_Reader(pcm_frames=44100 * 2,
+                                            bits_per_sample=bps))
+
+                #the encoder's MD5 sum matches the decoded samples
+                streaminfo = track.get_metadata().get_block(
+                    audiotools.Flac_STREAMINFO.BLOCK_ID)
+                checksum = decode(self.decoder(temp.name, 0x3))
+                self.assertEqual(streaminfo.md5sum, checksum)
+
+                #a corrupted MD5 sum is only caught if verifying
+                f = open(temp.name, "r+b")
+                f.seek(26)
+                f.write(chr(ord(streaminfo.md5sum[0]) ^ 0xFF))
+                f.close()
+                for threads in [1, 4]:
+                    self.assertRaises(ValueError,
+                                      decode,
+                                      self.decoder(temp.name, 0x3,
+                                                   threads=threads))
+                    self.assertEqual(
+                        decode(self.decoder(temp.name, 0x3,
+                                            threads=threads,
+                                            verify_md5=0)),
+                        checksum)
+
+                audiotools.FAST_DECODING = True
+                try:
+                    self.assertEqual(
+                        audiotools.pcm_frame_cmp(
+                            audiotools.open(temp.name).to_pcm(),
+                            self.decoder(temp.name, 0x3, verify_md5=0)),
+                        None)
+                finally:
+                    audiotools.FAST_DECODING = False
+        finally:
+            temp.close()
+
+    @FORMAT_FLAC
+    def test_metadata_cache(self):
+        temp = tempfile.NamedTemporaryFile(suffix=self.suffix)
+        try:
+            track = self.audio_class.from_pcm(temp.name,
+                                              BLANK_PCM_Reader(1))
+            metadata = audiotools.MetaData(track_name=u"Name",
+                                           track_number=1)
+            metadata.add_image(audiotools.Image.new(TEST_COVER1, u"", 0))
+            track.set_metadata(metadata)
+
+            track = audiotools.open(temp.name)
+            reads = []
+            read_metadata = track.__read_metadata__
+
+            def counted_read_metadata():
+                reads.append(None)
+                return read_metadata()
+
+            track.__read_metadata__ = counted_read_metadata
+
+            #metadata is only parsed once per instance
+            metadata = track.get_metadata()
+            self.assertEqual(track.track_number(), 1)
+            self.assertEqual(track.album_number(), 0)
+            self.assertEqual(len(reads), 1)
+
+            #image data is left on disk until it's needed
+            image = metadata.images()[0]
+            self.assert_("data" not in image.__dict__)
+            self.assertEqual(image.data, TEST_COVER1)
+
+            #each call returns a separate copy
+            metadata.track_name = u"Changed"
+            self.assertEqual(track.get_metadata().track_name, u"Name")
+            self.assertEqual(len(reads), 1)
+
+            #updating metadata discards the cached copy
+            metadata = track.get_metadata()
+            metadata.track_name = u"Updated"
+            track.update_metadata(metadata)
+            self.assertEqual(track.get_metadata().track_name, u"Updated")
+            self.assertEqual(len(reads), 2)
+
+            #unread image data survives the file being rewritten
+            metadata = track.get_metadata()
+            self.assert_("data" not in metadata.images()[0].__dict__)
+            track.delete_metadata()
+            self.assertEqual(track.get_metadata().images(), [])
+            track.set_metadata(metadata)
+            self.assertEqual(track.get_metadata().images()[0].data,
+                             TEST_COVER1)
+            self.assertEqual(audiotools.open(temp.name).get_metadata(),
+                             track.get_metadata())
+
+            track.set_metadata(audiotools.MetaData(track_name=u"Set"))
+            self.assertEqual(track.get_metadata().track_name, u"Set")
+
+            #unread image data is read before any object
+            #retags the file, so it remains available afterward
+            metadata.track_name = u"Name"
+            track.set_metadata(metadata)
+            metadata = audiotools.open(temp.name).get_metadata()
+            image = metadata.images()[0]
+            self.assert_("data" not in image.__dict__)
+            other = audiotools.open(temp.name)
+            other_metadata = other.get_metadata()
+            other_metadata.track_name = u"Retagged" * 10000
+            other_metadata.add_image(audiotools.Image.new(TEST_COVER2,
+                                                          u"", 1))
+            other.update_metadata(other_metadata)
+            self.assertEqual(image.data, TEST_COVER1)
+
+            #even if the picture is replaced by one of the same size
+            #and fields, or removed altogether
+            metadata = audiotools.open(temp.name).get_metadata()
+            image = metadata.images()[0]
+            other = audiotools.open(temp.name)
+            other_metadata = other.get_metadata()
+            other_metadata.delete_image(other_metadata.images()[0])
+            other_metadata.add_image(
+                audiotools.Flac_PICTURE(image.picture_type,
+                                        image.mime_type,
+                                        image.description,
+                                        image.width,
+                                        image.height,
+                                        image.color_depth,
+                                        image.color_count,
+                                        TEST_COVER1[::-1]))
+            other.update_metadata(other_metadata)
+            self.assertEqual(image.data, TEST_COVER1)
+            self.assertEqual(audiotools.open(temp.name).get_metadata(
+                    ).images()[-1].data, TEST_COVER1[::-1])
+
+            #but raises IOError once the file is modified
+            #outside of audiotools, since the data can't be trusted
+            metadata = audiotools.open(temp.name).get_metadata()
+            os.utime(temp.name, (0, 0))
+            self.assertRaises(IOError, getattr, metadata.images()[0], "data")
+
+            #and once the file itself is gone
+            metadata = audiotools.open(temp.name).get_metadata()
+        finally:
+            temp.close()
+        self.assertRaises(IOError, getattr, metadata.images()[0], "data")
+
+    @FORMAT_FLAC
+    def test_padding(self):
+        temp = tempfile.NamedTemporaryFile(suffix=self.suffix)
+        try:
+            track = self.audio_class.from_pcm(temp.name,
+                                              EXACT_RANDOM_PCM_Reader(100000))
+            original_pcm = audiotools.open(temp.name).to_pcm()
+            padding_id = audiotools.Flac_PADDING.BLOCK_ID
+
+            #metadata with no PADDING left forces a rewrite
+            #which reserves a new PADDING block
+            metadata = track.get_metadata()
+            metadata.replace_blocks(padding_id, [])
+            metadata.track_name = u"Foo"
+            track.update_metadata(metadata)
+            metadata = track.get_metadata()
+            self.assertEqual(
+                [block.length for block in metadata.get_blocks(padding_id)],
+                [audiotools.__flac__.FLAC_PADDING])
+            self.assertEqual(track.metadata_length(), metadata.size())
+            inode = os.stat(temp.name).st_ino
+
+            #so that larger metadata afterward is written in place
+            metadata.track_name = u"Foo" * 100
+            track.update_metadata(metadata)
+            self.assertEqual(os.stat(temp.name).st_ino, inode)
+            self.assertEqual(audiotools.open(temp.name).get_metadata(),
+                             metadata)
+
+            self.assertEqual(
+                audiotools.pcm_frame_cmp(
+                    original_pcm, audiotools.open(temp.name).to_pcm()),
+                None)
+        finally:
+            temp.close()
+
     def __test_reader__(self, pcmreader, **encode_options):
         if (not audiotools.BIN.can_execute(audiotools.BIN["flac"])):
             self.assert_(False,
@@ -3576,6 +4166,32 @@ class FlacFileTest(TestForeignAiffChunks,
         finally:
             temp.close()
 
+    @FORMAT_FLAC
+    def test_seek_fallbacks(self):
+        def read_all(pcmreader):
+            frames = []
+            framelist = pcmreader.read(4096)
+            while (len(framelist) > 0):
+                frames.append(framelist)
+                framelist = pcmreader.read(4096)
+            pcmreader.close()
+            return reduce(lambda x, y: x + y, frames)
+
+        #"flac-seektable.flac" has seekpoints with invalid destinations
+        #and "flac-allframes.flac" has invalid frame numbers,
+        #neither of which should prevent seeking to the correct PCM frame
+        for filename in ["flac-seektable.flac", "flac-allframes.flac"]:
+            track = audiotools.open(filename)
+            data = read_all(track.to_pcm())
+            for pcm_frame in [0, 1, data.frames / 3, data.frames / 2,
+                              data.frames - 1, data.frames]:
+                pcmreader = track.to_pcm()
+                self.assertEqual(pcmreader.seek(pcm_frame), pcm_frame)
+                remaining = data.split(pcm_frame)[1]
+                if (len(remaining) > 0):
+                    self.assertEqual(read_all(pcmreader), remaining)
+                else:
+                    self.assertEqual(len(pcmreader.read(4096)), 0)
 
     @FORMAT_FLAC
     def test_nonmd5(self):
@@ -3879,6 +4495,53 @@ class MP3FileTest(LossyFileTest):
         finally:
             temp_file.close()
 
+    @FORMAT_MP3
+    def test_update_metadata_in_place(self):
+        temp_file = tempfile.NamedTemporaryFile(suffix=self.suffix)
+        try:
+            mpeg_data = open("sine" + self.suffix, "rb").read()
+            f = open(temp_file.name, "wb")
+            f.write(mpeg_data)
+            f.close()
+            track = self.audio_class(temp_file.name)
+
+            #adding a tag rewrites the file with padding after it
+            track.set_metadata(audiotools.MetaData(track_name=u"Foo"))
+            metadata = track.get_metadata()
+            self.assertEqual(metadata.track_name, u"Foo")
+            self.assertEqual(os.path.getsize(temp_file.name),
+                             metadata.id3v2.size() +
+                             audiotools.__mp3__.ID3V2_PADDING +
+                             len(mpeg_data) + 128)
+            inode = os.stat(temp_file.name).st_ino
+
+            #a larger tag which fits in the padding is written in place
+            metadata.track_name = u"Foo" * 100
+            track.update_metadata(metadata)
+            self.assertEqual(os.stat(temp_file.name).st_ino, inode)
+            self.assertEqual(
+                self.audio_class(temp_file.name).get_metadata(), metadata)
+
+            #a tag larger than the padding rewrites the file
+            metadata.comment = u"Bar" * audiotools.__mp3__.ID3V2_PADDING
+            track.update_metadata(metadata)
+            self.assertNotEqual(os.stat(temp_file.name).st_ino, inode)
+            self.assertEqual(
+                self.audio_class(temp_file.name).get_metadata(), metadata)
+
+            #dropping the ID3v2 tag leaves the ID3v1 tag after the data
+            track.update_metadata(metadata.id3v1)
+            data = open(temp_file.name, "rb").read()
+            self.assertEqual(data[0:-128], mpeg_data)
+            self.assertEqual(data[-128:-125], "TAG")
+
+            #and deleting the metadata leaves only the MPEG frames
+            track.delete_metadata()
+            self.assertEqual(open(temp_file.name, "rb").read(), mpeg_data)
+            self.assertEqual(track.get_metadata(), None)
+        finally:
+            temp_file.close()
+
 
 class MP2FileTest(MP3FileTest):
     def setUp(self):
@@ -4742,6 +5405,48 @@ class WavPackFileTest(TestForeignWaveChunks,
 
         self.assertRaises(IOError, self.decoder, "/dev/null", sample_rate=-1)
 
+    @FORMAT_WAVPACK
+    def test_mmap_decoding(self):
+        temp = tempfile.NamedTemporaryFile(suffix=self.suffix)
+        try:
+            self.audio_class.from_pcm(
+                temp.name,
+                test_streams.Sine16_Stereo(44100 * 5, 44100,
+                                           441.0, 0.50,
+                                           4410.0, 0.49, 1.0))
+            self.assertEqual(
+                audiotools.pcm_frame_cmp(self.decoder(temp.name),
+                                         self.decoder(temp.name, 1)),
+                None)
+
+            #seeking works as before
+            decoders = [self.decoder(temp.name, use_mmap)
+                        for use_mmap in [0, 1]]
+            for decoder in decoders:
+                decoder.seek(44100 * 2 + 100)
+            self.assertEqual(audiotools.pcm_frame_cmp(*decoders), None)
+        finally:
+            temp.close()
+
+    @FORMAT_WAVPACK
+    def test_fast_decoding(self):
+        temp = tempfile.NamedTemporaryFile(suffix=self.suffix)
+        try:
+            for bps in [8, 16, 24]:
+                self.audio_class.from_pcm(
+                    temp.name,
+                    EXACT_RANDOM_PCM_Reader(pcm_frames=44100 * 2,
+                                            bits_per_sample=bps))
+
+                #both decoders return the same samples,
+                #with the verifying one checking the MD5 sum in C
+                self.assertEqual(
+                    audiotools.pcm_frame_cmp(self.decoder(temp.name),
+                                             self.decoder(temp.name, 0, 0)),
+                    None)
+        finally:
+            temp.close()
+
     @FORMAT_WAVPACK
     def test_verify(self):
         #test truncating a WavPack file causes verify()
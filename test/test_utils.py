@@ -1581,6 +1581,69 @@ class trackcat(UtilTest):
                     self.assertEqual(cuesheet.pcm_lengths(793800),
                                      [220500, 264600, 308700])
 
+    @UTIL_TRACKCAT
+    def test_joint(self):
+        #tracks are concatenated to the same PCM data and metadata
+        #whether their segments are encoded in turn or in parallel
+        #though only a file encoded as one stream has an MD5 sum
+        outfile = tempfile.NamedTemporaryFile(suffix=".wv")
+        try:
+            outputs = {}
+            metadatas = {}
+            for max_processes in [None, 1, 3]:
+                self.assertEqual(
+                    self.__run_app__(["trackcat", "-V", "quiet"] +
+                                     (["-j", str(max_processes)]
+                                      if max_processes is not None
+                                      else []) +
+                                     ["--cue", self.cuesheet.name,
+                                      "-o", outfile.name,
+                                      self.track1.filename,
+                                      self.track2.filename,
+                                      self.track3.filename]), 0)
+
+                outputs[max_processes] = open(outfile.name, "rb").read()
+
+                new_track = audiotools.open(outfile.name)
+                self.assertEqual(new_track.NAME, audiotools.WavPackAudio.NAME)
+                self.assertEqual(new_track.total_frames(), 793800)
+                self.assert_(audiotools.pcm_frame_cmp(
+                        new_track.to_pcm(),
+                        audiotools.PCMCat(iter([track.to_pcm() for track in
+                                                [self.track1,
+                                                 self.track2,
+                                                 self.track3]]))) is None)
+
+                metadata = new_track.get_metadata()
+                self.assertEqual(metadata.album_name, u"Album")
+                self.assertEqual(metadata.track_total, 3)
+                metadatas[max_processes] = metadata
+
+                cuesheet = new_track.get_cuesheet()
+                self.assert_(cuesheet is not None)
+                self.assertEqual(list(cuesheet.pcm_lengths(793800)),
+                                 [220500, 264600, 308700])
+
+            #by default, the output is encoded as a single stream
+            self.assertEqual(outputs[None], outputs[1])
+
+            #and joined segments carry the same metadata blocks
+            self.assertEqual(metadatas[3], metadatas[1])
+            self.assertEqual(
+                [(item.key, item.type, item.data)
+                 for item in metadatas[3].tags],
+                [(item.key, item.type, item.data)
+                 for item in metadatas[1].tags])
+
+            self.assertEqual(
+                self.__run_app__(["trackcat", "-j", "0",
+                                  "-o", outfile.name,
+                                  self.track1.filename]), 1)
+            self.__check_error__(
+                _(u"You must run at least 1 process at a time"))
+        finally:
+            outfile.close()
+
 
 class trackcmp(UtilTest):
     @UTIL_TRACKCMP
@@ -4136,3 +4199,61 @@ class tracksplit(UtilTest):
         self.__check_error__(_(u"Cuesheet too long for track being split"))
 
         #FIXME? - check for broken cue sheet output?
+
+    @UTIL_TRACKSPLIT
+    def test_joint(self):
+        #tracks are split the same way
+        #whether they're encoded in turn or in parallel
+        for source_type in [audiotools.FlacAudio,
+                            audiotools.WavPackAudio,
+                            audiotools.WaveAudio]:
+            source_file = tempfile.NamedTemporaryFile(
+                suffix="." + source_type.SUFFIX)
+            try:
+                self.stream.reset()
+                track = source_type.from_pcm(source_file.name, self.stream)
+
+                for max_processes in [1, 3]:
+                    self.clean_output_dirs()
+                    self.assertEqual(
+                        self.__run_app__(["tracksplit", "-V", "quiet",
+                                          "--no-musicbrainz", "--no-freedb",
+                                          "-j", str(max_processes),
+                                          "--cue", self.cuesheet.name,
+                                          "-t", self.type.NAME,
+                                          "-q", self.quality,
+                                          "-d", self.output_dir,
+                                          "--format", self.format,
+                                          track.filename]), 0)
+
+                    output_tracks = [
+                        audiotools.open(
+                            os.path.join(self.output_dir,
+                                         "%2.2d.%s" % (i + 1,
+                                                       self.type.SUFFIX)))
+                        for i in xrange(3)]
+                    self.assertEqual([t.total_frames()
+                                      for t in output_tracks],
+                                     [220500, 264600, 308700])
+                    self.stream.reset()
+                    self.assert_(
+                        audiotools.pcm_frame_cmp(
+                            audiotools.PCMCat(iter([t.to_pcm()
+                                                    for t in output_tracks])),
+                            self.stream) is None)
+
+                    for (i, ISRC) in enumerate([u"JPPI00652340",
+                                                u"JPPI00652349",
+                                                u"JPPI00652341"]):
+                        metadata = output_tracks[i].get_metadata()
+                        self.assertEqual(metadata.track_number, i + 1)
+                        self.assertEqual(metadata.ISRC, ISRC)
+            finally:
+                source_file.close()
+
+        track = self.type.from_pcm(self.unsplit_file.name,
+                                   BLANK_PCM_Reader(18))
+        self.assertEqual(self.__run_app__(
+                ["tracksplit", "-j", "0", "--cue", self.cuesheet.name,
+                 track.filename]), 1)
+        self.__check_error__(_(u"You must run at least 1 process at a time"))